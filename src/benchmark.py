@@ -0,0 +1,77 @@
+import argparse
+import statistics
+
+from utils.algoritmo import CONTROL_DUPLICADOS, MODOS_MUTACION
+from utils.almacen import AlmacenEjecuciones
+from utils.data_handler import cargar_cursos, cargar_docentes, cargar_franjas, cargar_relaciones, cargar_salones
+from utils.operadores import SELECCION_OPERADORES
+from utils.seleccion import METODOS_SELECCION
+from utils.solvers import SOLVERS, crear_solver
+
+# Compara los motores de optimizacion sobre un mismo conjunto de datos
+# Uso: python src/benchmark.py --datos data_usada --motores genetico recocido --repeticiones 3
+def main():
+    parser = argparse.ArgumentParser(description="Comparacion de motores de optimizacion de horarios")
+    parser.add_argument("--datos", default="data", help="carpeta con cursos.csv, salones.csv, docentes.csv, "
+                        "relaciones_docente_curso.csv y opcionalmente franjas.csv")
+    parser.add_argument("--motores", nargs="+", default=list(SOLVERS), choices=list(SOLVERS))
+    parser.add_argument("--generaciones", type=int, default=100)
+    parser.add_argument("--poblacion", type=int, default=10)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--seleccion", default="torneo", choices=list(METODOS_SELECCION))
+    parser.add_argument("--lotes", action="store_true", help="cruza y mutacion por lotes")
+    parser.add_argument("--mutacion", default="adaptativa", choices=list(MODOS_MUTACION))
+    parser.add_argument("--duplicados", default="compartir", choices=list(CONTROL_DUPLICADOS))
+    parser.add_argument("--operadores", default="generacion", choices=list(SELECCION_OPERADORES))
+    parser.add_argument("--almacen", help="base de datos SQLite donde se guarda cada ejecucion")
+    args = parser.parse_args()
+
+    cursos = cargar_cursos(f"{args.datos}/cursos.csv")
+    salones = cargar_salones(f"{args.datos}/salones.csv")
+    docentes = cargar_docentes(f"{args.datos}/docentes.csv")
+    relaciones = cargar_relaciones(f"{args.datos}/relaciones_docente_curso.csv")
+    franjas = cargar_franjas(f"{args.datos}/franjas.csv")
+
+    parametros = {
+        "poblacion_inicial": args.poblacion,
+        "tasa_mutacion": 0.3,
+        "penalizacion_continuidad": 10,
+        "conflicto_esperado": 0, "evaluar_conflicto": True,
+        "continuidad_esperada": 0, "evaluar_continuidad": False,
+        "penalizacion_esperada": 0, "evaluar_penalizacion": False,
+        "umbral_diversidad": 0.1,
+        "intervalo_reinsercion": 5, "porcentaje_reinsercion": 0.3,
+        "metodo_seleccion": args.seleccion,
+        "variacion_por_lotes": args.lotes,
+        "modo_mutacion": args.mutacion,
+        "control_duplicados": args.duplicados,
+        "seleccion_operadores": args.operadores,
+    }
+
+    almacen = AlmacenEjecuciones(args.almacen) if args.almacen else None
+    print(f"{'motor':<12}{'tiempo (s)':>12}{'conflictos':>12}{'continuidad':>13}{'iteraciones':>13}{'evaluaciones':>14}{'duplicados':>12}")
+    for nombre in args.motores:
+        tiempos, conflictos, continuidades, iteraciones, evaluaciones, duplicados = [], [], [], [], [], []
+        for repeticion in range(args.repeticiones):
+            solver = crear_solver(nombre)
+            ambiente = solver.cargar_instancia(cursos, salones, docentes, relaciones, franjas)
+            ambiente.callback_log = lambda mensaje: None
+            solver.resolver(args.generaciones, {**parametros, "semilla": args.semilla + repeticion})
+            if almacen is not None:
+                almacen.guardar_ejecucion(ambiente, nombre, {**parametros, "semilla": ambiente.semilla,
+                                                              "generaciones": args.generaciones})
+            tiempos.append(ambiente.tiempo_ejecucion)
+            conflictos.append(ambiente.conflictos_mejor_individuo)
+            continuidades.append(ambiente.porcentaje_continuidad)
+            iteraciones.append(ambiente.iteraciones_optimas)
+            evaluaciones.append(ambiente.evaluaciones)
+            duplicados.append(sum(ambiente.duplicados_por_generacion))
+        print(f"{nombre:<12}{statistics.mean(tiempos):>12.3f}{statistics.mean(conflictos):>12.2f}"
+              f"{statistics.mean(continuidades):>13.2f}{statistics.mean(iteraciones):>13.1f}{statistics.mean(evaluaciones):>14.0f}"
+              f"{statistics.mean(duplicados):>12.1f}")
+    if almacen is not None:
+        almacen.cerrar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import os
+
+from utils.algoritmo import MODOS_MUTACION
+from utils.data_handler import cargar_cursos, cargar_docentes, cargar_franjas, cargar_relaciones, cargar_salones
+from utils.ejecuciones import Portafolio, resultado_ejecucion
+from utils.exportador import EXTENSIONES, FORMATOS_EXPORTACION, exportar
+from utils.operadores import SELECCION_OPERADORES
+from utils.solvers import PARAMETROS_POR_DEFECTO, SOLVERS, crear_solver
+
+# Genera un horario sin la interfaz y lo exporta en los formatos elegidos
+# Uso: python src/cli.py --datos data --formatos csv json ical --salida reports
+def main():
+    parser = argparse.ArgumentParser(description="Generacion de horarios desde la linea de comandos")
+    parser.add_argument("--datos", default="data", help="carpeta con cursos.csv, salones.csv, docentes.csv, "
+                        "relaciones_docente_curso.csv y opcionalmente franjas.csv")
+    parser.add_argument("--motor", default="genetico", choices=list(SOLVERS))
+    parser.add_argument("--generaciones", type=int, default=100,
+                        help="con --tiempo-limite o --max-evaluaciones, 0 no limita las generaciones")
+    parser.add_argument("--tiempo-limite", type=float, default=0, help="segundos de ejecucion (0 = sin limite)")
+    parser.add_argument("--max-evaluaciones", type=int, default=0,
+                        help="evaluaciones de la funcion de costo (0 = sin limite)")
+    parser.add_argument("--poblacion", type=int, default=PARAMETROS_POR_DEFECTO["poblacion_inicial"])
+    parser.add_argument("--tasa-mutacion", type=float, default=PARAMETROS_POR_DEFECTO["tasa_mutacion"])
+    parser.add_argument("--mutacion", default=PARAMETROS_POR_DEFECTO["modo_mutacion"], choices=list(MODOS_MUTACION))
+    parser.add_argument("--operadores", default=PARAMETROS_POR_DEFECTO["seleccion_operadores"],
+                        choices=list(SELECCION_OPERADORES), help="eleccion de la cruza y la mutacion de cada hijo")
+    parser.add_argument("--semilla", type=int, help="repite una ejecucion anterior, sin semilla se sortea una")
+    parser.add_argument("--portafolio", type=int, default=1,
+                        help="cantidad de semillas que se ejecutan en paralelo, se conserva la mejor")
+    parser.add_argument("--procesos", type=int, help="procesos a la vez en el portafolio (por defecto uno por nucleo)")
+    parser.add_argument("--conflictos-esperados", type=int, default=0,
+                        help="se detiene al llegar a esta cantidad de conflictos")
+    parser.add_argument("--formatos", nargs="+", default=["csv"], choices=list(FORMATOS_EXPORTACION) + ["pdf"])
+    parser.add_argument("--salida", default="reports", help="carpeta donde se escriben los archivos")
+    parser.add_argument("--nombre", default="horario", help="nombre de los archivos exportados, sin extension")
+    parser.add_argument("--silencioso", action="store_true", help="no mostrar el avance por generacion")
+    args = parser.parse_args()
+
+    solver = crear_solver(args.motor)
+    ambiente = solver.cargar_instancia(
+        cargar_cursos(os.path.join(args.datos, "cursos.csv")),
+        cargar_salones(os.path.join(args.datos, "salones.csv")),
+        cargar_docentes(os.path.join(args.datos, "docentes.csv")),
+        cargar_relaciones(os.path.join(args.datos, "relaciones_docente_curso.csv")),
+        cargar_franjas(os.path.join(args.datos, "franjas.csv")))
+    ambiente.callback_log = (lambda mensaje: None) if args.silencioso else print
+    ambiente.generar_pdf = "pdf" in args.formatos
+    ambiente.directorio_reportes = args.salida
+
+    parametros = {
+        **PARAMETROS_POR_DEFECTO,
+        "poblacion_inicial": args.poblacion,
+        "tasa_mutacion": args.tasa_mutacion,
+        "modo_mutacion": args.mutacion,
+        "seleccion_operadores": args.operadores,
+        "conflicto_esperado": args.conflictos_esperados,
+        "evaluar_conflicto": True,
+        "evaluar_penalizacion": False,
+        "semilla": args.semilla,
+        "tiempo_limite": args.tiempo_limite,
+        "max_evaluaciones": args.max_evaluaciones,
+    }
+    if args.portafolio > 1:
+        resultado = Portafolio(ambiente, args.motor, args.generaciones, parametros, args.portafolio,
+                               args.procesos).ejecutar()
+        for ejecucion in resultado["portafolio"]:
+            print(f"Semilla {ejecucion['semilla']}: {ejecucion['estado']} en {ejecucion['generaciones']} generaciones")
+    else:
+        solver.resolver(args.generaciones, parametros)
+        resultado = resultado_ejecucion(ambiente)
+
+    os.makedirs(args.salida, exist_ok=True)
+    for formato in args.formatos:
+        if formato == "pdf":
+            print(f"pdf: {resultado['reporte_horarios_pdf']}")
+            continue
+        archivo = os.path.join(args.salida, args.nombre + EXTENSIONES[formato])
+        exportar(resultado["horario"], formato, archivo)
+        print(f"{formato}: {os.path.abspath(archivo)}")
+    print(f"Conflictos: {resultado['conflictos_mejor_individuo']} Continuidad: {resultado['continuidad']:.2f}% "
+          f"Tiempo: {resultado['tiempo']:.2f} s Semilla: {resultado['semilla']} "
+          f"Terminacion: {resultado['motivo_terminacion']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,44 @@
-from PyQt5.QtCore import QThread, pyqtSignal
+import pickle
+
+from PyQt5.QtCore import QThread, QTimer, pyqtSignal
 from PyQt5.QtGui import QTextCursor
-from PyQt5.QtWidgets import QCheckBox, QGridLayout, QGroupBox, QHBoxLayout, QLabel, QLineEdit, QMessageBox, QPushButton, QTextEdit, QVBoxLayout, QWidget
+from PyQt5.QtWidgets import QAbstractItemView, QCheckBox, QComboBox, QFileDialog, QGridLayout, QGroupBox, QHBoxLayout, QInputDialog, QLabel, QLineEdit, QMessageBox, QPushButton, QTableWidget, QTableWidgetItem, QTextEdit, QVBoxLayout, QWidget
 
 from interface.logger import Logger
 from interface.pdf_viewer import PDFViewer
-from interface.plot_viewer import ConflictPlot, ContinuidadPlot
-from utils.algoritmo import AmbienteAlgoritmo
+from interface.plot_viewer import ConvergenciaPlot
+from utils.algoritmo import CONTROL_DUPLICADOS, MODOS_MUTACION, AmbienteAlgoritmo
+from utils.almacen import AlmacenEjecuciones, huella_dataset
+from utils.data_handler import cargar_solucion, guardar_solucion
+from utils.ejecuciones import GrupoEjecuciones, Portafolio, ejecutar_en_ambiente
+from utils.exportador import FORMATOS_EXPORTACION, exportar
+from utils.operadores import SELECCION_OPERADORES
+from utils.pdf_handler import crear_horarios_pdf
+from utils.seleccion import METODOS_SELECCION
+from utils.solvers import SOLVERS
+
+# Columnas de la tabla de comparacion, la descripcion de la configuracion va al final
+COLUMNAS_COMPARACION = ["Ejecucion", "Motor", "Estado", "Generacion", "Conflictos", "Continuidad", "Penalizacion",
+                        "Evaluaciones", "Tiempo (s)", "Configuracion"]
 
 class GALayout(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, modelos=None, parent=None):
         super().__init__(parent)
+        # modelos de las pestañas de datos (cursos, salones, docentes, relaciones, franjas)
+        self.modelos = modelos or {}
+        # ultimo horario generado y solucion previa cargada para reprogramar
+        self.horario_actual = None
+        self.solucion_previa = None
+        # instancia preparada con los datos de las pestañas (y su copia serializada para los procesos),
+        # se reconstruye solo cuando cambia la version de algun modelo
+        self.instancia = None
+        self.instancia_serializada = None
+        self.versiones_instancia = None
+        # ejecuciones en segundo plano para comparar configuraciones: id -> fila, futuro, instancia y resultado
+        self.grupo_ejecuciones = None
+        self.ejecuciones = {}
+        self.temporizador_ejecuciones = QTimer(self)
+        self.temporizador_ejecuciones.timeout.connect(self.revisar_ejecuciones)
         self.initUI()
     
     def initUI(self):
@@ -43,9 +72,73 @@ class GALayout(QWidget):
         self.porcentaje_reinsercion_edit = QLineEdit("0.3")
         param_layout.addWidget(self.porcentaje_reinsercion_edit, 5, 1)
 
+        param_layout.addWidget(QLabel("Motor de Optimizacion"), 14, 0)
+        self.motor_combo = QComboBox()
+        for clave, solver in SOLVERS.items():
+            self.motor_combo.addItem(solver.nombre, clave)
+        param_layout.addWidget(self.motor_combo, 14, 1)
+
+        param_layout.addWidget(QLabel("Modo de Evolucion"), 6, 0)
+        self.modo_evolucion_combo = QComboBox()
+        self.modo_evolucion_combo.addItem("Generacional", "generacional")
+        self.modo_evolucion_combo.addItem("Estado Estacionario", "estacionario")
+        param_layout.addWidget(self.modo_evolucion_combo, 6, 1)
+
+        param_layout.addWidget(QLabel("Hijos por Paso (Estacionario)"), 7, 0)
+        self.hijos_por_paso_edit = QLineEdit("2")
+        param_layout.addWidget(self.hijos_por_paso_edit, 7, 1)
+
+        self.rastrear_memoria_check = QCheckBox("Rastrear Memoria por Generacion")
+        param_layout.addWidget(self.rastrear_memoria_check, 8, 0, 1, 2)
+
+        param_layout.addWidget(QLabel("Seleccion de Padres"), 9, 0)
+        self.seleccion_combo = QComboBox()
+        for clave, nombre in METODOS_SELECCION.items():
+            self.seleccion_combo.addItem(nombre, clave)
+        param_layout.addWidget(self.seleccion_combo, 9, 1)
+
+        self.variacion_por_lotes_check = QCheckBox("Cruza y Mutacion por Lotes")
+        param_layout.addWidget(self.variacion_por_lotes_check, 10, 0, 1, 2)
+
+        self.carga_docente_check = QCheckBox("Carga Docente como Objetivo (Multiobjetivo)")
+        param_layout.addWidget(self.carga_docente_check, 11, 0, 1, 2)
+
+        param_layout.addWidget(QLabel("Modo de Mutacion"), 12, 0)
+        self.modo_mutacion_combo = QComboBox()
+        for clave, nombre in MODOS_MUTACION.items():
+            self.modo_mutacion_combo.addItem(nombre, clave)
+        param_layout.addWidget(self.modo_mutacion_combo, 12, 1)
+
+        param_layout.addWidget(QLabel("Hijos Duplicados"), 13, 0)
+        self.control_duplicados_combo = QComboBox()
+        for clave, nombre in CONTROL_DUPLICADOS.items():
+            self.control_duplicados_combo.addItem(nombre, clave)
+        param_layout.addWidget(self.control_duplicados_combo, 13, 1)
+
+        param_layout.addWidget(QLabel("Seleccion de Operadores"), 15, 0)
+        self.seleccion_operadores_combo = QComboBox()
+        for clave, nombre in SELECCION_OPERADORES.items():
+            self.seleccion_operadores_combo.addItem(nombre, clave)
+        param_layout.addWidget(self.seleccion_operadores_combo, 15, 1)
+
         self.run_button = QPushButton("Generar Horario")
         self.run_button.clicked.connect(self.start_ga)
-        param_layout.addWidget(self.run_button, 6, 0, 1, 2)
+        param_layout.addWidget(self.run_button, 16, 0)
+        self.encolar_button = QPushButton("Ejecutar en Segundo Plano")
+        self.encolar_button.clicked.connect(self.encolar_ejecucion)
+        param_layout.addWidget(self.encolar_button, 16, 1)
+
+        param_layout.addWidget(QLabel("Procesos en Paralelo"), 17, 0)
+        self.procesos_paralelos_edit = QLineEdit("2")
+        param_layout.addWidget(self.procesos_paralelos_edit, 17, 1)
+
+        param_layout.addWidget(QLabel("Semilla (vacia = aleatoria)"), 18, 0)
+        self.semilla_edit = QLineEdit("")
+        param_layout.addWidget(self.semilla_edit, 18, 1)
+
+        param_layout.addWidget(QLabel("Semillas en Portafolio"), 19, 0)
+        self.portafolio_edit = QLineEdit("1")
+        param_layout.addWidget(self.portafolio_edit, 19, 1)
         param_group.setLayout(param_layout)
         header_hlayout.addWidget(param_group)
 
@@ -87,6 +180,69 @@ class GALayout(QWidget):
         self.continuidad_esperada_edit = QLineEdit("0")
         eval_layout.addWidget(self.continuidad_esperada_edit, 1, 2)
 
+        eval_layout.addWidget(QLabel("Generaciones sin Mejora (0 = no evaluar):"), 3, 1)
+        self.generaciones_sin_mejora_edit = QLineEdit("0")
+        eval_layout.addWidget(self.generaciones_sin_mejora_edit, 3, 2)
+
+        eval_layout.addWidget(QLabel("Mejora Minima por Generacion (0 = no evaluar):"), 4, 1)
+        self.epsilon_mejora_edit = QLineEdit("0")
+        eval_layout.addWidget(self.epsilon_mejora_edit, 4, 2)
+        eval_layout.addWidget(QLabel("Ventana (generaciones):"), 4, 3)
+        self.ventana_mejora_edit = QLineEdit("50")
+        eval_layout.addWidget(self.ventana_mejora_edit, 4, 4)
+
+        self.detectar_colapso_check = QCheckBox("Detectar Colapso de Diversidad")
+        eval_layout.addWidget(self.detectar_colapso_check, 5, 0)
+        eval_layout.addWidget(QLabel("Umbral de Diversidad:"), 5, 1)
+        self.umbral_diversidad_edit = QLineEdit("0.1")
+        eval_layout.addWidget(self.umbral_diversidad_edit, 5, 2)
+
+        eval_layout.addWidget(QLabel("Ante Estancamiento:"), 3, 3)
+        self.accion_estancamiento_combo = QComboBox()
+        self.accion_estancamiento_combo.addItem("Detener", "detener")
+        self.accion_estancamiento_combo.addItem("Reiniciar Poblacion", "reiniciar")
+        eval_layout.addWidget(self.accion_estancamiento_combo, 3, 4)
+
+        self.reprogramar_check = QCheckBox("Reprogramar desde Solucion Previa")
+        self.reprogramar_check.setEnabled(False)
+        eval_layout.addWidget(self.reprogramar_check, 6, 0)
+        self.cargar_solucion_button = QPushButton("Cargar Solucion Previa")
+        self.cargar_solucion_button.clicked.connect(self.cargar_solucion_previa)
+        eval_layout.addWidget(self.cargar_solucion_button, 6, 1)
+        eval_layout.addWidget(QLabel("Penalizacion por Curso Modificado:"), 6, 2)
+        self.peso_desviacion_edit = QLineEdit("0")
+        eval_layout.addWidget(self.peso_desviacion_edit, 6, 3)
+        self.guardar_solucion_button = QPushButton("Guardar Solucion")
+        self.guardar_solucion_button.setEnabled(False)
+        self.guardar_solucion_button.clicked.connect(self.guardar_solucion_actual)
+        eval_layout.addWidget(self.guardar_solucion_button, 6, 4)
+
+        self.guardar_historial_check = QCheckBox("Guardar Ejecuciones en el Historial")
+        self.guardar_historial_check.setChecked(True)
+        eval_layout.addWidget(self.guardar_historial_check, 7, 0)
+        self.cargar_ejecucion_button = QPushButton("Cargar Ejecucion Guardada")
+        self.cargar_ejecucion_button.clicked.connect(self.cargar_ejecucion_guardada)
+        eval_layout.addWidget(self.cargar_ejecucion_button, 7, 1)
+        self.generar_pdf_check = QCheckBox("Generar Reporte PDF")
+        self.generar_pdf_check.setChecked(True)
+        eval_layout.addWidget(self.generar_pdf_check, 7, 2)
+        self.exportar_button = QPushButton("Exportar Horario (CSV, JSON, iCal)")
+        self.exportar_button.setEnabled(False)
+        self.exportar_button.clicked.connect(self.exportar_horario)
+        eval_layout.addWidget(self.exportar_button, 7, 3)
+
+        eval_layout.addWidget(QLabel("Tiempo Limite en Segundos (0 = sin limite):"), 8, 1)
+        self.tiempo_limite_edit = QLineEdit("0")
+        eval_layout.addWidget(self.tiempo_limite_edit, 8, 2)
+        eval_layout.addWidget(QLabel("Maximo de Evaluaciones (0 = sin limite):"), 8, 3)
+        self.max_evaluaciones_edit = QLineEdit("0")
+        eval_layout.addWidget(self.max_evaluaciones_edit, 8, 4)
+        # muestra la mejor solucion de la ejecucion en curso sin esperar a que termine
+        self.tomar_mejor_button = QPushButton("Tomar Mejor Horario")
+        self.tomar_mejor_button.setEnabled(False)
+        self.tomar_mejor_button.clicked.connect(self.tomar_mejor_horario)
+        eval_layout.addWidget(self.tomar_mejor_button, 8, 0)
+
         eval_group.setLayout(eval_layout)
         layout.addWidget(eval_group)
 
@@ -117,51 +273,313 @@ class GALayout(QWidget):
 
         layout.addLayout(reports_hlayout)
 
+        comparacion_group = QGroupBox("Comparacion de Ejecuciones (doble clic para ver el resultado)")
+        comparacion_layout = QVBoxLayout()
+        self.comparacion_table = QTableWidget(0, len(COLUMNAS_COMPARACION))
+        self.comparacion_table.setHorizontalHeaderLabels(COLUMNAS_COMPARACION)
+        self.comparacion_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.comparacion_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.comparacion_table.horizontalHeader().setStretchLastSection(True)
+        self.comparacion_table.cellDoubleClicked.connect(self.mostrar_ejecucion)
+        comparacion_layout.addWidget(self.comparacion_table)
+        self.cancelar_ejecuciones_button = QPushButton("Cancelar Ejecuciones en Cola")
+        self.cancelar_ejecuciones_button.clicked.connect(self.cancelar_ejecuciones)
+        comparacion_layout.addWidget(self.cancelar_ejecuciones_button)
+        comparacion_group.setLayout(comparacion_layout)
+        layout.addWidget(comparacion_group)
+
         self.plot_group = QGroupBox("")
         self.plot_group.setMinimumHeight(400)
         self.plot_layout = QVBoxLayout()
         self.plot_group.setLayout(self.plot_layout)
+        self.convergencia_plot = ConvergenciaPlot(parent=self)
+        self.plot_layout.addWidget(self.convergencia_plot)
         layout.addWidget(self.plot_group)
 
-        self.plot_continuidad_group = QGroupBox("")
-        self.plot_continuidad_group.setMinimumHeight(400)
-        self.plot_continuidad_layout = QVBoxLayout()
-        self.plot_continuidad_group.setLayout(self.plot_continuidad_layout)
-        layout.addWidget(self.plot_continuidad_group)
-
         self.setLayout(layout)
 
-    def start_ga(self):
+    # Lee los parametros del formulario: (motor, generaciones, parametros, solucion previa, peso de desviacion)
+    # o None si algun valor no es valido
+    def leer_configuracion(self):
         try:
-            Logger.instance().clear()
-            poblacion_inicial = int(self.population_edit.text())
             generaciones = int(self.generations_edit.text())
-            tasa_mutacion = float(self.tasa_mutacion_edit.text())
-            penalizacion_continuidad = float(self.penalizacion_continuidad_edit.text())
-            generaciones_reinsercion = int(self.generaciones_reinsercion_edit.text())
-            porcentaje_reinsercion = float(self.porcentaje_reinsercion_edit.text())
-
-            evaluar_conflictos = self.evaluar_conflictos_check.isChecked()
-            conflictos_esperados = int(self.conflictos_esperados_edit.text())
-            
-            evaluar_continuidad = self.evaluar_continuidad_check.isChecked()
-            continuidad_esperada = int(self.continuidad_esperada_edit.text())
-            
-            evaluar_penalizacion = self.evaluar_penalizacion_check.isChecked()
-            penalizacion_esperada = int(self.penalizacion_esperada_edit.text())
+            parametros = {
+                "poblacion_inicial": int(self.population_edit.text()),
+                "tasa_mutacion": float(self.tasa_mutacion_edit.text()),
+                "penalizacion_continuidad": float(self.penalizacion_continuidad_edit.text()),
+                "conflicto_esperado": int(self.conflictos_esperados_edit.text()),
+                "evaluar_conflicto": self.evaluar_conflictos_check.isChecked(),
+                "continuidad_esperada": int(self.continuidad_esperada_edit.text()),
+                "evaluar_continuidad": self.evaluar_continuidad_check.isChecked(),
+                "penalizacion_esperada": int(self.penalizacion_esperada_edit.text()),
+                "evaluar_penalizacion": self.evaluar_penalizacion_check.isChecked(),
+                "umbral_diversidad": float(self.umbral_diversidad_edit.text()),
+                "intervalo_reinsercion": int(self.generaciones_reinsercion_edit.text()),
+                "porcentaje_reinsercion": float(self.porcentaje_reinsercion_edit.text()),
+                # opciones adicionales que se pasan por nombre a AmbienteAlgoritmo.ejecutar
+                "rastrear_memoria": self.rastrear_memoria_check.isChecked(),
+                "modo_evolucion": self.modo_evolucion_combo.currentData(),
+                "hijos_por_paso": int(self.hijos_por_paso_edit.text()),
+                "metodo_seleccion": self.seleccion_combo.currentData(),
+                "variacion_por_lotes": self.variacion_por_lotes_check.isChecked(),
+                "incluir_carga_docente": self.carga_docente_check.isChecked(),
+                "modo_mutacion": self.modo_mutacion_combo.currentData(),
+                "control_duplicados": self.control_duplicados_combo.currentData(),
+                "seleccion_operadores": self.seleccion_operadores_combo.currentData(),
+                "generaciones_sin_mejora": int(self.generaciones_sin_mejora_edit.text()),
+                "epsilon_mejora": float(self.epsilon_mejora_edit.text()),
+                "ventana_mejora": int(self.ventana_mejora_edit.text()),
+                "detectar_colapso_diversidad": self.detectar_colapso_check.isChecked(),
+                "accion_estancamiento": self.accion_estancamiento_combo.currentData(),
+                "semilla": int(self.semilla_edit.text()) if self.semilla_edit.text().strip() else None,
+                "tiempo_limite": float(self.tiempo_limite_edit.text()),
+                "max_evaluaciones": int(self.max_evaluaciones_edit.text()),
+            }
+            peso_desviacion = float(self.peso_desviacion_edit.text())
         except ValueError:
             QMessageBox.critical(self, "Error", "Ingrese valores numéricos válidos.")
+            return None
+        solucion_previa = self.solucion_previa if self.reprogramar_check.isChecked() else None
+        return self.motor_combo.currentData(), generaciones, parametros, solucion_previa, peso_desviacion
+
+    # Instancia del problema con los datos actuales de las pestañas, solo se vuelve a preparar
+    # (dominios, huellas, evaluador) cuando alguna pestaña cambio sus registros
+    def instancia_preparada(self) -> AmbienteAlgoritmo:
+        versiones = tuple(modelo.version for modelo in self.modelos.values())
+        if self.instancia is None or versiones != self.versiones_instancia:
+            # se copian las listas para que una edicion en las pestañas no afecte las ejecuciones en curso
+            datos = {nombre: list(modelo.registros) for nombre, modelo in self.modelos.items()}
+            ambiente = AmbienteAlgoritmo()
+            ambiente.preparar_data(**datos)
+            self.instancia = ambiente
+            self.instancia_serializada = pickle.dumps(ambiente)
+            self.versiones_instancia = versiones
+        return self.instancia
+
+    def start_ga(self):
+        configuracion = self.leer_configuracion()
+        if configuracion is None:
             return
+        try:
+            portafolio = int(self.portafolio_edit.text())
+            procesos = int(self.procesos_paralelos_edit.text())
+        except ValueError:
+            QMessageBox.critical(self, "Error", "Ingrese valores numéricos válidos.")
+            return
+        Logger.instance().clear()
+        motor, generaciones, parametros, solucion_previa, peso_desviacion = configuracion
 
         self.run_button.setEnabled(False)
-        self.worker = GAWorker(poblacion_inicial, generaciones, tasa_mutacion, penalizacion_continuidad, 
-                               generaciones_reinsercion, porcentaje_reinsercion, 
-                               evaluar_conflictos, conflictos_esperados, 
-                               evaluar_continuidad, continuidad_esperada, 
-                               evaluar_penalizacion, penalizacion_esperada)
+        self.convergencia_plot.reiniciar()
+        self.worker = GAWorker(self.instancia_preparada(), motor, generaciones, parametros, solucion_previa,
+                               peso_desviacion, self.guardar_historial_check.isChecked(),
+                               self.generar_pdf_check.isChecked(), portafolio, procesos)
         self.worker.result_signal.connect(self.display_result)
+        self.worker.progress_signal.connect(self.convergencia_plot.agregar_datos)
+        self.worker.finished.connect(self.ejecucion_terminada)
+        # el portafolio se ejecuta en otros procesos, su mejor solucion parcial no esta en esta instancia
+        self.tomar_mejor_button.setEnabled(portafolio <= 1)
         self.worker.start()
 
+    def ejecucion_terminada(self):
+        self.run_button.setEnabled(True)
+        self.tomar_mejor_button.setEnabled(False)
+
+    # Muestra la mejor solucion encontrada hasta ahora, la ejecucion continua y al terminar muestra su resultado
+    def tomar_mejor_horario(self):
+        mejor = self.worker.ambiente.mejor_hasta_ahora()
+        if mejor is None:
+            QMessageBox.information(self, "Mejor Horario", "La ejecucion aun no evalua ninguna generacion.")
+            return
+        self.display_result({
+            "horario": mejor["horario"],
+            "conflictos_mejor_individuo": mejor["conflictos"],
+            "continuidad": mejor["continuidad"],
+            "iteraciones": mejor["generacion"],
+            "evaluaciones": mejor["evaluaciones"],
+            "tiempo": mejor["tiempo"],
+            "motivo_terminacion": "en ejecucion (mejor solucion parcial)",
+            "reporte_horarios_pdf": (crear_horarios_pdf(mejor["horario"], franjas=self.worker.ambiente.franjas)
+                                     if self.generar_pdf_check.isChecked() else None),
+        })
+
+    # Envia la configuracion actual a los procesos en segundo plano y agrega su fila a la comparacion
+    def encolar_ejecucion(self):
+        configuracion = self.leer_configuracion()
+        if configuracion is None:
+            return
+        try:
+            procesos = int(self.procesos_paralelos_edit.text())
+        except ValueError:
+            QMessageBox.critical(self, "Error", "Ingrese valores numéricos válidos.")
+            return
+        motor, generaciones, parametros, solucion_previa, peso_desviacion = configuracion
+        ambiente = self.instancia_preparada()
+        if self.grupo_ejecuciones is None:
+            self.grupo_ejecuciones = GrupoEjecuciones(procesos)
+        id_ejecucion, futuro = self.grupo_ejecuciones.enviar(
+            self.instancia_serializada, motor, generaciones, parametros, solucion_previa, peso_desviacion,
+            self.guardar_historial_check.isChecked(), self.generar_pdf_check.isChecked(), procesos)
+
+        fila = self.comparacion_table.rowCount()
+        self.comparacion_table.insertRow(fila)
+        descripcion = (f"Poblacion {parametros['poblacion_inicial']}, Generaciones {generaciones}, "
+                       f"Mutacion {parametros['tasa_mutacion']} ({self.modo_mutacion_combo.currentText()}), "
+                       f"{self.modo_evolucion_combo.currentText()}, {self.seleccion_combo.currentText()}, "
+                       f"Operadores {self.seleccion_operadores_combo.currentText()}"
+                       + (", Por Lotes" if parametros["variacion_por_lotes"] else ""))
+        for columna, valor in enumerate([f"#{id_ejecucion}", self.motor_combo.currentText(), "En Cola"]):
+            self.comparacion_table.setItem(fila, columna, QTableWidgetItem(valor))
+        self.comparacion_table.setItem(fila, len(COLUMNAS_COMPARACION) - 1, QTableWidgetItem(descripcion))
+        # el horario vuelve con copias de los modelos, se interna con la instancia con que se envio
+        self.ejecuciones[id_ejecucion] = {"fila": fila, "futuro": futuro, "instancia": ambiente, "resultado": None,
+                                         "terminada": False}
+        if not self.temporizador_ejecuciones.isActive():
+            self.temporizador_ejecuciones.start(250)
+
+    def actualizar_fila(self, fila: int, estado: str, generacion="", conflictos="", continuidad="",
+                        penalizacion="", evaluaciones="", tiempo=""):
+        for columna, valor in enumerate([estado, generacion, conflictos, continuidad, penalizacion, evaluaciones,
+                                         tiempo], start=2):
+            self.comparacion_table.setItem(fila, columna, QTableWidgetItem(str(valor)))
+
+    # Se llama periodicamente mientras haya ejecuciones en segundo plano
+    def revisar_ejecuciones(self):
+        for id_ejecucion, metricas in self.grupo_ejecuciones.progreso():
+            ejecucion = self.ejecuciones.get(id_ejecucion)
+            if ejecucion is None or ejecucion["futuro"].done():
+                continue
+            self.actualizar_fila(ejecucion["fila"], "Ejecutando", metricas["generacion"], metricas["conflictos"],
+                                 f"{metricas['continuidad']:.2f}%", f"{metricas['penalizacion']:.2f}",
+                                 metricas["evaluaciones"])
+
+        pendientes = 0
+        for id_ejecucion, ejecucion in self.ejecuciones.items():
+            futuro = ejecucion["futuro"]
+            if not futuro.done():
+                pendientes += 1
+                continue
+            if ejecucion["terminada"]:
+                continue
+            ejecucion["terminada"] = True
+            if futuro.cancelled():
+                self.actualizar_fila(ejecucion["fila"], "Cancelada")
+                continue
+            if futuro.exception() is not None:
+                self.actualizar_fila(ejecucion["fila"], "Error")
+                Logger.instance().log(f"La ejecucion #{id_ejecucion} fallo: {futuro.exception()}")
+                continue
+            resultado = futuro.result()
+            if resultado["horario"] is not None:
+                resultado["horario"] = ejecucion["instancia"].internar_individuo(resultado["horario"])
+            ejecucion["resultado"] = resultado
+            penalizaciones = resultado["penalizaciones"]
+            self.actualizar_fila(ejecucion["fila"], resultado["motivo_terminacion"].capitalize(),
+                                 resultado["iteraciones"], resultado["conflictos_mejor_individuo"],
+                                 f"{resultado['continuidad']:.2f}%",
+                                 f"{penalizaciones[-1]:.2f}" if penalizaciones else "N/A",
+                                 resultado["evaluaciones"], f"{resultado['tiempo']:.2f}")
+        if not pendientes:
+            self.temporizador_ejecuciones.stop()
+
+    def mostrar_ejecucion(self, fila: int, columna: int):
+        for ejecucion in self.ejecuciones.values():
+            if ejecucion["fila"] == fila and ejecucion["resultado"] is not None:
+                self.convergencia_plot.reiniciar()
+                self.display_result(ejecucion["resultado"])
+                return
+
+    def cancelar_ejecuciones(self):
+        for ejecucion in self.ejecuciones.values():
+            ejecucion["futuro"].cancel()
+
+    # Al cerrar la ventana se interrumpen las ejecuciones en segundo plano
+    def detener_ejecuciones(self):
+        if self.grupo_ejecuciones is not None:
+            self.grupo_ejecuciones.detener()
+
+    # Carga un horario guardado, los siguientes horarios se pueden generar a partir de el
+    def cargar_solucion_previa(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar Solucion Previa", "", "JSON Files (*.json);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            self.solucion_previa = cargar_solucion(file_path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.critical(self, "Error", f"No se pudo cargar la solucion: {e}")
+            return
+        self.reprogramar_check.setEnabled(True)
+        self.reprogramar_check.setChecked(True)
+        Logger.instance().log(f"Solucion previa cargada: {file_path} ({len(self.solucion_previa)} asignaciones)")
+
+    def guardar_solucion_actual(self):
+        if self.horario_actual is None:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Guardar Solucion", "solucion.json", "JSON Files (*.json);;All Files (*)")
+        if not file_path:
+            return
+        try:
+            guardar_solucion(self.horario_actual, file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar la solucion: {e}")
+
+    def exportar_horario(self):
+        if self.horario_actual is None:
+            return
+        filtros = {filtro: formato for formato, (_, filtro) in FORMATOS_EXPORTACION.items()}
+        file_path, filtro = QFileDialog.getSaveFileName(self, "Exportar Horario", "horario", ";;".join(filtros))
+        if not file_path:
+            return
+        try:
+            exportar(self.horario_actual, filtros.get(filtro, "csv"), file_path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo exportar el horario: {e}")
+
+    # Muestra una ejecucion del historial sin volver a ejecutar el algoritmo
+    # Solo se ofrecen las ejecuciones hechas con los mismos datos que estan cargados
+    def cargar_ejecucion_guardada(self):
+        datos = {nombre: list(modelo.registros) for nombre, modelo in self.modelos.items()}
+        huella = huella_dataset(datos.get("cursos", []), datos.get("salones", []),
+                                datos.get("docentes", []), datos.get("relaciones", []), datos.get("franjas", []))
+        with AlmacenEjecuciones() as almacen:
+            ejecuciones = almacen.mejores_ejecuciones(huella, limite=20)
+            if not ejecuciones:
+                QMessageBox.information(self, "Historial", "No hay ejecuciones guardadas con los datos actuales.")
+                return
+            opciones = [
+                f"#{ejecucion['id']} {ejecucion['motor']} - Conflictos: {ejecucion['conflictos']} "
+                f"Continuidad: {ejecucion['continuidad']:.2f}% Tiempo: {ejecucion['tiempo']:.2f} s"
+                for ejecucion in ejecuciones
+            ]
+            opcion, aceptado = QInputDialog.getItem(self, "Historial", "Ejecucion:", opciones, 0, False)
+            if not aceptado:
+                return
+            ejecucion = ejecuciones[opciones.index(opcion)]
+            metricas = almacen.metricas(ejecucion["id"])
+            asignaciones = almacen.asignaciones(ejecucion["id"])
+
+        ambiente = self.instancia_preparada()
+        horario, _ = ambiente.reconstruir_solucion(asignaciones)
+        self.convergencia_plot.reiniciar()
+        self.display_result({
+            "horario": horario,
+            "conflictos": [metrica["conflictos"] for metrica in metricas],
+            "continuidades": [metrica["continuidad"] for metrica in metricas],
+            "penalizaciones": [metrica["penalizacion"] for metrica in metricas],
+            "diversidades": [metrica["diversidad"] for metrica in metricas],
+            "tasas_mutacion": [metrica["tasa_mutacion"] for metrica in metricas],
+            "conflictos_mejor_individuo": ejecucion["conflictos"],
+            "continuidad": ejecucion["continuidad"],
+            "iteraciones": ejecucion["iteraciones"],
+            "evaluaciones": ejecucion["evaluaciones"],
+            "tiempo": ejecucion["tiempo"],
+            "motivo_terminacion": ejecucion["motivo_terminacion"],
+            "memoria_pico": ejecucion["memoria_pico"],
+            "ejecucion_id": ejecucion["id"],
+            "reporte_horarios_pdf": (crear_horarios_pdf(horario, franjas=ambiente.franjas)
+                                     if self.generar_pdf_check.isChecked() else None),
+        })
+
     def display_result(self, result_data: dict):
         tiempo = result_data.get("tiempo", "N/A")
         iteraciones = result_data.get("iteraciones", "N/A")
@@ -171,93 +589,130 @@ class GALayout(QWidget):
         conflictos_mejor_individuo = result_data.get("conflictos_mejor_individuo", "N/A")
         continuidad = result_data.get("continuidad", "N/A")
         memoria = result_data.get("memoria", "N/A")
+        evaluaciones = result_data.get("evaluaciones", "N/A")
+        motivo_terminacion = result_data.get("motivo_terminacion", "N/A")
+        reinicios = result_data.get("reinicios", [])
+        memoria_pico = result_data.get("memoria_pico", "N/A")
+        memoria_por_generacion = result_data.get("memoria_por_generacion", [])
+        asignaciones_principales = result_data.get("asignaciones_principales", [])
 
         report_output = (
             f"Conflictos: {conflictos_mejor_individuo}\n"
             f"Porcentaje de Continuidad: {continuidad}%\n"
         )
+        conflictos_por_tipo = result_data.get("conflictos_por_tipo", {})
+        if conflictos_por_tipo:
+            report_output += ("Cursos en Conflicto por Tipo: "
+                              + ", ".join(f"{tipo} {cantidad}" for tipo, cantidad in conflictos_por_tipo.items()) + "\n")
+        if result_data.get("semilla") is not None:
+            report_output += f"Semilla: {result_data['semilla']}\n"
+        if result_data.get("ejecucion_id") is not None:
+            report_output += f"Ejecucion en el Historial: #{result_data['ejecucion_id']}\n"
+        frente_pareto = result_data.get("frente_pareto", [])
+        if frente_pareto:
+            report_output += f"\nFrente de Pareto ({len(frente_pareto)} soluciones):\n"
+            for solucion in frente_pareto:
+                report_output += f"  Conflictos: {solucion['conflictos']} Continuidad: {solucion['continuidad']:.2f}%"
+                if "carga_docente" in solucion:
+                    report_output += f" Carga Docente Maxima: {solucion['carga_docente']}"
+                report_output += "\n"
+        if result_data.get("reprogramacion"):
+            report_output += f"Cursos Modificados respecto a la Solucion Previa: {result_data.get('cursos_modificados', 'N/A')}\n"
         self.report_text.setPlainText(report_output)
 
         history_output = (
             f"Tiempo de Ejecución: {tiempo} s\n"
             f"Iteraciones Necesarias: {iteraciones}\n"
+            f"Evaluaciones de Aptitud: {evaluaciones}\n"
+            f"Hijos Duplicados Detectados: {sum(result_data.get('duplicados', []))}\n"
+            f"Motivo de Terminacion: {motivo_terminacion}\n"
+            f"Reinicios por Estancamiento: {len(reinicios)}\n"
             f"Conflictos Promedio: {final_conflicto}\n"
             f"Espacio en Memoria Consumido: {memoria} MB\n"
+            f"Pico de Memoria (RSS{', muestreado' if result_data.get('memoria_pico_muestreado') else ''}): "
+            f"{memoria_pico} MB\n"
         )
+        if memoria_por_generacion:
+            ultima = memoria_por_generacion[-1]
+            history_output += (
+                f"Pico de Memoria Asignada por Python: {result_data.get('memoria_pico_asignada', 'N/A'):.3f} MB\n"
+                f"Tamaño de la Poblacion: {ultima['poblacion']:.3f} MB\n"
+                f"Memoria RSS Ultimas Generaciones: "
+                f"{', '.join(format(registro['rss'], '.1f') for registro in memoria_por_generacion[-10:])} MB\n"
+                "Principales Sitios de Asignacion:\n"
+            )
+            history_output += "".join(f"  {sitio}\n" for sitio in asignaciones_principales)
+        portafolio = result_data.get("portafolio", [])
+        if portafolio:
+            history_output += f"Portafolio de {len(portafolio)} Semillas:\n"
+            for ejecucion in portafolio:
+                penalizacion = ejecucion["penalizacion"]
+                history_output += (f"  {ejecucion['semilla']}: {ejecucion['estado']} en {ejecucion['generaciones']} "
+                                   f"generaciones, penalizacion "
+                                   f"{'N/A' if penalizacion is None else format(penalizacion, '.2f')}\n")
+        for grupo, estadisticas in result_data.get("estadisticas_operadores", {}).items():
+            history_output += f"Operadores de {grupo.capitalize()}:\n"
+            for operador, datos in estadisticas.items():
+                history_output += (f"  {operador}: {datos['usos']} hijos ({100 * datos['participacion']:.1f}%), "
+                                   f"exito {100 * datos['tasa_exito']:.1f}% de {datos['evaluados']} evaluados, "
+                                   f"{datos['evaluaciones']} evaluaciones\n")
         self.history_text.setPlainText(history_output)
 
         pdf_path = result_data.get("reporte_horarios_pdf", None)
         if pdf_path:
+            # Se reutiliza el visor, solo se recarga el documento
             if self.pdf_viewer is not None:
-                self.pdf_layout.removeWidget(self.pdf_viewer)
-                self.pdf_viewer.deleteLater()
-            # Instanciar PDFViewerWidget
-            self.pdf_viewer = PDFViewer(pdf_path)
-            self.pdf_layout.addWidget(self.pdf_viewer)
+                self.pdf_viewer.cargar_documento(pdf_path)
+            else:
+                self.pdf_viewer = PDFViewer(pdf_path)
+                self.pdf_layout.addWidget(self.pdf_viewer)
 
         if conflictos:
-            if hasattr(self, "conflict_plot"):
-                self.plot_layout.removeWidget(self.conflict_plot)
-                self.conflict_plot.deleteLater()
-            self.conflict_plot = ConflictPlot(conflictos, self)
-            self.plot_layout.addWidget(self.conflict_plot)
-
-        if continuidades:
-            if hasattr(self, "continuidad_plot"):
-                self.plot_continuidad_layout.removeWidget(self.continuidad_plot)
-                self.continuidad_plot.deleteLater()
-            self.continuidad_plot = ContinuidadPlot(continuidades, self)
-            self.plot_continuidad_layout.addWidget(self.continuidad_plot)
-
-        self.run_button.setEnabled(True)
+            # Las series ya se agregaron generacion por generacion, se reemplazan por las finales
+            self.convergencia_plot.establecer_datos({
+                "penalizacion": result_data.get("penalizaciones", []),
+                "conflictos": conflictos,
+                "continuidad": continuidades,
+                "diversidad": result_data.get("diversidades", []),
+                "tasa_mutacion": result_data.get("tasas_mutacion", []),
+            })
+
+        self.horario_actual = result_data.get("horario")
+        self.guardar_solucion_button.setEnabled(self.horario_actual is not None)
+        self.exportar_button.setEnabled(self.horario_actual is not None)
 
 # QThread para poder ejecutar el algoritmo dentro de la interfaz
 class GAWorker(QThread):
     # signal que envía todos los datos del algoritmo (horario y reportes)
     result_signal = pyqtSignal(dict)
+    # signal con las metricas de cada generacion mientras el algoritmo se ejecuta
+    progress_signal = pyqtSignal(dict)
 
-    def __init__(self, poblacion_inicial: int, generaciones: int, tasa_mutacion: float, penalizacion_continuidad: float, 
-                 generaciones_reinsercion, porcentaje_reinsercion,
-                 evaluar_conflictos, conflictos_esperados,
-                 evaluar_continuidad, continuidad_esperada,
-                 evaluar_penalizacion, penalizacion_esperada,
-                 parent=None):
+    def __init__(self, ambiente: AmbienteAlgoritmo, motor: str, generaciones: int, parametros: dict,
+                 solucion_previa=None, peso_desviacion=0, guardar_historial=False, generar_pdf=True, portafolio=1,
+                 max_procesos=None, parent=None):
         super().__init__(parent)
-        self.population = poblacion_inicial
+        # instancia ya preparada por la pestaña, se reutiliza entre ejecuciones
+        self.ambiente = ambiente
+        self.motor = motor
         self.generations = generaciones
-        self.tasa_mutacion = tasa_mutacion
-        self.penalizacion_continuidad = penalizacion_continuidad
-        self.generaciones_reinsercion = generaciones_reinsercion
-        self.porcentaje_reinsercion = porcentaje_reinsercion
-
-        self.evaluar_conflictos = evaluar_conflictos
-        self.conflictos_esperados = conflictos_esperados
-
-        self.evaluar_continuidad = evaluar_continuidad
-        self.continuidad_esperada = continuidad_esperada
-
-        self.evaluar_penalizacion = evaluar_penalizacion
-        self.penalizacion_esperada = penalizacion_esperada
+        self.parametros = parametros
+        self.solucion_previa = solucion_previa
+        self.peso_desviacion = peso_desviacion
+        self.guardar_historial = guardar_historial
+        self.generar_pdf = generar_pdf
+        # con mas de una semilla se ejecuta un portafolio en procesos separados y se muestra la mejor
+        self.portafolio = portafolio
+        self.max_procesos = max_procesos
 
     def run(self):
-        ambiente = AmbienteAlgoritmo()
-        ambiente.preparar_data()
-        ambiente.ejecutar(self.population, self.generations, self.tasa_mutacion, 
-                          self.penalizacion_continuidad, 
-                          self.conflictos_esperados, self.evaluar_conflictos,
-                          self.continuidad_esperada, self.evaluar_continuidad,
-                          self.penalizacion_esperada, self.evaluar_penalizacion,
-                          self.generaciones_reinsercion, self.porcentaje_reinsercion)
-
-        result_data = {
-            "horario": ambiente.resultado,
-            "conflictos": ambiente.conflictos_por_generacion,
-            "continuidades": ambiente.continuidad_por_generacion,
-            "conflictos_mejor_individuo": ambiente.conflictos_mejor_individuo,
-            "iteraciones": ambiente.iteraciones_optimas,
-            "tiempo": ambiente.tiempo_ejecucion,
-            "continuidad": ambiente.porcentaje_continuidad,
-            "memoria": ambiente.memoria_consumida,
-            "reporte_horarios_pdf": ambiente.reporte_horarios_pdf
-        }
+        self.ambiente.callback_generacion = self.progress_signal.emit
+        self.ambiente.generar_pdf = self.generar_pdf
+        if self.portafolio > 1:
+            result_data = Portafolio(self.ambiente, self.motor, self.generations, self.parametros, self.portafolio,
+                                     self.max_procesos, solucion_previa=self.solucion_previa,
+                                     peso_desviacion=self.peso_desviacion).ejecutar()
+        else:
+            result_data = ejecutar_en_ambiente(self.ambiente, self.motor, self.generations, self.parametros,
+                                               self.solucion_previa, self.peso_desviacion, self.guardar_historial)
         self.result_signal.emit(result_data)
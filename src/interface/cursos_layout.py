@@ -1,4 +1,5 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QMessageBox, QFileDialog
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QPushButton, QMessageBox, QFileDialog, QLineEdit
+from interface.tabla_modelo import ModeloRegistros
 from utils.data_handler import cargar_cursos, guardar_cursos
 
 class CursosTab(QWidget):
@@ -15,25 +16,22 @@ class CursosTab(QWidget):
         self.save_button.clicked.connect(self.actualizar_cursos)
         layout.addWidget(self.save_button)
 
-        self.table_cursos = QTableWidget()
-        cursos = cargar_cursos("data/cursos.csv")
-        self.configurar_tabla(cursos)
-        layout.addWidget(self.table_cursos)
-
+        self.filtro_edit = QLineEdit()
+        self.filtro_edit.setPlaceholderText("Filtrar cursos...")
+        layout.addWidget(self.filtro_edit)
 
-    def configurar_tabla(self, cursos):
-        self.table_cursos.clear()
-        self.table_cursos.setRowCount(len(cursos))
-        self.table_cursos.setColumnCount(6)
-        self.table_cursos.setHorizontalHeaderLabels(["Nombre", "Código", "Carrera", "Semestre", "Sección", "Tipo"])
-        for row, curso in enumerate(cursos):
-            self.table_cursos.setItem(row, 0, QTableWidgetItem(curso.nombre))
-            self.table_cursos.setItem(row, 1, QTableWidgetItem(curso.codigo))
-            self.table_cursos.setItem(row, 2, QTableWidgetItem(curso.carrera))
-            self.table_cursos.setItem(row, 3, QTableWidgetItem(str(curso.semestre)))
-            self.table_cursos.setItem(row, 4, QTableWidgetItem(curso.seccion))
-            self.table_cursos.setItem(row, 5, QTableWidgetItem(curso.tipo))
+        # El mismo modelo se entrega al algoritmo, asi los cursos no se cargan dos veces
+        self.modelo = ModeloRegistros([
+            ("Nombre", "nombre"), ("Código", "codigo"), ("Carrera", "carrera"),
+            ("Semestre", "semestre"), ("Sección", "seccion"), ("Tipo", "tipo"), ("Sesiones", "sesiones"),
+            ("Inscritos", "inscritos"), ("Tipo de Salón", "tipo_salon")
+        ], cargar_cursos("data/cursos.csv"), self)
+        self.filtro_edit.textChanged.connect(self.modelo.filtrar)
 
+        self.table_cursos = QTableView()
+        self.table_cursos.setModel(self.modelo)
+        self.table_cursos.setSortingEnabled(True)
+        layout.addWidget(self.table_cursos)
 
     def actualizar_cursos(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar CSV de Cursos", "", "CSV Files (*.csv);;All Files (*)")
@@ -41,7 +39,7 @@ class CursosTab(QWidget):
             try:
                 nuevos_cursos = cargar_cursos(file_path)
                 guardar_cursos(nuevos_cursos, "data/cursos.csv")
-                self.configurar_tabla(nuevos_cursos)
+                self.modelo.establecer_registros(nuevos_cursos)
                 QMessageBox.information(self, "Actualizado", "Los cursos se han actualizado exitosamente.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al cargar los cursos: {e}")
@@ -1,5 +1,6 @@
 # docentes_tab.py
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QFileDialog, QMessageBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QPushButton, QFileDialog, QMessageBox, QLineEdit
+from interface.tabla_modelo import ModeloRegistros
 from utils.data_handler import cargar_docentes, guardar_docentes
 
 class DocentesTab(QWidget):
@@ -16,21 +17,20 @@ class DocentesTab(QWidget):
         self.save_button.clicked.connect(self.actualizar_docentes)
         layout.addWidget(self.save_button)
 
-        self.table_docentes = QTableWidget()
-        docentes = cargar_docentes("data/docentes.csv")
-        self.configurar_tabla(docentes)
-        layout.addWidget(self.table_docentes)
+        self.filtro_edit = QLineEdit()
+        self.filtro_edit.setPlaceholderText("Filtrar docentes...")
+        layout.addWidget(self.filtro_edit)
+
+        self.modelo = ModeloRegistros([
+            ("Nombre", "nombre"), ("Registro", "registro"),
+            ("Hora Entrada", "hora_entrada"), ("Hora Salida", "hora_salida")
+        ], cargar_docentes("data/docentes.csv"), self)
+        self.filtro_edit.textChanged.connect(self.modelo.filtrar)
 
-    def configurar_tabla(self, docentes):
-        self.table_docentes.clear()
-        self.table_docentes.setRowCount(len(docentes))
-        self.table_docentes.setColumnCount(6)
-        self.table_docentes.setHorizontalHeaderLabels(["Nombre", "Registro", "Hora Entrada", "Hora Salida"])
-        for row, docente in enumerate(docentes):
-            self.table_docentes.setItem(row, 0, QTableWidgetItem(docente.nombre))
-            self.table_docentes.setItem(row, 1, QTableWidgetItem(docente.registro))
-            self.table_docentes.setItem(row, 2, QTableWidgetItem(docente.hora_entrada))
-            self.table_docentes.setItem(row, 3, QTableWidgetItem(docente.hora_salida))
+        self.table_docentes = QTableView()
+        self.table_docentes.setModel(self.modelo)
+        self.table_docentes.setSortingEnabled(True)
+        layout.addWidget(self.table_docentes)
 
     def actualizar_docentes(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar CSV de Docentes", "", "CSV Files (*.csv);;All Files (*)")
@@ -38,7 +38,7 @@ class DocentesTab(QWidget):
             try:
                 nuevos_docentes = cargar_docentes(file_path)
                 guardar_docentes(nuevos_docentes, "data/docentes.csv")
-                self.configurar_tabla(nuevos_docentes)
+                self.modelo.establecer_registros(nuevos_docentes)
                 QMessageBox.information(self, "Actualizado", "Los docentes se han actualizado exitosamente.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al cargar los docentes: {e}")
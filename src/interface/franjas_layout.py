@@ -0,0 +1,43 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QPushButton, QFileDialog, QMessageBox, QLineEdit
+from interface.tabla_modelo import ModeloRegistros
+from utils.data_handler import cargar_franjas, guardar_franjas
+
+# Franjas (dia, hora de inicio) de la semana, sin data/franjas.csv se usa un solo dia con las horas por defecto
+class FranjasTab(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.initUI()
+    
+    def initUI(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(15, 15, 15, 15)
+        layout.setSpacing(10)
+
+        self.save_button = QPushButton("Actualizar franjas")
+        self.save_button.clicked.connect(self.actualizar_franjas)
+        layout.addWidget(self.save_button)
+
+        self.filtro_edit = QLineEdit()
+        self.filtro_edit.setPlaceholderText("Filtrar franjas...")
+        layout.addWidget(self.filtro_edit)
+
+        self.modelo = ModeloRegistros([
+            ("Día", "dia"), ("Hora", "hora")
+        ], cargar_franjas("data/franjas.csv"), self)
+        self.filtro_edit.textChanged.connect(self.modelo.filtrar)
+
+        self.table_franjas = QTableView()
+        self.table_franjas.setModel(self.modelo)
+        self.table_franjas.setSortingEnabled(True)
+        layout.addWidget(self.table_franjas)
+
+    def actualizar_franjas(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar CSV de Franjas", "", "CSV Files (*.csv);;All Files (*)")
+        if file_path:
+            try:
+                nuevas_franjas = cargar_franjas(file_path)
+                guardar_franjas(nuevas_franjas, "data/franjas.csv")
+                self.modelo.establecer_registros(nuevas_franjas)
+                QMessageBox.information(self, "Actualizado", "Las franjas se han actualizado exitosamente.")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Error al cargar las franjas: {e}")
@@ -1,17 +1,21 @@
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QPlainTextEdit
 
 class Logger(QPlainTextEdit):
     _instance = None
+    # los mensajes pasan por un signal para que se agreguen en el hilo de la interfaz
+    mensaje_signal = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setReadOnly(True)
-    
+        self.mensaje_signal.connect(self.appendPlainText)
+
     @classmethod
     def instance(cls):
         if cls._instance is None:
             cls._instance = Logger()
         return cls._instance
-    
+
     def log(self, message: str):
-        self.appendPlainText(message)
+        self.mensaje_signal.emit(message)
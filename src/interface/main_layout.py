@@ -9,6 +9,7 @@ from utils.algoritmo import *
 from interface.algoritmo_layout import GALayout
 from interface.cursos_layout import CursosTab
 from interface.docentes_layout import DocentesTab
+from interface.franjas_layout import FranjasTab
 from interface.salones_layout import SalonesTab
 
 class MainWindow(QMainWindow):
@@ -21,17 +22,26 @@ class MainWindow(QMainWindow):
     def initUI(self):
         self.tabs = QTabWidget()
 
-        self.tab_ga = GALayout()
         self.tab_cursos = CursosTab()
         self.tab_docentes = DocentesTab()
         self.tab_salones = SalonesTab()
         self.tab_relaciones = RelacionesTab()
+        self.tab_franjas = FranjasTab()
+        # El algoritmo usa los mismos registros que muestran las pestañas de datos
+        self.tab_ga = GALayout(modelos={
+            "cursos": self.tab_cursos.modelo,
+            "salones": self.tab_salones.modelo,
+            "docentes": self.tab_docentes.modelo,
+            "relaciones": self.tab_relaciones.modelo,
+            "franjas": self.tab_franjas.modelo,
+        })
 
         self.tabs.addTab(self.tab_ga, "Generar Horario")
         self.tabs.addTab(self.tab_cursos, "Cursos")
         self.tabs.addTab(self.tab_docentes, "Docentes")
         self.tabs.addTab(self.tab_salones, "Salones")
         self.tabs.addTab(self.tab_relaciones, "Relaciones")
+        self.tabs.addTab(self.tab_franjas, "Franjas")
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(10, 10, 10, 10)
@@ -46,3 +56,7 @@ class MainWindow(QMainWindow):
         scroll_area.setWidgetResizable(True)
 
         self.setCentralWidget(scroll_area)
+
+    def closeEvent(self, event):
+        self.tab_ga.detener_ejecuciones()
+        super().closeEvent(event)
@@ -1,48 +1,259 @@
-from PyQt5.QtWidgets import QFileDialog, QMessageBox, QPushButton, QScrollArea, QVBoxLayout, QWidget
+from collections import OrderedDict, deque
+import threading
+
 import fitz
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QScrollArea
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import QThread, QTimer, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import (
+    QFileDialog, QHBoxLayout, QLabel, QMessageBox, QPushButton, QScrollArea, QVBoxLayout, QWidget
+)
+
+# QThread que rasteriza paginas del documento bajo demanda, fuera del hilo de la interfaz
+class RenderizadorPaginas(QThread):
+    # signal con (pagina, dpi, imagen renderizada)
+    pagina_renderizada = pyqtSignal(int, int, QImage)
+
+    def __init__(self, documento, lock_documento, parent=None):
+        super().__init__(parent)
+        self.documento = documento
+        self.lock_documento = lock_documento
+        self.pendientes = deque()
+        # paginas que ya salieron de la cola y aun no llegan a la interfaz (ver entregada)
+        self.en_curso = set()
+        self.condicion = threading.Condition()
+        self.detenido = False
+
+    # Reemplaza las solicitudes pendientes, las paginas que ya no son visibles se descartan
+    # Las que se estan renderizando no se vuelven a encolar
+    def solicitar(self, solicitudes):
+        with self.condicion:
+            self.pendientes.clear()
+            self.pendientes.extend(clave for clave in solicitudes if clave not in self.en_curso)
+            self.condicion.notify()
+
+    # La interfaz recibio la pagina (ya esta en su cache), se puede volver a solicitar
+    def entregada(self, clave):
+        with self.condicion:
+            self.en_curso.discard(clave)
+
+    def detener(self):
+        with self.condicion:
+            self.detenido = True
+            self.pendientes.clear()
+            self.condicion.notify()
+        self.wait()
+
+    def run(self):
+        while True:
+            with self.condicion:
+                while not self.pendientes and not self.detenido:
+                    self.condicion.wait()
+                if self.detenido:
+                    return
+                pagina, dpi = self.pendientes.popleft()
+                self.en_curso.add((pagina, dpi))
+
+            with self.lock_documento:
+                pix = self.documento.load_page(pagina).get_pixmap(dpi=dpi) #type: ignore
+                # se copia la imagen porque el buffer de pix se libera al salir del bloque
+                imagen = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888).copy()
+            self.pagina_renderizada.emit(pagina, dpi, imagen)
 
 class PDFViewer(QWidget):
+    DPI_BASE = 100
+    ZOOM_MIN = 0.25
+    ZOOM_MAX = 4.0
+    # Limite de memoria para los pixmaps cacheados (en bytes)
+    LIMITE_CACHE = 64 * 1024 * 1024
+
     def __init__(self, pdf_path, parent=None):
         super().__init__(parent)
         self.pdf_path = pdf_path
+        self.documento = None
+        self.datos_pdf = b""
+        self.lock_documento = threading.Lock()
+        self.renderizador = None
+        self.zoom = 1.0
+        self.tamanos_pagina = []
+        self.etiquetas = []
+        # cache LRU (pagina, dpi) -> QPixmap
+        self.cache = OrderedDict()
+        self.bytes_cache = 0
         self.initUI()
+        self.cargar_documento(pdf_path)
 
     def initUI(self):
         layout = QVBoxLayout(self)
-        
-        scroll_area = QScrollArea(self)
-        scroll_area.setWidgetResizable(True)
-        
-        container = QWidget()
-        container_layout = QVBoxLayout(container)
 
+        controles = QHBoxLayout()
         self.download_button = QPushButton("Descargar horarios")
         self.download_button.clicked.connect(self.descargar_horarios)
-        container_layout.addWidget(self.download_button)
-        
+        controles.addWidget(self.download_button)
+
+        self.zoom_out_button = QPushButton("-")
+        self.zoom_out_button.clicked.connect(lambda: self.cambiar_zoom(self.zoom / 1.25))
+        controles.addWidget(self.zoom_out_button)
+        self.zoom_label = QLabel("100%")
+        controles.addWidget(self.zoom_label)
+        self.zoom_in_button = QPushButton("+")
+        self.zoom_in_button.clicked.connect(lambda: self.cambiar_zoom(self.zoom * 1.25))
+        controles.addWidget(self.zoom_in_button)
+        layout.addLayout(controles)
+
+        self.scroll_area = QScrollArea(self)
+        self.scroll_area.setWidgetResizable(True)
+        self.container = QWidget()
+        self.container_layout = QVBoxLayout(self.container)
+        self.scroll_area.setWidget(self.container)
+        layout.addWidget(self.scroll_area)
+        self.setLayout(layout)
+
+        # Se agrupan los eventos de scroll para no encolar paginas en cada pixel desplazado
+        self.timer_visibles = QTimer(self)
+        self.timer_visibles.setSingleShot(True)
+        self.timer_visibles.setInterval(50)
+        self.timer_visibles.timeout.connect(self.solicitar_visibles)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(lambda _: self.timer_visibles.start()) #type: ignore
+        self.scroll_area.horizontalScrollBar().valueChanged.connect(lambda _: self.timer_visibles.start()) #type: ignore
+
+    # Abre el documento una sola vez, las paginas se renderizan hasta que son visibles
+    def cargar_documento(self, pdf_path):
+        self.cerrar()
+        self.pdf_path = pdf_path
+        self.limpiar_paginas()
+
         try:
-            doc = fitz.open(self.pdf_path)
+            with open(pdf_path, "rb") as file_in:
+                self.datos_pdf = file_in.read()
+            # se abre desde memoria para no mantener bloqueado el archivo que el algoritmo sobreescribe
+            self.documento = fitz.open(stream=self.datos_pdf, filetype="pdf")
         except Exception as e:
-            label_error = QLabel(f"Error al abrir el PDF: {e}", self)
-            container_layout.addWidget(label_error)
-            self.setLayout(layout)
+            self.documento = None
+            self.container_layout.addWidget(QLabel(f"Error al abrir el PDF: {e}", self))
             return
 
-        for page_number in range(len(doc)):
-            page = doc.load_page(page_number)
-            pix = page.get_pixmap(dpi=100) #type: ignore
-            image = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-            pixmap = QPixmap.fromImage(image)
-            label = QLabel(self)
-            label.setPixmap(pixmap)
-            container_layout.addWidget(label)
-        
-        container.setLayout(container_layout)
-        scroll_area.setWidget(container)
-        layout.addWidget(scroll_area)
-        self.setLayout(layout)
+        self.tamanos_pagina = [(page.rect.width, page.rect.height) for page in self.documento]
+        for _ in self.tamanos_pagina:
+            label = QLabel("Cargando...", self.container)
+            label.setAlignment(Qt.AlignCenter) #type: ignore
+            self.container_layout.addWidget(label)
+            self.etiquetas.append(label)
+        self.container_layout.addStretch()
+        self.ajustar_etiquetas()
+
+        self.renderizador = RenderizadorPaginas(self.documento, self.lock_documento)
+        self.renderizador.pagina_renderizada.connect(self.pagina_renderizada)
+        self.renderizador.start()
+        self.timer_visibles.start()
+
+    def limpiar_paginas(self):
+        while self.container_layout.count():
+            item = self.container_layout.takeAt(0)
+            if item.widget() is not None:
+                item.widget().deleteLater()
+        self.etiquetas = []
+        self.tamanos_pagina = []
+        self.cache.clear()
+        self.bytes_cache = 0
+
+    # Detiene el hilo de renderizado y libera el documento
+    def cerrar(self):
+        if self.renderizador is not None:
+            self.renderizador.pagina_renderizada.disconnect()
+            self.renderizador.detener()
+            self.renderizador = None
+        if self.documento is not None:
+            with self.lock_documento:
+                self.documento.close()
+            self.documento = None
+
+    def closeEvent(self, event):
+        self.cerrar()
+        super().closeEvent(event)
+
+    def dpi_actual(self) -> int:
+        return int(self.DPI_BASE * self.zoom)
+
+    # El tamaño de cada pagina se conoce sin renderizarla, asi el scroll es correcto desde el inicio
+    def ajustar_etiquetas(self):
+        escala = self.dpi_actual() / 72
+        for label, (ancho, alto) in zip(self.etiquetas, self.tamanos_pagina):
+            label.setFixedSize(int(ancho * escala), int(alto * escala))
+
+    def cambiar_zoom(self, zoom):
+        zoom = max(self.ZOOM_MIN, min(self.ZOOM_MAX, zoom))
+        if zoom == self.zoom:
+            return
+        self.zoom = zoom
+        self.zoom_label.setText(f"{int(zoom * 100)}%")
+        dpi = self.dpi_actual()
+        for pagina, label in enumerate(self.etiquetas):
+            pixmap = self.cache.get((pagina, dpi))
+            if pixmap is not None:
+                label.setPixmap(pixmap)
+            else:
+                label.clear()
+                label.setText("Cargando...")
+        self.ajustar_etiquetas()
+        self.timer_visibles.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.timer_visibles.start()
+
+    def paginas_visibles(self) -> list[int]:
+        viewport = self.scroll_area.viewport()
+        visibles = []
+        for pagina, label in enumerate(self.etiquetas):
+            origen = label.mapTo(viewport, label.rect().topLeft())
+            if origen.y() + label.height() >= 0 and origen.y() <= viewport.height():
+                visibles.append(pagina)
+        # se precarga una pagina antes y despues de las visibles
+        if visibles:
+            if visibles[0] > 0:
+                visibles.append(visibles[0] - 1)
+            if visibles[-1] + 1 < len(self.etiquetas):
+                visibles.append(visibles[-1] + 1)
+        return visibles
+
+    def solicitar_visibles(self):
+        if self.renderizador is None:
+            return
+        dpi = self.dpi_actual()
+        solicitudes = []
+        for pagina in self.paginas_visibles():
+            clave = (pagina, dpi)
+            if clave in self.cache:
+                self.cache.move_to_end(clave)
+                self.etiquetas[pagina].setPixmap(self.cache[clave])
+            else:
+                solicitudes.append(clave)
+        self.renderizador.solicitar(solicitudes)
+
+    def pagina_renderizada(self, pagina, dpi, imagen):
+        if self.renderizador is not None:
+            self.renderizador.entregada((pagina, dpi))
+        if pagina >= len(self.etiquetas):
+            return
+        pixmap = QPixmap.fromImage(imagen)
+        self.guardar_en_cache((pagina, dpi), pixmap)
+        if dpi == self.dpi_actual():
+            self.etiquetas[pagina].setPixmap(pixmap)
+
+    # Cache LRU acotada por memoria, al expulsar un pixmap tambien se quita de su etiqueta
+    def guardar_en_cache(self, clave, pixmap):
+        anterior = self.cache.pop(clave, None)
+        if anterior is not None:
+            self.bytes_cache -= anterior.width() * anterior.height() * 4
+        self.cache[clave] = pixmap
+        self.bytes_cache += pixmap.width() * pixmap.height() * 4
+        while self.bytes_cache > self.LIMITE_CACHE and len(self.cache) > 1:
+            (pagina, dpi), expulsado = self.cache.popitem(last=False)
+            self.bytes_cache -= expulsado.width() * expulsado.height() * 4
+            label = self.etiquetas[pagina]
+            if label.pixmap() is not None and label.pixmap().cacheKey() == expulsado.cacheKey():
+                label.clear()
+                label.setText("Cargando...")
 
     def descargar_horarios(self):
         save_path, _ = QFileDialog.getSaveFileName(
@@ -53,11 +264,8 @@ class PDFViewer(QWidget):
         )
         if save_path:
             try:
-                with open(self.pdf_path, "rb") as file_in:
-                    data = file_in.read()
-
                 with open(save_path, "wb") as file_out:
-                    file_out.write(data)
+                    file_out.write(self.datos_pdf)
                 QMessageBox.information(self, "Éxito", "El PDF se ha guardado exitosamente.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"No se pudo guardar el PDF: {e}")
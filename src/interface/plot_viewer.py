@@ -2,46 +2,183 @@ import matplotlib
 matplotlib.use("Qt5Agg")
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QVBoxLayout, QWidget
 
-class ConflictPlot(QWidget):
-    def __init__(self, conflicts, parent=None):
-        super().__init__(parent)
-        self.figure = Figure(figsize=(5, 4))
-        self.canvas = FigureCanvas(self.figure)
-        layout = QVBoxLayout()
-        layout.addWidget(self.canvas)
-        self.setLayout(layout)
-        self.plot_conflicts(conflicts)
-
-    def plot_conflicts(self, conflicts):
-        ax = self.figure.add_subplot(111)
-        ax.clear()
-        generaciones = list(range(1, len(conflicts) + 1))
-        ax.plot(generaciones, conflicts, marker='o', linestyle='-', color='blue')
-        ax.set_xlabel("Generaciones")
-        ax.set_ylabel("Conflictos")
-        ax.set_title("Conflictos por Generacion")
-        ax.grid(True)
-        self.canvas.draw()
+# Serie reducida por cubetas, cada cubeta guarda su minimo y su maximo para no perder los picos
+# Cuando hay demasiadas cubetas se fusionan por pares, por lo que agregar un punto es O(1) amortizado
+class SerieReducida:
+    def __init__(self, max_cubetas=1000):
+        self.max_cubetas = max_cubetas
+        self.ancho = 1
+        self.n = 0
+        # cada cubeta es [x_min, y_min, x_max, y_max, cantidad]
+        self.cubetas = []
 
-class ContinuidadPlot(QWidget):
-    def __init__(self, continuidades, parent=None):
+    def agregar(self, y):
+        self.n += 1
+        x = self.n
+        if self.cubetas and self.cubetas[-1][4] < self.ancho:
+            cubeta = self.cubetas[-1]
+            if y < cubeta[1]:
+                cubeta[0], cubeta[1] = x, y
+            if y > cubeta[3]:
+                cubeta[2], cubeta[3] = x, y
+            cubeta[4] += 1
+        else:
+            self.cubetas.append([x, y, x, y, 1])
+
+        if len(self.cubetas) > self.max_cubetas:
+            self.fusionar()
+
+    def fusionar(self):
+        fusionadas = []
+        for i in range(0, len(self.cubetas), 2):
+            a = self.cubetas[i]
+            if i + 1 == len(self.cubetas):
+                fusionadas.append(a)
+                continue
+            b = self.cubetas[i + 1]
+            minimo = a if a[1] <= b[1] else b
+            maximo = a if a[3] >= b[3] else b
+            fusionadas.append([minimo[0], minimo[1], maximo[2], maximo[3], a[4] + b[4]])
+        self.cubetas = fusionadas
+        self.ancho *= 2
+
+    # Devuelve los puntos a dibujar, los extremos de cada cubeta en orden de generacion
+    def puntos(self) -> tuple[list, list]:
+        xs, ys = [], []
+        for x_min, y_min, x_max, y_max, _ in self.cubetas:
+            if x_min == x_max:
+                xs.append(x_min)
+                ys.append(y_min)
+            elif x_min < x_max:
+                xs.extend((x_min, x_max))
+                ys.extend((y_min, y_max))
+            else:
+                xs.extend((x_max, x_min))
+                ys.extend((y_max, y_min))
+        return xs, ys
+
+# Grafica de convergencia con varias series sobre el mismo eje de generaciones
+# Las series en porcentaje o conteo usan el eje izquierdo y las fracciones (diversidad, mutacion) el derecho
+class ConvergenciaPlot(QWidget):
+    SERIES = {
+        "penalizacion": ("Penalización", "tab:red", "izquierdo"),
+        "conflictos": ("Conflictos", "tab:blue", "izquierdo"),
+        "continuidad": ("Continuidad (%)", "tab:green", "izquierdo"),
+        "diversidad": ("Diversidad", "tab:purple", "derecho"),
+        "tasa_mutacion": ("Tasa de Mutación", "tab:orange", "derecho"),
+    }
+    # Intervalo minimo entre redibujos cuando llegan datos incrementales (ms)
+    INTERVALO_REDIBUJO = 100
+
+    def __init__(self, series=None, max_puntos=2000, parent=None):
         super().__init__(parent)
+        self.nombres = list(series) if series else list(self.SERIES)
+        self.max_puntos = max_puntos
         self.figure = Figure(figsize=(5, 4))
         self.canvas = FigureCanvas(self.figure)
         layout = QVBoxLayout()
         layout.addWidget(self.canvas)
         self.setLayout(layout)
-        self.plot_continuidades(continuidades)
-
-    def plot_continuidades(self, continuidades):
-        ax = self.figure.add_subplot(111)
-        ax.clear()
-        generaciones = list(range(1, len(continuidades) + 1))
-        ax.plot(generaciones, continuidades, marker='o', linestyle='-', color='blue')
-        ax.set_xlabel("Generaciones")
-        ax.set_ylabel("Conflictos")
-        ax.set_title("Continuidad por Generacion")
-        ax.grid(True)
+
+        self.fondo = None
+        self.timer_redibujo = QTimer(self)
+        self.timer_redibujo.setSingleShot(True)
+        self.timer_redibujo.setInterval(self.INTERVALO_REDIBUJO)
+        self.timer_redibujo.timeout.connect(self.actualizar)
+
+        self.configurar_ejes()
+        self.canvas.mpl_connect("draw_event", self.al_dibujar)
+
+    def configurar_ejes(self):
+        self.figure.clear()
+        self.ax = self.figure.add_subplot(111)
+        self.ax_derecho = None
+        if any(self.SERIES[nombre][2] == "derecho" for nombre in self.nombres):
+            self.ax_derecho = self.ax.twinx()
+            self.ax_derecho.set_ylabel("Fracción")
+
+        self.series = {}
+        self.lineas = {}
+        for nombre in self.nombres:
+            etiqueta, color, lado = self.SERIES[nombre]
+            eje = self.ax_derecho if lado == "derecho" else self.ax
+            # sin marcadores, con miles de generaciones solo agregan costo de dibujo
+            linea, = eje.plot([], [], linestyle='-', color=color, label=etiqueta, animated=True)
+            self.series[nombre] = SerieReducida(max(1, self.max_puntos // 2))
+            self.lineas[nombre] = linea
+
+        self.ax.set_xlabel("Generaciones")
+        self.ax.set_ylabel("Valor")
+        self.ax.set_title("Convergencia por Generacion")
+        self.ax.grid(True)
+        self.ax.set_xlim(1, 10)
+        self.ax.set_ylim(0, 1)
+        if self.ax_derecho is not None:
+            self.ax_derecho.set_ylim(0, 1)
+        self.ax.legend(handles=list(self.lineas.values()), loc="upper right", fontsize="small")
+
+    def reiniciar(self):
+        self.configurar_ejes()
         self.canvas.draw()
+
+    # Reemplaza todos los datos, recibe un diccionario nombre -> lista de valores
+    def establecer_datos(self, datos: dict):
+        self.configurar_ejes()
+        self.agregar_datos(datos)
+        self.actualizar()
+
+    # Agrega datos de forma incremental, cada valor puede ser un numero o una lista
+    def agregar_datos(self, datos: dict):
+        for nombre, valores in datos.items():
+            serie = self.series.get(nombre)
+            if serie is None or valores is None:
+                continue
+            if isinstance(valores, (list, tuple)):
+                for valor in valores:
+                    serie.agregar(valor)
+            else:
+                serie.agregar(valores)
+        if not self.timer_redibujo.isActive():
+            self.timer_redibujo.start()
+
+    # Actualiza las lineas, solo se redibuja la figura completa si los limites cambian
+    def actualizar(self):
+        redibujar = self.fondo is None
+        for nombre, linea in self.lineas.items():
+            xs, ys = self.series[nombre].puntos()
+            linea.set_data(xs, ys)
+            if xs:
+                redibujar |= self.ajustar_limites(linea.axes, xs[-1], min(ys), max(ys))
+
+        if redibujar:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.fondo)
+            self.dibujar_lineas()
+            self.canvas.blit(self.figure.bbox)
+
+    def ajustar_limites(self, eje, x, y_min, y_max) -> bool:
+        cambio = False
+        x_inf, x_sup = self.ax.get_xlim()
+        if x > x_sup:
+            # se duplica el limite para que los redibujos completos sean logaritmicos
+            self.ax.set_xlim(x_inf, max(x, x_sup * 2))
+            cambio = True
+        y_inf, y_sup = eje.get_ylim()
+        if y_min < y_inf or y_max > y_sup:
+            margen = (max(y_max, y_sup) - min(y_min, y_inf)) * 0.1
+            eje.set_ylim(min(y_min, y_inf) - margen if y_min < y_inf else y_inf,
+                         max(y_max, y_sup) + margen if y_max > y_sup else y_sup)
+            cambio = True
+        return cambio
+
+    def al_dibujar(self, event):
+        self.fondo = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.dibujar_lineas()
+
+    def dibujar_lineas(self):
+        for linea in self.lineas.values():
+            linea.axes.draw_artist(linea)
@@ -1,5 +1,6 @@
 # docentes_tab.py
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QFileDialog, QMessageBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QPushButton, QFileDialog, QMessageBox, QLineEdit
+from interface.tabla_modelo import ModeloRegistros
 from utils.data_handler import cargar_relaciones, guardar_relaciones
 
 class RelacionesTab(QWidget):
@@ -16,19 +17,19 @@ class RelacionesTab(QWidget):
         self.save_button.clicked.connect(self.actualizar_relaciones)
         layout.addWidget(self.save_button)
 
-        self.table_relaciones = QTableWidget()
-        relaciones = cargar_relaciones("data/relaciones_docente_curso.csv")
-        self.configurar_tabla(relaciones)
-        layout.addWidget(self.table_relaciones)
+        self.filtro_edit = QLineEdit()
+        self.filtro_edit.setPlaceholderText("Filtrar relaciones...")
+        layout.addWidget(self.filtro_edit)
+
+        self.modelo = ModeloRegistros([
+            ("Registro Docente", "registro_docente"), ("Codigo Curso", "codigo_curso")
+        ], cargar_relaciones("data/relaciones_docente_curso.csv"), self)
+        self.filtro_edit.textChanged.connect(self.modelo.filtrar)
 
-    def configurar_tabla(self, relaciones):
-        self.table_relaciones.clear()
-        self.table_relaciones.setRowCount(len(relaciones))
-        self.table_relaciones.setColumnCount(6)
-        self.table_relaciones.setHorizontalHeaderLabels(["Registro Docente", "Codigo Curso"])
-        for row, salon in enumerate(relaciones):
-            self.table_relaciones.setItem(row, 0, QTableWidgetItem(salon.registro_docente))
-            self.table_relaciones.setItem(row, 1, QTableWidgetItem(salon.codigo_curso))
+        self.table_relaciones = QTableView()
+        self.table_relaciones.setModel(self.modelo)
+        self.table_relaciones.setSortingEnabled(True)
+        layout.addWidget(self.table_relaciones)
 
     def actualizar_relaciones(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar CSV de Relaciones Docente-Curso", "", "CSV Files (*.csv);;All Files (*)")
@@ -36,7 +37,7 @@ class RelacionesTab(QWidget):
             try:
                 nuevas_relaciones = cargar_relaciones(file_path)
                 guardar_relaciones(nuevas_relaciones, "data/relaciones_docente_curso.csv")
-                self.configurar_tabla(nuevas_relaciones)
+                self.modelo.establecer_registros(nuevas_relaciones)
                 QMessageBox.information(self, "Actualizado", "Las relaciones se han actualizado exitosamente.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al cargar los relaciones: {e}")
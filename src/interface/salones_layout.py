@@ -1,5 +1,6 @@
 # salones_tab.py
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QFileDialog, QMessageBox
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QTableView, QPushButton, QFileDialog, QMessageBox, QLineEdit
+from interface.tabla_modelo import ModeloRegistros
 from utils.data_handler import cargar_salones, guardar_salones
 
 class SalonesTab(QWidget):
@@ -16,19 +17,19 @@ class SalonesTab(QWidget):
         self.save_button.clicked.connect(self.actualizar_docentes)
         layout.addWidget(self.save_button)
 
-        self.table_salones = QTableWidget()
-        salones = cargar_salones("data/salones.csv")
-        self.configurar_tabla(salones)
-        layout.addWidget(self.table_salones)
+        self.filtro_edit = QLineEdit()
+        self.filtro_edit.setPlaceholderText("Filtrar salones...")
+        layout.addWidget(self.filtro_edit)
+
+        self.modelo = ModeloRegistros([
+            ("ID", "id"), ("Nombre", "nombre"), ("Capacidad", "capacidad"), ("Tipo", "tipo")
+        ], cargar_salones("data/salones.csv"), self)
+        self.filtro_edit.textChanged.connect(self.modelo.filtrar)
 
-    def configurar_tabla(self, salones):
-        self.table_salones.clear()
-        self.table_salones.setRowCount(len(salones))
-        self.table_salones.setColumnCount(6)
-        self.table_salones.setHorizontalHeaderLabels(["ID", "Nombre"])
-        for row, salon in enumerate(salones):
-            self.table_salones.setItem(row, 0, QTableWidgetItem(salon.id))
-            self.table_salones.setItem(row, 1, QTableWidgetItem(salon.nombre))
+        self.table_salones = QTableView()
+        self.table_salones.setModel(self.modelo)
+        self.table_salones.setSortingEnabled(True)
+        layout.addWidget(self.table_salones)
 
     def actualizar_docentes(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar CSV de Salones", "", "CSV Files (*.csv);;All Files (*)")
@@ -36,7 +37,7 @@ class SalonesTab(QWidget):
             try:
                 nuevos_salones = cargar_salones(file_path)
                 guardar_salones(nuevos_salones, "data/salones.csv")
-                self.configurar_tabla(nuevos_salones)
+                self.modelo.establecer_registros(nuevos_salones)
                 QMessageBox.information(self, "Actualizado", "Los salones se han actualizado exitosamente.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error al salones los docentes: {e}")
@@ -0,0 +1,112 @@
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+
+# Modelo de tabla sobre una lista de registros (Curso, Docente, Salon, DocenteCurso)
+# Las filas se entregan a la vista por lotes y el orden y el filtro se aplican sobre indices,
+# los registros nunca se copian en celdas
+class ModeloRegistros(QAbstractTableModel):
+    # Cantidad de filas que se entregan a la vista por cada fetchMore
+    LOTE = 256
+
+    def __init__(self, columnas: list[tuple[str, str]], registros=None, parent=None):
+        super().__init__(parent)
+        # columnas: lista de (encabezado, atributo del registro)
+        self.columnas = columnas
+        self.registros = []
+        # aumenta cada vez que cambian los registros (no al filtrar u ordenar), la pestaña del algoritmo
+        # la compara para saber si su instancia preparada sigue vigente
+        self.version = 0
+        self.vista: list[int] = []
+        self.cargadas = 0
+        self.texto_filtro = ""
+        self.columna_orden = -1
+        self.orden = Qt.AscendingOrder
+        self.establecer_registros(registros or [])
+
+    # Reemplaza los registros del modelo, por ejemplo al importar un nuevo CSV
+    def establecer_registros(self, registros):
+        self.beginResetModel()
+        self.registros = list(registros)
+        self.version += 1
+        self.recalcular_vista()
+        self.endResetModel()
+
+    def recalcular_vista(self):
+        if self.texto_filtro:
+            texto = self.texto_filtro
+            self.vista = [
+                i for i, registro in enumerate(self.registros)
+                if any(texto in str(getattr(registro, atributo)).lower() for _, atributo in self.columnas)
+            ]
+        else:
+            self.vista = list(range(len(self.registros)))
+
+        if self.columna_orden >= 0:
+            atributo = self.columnas[self.columna_orden][1]
+            self.vista.sort(key=lambda i: self.clave_orden(getattr(self.registros[i], atributo)),
+                            reverse=self.orden == Qt.DescendingOrder)
+        self.cargadas = min(self.LOTE, len(self.vista))
+
+    # Los numeros se ordenan como numeros y el resto como texto
+    @staticmethod
+    def clave_orden(valor):
+        if isinstance(valor, (int, float)):
+            return (0, valor, "")
+        return (1, 0, str(valor).lower())
+
+    def filtrar(self, texto: str):
+        self.beginResetModel()
+        self.texto_filtro = texto.strip().lower()
+        self.recalcular_vista()
+        self.endResetModel()
+
+    def registro(self, fila: int):
+        return self.registros[self.vista[fila]]
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self.cargadas
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.columnas)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self.cargadas < len(self.vista)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        restantes = len(self.vista) - self.cargadas
+        por_cargar = min(self.LOTE, restantes)
+        if por_cargar <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.cargadas, self.cargadas + por_cargar - 1)
+        self.cargadas += por_cargar
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        atributo = self.columnas[index.column()][1]
+        valor = getattr(self.registro(index.row()), atributo)
+        # los atributos opcionales sin valor (capacidad, inscritos, ...) se muestran vacios
+        return "" if valor is None else str(valor)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.columnas[section][0]
+        return str(section + 1)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # se reinicia el modelo porque al ordenar tambien se reinician las filas cargadas
+        self.beginResetModel()
+        self.columna_orden = column
+        self.orden = order
+        self.recalcular_vista()
+        self.endResetModel()
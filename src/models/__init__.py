@@ -1,6 +1,7 @@
 from .curso import Curso
 from .docente import Docente
+from .franja import Franja
 from .salon import Salon
 from .docente_curso import DocenteCurso
 
-__all__ = ['Curso', 'Docente', 'Salon', 'DocenteCurso']
+__all__ = ['Curso', 'Docente', 'Franja', 'Salon', 'DocenteCurso']
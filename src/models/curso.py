@@ -1,11 +1,39 @@
 class Curso:
-    def __init__(self, nombre, codigo, carrera, semestre, seccion, tipo):
+    __slots__ = ("nombre", "codigo", "carrera", "semestre", "seccion", "tipo", "sesiones", "inscritos", "tipo_salon",
+                 "sesion", "indice")
+
+    def __init__(self, nombre, codigo, carrera, semestre, seccion, tipo, sesiones=1, inscritos=None, tipo_salon=None,
+                 sesion=0, indice=-1):
         self.nombre = nombre
         self.codigo = codigo
         self.carrera = carrera
         self.semestre = semestre
         self.seccion = seccion
         self.tipo = tipo
+        # sesiones por semana, preparar_data agrega un gen (una copia con su numero de sesion) por cada una
+        self.sesiones = sesiones
+        self.sesion = sesion
+        # estudiantes inscritos y tipo de salon requerido (ver Salon.admite), None si no se restringe
+        self.inscritos = inscritos
+        self.tipo_salon = tipo_salon
+        # posicion del curso dentro de la instancia del problema, se asigna en preparar_data
+        self.indice = indice
+
+    # Copia del curso para otra de sus sesiones semanales
+    def copia_sesion(self, sesion: int) -> "Curso":
+        return Curso(self.nombre, self.codigo, self.carrera, self.semestre, self.seccion, self.tipo,
+                     self.sesiones, self.inscritos, self.tipo_salon, sesion)
+
+    # La igualdad se basa en el codigo (y la sesion) para que las copias (por ejemplo de otro proceso) sean equivalentes
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Curso):
+            return NotImplemented
+        return self.codigo == other.codigo and self.sesion == other.sesion
+
+    def __hash__(self) -> int:
+        return hash((self.codigo, self.sesion))
 
     def __str__(self) -> str:
         return f"Curso({self.nombre},{self.codigo},{self.carrera},{self.semestre},{self.seccion},{self.tipo})"
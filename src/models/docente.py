@@ -1,25 +1,46 @@
-from datetime import datetime, timedelta
+from functools import lru_cache
 
 
+# Convierte una hora "HH:MM" a minutos, las horas se repiten mucho por lo que se cachean
+@lru_cache(maxsize=None)
+def minutos_del_dia(hora) -> int:
+    horas, minutos = str(hora).split(":")
+    horas, minutos = int(horas), int(minutos)
+    if not (0 <= horas < 24 and 0 <= minutos < 60):
+        raise ValueError(f"Hora invalida: {hora}")
+    return horas * 60 + minutos
+
 class Docente:
-    def __init__(self, nombre, registro, hora_entrada, hora_salida):
+    __slots__ = ("nombre", "registro", "hora_entrada", "hora_salida", "indice")
+
+    def __init__(self, nombre, registro, hora_entrada, hora_salida, indice=-1):
         self.nombre = nombre
         self.registro = registro
         self.hora_entrada = hora_entrada
         self.hora_salida = hora_salida
+        # posicion del docente dentro de la instancia del problema, se asigna en preparar_data
+        self.indice = indice
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Docente):
+            return NotImplemented
+        return self.registro == other.registro
+
+    def __hash__(self) -> int:
+        return hash(self.registro)
 
     def __str__(self) -> str:
         return f"Docente({self.nombre},{self.registro},{self.hora_entrada},{self.hora_salida})"
 
     def esta_disponible(self, hora_inicio_cmp) -> bool:
-        formato = "%H:%M"
         try:
-            hora_inicio_cmp = datetime.strptime(hora_inicio_cmp, formato)
-            hora_final = hora_inicio_cmp + timedelta(minutes=50)
-            hora_ent = datetime.strptime(self.hora_entrada, formato)
-            hora_sal = datetime.strptime(self.hora_salida, formato)
+            hora_inicio = minutos_del_dia(hora_inicio_cmp)
+            hora_final = hora_inicio + 50
+            hora_ent = minutos_del_dia(self.hora_entrada)
+            hora_sal = minutos_del_dia(self.hora_salida)
             
-            return hora_ent <= hora_inicio_cmp and hora_final <= hora_sal
+            return hora_ent <= hora_inicio and hora_final <= hora_sal
         except ValueError:
             return False
-
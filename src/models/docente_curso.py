@@ -1,4 +1,15 @@
+
 class DocenteCurso:
+    __slots__ = ("registro_docente", "codigo_curso")
+
     def __init__(self, registro_docente, codigo_curso):
         self.registro_docente = registro_docente
         self.codigo_curso = codigo_curso
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DocenteCurso):
+            return NotImplemented
+        return self.registro_docente == other.registro_docente and self.codigo_curso == other.codigo_curso
+
+    def __hash__(self) -> int:
+        return hash((self.registro_docente, self.codigo_curso))
@@ -0,0 +1,34 @@
+# Horas de inicio de los periodos si no se configuran franjas (un solo dia)
+HORAS_POR_DEFECTO = ["13:40", "14:30", "15:20", "16:10", "17:00", "17:50", "18:40", "19:30", "20:20", "21:10"]
+DIA_POR_DEFECTO = "Diario"
+
+# Franja de tiempo de la semana: un periodo (hora de inicio) de un dia
+class Franja:
+    __slots__ = ("dia", "hora", "dia_indice", "periodo", "indice")
+
+    def __init__(self, dia, hora, dia_indice=-1, periodo=-1, indice=-1):
+        self.dia = dia
+        self.hora = hora
+        # posicion del dia en la semana y del periodo dentro del dia, se asignan en preparar_data
+        # dos franjas son consecutivas si tienen el mismo dia_indice y periodos seguidos
+        self.dia_indice = dia_indice
+        self.periodo = periodo
+        # posicion de la franja dentro de la instancia del problema, se asigna en preparar_data
+        self.indice = indice
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Franja):
+            return NotImplemented
+        return self.dia == other.dia and self.hora == other.hora
+
+    def __hash__(self) -> int:
+        return hash((self.dia, self.hora))
+
+    def __str__(self) -> str:
+        return f"{self.dia} {self.hora}"
+
+# Todas las combinaciones de dias y horas, por ejemplo crear_franjas(["Lunes", "Martes"], HORAS_POR_DEFECTO)
+def crear_franjas(dias, horas) -> list[Franja]:
+    return [Franja(dia, hora) for dia in dias for hora in horas]
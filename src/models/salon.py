@@ -1,7 +1,32 @@
 class Salon:
-    def __init__(self, nombre, id):
+    __slots__ = ("nombre", "id", "capacidad", "tipo", "indice")
+
+    def __init__(self, nombre, id, capacidad=None, tipo=None, indice=-1):
         self.nombre = nombre
         self.id = id
+        # capacidad (estudiantes) y tipo de salon (por ejemplo "Laboratorio"), None si no se restringe
+        self.capacidad = capacidad
+        self.tipo = tipo
+        # posicion del salon dentro de la instancia del problema, se asigna en preparar_data
+        self.indice = indice
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Salon):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
 
     def __str__(self) -> str:
         return f"Salon({self.nombre},{self.id})"
+
+    # El salon admite al curso si le caben sus inscritos y es del tipo que el curso requiere
+    def admite(self, curso) -> bool:
+        if curso.inscritos is not None and self.capacidad is not None and curso.inscritos > self.capacidad:
+            return False
+        if curso.tipo_salon is not None and str(curso.tipo_salon).strip().lower() != str(self.tipo).strip().lower():
+            return False
+        return True
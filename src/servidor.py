@@ -0,0 +1,34 @@
+import argparse
+import logging
+
+from utils.servicio import crear_servidor
+
+# Servicio HTTP/JSON local para generar horarios sin la interfaz
+# Uso: python src/servidor.py --puerto 8765 --procesos 2
+# Ejemplo: curl -X POST localhost:8765/trabajos -d '{"datos": {"directorio": "data"}, "generaciones": 100}'
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de generacion de horarios")
+    parser.add_argument("--host", default="127.0.0.1", help="por defecto solo acepta conexiones locales")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--procesos", type=int, default=2, help="trabajos ejecutandose a la vez")
+    parser.add_argument("--max-cola", type=int, default=100, help="trabajos en espera antes de rechazar nuevos")
+    parser.add_argument("--directorio", default="trabajos", help="carpeta donde se guardan los resultados de cada trabajo")
+    parser.add_argument("--max-terminados", type=int, default=100, help="trabajos terminados que se conservan")
+    parser.add_argument("--horas-terminados", type=float, default=24,
+                        help="horas que se conserva un trabajo terminado, 0 los conserva hasta max-terminados")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    servidor = crear_servidor(args.host, args.puerto, args.procesos, args.max_cola, args.directorio,
+                              args.max_terminados, args.horas_terminados * 3600 or None)
+    logging.info("Servicio escuchando en http://%s:%d", args.host, args.puerto)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.gestor.detener()
+        servidor.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,49 @@
+import itertools
+import logging
 import os
+import numpy as np
 import psutil
 import random
+import sys
+import threading
 
 from fitz import time
-from interface.logger import Logger
+from models.docente import minutos_del_dia
 from utils.data_handler import *
+from utils.dominios import DominioCurso, calcular_dominios
+from utils.estancamiento import DetectorEstancamiento
+from utils.evaluacion import NUMBA_DISPONIBLE, EvaluadorAcelerado
+from utils.huellas import TablaHuellas
+from utils.nsga2 import reducir_poblacion
+from utils.operadores import OPERADORES_CRUZA, OPERADORES_MUTACION, SelectorOperadores
+from utils.memoria import MonitorMemoria
 from utils.pdf_handler import crear_horarios_pdf
+from utils.poblacion import PoblacionOrdenada
+from utils.seleccion import seleccionar_padres
+from utils.variacion import CodificacionGenetica
 
-type Individuo = dict[Curso, tuple[Salon, str, Docente | None]]
+type Individuo = dict[Curso, tuple[Salon, Franja, Docente | None]]
+
+# Tipos de choque que reporta cursos_en_conflicto: los primeros cuentan como conflictos,
+# los segundos solo suman penalizacion
+TIPOS_CONFLICTO = ("salon", "docente", "disponibilidad")
+TIPOS_PENALIZACION = ("grupo", "sesion_dia")
+
+MODOS_MUTACION = {
+    "adaptativa": "Adaptativa",
+    "dirigida": "Dirigida por Conflictos",
+}
+
+# Tasa de la mutacion aleatoria cuando la elige el calendario de mutacion_adaptativa
+TASA_MUTACION_ALEATORIA = 0.1
+
+# Que hacer con un hijo identico a un individuo que ya esta en la poblacion (ver insertar_sin_duplicados)
+CONTROL_DUPLICADOS = {
+    "compartir": "Compartir Evaluacion",
+    "rechazar": "Rechazar",
+    "remutar": "Mutar de Nuevo",
+    "ninguno": "Sin Control",
+}
 
 class AmbienteAlgoritmo:
     def __init__(self):
@@ -15,109 +51,435 @@ class AmbienteAlgoritmo:
         self.salones: list[Salon] = []
         self.docentes = []
         self.relaciones = []
-        self.horarios = []
+        # Franjas (dia, periodo) de la semana en orden, ver models.franja
+        self.franjas: list[Franja] = []
+        self.dias: list[str] = []
         self.docentes_por_curso: dict[str, list[Docente]] = {}
+        # Asignaciones factibles de cada curso (ver utils.dominios), todos los operadores muestrean de aqui
+        self.dominios: dict[Curso, DominioCurso] = {}
+        # Objetos canonicos de la instancia, se usan para internar individuos de otros procesos
+        self.curso_por_clave: dict[tuple, Curso] = {}
+        self.salon_por_id: dict[str, Salon] = {}
+        self.franja_por_clave: dict[tuple[str, str], Franja] = {}
+        self.docente_por_registro: dict[str, Docente] = {}
 
         self.penalizacion_continuidad: float = 0
+        # Operador de seleccion de padres (ver utils.seleccion)
+        self.metodo_seleccion: str = "torneo"
+        self.tamano_torneo: int = 3
+        self.presion_seleccion: float = 1.5
+        # Generacion de hijos por lotes sobre la matriz de cromosomas (ver utils.variacion)
+        self.variacion_por_lotes: bool = False
+        self.codificacion: CodificacionGenetica | None = None
+        # Mutacion: "adaptativa" (reparadora o aleatoria segun la generacion) o "dirigida" a los cursos en conflicto
+        self.modo_mutacion: str = "adaptativa"
+        # En la mutacion dirigida, probabilidad de cambiar un curso que no esta en conflicto
+        self.prob_exploracion: float = 0.02
+        # Huellas de los individuos para detectar duplicados en O(1) (ver utils.huellas)
+        self.tabla_huellas: TablaHuellas | None = None
+        self.control_duplicados: str = "compartir"
+        self.intentos_remutacion: int = 3
+        # Evaluacion con los nucleos compilados de utils.evaluacion: None o True la activan si numba esta instalado
+        self.usar_aceleracion: bool | None = None
+        self.evaluador: EvaluadorAcelerado | None = None
+        # id -> (individuo, (choques, conflictos, continuidad)) de la poblacion evaluada y de los hijos ya evaluados
+        # por lotes, esas partes no dependen del peso de continuidad y no se recalculan mientras el objeto no cambie
+        self.partes_por_id: dict[int, tuple] = {}
+        # id -> (individuo, fila) de la poblacion codificada por lotes, ver codificar_poblacion
+        self.filas_por_id: dict[int, tuple] = {}
+        # entradas del estado estacionario y su matriz codificada, se actualiza fila por fila (ver reemplazar_fila)
+        self.entradas_codificadas: list | None = None
+        self.matriz_codificada: np.ndarray | None = None
+        self.modo_evolucion: str = "generacional"
+        # Eleccion de la cruza y la mutacion de cada hijo (ver utils.operadores) y credito de cada operador
+        self.seleccion_operadores: str = "generacion"
+        self.operadores_cruza: SelectorOperadores | None = None
+        self.operadores_mutacion: SelectorOperadores | None = None
+        # id -> (hijo, cruza, mutacion, costo comparable del mejor padre, evaluaciones extra de la mutacion)
+        # de los hijos que aun no se evaluan
+        self.origen_por_id: dict[int, tuple] = {}
+
+        # Generador de numeros aleatorios de la ejecucion, todos los operadores sortean de aqui
+        # (no del modulo random) para que la semilla reproduzca la ejecucion aun con otras en el mismo proceso
+        self.rng = random.Random()
+        self.semilla: int | None = None
 
         self.generacion_actual: int = 0
         self.total_generaciones: int = 0
+        # Cantidad de llamadas a la funcion de costo, permite comparar modos con distinto trabajo por generacion
+        self.evaluaciones: int = 0
+        # Presupuesto de la ejecucion ademas de las generaciones (ver iniciar_presupuesto), 0 = sin limite
+        self.tiempo_limite: float = 0
+        self.max_evaluaciones: int = 0
+        self.inicio_presupuesto: float = 0
+        # fraccion consumida del presupuesto al inicio de la generacion actual, None si solo hay generaciones
+        self.fraccion_presupuesto: float | None = None
+        # Mejor solucion de la ejecucion en curso, se lee desde otro hilo con mejor_hasta_ahora
+        self.bloqueo_mejor = threading.Lock()
+        self.mejor_parcial: dict | None = None
+        self.mejor_parcial_comparable: float = float("inf")
 
         self.resultado: Individuo | None = None
         self.conflictos_por_generacion: list = []
         self.continuidad_por_generacion: list = []
+        self.penalizacion_por_generacion: list = []
+        self.diversidad_por_generacion: list = []
+        self.tasa_mutacion_por_generacion: list = []
+        self.evaluaciones_por_generacion: list = []
+        # hijos identicos a un individuo de la poblacion detectados al construir cada generacion
+        self.duplicados_por_generacion: list = []
+        self.duplicados_generacion: int = 0
+        # "convergencia", "generaciones", "tiempo", "evaluaciones" o el criterio de estancamiento que detuvo la ejecucion
+        self.motivo_terminacion: str = ""
+        # (generacion, motivo) de cada reinicio provocado por estancamiento
+        self.reinicios: list[tuple[int, str]] = []
         self.conflictos_mejor_individuo: int = 0
+        # cantidad de cursos del mejor individuo en cada tipo de choque (ver cursos_en_conflicto)
+        self.conflictos_por_tipo: dict[str, int] = {}
+        # usos, exitos y calidad de cada operador de cruza y de mutacion (ver SelectorOperadores.estadisticas)
+        self.estadisticas_operadores: dict[str, dict] = {}
         self.iteraciones_optimas: int = 0
         self.tiempo_ejecucion: float = 0
         self.porcentaje_continuidad: float = 0
         self.memoria_consumida: int = 0
+        # Telemetria de memoria, solo se llena si se ejecuta con rastrear_memoria
+        self.memoria_por_generacion: list[dict] = []
+        self.memoria_pico: float = 0
+        # True si memoria_pico es el mayor valor medido y no el pico que reporta el sistema
+        self.memoria_pico_muestreado: bool = True
+        self.memoria_pico_asignada: float = 0
+        self.asignaciones_principales: list[str] = []
         self.reporte_horarios_pdf: str | None = None
-
-    def preparar_data(self):
-        self.cursos = cargar_cursos("data/cursos.csv")
-        self.salones = cargar_salones("data/salones.csv")
-        self.docentes = cargar_docentes("data/docentes.csv")
-        self.relaciones = cargar_relaciones("data/relaciones_docente_curso.csv")
-        self.horarios = ["13:40", "14:30", "15:20", "16:10", "17:00", "17:50", "18:40", "19:30", "20:20", "21:10"]
-
+        # Carpeta donde se escribe el reporte PDF (el servicio usa una por trabajo)
+        self.directorio_reportes: str = "reports"
+        # El PDF es lento de construir, se puede omitir y exportar el horario con utils.exportador
+        self.generar_pdf: bool = True
+        # Reprogramacion: se parte de una solucion previa y solo cambian los genes libres
+        self.solucion_previa: Individuo | None = None
+        self.solucion_base: Individuo | None = None
+        self.genes_libres: set[Curso] | None = None
+        self.lista_genes_libres: list[Curso] = []
+        self.peso_desviacion: float = 0
+        # cursos cuya asignacion cambio respecto a la solucion previa
+        self.cursos_modificados: int = 0
+        # Solo en el modo multiobjetivo: soluciones no dominadas de la ultima generacion
+        self.frente_pareto: list[dict] = []
+
+        # Se llama al final de cada generacion con las metricas de esta (para graficas en vivo)
+        self.callback_generacion = None
+        # Recibe los mensajes del algoritmo, si es None se usa la consola de la interfaz (o logging sin interfaz)
+        self.callback_log = None
+        # Evento (threading o multiprocessing) que interrumpe la ejecucion al final de la generacion en curso
+        self.cancelacion = None
+
+    # La instancia preparada se envia a otros procesos (ver utils.ejecuciones), los callbacks y la cancelacion
+    # pertenecen al proceso que la preparo y no se copian (tampoco el bloqueo, cada copia crea el suyo)
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["callback_generacion"] = None
+        estado["callback_log"] = None
+        estado["cancelacion"] = None
+        del estado["bloqueo_mejor"]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.bloqueo_mejor = threading.Lock()
+
+    # Qt solo se importa si la interfaz ya lo cargo, el servicio, los procesos de ejecuciones y los
+    # benchmarks no dependen de PyQt5
+    def log(self, mensaje: str):
+        if self.callback_log is not None:
+            self.callback_log(mensaje)
+        elif "PyQt5.QtWidgets" in sys.modules and sys.modules["PyQt5.QtWidgets"].QApplication.instance() is not None:
+            from interface.logger import Logger
+            Logger.instance().log(mensaje)
+        else:
+            logging.getLogger(__name__).info(mensaje)
+
+    # Si se reciben los registros ya cargados (por ejemplo desde los modelos de la interfaz) no se leen los CSV
+    # Cada curso con varias sesiones semanales aporta un gen por sesion
+    def preparar_data(self, cursos=None, salones=None, docentes=None, relaciones=None, franjas=None):
+        cursos = list(cursos) if cursos is not None else cargar_cursos("data/cursos.csv")
+        self.cursos = []
+        for curso in cursos:
+            self.cursos.append(curso)
+            self.cursos.extend(curso.copia_sesion(sesion) for sesion in range(1, curso.sesiones))
+        self.salones = list(salones) if salones is not None else cargar_salones("data/salones.csv")
+        self.docentes = list(docentes) if docentes is not None else cargar_docentes("data/docentes.csv")
+        self.relaciones = list(relaciones) if relaciones is not None else cargar_relaciones("data/relaciones_docente_curso.csv")
+        self.descartar_reprogramacion()
+        self.franjas = list(franjas) if franjas is not None else cargar_franjas("data/franjas.csv")
+        self.internar_modelos()
+
+        self.docentes_por_curso = {}
         for curso in self.cursos:
             self.docentes_por_curso[curso.codigo] = []
 
         for relacion in self.relaciones:
             # Se busca el docente correspondiente según su registro
-            for docente in self.docentes:
-                if docente.registro == relacion.registro_docente:
-                    if docente not in self.docentes_por_curso[relacion.codigo_curso]:
-                        self.docentes_por_curso[relacion.codigo_curso].append(docente)
+            docente = self.docente_por_registro.get(relacion.registro_docente)
+            if docente is not None and docente not in self.docentes_por_curso[relacion.codigo_curso]:
+                self.docentes_por_curso[relacion.codigo_curso].append(docente)
+
+        self.preparar_dominios()
+        self.tabla_huellas = TablaHuellas(self.cursos, self.salones, self.franjas, self.docentes)
+        self.preparar_evaluador()
+
+    # Dominios factibles: salones con capacidad y tipo adecuados y franjas en las que el docente trabaja
+    def preparar_dominios(self):
+        self.dominios, sin_solucion = calcular_dominios(self.cursos, self.salones, self.franjas, self.docentes_por_curso)
+        for curso in sin_solucion:
+            self.log(f"El curso {curso.codigo} no tiene asignaciones factibles (salon o docente disponible), "
+                     f"se usan todas las opciones.")
+        completo = sum(len(self.salones) * len(self.franjas) * max(1, len(self.docentes_por_curso.get(curso.codigo, [])))
+                       for curso in self.cursos)
+        factible = sum(dominio.tamano() for dominio in self.dominios.values())
+        if completo:
+            self.log(f"Dominios factibles: {factible} de {completo} asignaciones posibles ({100 * factible / completo:.1f}%).")
+
+    # Los nucleos compilados dan los mismos resultados que funcion_costo
+    # Sin numba se usa funcion_costo aunque se pida la aceleracion, los nucleos sin compilar son mas lentos
+    def preparar_evaluador(self):
+        usar = NUMBA_DISPONIBLE and self.usar_aceleracion is not False
+        self.evaluador = EvaluadorAcelerado(self.cursos, self.salones, self.franjas, self.docentes) if usar else None
+        self.partes_por_id = {}
+        if self.usar_aceleracion and not NUMBA_DISPONIBLE:
+            self.log("Numba no esta instalado, se usa la funcion de costo original.")
+
+    # Se asigna a cada curso, salon, docente y franja su indice dentro de la instancia
+    # y se guarda el objeto canonico de cada codigo
+    def internar_modelos(self):
+        self.curso_por_clave = {}
+        self.salon_por_id = {}
+        self.docente_por_registro = {}
+        self.franja_por_clave = {}
+        for indice, curso in enumerate(self.cursos):
+            curso.indice = indice
+            self.curso_por_clave.setdefault((curso.codigo, curso.sesion), curso)
+        for indice, salon in enumerate(self.salones):
+            salon.indice = indice
+            self.salon_por_id.setdefault(salon.id, salon)
+        for indice, docente in enumerate(self.docentes):
+            docente.indice = indice
+            self.docente_por_registro.setdefault(docente.registro, docente)
+
+        # los dias quedan en el orden de su primera aparicion y los periodos de cada dia por hora de inicio
+        self.dias = list(dict.fromkeys(franja.dia for franja in self.franjas))
+        posicion_dia = {dia: indice for indice, dia in enumerate(self.dias)}
+        unicas = {(franja.dia, franja.hora): franja for franja in self.franjas}
+        self.franjas = sorted(unicas.values(), key=lambda f: (posicion_dia[f.dia], minutos_del_dia(f.hora)))
+        periodos = {}
+        for indice, franja in enumerate(self.franjas):
+            franja.indice = indice
+            franja.dia_indice = posicion_dia[franja.dia]
+            franja.periodo = periodos.get(franja.dia, 0)
+            periodos[franja.dia] = franja.periodo + 1
+            self.franja_por_clave[(franja.dia, franja.hora)] = franja
+
+    # Reemplaza los objetos de un individuo (por ejemplo deserializado en otro proceso)
+    # por los objetos canonicos de esta instancia
+    def internar_individuo(self, individuo: Individuo) -> Individuo:
+        internado: Individuo = {}
+        for curso, (salon, franja, docente) in individuo.items():
+            if docente is not None:
+                docente = self.docente_por_registro.get(docente.registro, docente)
+            internado[self.curso_por_clave.get((curso.codigo, curso.sesion), curso)] = (
+                self.salon_por_id.get(salon.id, salon), self.franja_por_clave.get((franja.dia, franja.hora), franja),
+                docente)
+        return internado
+
+    # Reconstruye una solucion guardada (ver cargar_solucion) con los objetos de la instancia actual
+    # Devuelve la solucion y los cursos cuya asignacion ya no es valida con los datos editados:
+    # cursos o sesiones nuevas, salones, franjas o docentes que ya no existen, docentes que ya no imparten el curso
+    # o que ya no estan disponibles en esa hora
+    # Las soluciones guardadas sin dia (de un solo dia) se ubican en el primer dia de la semana
+    def reconstruir_solucion(self, asignaciones: list[dict]) -> tuple[Individuo, set[Curso]]:
+        # se compara como texto porque el JSON puede traer numeros donde pandas leyo texto o al reves
+        cursos = {(str(curso.codigo), curso.sesion): curso for curso in self.cursos}
+        salones = {str(salon.id): salon for salon in self.salones}
+        docentes = {str(docente.registro): docente for docente in self.docentes}
+        primer_dia = self.dias[0] if self.dias else None
+
+        solucion: Individuo = {}
+        for asignacion in asignaciones:
+            curso = cursos.get((str(asignacion["curso"]), int(asignacion.get("sesion", 0))))
+            # el curso (o esa sesion) ya no existe
+            if curso is None:
+                continue
+            docente = None
+            if asignacion["docente"] is not None:
+                docente = docentes.get(str(asignacion["docente"]))
+            franja = self.franja_por_clave.get((asignacion.get("dia", primer_dia), asignacion["hora"]))
+            solucion[curso] = (salones.get(str(asignacion["salon"])), franja, docente)
+
+        afectados = set()
+        for curso in self.cursos:
+            if curso not in solucion:
+                afectados.add(curso)
+                continue
+            salon, franja, docente = solucion[curso]
+            permitidos = self.docentes_por_curso.get(curso.codigo, [])
+            if salon is None or franja is None:
+                afectados.add(curso)
+            elif salon not in self.dominios[curso].conjunto_salones:
+                # el salon ya no tiene capacidad o no es del tipo que requiere el curso
+                afectados.add(curso)
+            elif docente is None and permitidos:
+                afectados.add(curso)
+            elif docente is not None and (docente not in permitidos or not docente.esta_disponible(franja.hora)):
+                afectados.add(curso)
+        return solucion, afectados
+
+    # Vecindad de conflicto de 'cursos': los que chocan con ellos en la misma franja (salon, docente o grupo)
+    # y los que comparten docente o grupo (carrera y semestre) en cualquier franja, que son los que
+    # pueden tener que moverse para hacerles lugar o para mantener la continuidad del grupo
+    def vecindad_conflictos(self, individuo: Individuo, cursos) -> set[Curso]:
+        por_franja = {}
+        por_docente = {}
+        por_grupo = {}
+        for curso, (_, franja, docente) in individuo.items():
+            por_franja.setdefault(franja, []).append(curso)
+            if docente is not None:
+                por_docente.setdefault(docente, []).append(curso)
+            por_grupo.setdefault((curso.carrera, curso.semestre), []).append(curso)
+
+        vecinos = set()
+        for curso in cursos:
+            vecinos.update(por_grupo.get((curso.carrera, curso.semestre), []))
+            if curso not in individuo:
+                continue
+            salon, franja, docente = individuo[curso]
+            if docente is not None:
+                vecinos.update(por_docente.get(docente, []))
+            for otro in por_franja.get(franja, []):
+                if salon is not None and individuo[otro][0] == salon:
+                    vecinos.add(otro)
+        vecinos.difference_update(cursos)
+        return vecinos
+
+    # Prepara una reprogramacion a partir de una solucion previa (ver cargar_solucion)
+    # Los individuos parten de la solucion previa y solo cambian los genes libres:
+    # los cursos afectados por los cambios en los datos y los que estaban en conflicto con ellos
+    # peso_desviacion penaliza cada curso cuya asignacion cambia respecto a la solucion previa
+    def preparar_reprogramacion(self, asignaciones: list[dict], peso_desviacion=0, incluir_vecindad=True) -> set[Curso]:
+        previa, afectados = self.reconstruir_solucion(asignaciones)
+        libres = set(afectados)
+        if incluir_vecindad:
+            libres |= self.vecindad_conflictos(previa, afectados)
+
+        self.solucion_previa = previa
+        self.solucion_base = {
+            curso: self.gen_aleatorio(curso) if curso in afectados else previa[curso]
+            for curso in self.cursos
+        }
+        self.genes_libres = libres
+        self.lista_genes_libres = [curso for curso in self.cursos if curso in libres]
+        self.peso_desviacion = peso_desviacion
+        self.log(f"Reprogramación: {len(afectados)} cursos afectados por los cambios, "
+                 f"{len(libres)} genes libres de {len(self.cursos)}.")
+        return libres
+
+    # Vuelve a generar horarios completos, la instancia preparada se reutiliza en la siguiente ejecucion
+    def descartar_reprogramacion(self):
+        self.solucion_previa = None
+        self.solucion_base = None
+        self.genes_libres = None
+        self.lista_genes_libres = []
+        self.peso_desviacion = 0
+
+    # Cursos cuyo gen pueden cambiar los operadores, en una reprogramacion solo los genes libres
+    def cursos_mutables(self) -> list[Curso]:
+        return self.lista_genes_libres if self.solucion_base is not None else self.cursos
+
+    # Asignacion aleatoria (salon, franja, docente) para un curso, solo de su dominio factible
+    def gen_aleatorio(self, curso: Curso) -> tuple[Salon, Franja, Docente | None]:
+        return self.dominios[curso].muestra(self.rng)
 
     # Creacion de un individuo
     def crear_individuo(self) -> Individuo:
+        # en una reprogramacion se parte de la solucion previa y solo se sortean los genes libres
+        if self.solucion_base is not None:
+            horario_ind = dict(self.solucion_base)
+            for curso in self.lista_genes_libres:
+                horario_ind[curso] = self.gen_aleatorio(curso)
+            return horario_ind
         horario_ind: Individuo = {}
         for curso in self.cursos:
-            salon = random.choice(self.salones)
-            hora = random.choice(self.horarios)
-            docentes_permitidos = self.docentes_por_curso.get(curso.codigo, [])
-            if docentes_permitidos:
-                profesor = random.choice(docentes_permitidos)
-            else:
-                profesor = None  # En caso de que no haya docentes permitidos
-            horario_ind[curso] = (salon, hora, profesor)
+            horario_ind[curso] = self.gen_aleatorio(curso)
         return horario_ind
 
-    # La penalizacion por la continuidad aumenta dinamicamente conforme pasan las generaciones
-    def penalizacion_continuidad_dinamica(self, generacion, total_generaciones, peso_inicial, peso_final=50):
-        ratio = generacion / total_generaciones
-        return peso_inicial + (peso_final - peso_inicial) * ratio
+    # La penalizacion por la continuidad aumenta dinamicamente conforme avanza la ejecucion
+    def penalizacion_continuidad_dinamica(self, avance, peso_inicial, peso_final=50):
+        return peso_inicial + (peso_final - peso_inicial) * avance
+
+    def peso_continuidad_actual(self) -> float:
+        return self.penalizacion_continuidad_dinamica(self.avance(), self.penalizacion_continuidad)
+
+    # Penalizacion evaluada con el peso final de continuidad
+    # El peso crece con las generaciones, asi se pueden comparar penalizaciones de generaciones distintas
+    def penalizacion_comparable(self, penalizacion, porcentaje_continuidad, peso_final=50):
+        peso_continuidad = self.peso_continuidad_actual()
+        return penalizacion + (peso_final - peso_continuidad) * (100 - porcentaje_continuidad) / 100
 
     # Función de costo
     # Penaliza una solucion basado en conflictos y la continuidad de esta 
+    # Los choques se cuentan por recurso y franja: k asignaciones en el mismo salon (o con el mismo docente
+    # o del mismo grupo) y la misma franja forman k(k-1)/2 pares en conflicto, asi el costo es lineal
+    # en la cantidad de asignaciones sin importar cuantas franjas tenga la semana
     def funcion_costo(self, individuo: Individuo) -> tuple[float, int, float]:
+        self.evaluaciones += 1
+        if self.evaluador is not None:
+            penalizacion, conflictos, porcentaje_continuidad_solucion = self.evaluador.evaluar([individuo])[0]
+        else:
+            penalizacion, conflictos = self.choques(individuo)
+            porcentaje_continuidad_solucion = self.calcular_continuidad(individuo)
+        return self.combinar_costo(individuo, penalizacion, conflictos, porcentaje_continuidad_solucion)
+
+    # Penalizacion y conflictos por choques de salon, docente, disponibilidad, grupo y sesiones del mismo dia
+    def choques(self, individuo: Individuo) -> tuple[int, int]:
         penalizacion = 0
         conflictos = 0
-        cursos = list(individuo.items())
-        for i in range(len(cursos)):
-            curso_i, asignacion_i = cursos[i]
-            salon_i, hora_i, docente_i = asignacion_i
-
-            #Conflicto si hay un docente en un curso en un horario en el que no trabaja
-            if (
-                docente_i is not None and
-                not docente_i.esta_disponible(hora_i)
-            ):
-                pass
-                penalizacion += 5
-                conflictos += 1
-
-            for j in range(i + 1, len(cursos)):
-                curso_j, asignacion_j = cursos[j]
-                salon_j, hora_j, docente_j = asignacion_j
-
-                # Conflicto de salón y horario
-                if salon_i == salon_j and hora_i == hora_j:
+        por_salon = {}
+        por_docente = {}
+        por_grupo = {}
+        por_sesion_dia = {}
+        for curso, (salon, franja, docente) in individuo.items():
+            clave = (salon.indice, franja.indice)
+            por_salon[clave] = por_salon.get(clave, 0) + 1
+            if docente is not None:
+                #Conflicto si hay un docente en un curso en un horario en el que no trabaja
+                if not docente.esta_disponible(franja.hora):
                     penalizacion += 5
                     conflictos += 1
-                # Conflicto si hay mismo docente en el mismo horario
-                if (
-                    docente_i is not None and
-                    docente_i == docente_j and
-                    hora_i == hora_j
-                ):
-                    penalizacion += 1
-                    conflictos += 1
+                clave = (docente.indice, franja.indice)
+                por_docente[clave] = por_docente.get(clave, 0) + 1
+            clave = (curso.carrera, curso.semestre, franja.indice)
+            por_grupo[clave] = por_grupo.get(clave, 0) + 1
+            if curso.sesiones > 1:
+                clave = (curso.codigo, franja.dia_indice)
+                por_sesion_dia[clave] = por_sesion_dia.get(clave, 0) + 1
+
+        # Conflicto de salón y franja
+        pares = sum(k * (k - 1) // 2 for k in por_salon.values() if k > 1)
+        penalizacion += 5 * pares
+        conflictos += pares
+        # Conflicto si hay mismo docente en la misma franja
+        pares = sum(k * (k - 1) // 2 for k in por_docente.values() if k > 1)
+        penalizacion += pares
+        conflictos += pares
+        # Penalizacion si hay dos cursos del mismo semestre y carrera en la misma franja
+        penalizacion += sum(k * (k - 1) // 2 for k in por_grupo.values() if k > 1)
+        # Penalizacion si dos sesiones de un mismo curso caen el mismo dia
+        penalizacion += sum(k * (k - 1) // 2 for k in por_sesion_dia.values() if k > 1)
+        return penalizacion, conflictos
+
+    # Costo final: los choques mas la penalizacion por continuidad (con el peso de la generacion actual)
+    # y, en una reprogramacion, por los cursos que se alejan de la solucion previa
+    def combinar_costo(self, individuo: Individuo, penalizacion, conflictos,
+                       porcentaje_continuidad_solucion) -> tuple[float, int, float]:
+        peso_continuidad = self.peso_continuidad_actual()
 
-
-                # Penalizacion si hay dos cursos del mismo semestre y carrera en el mismo horario
-                if (
-                    curso_i.semestre == curso_j.semestre and
-                    curso_i.carrera == curso_j.carrera and
-                    hora_i == hora_j
-                ):
-                    penalizacion += 1
-
-        peso_continuidad = self.penalizacion_continuidad_dinamica(
-            self.generacion_actual, self.total_generaciones, self.penalizacion_continuidad)
-
-        porcentaje_continuidad_solucion = self.calcular_continuidad(individuo)
         punteo_continuidad = (porcentaje_continuidad_solucion * peso_continuidad) / 100
 
         # Penalizacion por falta de continuidad 
@@ -125,48 +487,117 @@ class AmbienteAlgoritmo:
         penalizacion_continuidad = peso_continuidad - punteo_continuidad
         penalizacion += penalizacion_continuidad
 
+        # En una reprogramacion se penaliza cada curso que se aleja de la solucion previa
+        if self.peso_desviacion > 0 and self.solucion_previa is not None:
+            previa = self.solucion_previa
+            cambios = sum(1 for curso in self.lista_genes_libres if individuo[curso] != previa.get(curso))
+            penalizacion += self.peso_desviacion * cambios
+
         return (penalizacion, conflictos, porcentaje_continuidad_solucion)
 
+    # Cursos involucrados en cada tipo de choque, se agrupan por recurso y franja como en funcion_costo
+    # "salon", "docente" y "disponibilidad" son conflictos, "grupo" y "sesion_dia" solo penalizaciones
+    def cursos_en_conflicto(self, individuo: Individuo) -> dict[str, set[Curso]]:
+        por_salon = {}
+        por_docente = {}
+        por_grupo = {}
+        por_sesion_dia = {}
+        disponibilidad = set()
+        for curso, (salon, franja, docente) in individuo.items():
+            por_salon.setdefault((salon.indice, franja.indice), []).append(curso)
+            if docente is not None:
+                if not docente.esta_disponible(franja.hora):
+                    disponibilidad.add(curso)
+                por_docente.setdefault((docente.indice, franja.indice), []).append(curso)
+            por_grupo.setdefault((curso.carrera, curso.semestre, franja.indice), []).append(curso)
+            if curso.sesiones > 1:
+                por_sesion_dia.setdefault((curso.codigo, franja.dia_indice), []).append(curso)
+
+        def repetidos(grupos: dict) -> set[Curso]:
+            return {curso for cursos in grupos.values() if len(cursos) > 1 for curso in cursos}
+
+        return {
+            "salon": repetidos(por_salon),
+            "docente": repetidos(por_docente),
+            "disponibilidad": disponibilidad,
+            "grupo": repetidos(por_grupo),
+            "sesion_dia": repetidos(por_sesion_dia),
+        }
+
+    # Cursos a los que se dirige la mutacion: los que estan en conflicto,
+    # si no hay conflictos los que suman penalizacion (grupo o sesiones el mismo dia)
+    def cursos_objetivo(self, individuo: Individuo) -> set[Curso]:
+        detalle = self.cursos_en_conflicto(individuo)
+        objetivo = set().union(*(detalle[tipo] for tipo in TIPOS_CONFLICTO))
+        if not objetivo:
+            objetivo = set().union(*(detalle[tipo] for tipo in TIPOS_PENALIZACION))
+        return objetivo
+
+    # Mutación dirigida por conflictos
+    # cada curso en conflicto cambia con probabilidad tasa_mutacion y el resto solo con prob_exploracion,
+    # asi al final de la ejecucion no se deshacen las asignaciones que ya son buenas
+    # Si no queda ningun curso objetivo se usa la mutacion normal
+    def mutacion_dirigida(self, individuo: Individuo, tasa_mutacion=0.1, prob_exploracion=0.02) -> Individuo:
+        objetivo = self.cursos_objetivo(individuo)
+        if not objetivo:
+            return self.mutacion(individuo, tasa_mutacion)
+        for curso in self.cursos_mutables():
+            if self.rng.random() < (tasa_mutacion if curso in objetivo else prob_exploracion):
+                individuo[curso] = self.gen_aleatorio(curso)
+        return individuo
+
     # Mutación Reparadora 
     # para cada curso, con cierta probabilidad se prueban varias alternativas y se escoge la que minimice la función de costo.
     def mutacion_reparadora(self, individuo: Individuo, tasa_mutacion=0.1, n_alternativas=3) -> dict:
-        for curso in individuo:
-            if random.random() < tasa_mutacion:
+        for curso in self.cursos_mutables():
+            if self.rng.random() < tasa_mutacion:
                 gen_original = individuo[curso]
                 mejor_gen = gen_original
                 menor_penalizacion,_,_ = self.funcion_costo(individuo)
                 # Probar n alternativas
                 for _ in range(n_alternativas):
-                    nuevo_salon = random.choice(self.salones)
-                    nuevo_horario = random.choice(self.horarios)
-                    docentes_permitidos = self.docentes_por_curso.get(curso.codigo, [])
-                    nuevo_profesor = random.choice(docentes_permitidos) if docentes_permitidos else None
+                    nuevo_gen = self.gen_aleatorio(curso)
 
                     # Asignar temporalmente la nueva opción
-                    individuo[curso] = (nuevo_salon, nuevo_horario, nuevo_profesor)
+                    individuo[curso] = nuevo_gen
                     nueva_penalizacion,_,_ = self.funcion_costo(individuo)
                     # Se elige la opción que minimiza la penalización de conflictos
                     if nueva_penalizacion < menor_penalizacion:
                         menor_penalizacion = nueva_penalizacion
-                        mejor_gen = (nuevo_salon, nuevo_horario, nuevo_profesor)
+                        mejor_gen = nuevo_gen
                 # Reasignar el mejor gen encontrado
                 individuo[curso] = mejor_gen
         return individuo
 
     def mutacion_adaptativa(self, individuo, tasa_mutacion):
-        ratio = self.generacion_actual / self.total_generaciones
-        randomNum = random.random()
-        if randomNum < (1 - ratio):
+        if self.mutacion_segun_generacion() == "reparadora":
             return self.mutacion_reparadora(individuo, tasa_mutacion)
         else:
             return self.mutacion(individuo)
 
-    # Selección: Se utiliza torneo simple
-    def seleccion_torneo(self, poblacion, tamano=3):
-        #Logger.instance().log(f"Torneo con {tamano} individuos")
-        candidatos = random.sample(poblacion, tamano)
-        candidatos.sort(key=lambda ind: self.funcion_costo(ind)[0])
-        return candidatos[0]
+    def mutacion_segun_generacion(self) -> str:
+        ratio = self.avance()
+        randomNum = self.rng.random()
+        if randomNum < (1 - ratio):
+            return "reparadora"
+        return "aleatoria"
+
+    def aplicar_mutacion(self, operador: str, individuo: Individuo, tasa_mutacion) -> Individuo:
+        if operador == "reparadora":
+            return self.mutacion_reparadora(individuo, tasa_mutacion)
+        if operador == "dirigida":
+            return self.mutacion_dirigida(individuo, tasa_mutacion, self.prob_exploracion)
+        return self.mutacion(individuo, tasa_mutacion)
+
+    # Selección: los padres se eligen con los costos que ya calculo evaluar_poblacion, sin reevaluar
+    # Se eligen todos los padres necesarios en una sola llamada
+    def elegir_padres(self, poblacion_evaluada, cantidad) -> list[Individuo]:
+        return [poblacion_evaluada[i][2] for i in self.indices_padres(poblacion_evaluada, cantidad)]
+
+    def indices_padres(self, poblacion_evaluada, cantidad) -> list[int]:
+        costos = [entrada[0] for entrada in poblacion_evaluada]
+        return seleccionar_padres(self.metodo_seleccion, costos, cantidad, self.tamano_torneo, self.presion_seleccion,
+                                  self.rng)
 
     # Cruce: Se realiza un cruce de punto medio para mezclar asignaciones
     def cruza(self, padre1, padre2):
@@ -184,25 +615,32 @@ class AmbienteAlgoritmo:
     def cruza_uniforme(self, padre1: Individuo, padre2: Individuo) -> Individuo:
         hijo = {}
         for curso in self.cursos:
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 hijo[curso] = padre1[curso]
             else:
                 hijo[curso] = padre2[curso]
         return hijo
 
     # Alterna entre la cruza normal y uniforme para mejorar la diversidad
-    def cruza_adaptativa(self, padre1: Individuo, padre2: Individuo, generacion: int, total_generaciones: int) -> Individuo:
-        # se calcula el ratio basado en que tan avanzado va el proceso de generacion
-        ratio = generacion / total_generaciones
+    def cruza_adaptativa(self, padre1: Individuo, padre2: Individuo, avance: float) -> Individuo:
+        return self.aplicar_cruza(self.cruza_segun_generacion(avance), padre1, padre2)
+
+    def cruza_segun_generacion(self, avance: float) -> str:
+        # el ratio es que tan avanzado va el proceso de generacion (o el presupuesto, ver avance)
+        ratio = avance
         # mientras mas avance el proceso de generacion mas se favorecera la cruza uniforme
-        if random.random() < (1 - ratio):
-            return self.cruza(padre1, padre2)
-        else:
+        if self.rng.random() < (1 - ratio):
+            return "punto_medio"
+        return "uniforme"
+
+    def aplicar_cruza(self, operador: str, padre1: Individuo, padre2: Individuo) -> Individuo:
+        if operador == "uniforme":
             return self.cruza_uniforme(padre1, padre2)
+        return self.cruza(padre1, padre2)
 
-    # La tasa de mutacion cambia, se reduce linealmente conforme pasan las generaciones
-    def tasa_mutacion_dinamica(self, tasa_inicial: float, generacion: int, total_generaciones: int, min_tasa: float = 0.05) -> float:
-        return tasa_inicial - (tasa_inicial - min_tasa) * (generacion / total_generaciones)
+    # La tasa de mutacion cambia, se reduce linealmente conforme avanza la ejecucion
+    def tasa_mutacion_dinamica(self, tasa_inicial: float, avance: float, min_tasa: float = 0.05) -> float:
+        return tasa_inicial - (tasa_inicial - min_tasa) * avance
 
     # Se calcula la distancia entre dos individuos, esto en base a la cantidad de genes que son iguales
     def distancia(self, ind1: Individuo, ind2: Individuo) -> float:
@@ -230,13 +668,13 @@ class AmbienteAlgoritmo:
             return 0
         return suma_distancias / contador
 
-    # La tasa de mutacion se reduce conforme pasan las generaciones (de forma lineal)
+    # La tasa de mutacion se reduce conforme avanza la ejecucion (de forma lineal)
     # Si hay poca diversidad se aumenta
-    def tasa_mutacion_adaptativa(self, tasa_inicial: float, generacion: int, total_generaciones: int,
+    def tasa_mutacion_adaptativa(self, tasa_inicial: float, avance: float,
                                 diversidad: float, umbral_diversidad, min_tasa: float = 0.1,
                                 potenciador_min = 1, potenciador_max = 8) -> float:
-        tasa_base = tasa_inicial - (tasa_inicial - min_tasa) * (generacion / total_generaciones)
-        potenciador = potenciador_min + (potenciador_max - potenciador_min) * (generacion / total_generaciones)
+        tasa_base = tasa_inicial - (tasa_inicial - min_tasa) * avance
+        potenciador = potenciador_min + (potenciador_max - potenciador_min) * avance
         # Si la diversidad es muy baja, incrementa la tasa de mutación hasta max_tasa
         #Logger.instance().log(f"Diversidad: {diversidad} Umbral: {umbral_diversidad}")
         if diversidad < umbral_diversidad:
@@ -244,35 +682,28 @@ class AmbienteAlgoritmo:
         return tasa_base
 
     # Mutación: Con una probabilidad, se cambia el salón y/o el horario de un curso
-    def mutacion(self, individuo: Individuo, tasa_mutacion=0.1):
-        for curso in individuo:
-            if random.random() < tasa_mutacion:
-                nuevo_salon = random.choice(self.salones)
-                nuevo_horario = random.choice(self.horarios)
-                docentes_permitidos = self.docentes_por_curso.get(curso.codigo, [])
-                if docentes_permitidos:
-                    nuevo_profesor = random.choice(docentes_permitidos)
-                else:
-                    nuevo_profesor = None
-                individuo[curso] = (nuevo_salon, nuevo_horario, nuevo_profesor)
+    def mutacion(self, individuo: Individuo, tasa_mutacion=TASA_MUTACION_ALEATORIA):
+        for curso in self.cursos_mutables():
+            if self.rng.random() < tasa_mutacion:
+                individuo[curso] = self.gen_aleatorio(curso)
         return individuo
 
     # Se calcula el porcentaje de continuidad que tienen los cursos de un horario
+    # La continuidad se evalua por dia, los periodos de dias distintos nunca son consecutivos
     def calcular_continuidad(self, individuo: Individuo) -> float:
         grupos = {}
 
-        # Agrupa los cursos según carrera y semestre.
-        for curso in individuo:
-            key = (curso.carrera, curso.semestre)
-            grupos.setdefault(key, []).append(individuo[curso][1])
+        # Agrupa los cursos según carrera, semestre y dia.
+        for curso, (_, franja, _) in individuo.items():
+            key = (curso.carrera, curso.semestre, franja.dia_indice)
+            grupos.setdefault(key, []).append(franja.periodo)
 
         suma_continuidad = 0.0
         grupos_validos = 0
 
-        for horas in grupos.values():
-            # Convertir cada horario en su índice según self.horarios
-            indices = sorted([self.horarios.index(h) for h in horas if h in self.horarios])
-            # Solo consideramos grupos con al menos dos cursos
+        for periodos in grupos.values():
+            indices = sorted(periodos)
+            # Solo consideramos grupos con al menos dos cursos en el dia
             if len(indices) < 2:
                 continue
             total_pares = len(indices) - 1
@@ -323,29 +754,264 @@ class AmbienteAlgoritmo:
 
         return poblacion
 
+    # Huella de Zobrist del individuo, dos individuos iguales tienen la misma
+    def huella(self, individuo: Individuo) -> int:
+        return self.tabla_huellas.huella(individuo)
+
+    # Control de duplicados al insertar hijos en la poblacion
+    # vistas son las huellas de los individuos que ya estan en la poblacion, se agregan las de los hijos aceptados
+    # "rechazar" descarta los hijos repetidos, "remutar" les cambia un gen (hasta intentos_remutacion veces)
+    # y "compartir" los deja entrar, su evaluacion se comparte con el original (ver evaluar_poblacion)
+    def insertar_sin_duplicados(self, hijos: list[Individuo], vistas: set[int]) -> list[Individuo]:
+        if self.control_duplicados == "ninguno":
+            return hijos
+        aceptados = []
+        for hijo in hijos:
+            huella = self.huella(hijo)
+            if huella in vistas:
+                self.duplicados_generacion += 1
+                if self.control_duplicados == "rechazar":
+                    continue
+                if self.control_duplicados == "remutar":
+                    huella = self.remutar(hijo, huella, vistas)
+            vistas.add(huella)
+            aceptados.append(hijo)
+        return aceptados
+
+    # Cambia un gen al azar del individuo hasta que su huella no este en vistas, la huella se actualiza en O(1)
+    def remutar(self, individuo: Individuo, huella: int, vistas: set[int]) -> int:
+        cursos = self.cursos_mutables()
+        if not cursos:
+            return huella
+        # las partes de costo que ya tuviera el individuo dejan de ser validas
+        self.partes_por_id.pop(id(individuo), None)
+        self.filas_por_id.pop(id(individuo), None)
+        for _ in range(self.intentos_remutacion):
+            curso = self.rng.choice(cursos)
+            anterior = individuo[curso]
+            individuo[curso] = self.gen_aleatorio(curso)
+            huella = self.tabla_huellas.cambiar(huella, curso, anterior, individuo[curso])
+            if huella not in vistas:
+                break
+        return huella
+
+    # Costo de varios individuos
+    # Los individuos que ya se evaluaron (la poblacion anterior y los hijos por lotes) solo se combinan con el peso
+    # de continuidad actual, los repetidos se evaluan una sola vez y con el evaluador acelerado los pendientes
+    # se evaluan en una sola llamada a los nucleos
+    def evaluar_lote(self, poblacion) -> list[tuple[float, int, float]]:
+        anteriores = self.partes_por_id
+        partes = [None] * len(poblacion)
+        pendientes = []
+        repetidos = []
+        por_huella = {}
+        for posicion, ind in enumerate(poblacion):
+            guardada = anteriores.get(id(ind))
+            if guardada is not None and guardada[0] is ind:
+                partes[posicion] = guardada[1]
+            elif self.control_duplicados != "ninguno":
+                huella = self.huella(ind)
+                if huella in por_huella:
+                    repetidos.append((posicion, por_huella[huella]))
+                    continue
+                por_huella[huella] = posicion
+                pendientes.append(posicion)
+            else:
+                pendientes.append(posicion)
+
+        self.evaluaciones += len(pendientes)
+        if self.evaluador is not None:
+            resultados = self.evaluador.evaluar([poblacion[posicion] for posicion in pendientes])
+        else:
+            resultados = [self.choques(poblacion[posicion]) + (self.calcular_continuidad(poblacion[posicion]),)
+                          for posicion in pendientes]
+        for posicion, resultado in zip(pendientes, resultados):
+            partes[posicion] = resultado
+        for posicion, original in repetidos:
+            partes[posicion] = partes[original]
+
+        self.partes_por_id = {id(ind): (ind, parte) for ind, parte in zip(poblacion, partes)}
+        costos = [self.combinar_costo(ind, *parte) for ind, parte in zip(poblacion, partes)]
+        if self.origen_por_id:
+            for ind, (costo, _, continuidad) in zip(poblacion, costos):
+                self.acreditar_operadores(ind, costo, continuidad)
+        return costos
+
     # Se evalua la poblacion en base a la funcion costo
     def evaluar_poblacion(self, poblacion) -> list[tuple[float, int, Individuo, float]]:
         poblacion_evaluada = []
-        for ind in poblacion:
-            costo, conflictos, porcentaje_continuidad_solucion = self.funcion_costo(ind)
+        for ind, (costo, conflictos, porcentaje_continuidad_solucion) in zip(poblacion, self.evaluar_lote(poblacion)):
             poblacion_evaluada.append((costo, conflictos, ind, porcentaje_continuidad_solucion))
         # se ordenan de menor a mayor penalizacion
         poblacion_evaluada.sort(key=lambda tup: tup[0])
         return poblacion_evaluada
     
     # Se genera un hijo 
-    def generar_hijo(self, poblacion, tasa_mutacion, generacion, total_generaciones):
-        padre1 = self.seleccion_torneo(poblacion)
-        padre2 = self.seleccion_torneo(poblacion)
-        hijo = self.cruza_adaptativa(padre1, padre2, generacion, total_generaciones)
-        hijo = self.mutacion_adaptativa(hijo, tasa_mutacion)
+    # Con seleccion de operadores "generacion" la cruza y la mutacion siguen el calendario de cruza_adaptativa
+    # y mutacion_adaptativa (o la mutacion dirigida), si no las eligen los selectores por su credito
+    # referencia es el costo comparable del mejor padre, con ella se acredita al operador cuando se evalua el hijo
+    def generar_hijo(self, padre1, padre2, tasa_mutacion, avance, referencia=None):
+        adaptativa = self.operadores_cruza is not None and self.seleccion_operadores != "generacion"
+        if adaptativa:
+            cruza = self.operadores_cruza.elegir()
+        else:
+            cruza = self.cruza_segun_generacion(avance)
+        hijo = self.aplicar_cruza(cruza, padre1, padre2)
+
+        evaluaciones = self.evaluaciones
+        if adaptativa:
+            mutacion = self.operadores_mutacion.elegir()
+            hijo = self.aplicar_mutacion(mutacion, hijo, tasa_mutacion)
+        elif self.modo_mutacion == "dirigida":
+            mutacion = "dirigida"
+            hijo = self.mutacion_dirigida(hijo, tasa_mutacion, self.prob_exploracion)
+        else:
+            mutacion = self.mutacion_segun_generacion()
+            hijo = self.mutacion_reparadora(hijo, tasa_mutacion) if mutacion == "reparadora" else self.mutacion(hijo)
+
+        if self.operadores_cruza is not None:
+            if not adaptativa:
+                self.operadores_cruza.usar(cruza)
+                self.operadores_mutacion.usar(mutacion)
+            if referencia is not None:
+                self.origen_por_id[id(hijo)] = (hijo, cruza, mutacion, referencia, self.evaluaciones - evaluaciones)
         return hijo
 
-    # Basado en generaciones, elites y diversidad se calcula la cantidad de individuos conservados como elites
-    def obtener_elites(self, poblacion_evaluada, generacion, total_generaciones, elite_fraction_min, elite_fraction_max, 
+    # Se generan varios hijos, los padres de todos se seleccionan de una vez
+    def generar_hijos(self, poblacion_evaluada, cantidad, tasa_mutacion) -> list[Individuo]:
+        # los hijos anteriores que no llegaron a evaluarse (rechazados o reemplazados) ya no se acreditan
+        self.origen_por_id = {}
+        if self.variacion_por_lotes:
+            return self.generar_hijos_por_lotes(poblacion_evaluada, cantidad, tasa_mutacion)
+        indices = self.indices_padres(poblacion_evaluada, 2 * cantidad)
+        referencias = self.referencias_padres(poblacion_evaluada, indices)
+        return [self.generar_hijo(poblacion_evaluada[indices[2 * i]][2], poblacion_evaluada[indices[2 * i + 1]][2],
+                                  tasa_mutacion, self.avance(), referencias[i])
+                for i in range(cantidad)]
+
+    # Costo comparable (ver penalizacion_comparable) del mejor padre de cada pareja
+    # En el modo multiobjetivo la primera posicion de las entradas de seleccion es el rango y el costo va al final
+    def referencias_padres(self, poblacion_evaluada, indices) -> list[float | None]:
+        if self.operadores_cruza is None:
+            return [None] * (len(indices) // 2)
+        costos = [self.penalizacion_comparable(entrada[4] if len(entrada) > 4 else entrada[0], entrada[3])
+                  for entrada in poblacion_evaluada]
+        return [min(costos[indices[i]], costos[indices[i + 1]]) for i in range(0, len(indices) - 1, 2)]
+
+    # Se acredita a los operadores que produjeron al individuo (si es un hijo pendiente de evaluar)
+    # Un hijo tiene exito si su costo comparable es menor que el de su mejor padre
+    def acreditar_operadores(self, individuo: Individuo, costo, continuidad):
+        origen = self.origen_por_id.pop(id(individuo), None)
+        if origen is None or origen[0] is not individuo:
+            return
+        _, cruza, mutacion, referencia, evaluaciones_extra = origen
+        exito = self.penalizacion_comparable(costo, continuidad) < referencia
+        self.operadores_cruza.registrar(cruza, exito)
+        self.operadores_mutacion.registrar(mutacion, exito, 1 + evaluaciones_extra)
+
+    # Los selectores guardan la telemetria de todos los modos, solo eligen si la seleccion es adaptativa
+    def preparar_operadores(self, seleccion_operadores):
+        self.seleccion_operadores = seleccion_operadores
+        metodo = "probabilidad" if seleccion_operadores == "generacion" else seleccion_operadores
+        self.operadores_cruza = SelectorOperadores(OPERADORES_CRUZA, metodo, rng=self.rng)
+        self.operadores_mutacion = SelectorOperadores(OPERADORES_MUTACION, metodo, rng=self.rng)
+        self.origen_por_id = {}
+
+    def actualizar_operadores(self):
+        if self.operadores_cruza is not None:
+            self.operadores_cruza.actualizar()
+            self.operadores_mutacion.actualizar()
+
+    # La poblacion por lotes se mantiene codificada entre generaciones: cada hijo guarda su fila de la matriz y
+    # solo se codifican los individuos que no salieron de una generacion por lotes (poblacion inicial, reinsertados)
+    def codificar_poblacion(self, poblacion) -> np.ndarray:
+        anteriores = [self.filas_por_id.get(id(individuo)) for individuo in poblacion]
+        guardadas = [fila is not None and fila[0] is individuo for individuo, fila in zip(poblacion, anteriores)]
+        nuevos = [individuo for individuo, guardada in zip(poblacion, guardadas) if not guardada]
+        codificados = iter(self.codificacion.codificar(nuevos) if nuevos else ())
+        matriz = np.stack([fila[1] if guardada else next(codificados) for fila, guardada in zip(anteriores, guardadas)])
+        self.filas_por_id = {id(individuo): (individuo, fila) for individuo, fila in zip(poblacion, matriz)}
+        return matriz
+
+    # Las entradas de PoblacionOrdenada conservan su posicion, su matriz se codifica una vez y entre pasos solo cambian
+    # las filas de los miembros reemplazados
+    def matriz_poblacion(self, poblacion_evaluada) -> np.ndarray:
+        if self.modo_evolucion != "estacionario":
+            return self.codificar_poblacion([entrada[2] for entrada in poblacion_evaluada])
+        if poblacion_evaluada is not self.entradas_codificadas:
+            self.matriz_codificada = self.codificar_poblacion([entrada[2] for entrada in poblacion_evaluada])
+            self.entradas_codificadas = poblacion_evaluada
+        return self.matriz_codificada
+
+    # Copia la fila del hijo que entro a la poblacion en la posicion del miembro reemplazado
+    # Un hijo remutado al quitar duplicados perdio su fila y se codifica de nuevo
+    def reemplazar_fila(self, poblacion_evaluada, posicion: int, individuo: Individuo):
+        if poblacion_evaluada is not self.entradas_codificadas:
+            return
+        fila = self.filas_por_id.get(id(individuo))
+        if fila is not None and fila[0] is individuo:
+            self.matriz_codificada[posicion] = fila[1]
+        else:
+            self.matriz_codificada[posicion] = self.codificacion.codificar([individuo])[0]
+
+    # Cruza y mutacion de todos los hijos a la vez sobre la poblacion codificada
+    # Como en cruza_adaptativa, la cruza uniforme se vuelve mas probable conforme avanzan las generaciones, y como en
+    # mutacion_adaptativa cada hijo recibe la mutacion reparadora con probabilidad 1 - avance (ver
+    # CodificacionGenetica.reparar) o si no la aleatoria con TASA_MUTACION_ALEATORIA
+    def generar_hijos_por_lotes(self, poblacion_evaluada, cantidad, tasa_mutacion) -> list[Individuo]:
+        if cantidad <= 0:
+            return []
+        if self.codificacion is None:
+            self.codificacion = CodificacionGenetica(self.cursos, self.salones, self.franjas, self.docentes_por_curso,
+                                                     self.genes_libres if self.solucion_base is not None else None,
+                                                     self.dominios, self.rng)
+            if self.peso_desviacion > 0 and self.solucion_previa is not None:
+                self.codificacion.fijar_previa(self.solucion_previa, self.peso_desviacion)
+        indices = self.indices_padres(poblacion_evaluada, 2 * cantidad)
+        matriz = self.matriz_poblacion(poblacion_evaluada)
+        ratio = self.avance()
+        prob_exploracion = self.prob_exploracion if self.modo_mutacion == "dirigida" else None
+        uniforme = dirigidos = reparados = tasa_aleatoria = None
+        if self.operadores_cruza is not None and self.seleccion_operadores != "generacion":
+            uniforme = np.array([self.operadores_cruza.elegir() == "uniforme" for _ in range(cantidad)])
+            mutaciones = [self.operadores_mutacion.elegir() for _ in range(cantidad)]
+            dirigidos = np.array([mutacion == "dirigida" for mutacion in mutaciones])
+            reparados = np.array([mutacion == "reparadora" for mutacion in mutaciones])
+            prob_exploracion = self.prob_exploracion
+        elif self.modo_mutacion != "dirigida":
+            reparados = self.codificacion.rng.random(cantidad) < 1 - ratio
+            tasa_aleatoria = TASA_MUTACION_ALEATORIA
+        hijos, uniforme, dirigidos = self.codificacion.variacion_con_operadores(
+            matriz, indices, tasa_mutacion, ratio, prob_exploracion, uniforme, dirigidos, reparados, tasa_aleatoria,
+            self.peso_continuidad_actual())
+        poblacion = self.codificacion.decodificar(hijos)
+        self.filas_por_id.update((id(individuo), (individuo, fila)) for individuo, fila in zip(poblacion, hijos))
+        if reparados is None:
+            reparados = np.zeros(cantidad, dtype=bool)
+        if self.operadores_cruza is not None:
+            referencias = self.referencias_padres(poblacion_evaluada, indices)
+            for individuo, referencia, cruza_uniforme, dirigida, reparado in zip(
+                    poblacion, referencias, uniforme.tolist(), dirigidos.tolist(), reparados.tolist()):
+                cruza = "uniforme" if cruza_uniforme else "punto_medio"
+                mutacion = "reparadora" if reparado else "dirigida" if dirigida else "aleatoria"
+                if self.seleccion_operadores == "generacion":
+                    self.operadores_cruza.usar(cruza)
+                    self.operadores_mutacion.usar(mutacion)
+                if referencia is not None:
+                    self.origen_por_id[id(individuo)] = (individuo, cruza, mutacion, referencia, 0)
+        # los hijos se evaluan aqui sobre la matriz, sin volver a codificarlos; evaluar_lote usa estas partes
+        # (en el modo estacionario cada hijo se evalua al insertarlo)
+        if self.evaluador is not None and self.modo_evolucion != "estacionario":
+            resultados = self.evaluador.evaluar_matriz(self.codificacion.genes_instancia(hijos))
+            self.evaluaciones += len(poblacion)
+            for individuo, partes in zip(poblacion, resultados):
+                self.partes_por_id[id(individuo)] = (individuo, partes)
+        return poblacion
+
+    # Basado en el avance de la ejecucion, elites y diversidad se calcula la cantidad de individuos conservados como elites
+    def obtener_elites(self, poblacion_evaluada, avance, elite_fraction_min, elite_fraction_max,
                        diversidad, umbral_diversidad):
-        ratio = generacion / total_generaciones
-        elite_fraction_actual = elite_fraction_min + (elite_fraction_max - elite_fraction_min) * ratio
+        elite_fraction_actual = elite_fraction_min + (elite_fraction_max - elite_fraction_min) * avance
 
         # si la diversidad cae bajo el umbral se suaviza la cantidad de elites
         if diversidad < umbral_diversidad:
@@ -355,7 +1021,7 @@ class AmbienteAlgoritmo:
         elite_count = max(1, int(len(poblacion_evaluada) * elite_fraction_actual))
         # Extraer los 'elite_count' mejores individuos (ya ordenados)
         elites = [tup[2] for tup in poblacion_evaluada[:elite_count]]
-        Logger.instance().log(f"Generación {generacion}: Se conservan {elite_count} élites (fraccion: {elite_fraction_actual:.2f}).")
+        self.log(f"Generación {self.generacion_actual}: Se conservan {elite_count} élites (fraccion: {elite_fraction_actual:.2f}).")
         return elites
 
     # Se genera una poblacion
@@ -364,96 +1030,524 @@ class AmbienteAlgoritmo:
             fraccion_elite_min, fraccion_elite_max, tasa_mutacion,
             intervalo_reinsercion, porcentaje_reinsercion, diversidad, umbral_diversidad):
         elites = self.obtener_elites(
-            poblacion_evaluada, self.generacion_actual, self.total_generaciones, fraccion_elite_min, fraccion_elite_max, 
+            poblacion_evaluada, self.avance(), fraccion_elite_min, fraccion_elite_max,
             diversidad, umbral_diversidad)
 
-        nuevos_hijos = []
-        while len(nuevos_hijos) < (poblacion_inicial - len(elites)):
-            nuevos_hijos.append(self.generar_hijo(poblacion, tasa_mutacion, self.generacion_actual, self.total_generaciones))
-        nueva_poblacion = nuevos_hijos
+        nueva_poblacion = self.generar_hijos(poblacion_evaluada, max(0, poblacion_inicial - len(elites)), tasa_mutacion)
 
         nuevos_hijos = self.reinsertar_poblacion_adaptativo(intervalo_reinsercion, 
                                                                nueva_poblacion, (poblacion_inicial - len(elites)), porcentaje_reinsercion)
-        nueva_poblacion = elites + nuevos_hijos
+        vistas = {self.huella(elite) for elite in elites} if self.control_duplicados != "ninguno" else set()
+        nueva_poblacion = elites + self.insertar_sin_duplicados(nuevos_hijos, vistas)
 
         return nueva_poblacion
 
+    # Modo de estado estacionario: en cada paso se generan pocos hijos que reemplazan a miembros de la poblacion
+    # Se realizan los pasos equivalentes a una generacion (aproximadamente poblacion_inicial hijos)
+    # Los costos guardados se ajustan al peso de continuidad de la generacion antes de los pasos (ver ejecutar)
+    def pasos_estado_estacionario(self, poblacion_ordenada: PoblacionOrdenada, poblacion_inicial, tasa_mutacion,
+                                  hijos_por_paso=2, reemplazo="peor", tamano_torneo_reemplazo=3):
+        pasos = max(1, poblacion_inicial // hijos_por_paso)
+        controlar = self.control_duplicados != "ninguno"
+        # huella -> entradas de los miembros con esa huella, un hijo repetido no se vuelve a evaluar
+        miembros = {}
+        if controlar:
+            for entrada in poblacion_ordenada.entradas:
+                miembros.setdefault(self.huella(entrada[2]), []).append(entrada)
+        vistas = set(miembros)
+        for _ in range(pasos):
+            hijos = self.generar_hijos(poblacion_ordenada.entradas, hijos_por_paso, tasa_mutacion)
+            for hijo in self.insertar_sin_duplicados(hijos, vistas):
+                huella = self.huella(hijo) if controlar else None
+                if huella in miembros:
+                    costo, conflictos, _, continuidad = miembros[huella][0]
+                else:
+                    costo, conflictos, continuidad = self.funcion_costo(hijo)
+                self.acreditar_operadores(hijo, costo, continuidad)
+
+                if reemplazo == "torneo":
+                    # torneo inverso: se reemplaza al peor de unos candidatos al azar, nunca al mejor
+                    posicion = poblacion_ordenada.posicion_torneo(tamano_torneo_reemplazo, self.rng)
+                else:
+                    posicion = poblacion_ordenada.posicion_peor()
+
+                # el hijo solo entra si mejora al individuo que reemplazaria
+                if costo < poblacion_ordenada[posicion][0]:
+                    entrada = (costo, conflictos, hijo, continuidad)
+                    quitado = poblacion_ordenada.reemplazar(posicion, entrada)
+                    self.reemplazar_fila(poblacion_ordenada.entradas, posicion, hijo)
+                    if controlar:
+                        huella_quitado = self.huella(quitado[2])
+                        miembros[huella_quitado].remove(quitado)
+                        if not miembros[huella_quitado]:
+                            del miembros[huella_quitado]
+                            vistas.discard(huella_quitado)
+                        miembros.setdefault(huella, []).append(entrada)
+                # la huella de un hijo que no entro a la poblacion deja de estar vista
+                if controlar and huella not in miembros:
+                    vistas.discard(huella)
+            # las filas de los hijos ya se copiaron a la matriz o se descartaron
+            self.filas_por_id = {}
+
+    # Verifica los criterios de convergencia que el usuario eligio evaluar
+    def cumple_criterios(self, conflictos, continuidad, penalizacion,
+                         conflicto_esperado, evaluar_conflicto,
+                         continuidad_esperada, evaluar_continuidad,
+                         penalizacion_esperada, evaluar_penalizacion) -> bool:
+        converge = True
+
+        if evaluar_conflicto and not (conflictos <= conflicto_esperado):
+            converge = False
+
+        if evaluar_continuidad and not (continuidad >= continuidad_esperada):
+            converge = False
+
+        if evaluar_penalizacion and not (penalizacion <= penalizacion_esperada):
+            converge = False
+
+        return converge
+
+    def reiniciar_metricas(self):
+        self.evaluaciones = 0
+        self.conflictos_por_generacion = []
+        self.continuidad_por_generacion = []
+        self.penalizacion_por_generacion = []
+        self.diversidad_por_generacion = []
+        self.tasa_mutacion_por_generacion = []
+        self.evaluaciones_por_generacion = []
+        self.duplicados_por_generacion = []
+        self.duplicados_generacion = 0
+        self.operadores_cruza = None
+        self.operadores_mutacion = None
+        self.origen_por_id = {}
+        self.estadisticas_operadores = {}
+        self.reinicios = []
+        self.frente_pareto = []
+        self.motivo_terminacion = "generaciones"
+        with self.bloqueo_mejor:
+            self.mejor_parcial = None
+            self.mejor_parcial_comparable = float("inf")
+
+    # Se llama al inicio de cada ejecucion, sin semilla se sortea una y queda en self.semilla
+    # para poder repetir la ejecucion
+    def sembrar(self, semilla: int | None = None):
+        self.semilla = semilla if semilla is not None else random.getrandbits(32)
+        self.rng.seed(self.semilla)
+
+    # Presupuesto de la ejecucion: tiempo_limite en segundos y max_evaluaciones de la funcion de costo, 0 = sin limite
+    # Las generaciones siguen siendo un limite (con presupuesto 0 generaciones no limita, ver rango_generaciones)
+    def iniciar_presupuesto(self, tiempo_limite: float = 0, max_evaluaciones: int = 0):
+        self.tiempo_limite = tiempo_limite or 0
+        self.max_evaluaciones = max_evaluaciones or 0
+        self.inicio_presupuesto = time.time()
+        self.fraccion_presupuesto = 0.0 if self.tiempo_limite > 0 or self.max_evaluaciones > 0 else None
+
+    def rango_generaciones(self, generaciones: int):
+        if generaciones <= 0 and self.fraccion_presupuesto is not None:
+            return itertools.count()
+        return range(generaciones)
+
+    # Se llama al inicio de cada generacion, la fraccion se fija para toda la generacion
+    # asi todos sus individuos se evaluan con el mismo peso de continuidad
+    # Es la mayor entre tiempo, evaluaciones y generaciones: los calendarios terminan con el primer limite
+    def medir_presupuesto(self):
+        if self.fraccion_presupuesto is None:
+            return
+        fracciones = [self.generacion_actual / self.total_generaciones if self.total_generaciones > 0 else 0]
+        if self.tiempo_limite > 0:
+            fracciones.append((time.time() - self.inicio_presupuesto) / self.tiempo_limite)
+        if self.max_evaluaciones > 0:
+            fracciones.append(self.evaluaciones / self.max_evaluaciones)
+        self.fraccion_presupuesto = min(1.0, max(fracciones))
+
+    # "tiempo" o "evaluaciones" si ya se consumio el presupuesto, los motores lo revisan al final de cada generacion
+    # Una ejecucion cancelada termina por el mismo camino con "cancelada"
+    def presupuesto_agotado(self) -> str | None:
+        if self.cancelacion is not None and self.cancelacion.is_set():
+            return "cancelada"
+        if self.tiempo_limite > 0 and time.time() - self.inicio_presupuesto >= self.tiempo_limite:
+            return "tiempo"
+        if self.max_evaluaciones > 0 and self.evaluaciones >= self.max_evaluaciones:
+            return "evaluaciones"
+        return None
+
+    # Que tan avanzada va la ejecucion, de 0 a 1: la siguen los calendarios de la tasa de mutacion,
+    # la fraccion de elites, el peso de continuidad y la eleccion de la cruza y la mutacion
+    # Sin presupuesto es generacion_actual / total_generaciones
+    def avance(self) -> float:
+        if self.fraccion_presupuesto is not None:
+            return self.fraccion_presupuesto
+        return self.generacion_actual / self.total_generaciones if self.total_generaciones else 0
+
+    # Guarda una copia del individuo si mejora (por penalizacion comparable) al mejor de la ejecucion
+    def actualizar_mejor_parcial(self, generacion, penalizacion, conflictos, continuidad, individuo: Individuo):
+        comparable = self.penalizacion_comparable(penalizacion, continuidad)
+        if comparable >= self.mejor_parcial_comparable:
+            return
+        mejor = {
+            "horario": dict(individuo),
+            "penalizacion": penalizacion,
+            "conflictos": conflictos,
+            "continuidad": continuidad,
+            "generacion": generacion,
+            "evaluaciones": self.evaluaciones,
+            "tiempo": time.time() - self.inicio_presupuesto,
+        }
+        with self.bloqueo_mejor:
+            self.mejor_parcial = mejor
+            self.mejor_parcial_comparable = comparable
+
+    # Mejor solucion encontrada hasta ahora en la ejecucion en curso (o en la ultima), None si aun no hay
+    # Se puede llamar desde otro hilo mientras el algoritmo sigue, el horario devuelto es una copia
+    def mejor_hasta_ahora(self) -> dict | None:
+        with self.bloqueo_mejor:
+            if self.mejor_parcial is None:
+                return None
+            return {**self.mejor_parcial, "horario": dict(self.mejor_parcial["horario"])}
+
+    # Guarda las metricas de una generacion y las envia a callback_generacion
+    # individuo es la mejor solucion de la generacion, se conserva si es la mejor de la ejecucion
+    def registrar_metricas(self, generacion, penalizacion, conflictos, continuidad, diversidad, tasa_mutacion,
+                           memoria=None, individuo: Individuo | None = None) -> dict:
+        if individuo is not None:
+            self.actualizar_mejor_parcial(generacion, penalizacion, conflictos, continuidad, individuo)
+        self.conflictos_por_generacion.append(conflictos)
+        self.continuidad_por_generacion.append(continuidad)
+        self.penalizacion_por_generacion.append(penalizacion)
+        self.diversidad_por_generacion.append(diversidad)
+        self.tasa_mutacion_por_generacion.append(tasa_mutacion)
+        self.evaluaciones_por_generacion.append(self.evaluaciones)
+        self.duplicados_por_generacion.append(self.duplicados_generacion)
+        self.duplicados_generacion = 0
+        metricas = {
+            "generacion": generacion,
+            "penalizacion": penalizacion,
+            "conflictos": conflictos,
+            "continuidad": continuidad,
+            "diversidad": diversidad,
+            "tasa_mutacion": tasa_mutacion,
+            "evaluaciones": self.evaluaciones,
+            "duplicados": self.duplicados_por_generacion[-1],
+        }
+        if memoria is not None:
+            metricas["memoria_rss"] = memoria["rss"]
+        if self.callback_generacion is not None:
+            self.callback_generacion(metricas)
+        return metricas
+
+    # Guarda el resultado de una ejecucion (de cualquier motor) y genera el reporte
+    def finalizar_ejecucion(self, mejor_individuo: Individuo, conflictos, iteraciones, start_time,
+                            monitor_memoria: MonitorMemoria | None = None):
+        end_time = time.time()
+
+        self.resultado = mejor_individuo
+        self.conflictos_mejor_individuo = conflictos
+        self.tiempo_ejecucion = end_time - start_time
+        self.iteraciones_optimas = iteraciones
+        self.porcentaje_continuidad = self.calcular_continuidad(mejor_individuo)
+        self.conflictos_por_tipo = {tipo: len(cursos) for tipo, cursos in self.cursos_en_conflicto(mejor_individuo).items()}
+        self.estadisticas_operadores = {}
+        if self.operadores_cruza is not None:
+            self.estadisticas_operadores = {"cruza": self.operadores_cruza.estadisticas(),
+                                            "mutacion": self.operadores_mutacion.estadisticas()}
+        self.cursos_modificados = 0
+        if self.solucion_previa is not None:
+            self.cursos_modificados = sum(1 for curso, gen in mejor_individuo.items()
+                                          if gen != self.solucion_previa.get(curso))
+        self.memoria_consumida = psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+        if monitor_memoria is not None:
+            monitor_memoria.detener()
+            self.memoria_por_generacion = monitor_memoria.por_generacion
+            self.memoria_pico = monitor_memoria.pico_rss
+            self.memoria_pico_muestreado = monitor_memoria.pico_rss_muestreado
+            self.memoria_pico_asignada = monitor_memoria.pico_asignado
+            self.asignaciones_principales = monitor_memoria.asignaciones_principales
+        else:
+            self.memoria_por_generacion = []
+            self.memoria_pico = self.memoria_consumida
+            self.memoria_pico_muestreado = True
+            self.memoria_pico_asignada = 0
+            self.asignaciones_principales = []
+
+        self.reporte_horarios_pdf = None
+        if self.generar_pdf:
+            self.reporte_horarios_pdf = os.path.abspath(crear_horarios_pdf(self.resultado, self.directorio_reportes, self.franjas))
+
     # se ejecuta el algoritmo
+    # modo_evolucion: "generacional" reemplaza la poblacion cada generacion, "estacionario" reemplaza pocos individuos por paso
     def ejecutar(self, poblacion_inicial, generaciones: int, tasa_mutacion, penalizacion_continuidad,
                  conflicto_esperado, evaluar_conflicto,
                  continuidad_esperada, evaluar_continuidad,
                  penalizacion_esperada, evaluar_penalizacion,
                  umbral_diversidad,
-                 intervalo_reinsercion = 10, porcentaje_reinsercion = 0.6, fraccion_elite_min = 0.3, fraccion_elite_max = 0.7):
+                 intervalo_reinsercion = 10, porcentaje_reinsercion = 0.6, fraccion_elite_min = 0.3, fraccion_elite_max = 0.7,
+                 rastrear_memoria = False, modo_evolucion = "generacional", hijos_por_paso = 2, reemplazo = "peor",
+                 generaciones_sin_mejora = 0, epsilon_mejora = 0, ventana_mejora = 50,
+                 detectar_colapso_diversidad = False, generaciones_tras_colapso = 20,
+                 accion_estancamiento = "detener", max_reinicios = 3,
+                 metodo_seleccion = "torneo", tamano_torneo = 3, presion_seleccion = 1.5,
+                 variacion_por_lotes = False, modo_mutacion = "adaptativa", prob_exploracion = 0.02,
+                 control_duplicados = "compartir", intentos_remutacion = 3, seleccion_operadores = "generacion",
+                 semilla = None, tiempo_limite = 0, max_evaluaciones = 0):
 
         start_time = time.time()
-        process = psutil.Process(os.getpid())
+        monitor_memoria = MonitorMemoria() if rastrear_memoria else None
+        if monitor_memoria is not None:
+            monitor_memoria.iniciar()
 
         mejor_individuo: Individuo = dict()
         self.penalizacion_continuidad = penalizacion_continuidad
+        self.metodo_seleccion = metodo_seleccion
+        self.tamano_torneo = tamano_torneo
+        self.presion_seleccion = presion_seleccion
+        self.variacion_por_lotes = variacion_por_lotes
+        self.modo_mutacion = modo_mutacion
+        self.prob_exploracion = prob_exploracion
+        self.control_duplicados = control_duplicados
+        self.intentos_remutacion = intentos_remutacion
+        self.partes_por_id = {}
+        self.filas_por_id = {}
+        self.entradas_codificadas = self.matriz_codificada = None
+        # la codificacion depende de la instancia cargada, se construye en la primera generacion por lotes
+        self.codificacion = None
         self.generacion_actual = 0
         self.total_generaciones = generaciones
         #print(self.penalizacion_continuidad)
         #print(self.generacion_actual)
         #print(self.total_generaciones)
 
+        self.reiniciar_metricas()
+        self.sembrar(semilla)
+        self.iniciar_presupuesto(tiempo_limite, max_evaluaciones)
+        self.preparar_operadores(seleccion_operadores)
+        self.modo_evolucion = modo_evolucion
+        estacionario = modo_evolucion == "estacionario"
+        detector = DetectorEstancamiento(generaciones_sin_mejora, epsilon_mejora, ventana_mejora,
+                                         detectar_colapso_diversidad, generaciones_tras_colapso)
+
         # Creación de la población inicial
         poblacion = [self.crear_individuo() for _ in range(poblacion_inicial)]
+        if self.solucion_base is not None:
+            poblacion[0] = dict(self.solucion_base)
+        if estacionario:
+            poblacion_ordenada = PoblacionOrdenada(self.evaluar_poblacion(poblacion), self.peso_continuidad_actual())
 
         conflictos: int = 0
-        self.conflictos_por_generacion = []
-        self.continuidad_por_generacion = []
         convergencia = generaciones  # Si no converge, asumimos que se realizaron todas las iteraciones
         # Ciclo del algoritmo
-        for generacion in range(generaciones):
+        for generacion in self.rango_generaciones(generaciones):
             self.generacion_actual = generacion
-            Logger.instance().log(f"============================Generacion {generacion}")
-            #tasa_actual = self.tasa_mutacion_dinamica(tasa_mutacion, generacion, generaciones)
+            self.medir_presupuesto()
+            self.log(f"============================Generacion {generacion}")
+            #tasa_actual = self.tasa_mutacion_dinamica(tasa_mutacion, self.avance())
             diversidad = self.calcular_diversidad(poblacion)
-            tasa_actual = self.tasa_mutacion_adaptativa(tasa_mutacion, generacion, generaciones, diversidad, umbral_diversidad)
+            tasa_actual = self.tasa_mutacion_adaptativa(tasa_mutacion, self.avance(), diversidad, umbral_diversidad)
 
-            poblacion_evaluada = self.evaluar_poblacion(poblacion)
+            if estacionario:
+                # el peso de continuidad cambio, los miembros y los hijos se comparan con el peso actual
+                poblacion_ordenada.reponderar(self.peso_continuidad_actual())
+                poblacion_evaluada = poblacion_ordenada.ordenadas()
+            else:
+                poblacion_evaluada = self.evaluar_poblacion(poblacion)
             menor_penalizacion, conflictos, mejor_individuo, continuidad_actual = poblacion_evaluada[0]
             self.porcentaje_continuidad = continuidad_actual
+            # los hijos de la generacion anterior ya se acreditaron
+            self.actualizar_operadores()
 
-            self.conflictos_por_generacion.append(conflictos)
-            self.continuidad_por_generacion.append(continuidad_actual)
+            memoria = None
+            if monitor_memoria is not None:
+                memoria = monitor_memoria.registrar_generacion(generacion, poblacion)
+            self.registrar_metricas(generacion, menor_penalizacion, conflictos, continuidad_actual, diversidad,
+                                    tasa_actual, memoria, mejor_individuo)
 
             porcentaje_aptitud = (1 / (1 + menor_penalizacion)) * 100
-            Logger.instance().log(f"Aptitud: {porcentaje_aptitud:.5f}% Penalizacion: {menor_penalizacion:.5f} Mutacion: {tasa_actual:.5f} Continuidad: {continuidad_actual:.5f} Diversidad: {diversidad:.5f}")
+            self.log(f"Aptitud: {porcentaje_aptitud:.5f}% Penalizacion: {menor_penalizacion:.5f} Mutacion: {tasa_actual:.5f} Continuidad: {continuidad_actual:.5f} Diversidad: {diversidad:.5f} Evaluaciones: {self.evaluaciones} Duplicados: {self.duplicados_por_generacion[-1]}")
             
-            converge = True
-
-            if evaluar_conflicto and not (conflictos <= conflicto_esperado):
-                converge = False
+            converge = self.cumple_criterios(conflictos, continuidad_actual, menor_penalizacion,
+                                             conflicto_esperado, evaluar_conflicto,
+                                             continuidad_esperada, evaluar_continuidad,
+                                             penalizacion_esperada, evaluar_penalizacion)
 
-            if evaluar_continuidad and not (continuidad_actual >= continuidad_esperada):
-                converge = False
+            if converge:
+                convergencia = generacion
+                self.motivo_terminacion = "convergencia"
+                break
 
-            if evaluar_penalizacion and not (menor_penalizacion <= penalizacion_esperada):
-                converge = False
+            agotado = self.presupuesto_agotado()
+            if agotado is not None:
+                self.log(f"Presupuesto agotado ({agotado}) en la generación {generacion}.")
+                convergencia = generacion
+                self.motivo_terminacion = agotado
+                break
 
-            if converge:
+            motivo = None
+            if detector.activo():
+                motivo = detector.evaluar(generacion, self.penalizacion_comparable(menor_penalizacion, continuidad_actual),
+                                          diversidad, umbral_diversidad)
+            if motivo is not None:
+                if accion_estancamiento == "reiniciar" and len(self.reinicios) < max_reinicios:
+                    # Se conserva el mejor individuo y el resto de la poblacion se genera de nuevo
+                    self.log(f"Estancamiento ({motivo}) en la generación {generacion}: se reinicia la población.")
+                    self.reinicios.append((generacion, motivo))
+                    detector.reiniciar(generacion)
+                    poblacion = [mejor_individuo] + [self.crear_individuo() for _ in range(poblacion_inicial - 1)]
+                    if estacionario:
+                        poblacion_ordenada = PoblacionOrdenada(
+                            [poblacion_evaluada[0]] + self.evaluar_poblacion(poblacion[1:]),
+                            self.peso_continuidad_actual())
+                    continue
+                self.log(f"Estancamiento ({motivo}) en la generación {generacion}: se detiene la ejecución.")
                 convergencia = generacion
+                self.motivo_terminacion = motivo
                 break
 
+            if estacionario:
+                self.pasos_estado_estacionario(poblacion_ordenada, poblacion_inicial, tasa_actual, hijos_por_paso, reemplazo)
+                poblacion = poblacion_ordenada.individuos()
+                continue
+
             nueva_poblacion = self.generar_poblacion(poblacion_inicial, poblacion, poblacion_evaluada, 
                                                      fraccion_elite_min, fraccion_elite_max, tasa_actual, 
                                                      intervalo_reinsercion, porcentaje_reinsercion, diversidad, umbral_diversidad)
 
             poblacion = nueva_poblacion
 
-        end_time = time.time()
+        self.finalizar_ejecucion(mejor_individuo, conflictos, convergencia, start_time, monitor_memoria)
+
+    # Carga del docente mas ocupado (cantidad de cursos asignados), objetivo opcional del modo multiobjetivo
+    def carga_docente(self, individuo: Individuo) -> int:
+        cargas = {}
+        for _, _, docente in individuo.values():
+            if docente is not None:
+                cargas[docente.indice] = cargas.get(docente.indice, 0) + 1
+        return max(cargas.values(), default=0)
+
+    # Evalua cada individuo por separado en cada objetivo (todos se minimizan)
+    # Cada entrada es (objetivos, costo, conflictos, individuo, continuidad)
+    # conocidos (huella -> entrada) evita evaluar de nuevo a los individuos repetidos
+    def evaluar_objetivos(self, poblacion, incluir_carga_docente=False, conocidos=None) -> list[tuple]:
+        evaluados = []
+        conocidos = {} if conocidos is None else conocidos
+        huellas = [self.huella(individuo) for individuo in poblacion] if self.control_duplicados != "ninguno" \
+            else [None] * len(poblacion)
+        pendientes = [huella not in conocidos for huella in huellas]
+        costos = iter(self.evaluar_lote([individuo for individuo, pendiente in zip(poblacion, pendientes) if pendiente]))
+        for individuo, huella, pendiente in zip(poblacion, huellas, pendientes):
+            if not pendiente:
+                objetivos, costo, conflictos, _, continuidad = conocidos[huella]
+                evaluados.append((objetivos, costo, conflictos, individuo, continuidad))
+                continue
+            costo, conflictos, continuidad = next(costos)
+            objetivos = (conflictos, 100 - continuidad)
+            if incluir_carga_docente:
+                objetivos += (self.carga_docente(individuo),)
+            evaluados.append((objetivos, costo, conflictos, individuo, continuidad))
+            if huella is not None:
+                conocidos.setdefault(huella, evaluados[-1])
+        return evaluados
+
+    # Modo multiobjetivo (NSGA-II): conflictos, continuidad y opcionalmente la carga docente no se combinan
+    # en una sola penalizacion, el resultado de una ejecucion es el frente de Pareto completo (frente_pareto)
+    # Como horario principal se reporta la solucion del frente con menos conflictos y, entre esas, mayor continuidad
+    def ejecutar_multiobjetivo(self, poblacion_inicial, generaciones: int, tasa_mutacion, penalizacion_continuidad,
+                               conflicto_esperado = 0, evaluar_conflicto = False,
+                               continuidad_esperada = 0, evaluar_continuidad = False,
+                               incluir_carga_docente = False, rastrear_memoria = False,
+                               tamano_torneo = 2, variacion_por_lotes = False,
+                               modo_mutacion = "adaptativa", prob_exploracion = 0.02,
+                               control_duplicados = "compartir", intentos_remutacion = 3,
+                               seleccion_operadores = "generacion", semilla = None,
+                               tiempo_limite = 0, max_evaluaciones = 0):
+        start_time = time.time()
+        monitor_memoria = MonitorMemoria() if rastrear_memoria else None
+        if monitor_memoria is not None:
+            monitor_memoria.iniciar()
 
-        self.resultado = mejor_individuo
-        self.conflictos_mejor_individuo = conflictos
-        self.tiempo_ejecucion = end_time - start_time
-        self.iteraciones_optimas = convergencia
-        self.porcentaje_continuidad = self.calcular_continuidad(mejor_individuo)
-        self.memoria_consumida = process.memory_info().rss / (1024 * 1024)
+        self.penalizacion_continuidad = penalizacion_continuidad
+        self.generacion_actual = 0
+        self.total_generaciones = generaciones
+        self.reiniciar_metricas()
+        self.sembrar(semilla)
+        self.iniciar_presupuesto(tiempo_limite, max_evaluaciones)
+        # los padres se comparan por (rango, -aglomeracion), el torneo usa esa clave sin reevaluar
+        self.metodo_seleccion = "torneo"
+        self.tamano_torneo = tamano_torneo
+        self.variacion_por_lotes = variacion_por_lotes
+        self.preparar_operadores(seleccion_operadores)
+        self.modo_mutacion = modo_mutacion
+        self.prob_exploracion = prob_exploracion
+        self.control_duplicados = control_duplicados
+        self.intentos_remutacion = intentos_remutacion
+        self.partes_por_id = {}
+        self.filas_por_id = {}
+        self.entradas_codificadas = self.matriz_codificada = None
+        self.codificacion = None
+        self.modo_evolucion = "generacional"
+
+        evaluados = self.evaluar_objetivos([self.crear_individuo() for _ in range(poblacion_inicial)],
+                                           incluir_carga_docente)
+        conservados, claves = reducir_poblacion([entrada[0] for entrada in evaluados], poblacion_inicial)
+        evaluados = [evaluados[i] for i in conservados]
+        claves = [claves[i] for i in conservados]
+
+        convergencia = generaciones
+        for generacion in self.rango_generaciones(generaciones):
+            self.generacion_actual = generacion
+            self.medir_presupuesto()
+            frente = [entrada for entrada, clave in zip(evaluados, claves) if clave[0] == 0]
+            _, penalizacion, conflictos, individuo, continuidad = min(frente, key=lambda e: (e[2], -e[4]))
+            diversidad = self.calcular_diversidad([entrada[3] for entrada in evaluados])
+
+            memoria = None
+            if monitor_memoria is not None:
+                memoria = monitor_memoria.registrar_generacion(generacion, [entrada[3] for entrada in evaluados])
+            self.registrar_metricas(generacion, penalizacion, conflictos, continuidad, diversidad, tasa_mutacion, memoria,
+                                    individuo)
+            self.log(f"Generacion {generacion}: Frente de Pareto: {len(frente)} soluciones Conflictos: {conflictos} "
+                     f"Continuidad: {continuidad:.5f} Diversidad: {diversidad:.5f} Evaluaciones: {self.evaluaciones} "
+                     f"Duplicados: {self.duplicados_por_generacion[-1]}")
+
+            if self.cumple_criterios(conflictos, continuidad, penalizacion,
+                                     conflicto_esperado, evaluar_conflicto,
+                                     continuidad_esperada, evaluar_continuidad,
+                                     0, False):
+                convergencia = generacion
+                self.motivo_terminacion = "convergencia"
+                break
+
+            agotado = self.presupuesto_agotado()
+            if agotado is not None:
+                convergencia = generacion
+                self.motivo_terminacion = agotado
+                break
+
+            # (mu + lambda): padres e hijos compiten por los lugares de la siguiente generacion
+            entradas_seleccion = [(clave, entrada[2], entrada[3], entrada[4], entrada[1])
+                                  for clave, entrada in zip(claves, evaluados)]
+            hijos = self.generar_hijos(entradas_seleccion, poblacion_inicial, tasa_mutacion)
+            conocidos = {self.huella(entrada[3]): entrada for entrada in evaluados} if self.control_duplicados != "ninguno" else {}
+            hijos = self.insertar_sin_duplicados(hijos, set(conocidos))
+            combinados = evaluados + self.evaluar_objetivos(hijos, incluir_carga_docente, conocidos)
+            self.actualizar_operadores()
+            conservados, claves_combinados = reducir_poblacion([entrada[0] for entrada in combinados], poblacion_inicial)
+            evaluados = [combinados[i] for i in conservados]
+            claves = [claves_combinados[i] for i in conservados]
+
+        frente = [entrada for entrada, clave in zip(evaluados, claves) if clave[0] == 0]
+        vistos = set()
+        for objetivos, penalizacion, conflictos, individuo, continuidad in sorted(frente, key=lambda e: e[0]):
+            # individuos distintos con los mismos objetivos se reportan una sola vez
+            if objetivos in vistos:
+                continue
+            vistos.add(objetivos)
+            solucion = {"conflictos": conflictos, "continuidad": continuidad, "penalizacion": penalizacion,
+                        "individuo": individuo}
+            if incluir_carga_docente:
+                solucion["carga_docente"] = objetivos[2]
+            self.frente_pareto.append(solucion)
 
-        crear_horarios_pdf(self.resultado)
-        self.reporte_horarios_pdf = os.path.join(os.getcwd(), "reports", "reporte_horarios.pdf")
+        _, _, conflictos, mejor_individuo, _ = min(frente, key=lambda e: (e[2], -e[4]))
+        self.finalizar_ejecucion(mejor_individuo, conflictos, convergencia, start_time, monitor_memoria)
 
     def imprimir_resultado(self):
         if self.resultado is None:
@@ -461,5 +1555,5 @@ class AmbienteAlgoritmo:
             return
         print("Mejor horario encontrado:")
         for curso, asignacion in self.resultado.items():
-            salon, hora, docente = asignacion
-            print(f"Curso {curso}: Salón {salon}, Horario {hora}, Docente {docente}")
+            salon, franja, docente = asignacion
+            print(f"Curso {curso}: Salón {salon}, Horario {franja}, Docente {docente}")
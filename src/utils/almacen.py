@@ -0,0 +1,206 @@
+import hashlib
+import itertools
+import json
+import os
+import sqlite3
+import time
+
+RUTA_POR_DEFECTO = os.path.join("reports", "ejecuciones.db")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS ejecuciones (
+    id INTEGER PRIMARY KEY,
+    fecha REAL NOT NULL,
+    motor TEXT NOT NULL,
+    huella_dataset TEXT NOT NULL,
+    cantidad_cursos INTEGER NOT NULL,
+    parametros TEXT NOT NULL,
+    conflictos INTEGER NOT NULL,
+    continuidad REAL NOT NULL,
+    penalizacion REAL,
+    iteraciones INTEGER,
+    evaluaciones INTEGER,
+    tiempo REAL,
+    memoria_pico REAL,
+    motivo_terminacion TEXT
+);
+CREATE TABLE IF NOT EXISTS metricas_generacion (
+    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id) ON DELETE CASCADE,
+    generacion INTEGER NOT NULL,
+    penalizacion REAL,
+    conflictos INTEGER,
+    continuidad REAL,
+    diversidad REAL,
+    tasa_mutacion REAL,
+    evaluaciones INTEGER,
+    PRIMARY KEY (ejecucion_id, generacion)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS asignaciones (
+    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id) ON DELETE CASCADE,
+    curso TEXT NOT NULL,
+    sesion INTEGER NOT NULL DEFAULT 0,
+    salon TEXT NOT NULL,
+    dia TEXT,
+    hora TEXT NOT NULL,
+    docente TEXT,
+    PRIMARY KEY (ejecucion_id, curso, sesion)
+) WITHOUT ROWID;
+-- mejores ejecuciones de un dataset: menos conflictos y luego mayor continuidad
+CREATE INDEX IF NOT EXISTS idx_ejecuciones_mejores ON ejecuciones (huella_dataset, conflictos, continuidad DESC);
+-- comparacion de configuraciones sobre un dataset
+CREATE INDEX IF NOT EXISTS idx_ejecuciones_configuracion ON ejecuciones (huella_dataset, motor, parametros);
+CREATE INDEX IF NOT EXISTS idx_ejecuciones_fecha ON ejecuciones (fecha);
+"""
+
+# Version del esquema en PRAGMA user_version
+# 1: asignaciones con sesion y dia (franjas semanales)
+VERSION_ESQUEMA = 1
+
+# Historiales creados antes de las franjas semanales: la tabla de asignaciones se reconstruye
+# con las columnas sesion y dia (las asignaciones guardadas quedan en la sesion 0 sin dia)
+MIGRACION_ASIGNACIONES = """
+ALTER TABLE asignaciones RENAME TO asignaciones_anterior;
+CREATE TABLE asignaciones (
+    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id) ON DELETE CASCADE,
+    curso TEXT NOT NULL,
+    sesion INTEGER NOT NULL DEFAULT 0,
+    salon TEXT NOT NULL,
+    dia TEXT,
+    hora TEXT NOT NULL,
+    docente TEXT,
+    PRIMARY KEY (ejecucion_id, curso, sesion)
+) WITHOUT ROWID;
+INSERT INTO asignaciones (ejecucion_id, curso, salon, hora, docente)
+    SELECT ejecucion_id, curso, salon, hora, docente FROM asignaciones_anterior;
+DROP TABLE asignaciones_anterior;
+"""
+
+# Huella del conjunto de datos, no depende del orden de las filas
+# Dos ejecuciones con la misma huella resolvieron el mismo problema
+# Solo se toman los cursos de la sesion 0, asi la huella es la misma con los cursos cargados
+# o con los de la instancia (que tiene una copia por sesion semanal)
+def huella_dataset(cursos, salones, docentes, relaciones, franjas=()) -> str:
+    filas = [
+        sorted(f"{c.codigo}|{c.nombre}|{c.carrera}|{c.semestre}|{c.seccion}|{c.tipo}|{c.sesiones}|{c.inscritos}|{c.tipo_salon}"
+               for c in cursos if c.sesion == 0),
+        sorted(f"{s.id}|{s.nombre}|{s.capacidad}|{s.tipo}" for s in salones),
+        sorted(f"{d.registro}|{d.nombre}|{d.hora_entrada}|{d.hora_salida}" for d in docentes),
+        sorted(f"{r.registro_docente}|{r.codigo_curso}" for r in relaciones),
+        sorted(f"{f.dia}|{f.hora}" for f in franjas),
+    ]
+    return hashlib.sha256(json.dumps(filas, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+# Historial de ejecuciones en SQLite: parametros, metricas por generacion, horario final y tiempos
+# Una conexion por instancia, cada hilo que guarde o consulte debe crear la suya
+class AlmacenEjecuciones:
+    def __init__(self, ruta: str = RUTA_POR_DEFECTO):
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self.conexion = sqlite3.connect(ruta)
+        self.conexion.row_factory = sqlite3.Row
+        self.conexion.execute("PRAGMA foreign_keys = ON")
+        # WAL permite leer el historial mientras otra ejecucion guarda
+        self.conexion.execute("PRAGMA journal_mode = WAL")
+        self.migrar()
+        self.conexion.executescript(ESQUEMA)
+
+    def migrar(self):
+        version = self.conexion.execute("PRAGMA user_version").fetchone()[0]
+        if version >= VERSION_ESQUEMA:
+            return
+        columnas = [fila[1] for fila in self.conexion.execute("PRAGMA table_info(asignaciones)")]
+        if columnas and "sesion" not in columnas:
+            self.conexion.executescript(f"BEGIN; {MIGRACION_ASIGNACIONES} COMMIT;")
+        self.conexion.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+
+    def cerrar(self):
+        self.conexion.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    # Guarda una ejecucion terminada de AmbienteAlgoritmo en una sola transaccion, devuelve su id
+    def guardar_ejecucion(self, ambiente, motor: str, parametros: dict) -> int:
+        penalizacion = ambiente.penalizacion_por_generacion[-1] if ambiente.penalizacion_por_generacion else None
+        with self.conexion:
+            cursor = self.conexion.execute(
+                "INSERT INTO ejecuciones (fecha, motor, huella_dataset, cantidad_cursos, parametros, conflictos, "
+                "continuidad, penalizacion, iteraciones, evaluaciones, tiempo, memoria_pico, motivo_terminacion) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), motor,
+                 huella_dataset(ambiente.cursos, ambiente.salones, ambiente.docentes, ambiente.relaciones,
+                                ambiente.franjas),
+                 len(ambiente.cursos), json.dumps(parametros, sort_keys=True, default=str),
+                 ambiente.conflictos_mejor_individuo, ambiente.porcentaje_continuidad, penalizacion,
+                 ambiente.iteraciones_optimas, ambiente.evaluaciones, ambiente.tiempo_ejecucion,
+                 ambiente.memoria_pico, ambiente.motivo_terminacion))
+            ejecucion_id = cursor.lastrowid
+
+            self.conexion.executemany(
+                "INSERT INTO metricas_generacion VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                zip(itertools.repeat(ejecucion_id), range(len(ambiente.penalizacion_por_generacion)),
+                    ambiente.penalizacion_por_generacion, ambiente.conflictos_por_generacion,
+                    ambiente.continuidad_por_generacion, ambiente.diversidad_por_generacion,
+                    ambiente.tasa_mutacion_por_generacion, ambiente.evaluaciones_por_generacion))
+
+            self.conexion.executemany(
+                "INSERT INTO asignaciones VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((ejecucion_id, str(curso.codigo), curso.sesion, str(salon.id), franja.dia, franja.hora,
+                  str(docente.registro) if docente is not None else None)
+                 for curso, (salon, franja, docente) in (ambiente.resultado or {}).items()))
+        return ejecucion_id
+
+    def ejecucion(self, ejecucion_id: int) -> dict | None:
+        fila = self.conexion.execute("SELECT * FROM ejecuciones WHERE id = ?", (ejecucion_id,)).fetchone()
+        return self.fila_a_dict(fila) if fila is not None else None
+
+    # Ejecuciones mas recientes, opcionalmente de un solo dataset
+    def ejecuciones(self, huella: str | None = None, limite: int = 50) -> list[dict]:
+        if huella is None:
+            filas = self.conexion.execute("SELECT * FROM ejecuciones ORDER BY fecha DESC LIMIT ?", (limite,))
+        else:
+            filas = self.conexion.execute("SELECT * FROM ejecuciones WHERE huella_dataset = ? ORDER BY fecha DESC LIMIT ?",
+                                          (huella, limite))
+        return [self.fila_a_dict(fila) for fila in filas]
+
+    # Mejores ejecuciones de un dataset: menos conflictos y luego mayor continuidad
+    def mejores_ejecuciones(self, huella: str, limite: int = 10) -> list[dict]:
+        filas = self.conexion.execute(
+            "SELECT * FROM ejecuciones WHERE huella_dataset = ? ORDER BY conflictos, continuidad DESC LIMIT ?",
+            (huella, limite))
+        return [self.fila_a_dict(fila) for fila in filas]
+
+    # Resultados promedio de cada configuracion (motor + parametros) sobre un dataset
+    def comparar_configuraciones(self, huella: str) -> list[dict]:
+        filas = self.conexion.execute(
+            "SELECT motor, parametros, COUNT(*) AS ejecuciones, AVG(conflictos) AS conflictos, "
+            "MIN(conflictos) AS mejores_conflictos, AVG(continuidad) AS continuidad, AVG(tiempo) AS tiempo, "
+            "AVG(evaluaciones) AS evaluaciones FROM ejecuciones WHERE huella_dataset = ? "
+            "GROUP BY motor, parametros ORDER BY conflictos, continuidad DESC",
+            (huella,))
+        return [self.fila_a_dict(fila) for fila in filas]
+
+    def metricas(self, ejecucion_id: int) -> list[dict]:
+        filas = self.conexion.execute(
+            "SELECT * FROM metricas_generacion WHERE ejecucion_id = ? ORDER BY generacion", (ejecucion_id,))
+        return [dict(fila) for fila in filas]
+
+    # Asignaciones del horario guardado, en el formato de cargar_solucion
+    # (AmbienteAlgoritmo.reconstruir_solucion lo convierte en un individuo sin volver a ejecutar)
+    def asignaciones(self, ejecucion_id: int) -> list[dict]:
+        filas = self.conexion.execute(
+            "SELECT curso, sesion, salon, dia, hora, docente FROM asignaciones WHERE ejecucion_id = ?", (ejecucion_id,))
+        # las asignaciones migradas no tienen dia, reconstruir_solucion las ubica en el primer dia
+        return [{clave: valor for clave, valor in dict(fila).items() if not (clave == "dia" and valor is None)}
+                for fila in filas]
+
+    @staticmethod
+    def fila_a_dict(fila: sqlite3.Row) -> dict:
+        registro = dict(fila)
+        if "parametros" in registro:
+            registro["parametros"] = json.loads(registro["parametros"])
+        return registro
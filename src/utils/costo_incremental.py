@@ -0,0 +1,92 @@
+from collections import Counter
+
+# Costo de una sola solucion mantenido por diferencias, para los motores de trayectoria (utils.solvers)
+# Guarda los mismos conteos que AmbienteAlgoritmo.choques: k asignaciones en el mismo recurso y franja forman
+# k(k-1)/2 pares, al agregar una el total sube k y al quitarla baja k - 1. La continuidad se recalcula solo en los
+# grupos (carrera, semestre, dia) de los genes que cambian, asi cambiar un gen no depende del tamano del horario
+# Los totales de continuidad son flotantes y acumulan redondeo, los motores reconstruyen el estado cada generacion
+# y confirman cada nueva mejor solucion con funcion_costo
+class CostoIncremental:
+    def __init__(self, ambiente, individuo: dict):
+        self.ambiente = ambiente
+        self.previa = ambiente.solucion_previa if ambiente.peso_desviacion > 0 else None
+        self.libres = set(ambiente.lista_genes_libres) if self.previa is not None else set()
+        self.por_salon = Counter()
+        self.por_docente = Counter()
+        self.por_grupo = Counter()
+        self.por_sesion_dia = Counter()
+        self.periodos: dict[tuple, list[int]] = {}
+        self.continuidad_grupo: dict[tuple, float] = {}
+        self.pares_salon = self.pares_docente = self.pares_grupo = self.pares_sesion_dia = 0
+        self.disponibilidad = 0
+        self.cambios = 0
+        self.suma_continuidad = 0.0
+        for curso, gen in individuo.items():
+            self.agregar(curso, gen)
+
+    @staticmethod
+    def sumar(conteo: Counter, clave, signo: int) -> int:
+        if signo > 0:
+            conteo[clave] += 1
+            return conteo[clave] - 1
+        conteo[clave] -= 1
+        return -conteo[clave]
+
+    def agregar(self, curso, gen):
+        self.actualizar(curso, gen, 1)
+
+    def quitar(self, curso, gen):
+        self.actualizar(curso, gen, -1)
+
+    def actualizar(self, curso, gen, signo: int):
+        salon, franja, docente = gen
+        self.pares_salon += self.sumar(self.por_salon, (salon.indice, franja.indice), signo)
+        if docente is not None:
+            if not docente.esta_disponible(franja.hora):
+                self.disponibilidad += signo
+            self.pares_docente += self.sumar(self.por_docente, (docente.indice, franja.indice), signo)
+        self.pares_grupo += self.sumar(self.por_grupo, (curso.carrera, curso.semestre, franja.indice), signo)
+        if curso.sesiones > 1:
+            self.pares_sesion_dia += self.sumar(self.por_sesion_dia, (curso.codigo, franja.dia_indice), signo)
+        if curso in self.libres and gen != self.previa.get(curso):
+            self.cambios += signo
+
+        clave = (curso.carrera, curso.semestre, franja.dia_indice)
+        periodos = self.periodos.setdefault(clave, [])
+        if signo > 0:
+            periodos.append(franja.periodo)
+        else:
+            periodos.remove(franja.periodo)
+        self.suma_continuidad -= self.continuidad_grupo.pop(clave, 0)
+        if len(periodos) > 1:
+            indices = sorted(periodos)
+            consecutivos = sum(1 for i in range(1, len(indices)) if indices[i] - indices[i - 1] == 1)
+            self.continuidad_grupo[clave] = (consecutivos / (len(indices) - 1)) * 100
+            self.suma_continuidad += self.continuidad_grupo[clave]
+
+    # Los genes de originales ya cambiaron en el individuo (ver SolverRecocido.vecino)
+    def aplicar(self, individuo: dict, originales: list):
+        for curso, gen in originales:
+            self.quitar(curso, gen)
+        for curso, _ in originales:
+            self.agregar(curso, individuo[curso])
+
+    # Se llama antes de deshacer el movimiento en el individuo
+    def revertir(self, individuo: dict, originales: list):
+        for curso, _ in originales:
+            self.quitar(curso, individuo[curso])
+        for curso, gen in originales:
+            self.agregar(curso, gen)
+
+    # (costo, conflictos, continuidad) como funcion_costo, con el peso de continuidad actual
+    def costo(self) -> tuple[float, int, float]:
+        self.ambiente.evaluaciones += 1
+        penalizacion = 5 * (self.disponibilidad + self.pares_salon) + self.pares_docente + self.pares_grupo \
+            + self.pares_sesion_dia
+        conflictos = self.disponibilidad + self.pares_salon + self.pares_docente
+        continuidad = self.suma_continuidad / len(self.continuidad_grupo) if self.continuidad_grupo else 100
+        peso_continuidad = self.ambiente.peso_continuidad_actual()
+        penalizacion += peso_continuidad - (continuidad * peso_continuidad) / 100
+        if self.previa is not None:
+            penalizacion += self.ambiente.peso_desviacion * self.cambios
+        return penalizacion, conflictos, continuidad
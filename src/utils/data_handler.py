@@ -1,5 +1,19 @@
+import json
+import os
+
 import pandas as pd
-from models import Curso, Docente, Salon, DocenteCurso
+from models import Curso, Docente, Franja, Salon, DocenteCurso
+from models.franja import DIA_POR_DEFECTO, HORAS_POR_DEFECTO, crear_franjas
+
+def valor_opcional(row: dict, columna: str, tipo=None):
+    """
+    Devuelve el valor de una columna opcional del CSV o None si la columna
+    no existe o la celda esta vacia. Si se indica 'tipo' el valor se convierte.
+    """
+    valor = row.get(columna)
+    if valor is None or pd.isna(valor):
+        return None
+    return tipo(valor) if tipo is not None else valor
 
 def cargar_cursos(archivo_csv) -> list[Curso]:
     """
@@ -7,17 +21,22 @@ def cargar_cursos(archivo_csv) -> list[Curso]:
     
     Se asume que el CSV tiene las columnas: 
     'nombre', 'codigo', 'carrera', 'semestre', 'seccion', 'tipo'
+    y opcionalmente 'sesiones' (sesiones por semana, 1 si no se indica),
+    'inscritos' y 'tipo_salon' (tipo de salon requerido)
     """
     df = pd.read_csv(archivo_csv)
     cursos = []
-    for _, row in df.iterrows():
+    for row in df.to_dict('records'):
         curso = Curso(
             nombre=row['nombre'],
             codigo=row['codigo'],
             carrera=row['carrera'],
             semestre=row['semestre'],
             seccion=row['seccion'],
-            tipo=row['tipo']
+            tipo=row['tipo'],
+            sesiones=valor_opcional(row, 'sesiones', int) or 1,
+            inscritos=valor_opcional(row, 'inscritos', int),
+            tipo_salon=valor_opcional(row, 'tipo_salon', str)
         )
         cursos.append(curso)
     return cursos
@@ -27,7 +46,7 @@ def guardar_cursos(cursos: list[Curso], archivo_csv):
     Guarda un archivo CSV de cursos
     
     Se asume que el CSV tiene las columnas: 
-    'nombre', 'codigo', 'carrera', 'semestre', 'seccion', 'tipo'
+    'nombre', 'codigo', 'carrera', 'semestre', 'seccion', 'tipo', 'sesiones', 'inscritos', 'tipo_salon'
     """
     # Convertir la lista de objetos a una lista de diccionarios
     data = [{
@@ -36,7 +55,10 @@ def guardar_cursos(cursos: list[Curso], archivo_csv):
         'carrera': curso.carrera,
         'semestre': curso.semestre,
         'seccion': curso.seccion,
-        'tipo': curso.tipo
+        'tipo': curso.tipo,
+        'sesiones': curso.sesiones,
+        'inscritos': curso.inscritos,
+        'tipo_salon': curso.tipo_salon
     } for curso in cursos]
 
     # Crear un DataFrame a partir de la lista de diccionarios
@@ -54,7 +76,7 @@ def cargar_docentes(archivo_csv) -> list[Docente]:
     """
     df = pd.read_csv(archivo_csv)
     docentes = []
-    for _, row in df.iterrows():
+    for row in df.to_dict('records'):
         docente = Docente(
             nombre=row['nombre'],
             registro=row['registro'],
@@ -95,7 +117,7 @@ def cargar_relaciones(archivo_csv) -> list[DocenteCurso]:
     """
     df = pd.read_csv(archivo_csv)
     relaciones = []
-    for _, row in df.iterrows():
+    for row in df.to_dict('records'):
         relacion = DocenteCurso(
             registro_docente=row['registro'],
             codigo_curso=row['codigo']
@@ -127,13 +149,16 @@ def cargar_salones(archivo_csv) -> list[Salon]:
     Lee un archivo CSV con la información de los salones y devuelve una lista de objetos Salon.
     
     Se asume que el CSV tiene las columnas: 'id' y 'nombre'
+    y opcionalmente 'capacidad' y 'tipo'
     """
     df = pd.read_csv(archivo_csv)
     salones = []
-    for _, row in df.iterrows():
+    for row in df.to_dict('records'):
         salon = Salon(
             id=row['id'],
-            nombre=row['nombre']
+            nombre=row['nombre'],
+            capacidad=valor_opcional(row, 'capacidad', int),
+            tipo=valor_opcional(row, 'tipo', str)
         )
         salones.append(salon)
     return salones
@@ -143,12 +168,14 @@ def guardar_salones(salones: list[Salon], archivo_csv):
     Guarda un archivo CSV de salones
     
     Se asume que el CSV tiene las columnas: 
-    'nombre', 'id'
+    'nombre', 'id', 'capacidad', 'tipo'
     """
     # Convertir la lista de objetos a una lista de diccionarios
     data = [{
         'nombre': salon.nombre,
         'id': salon.id,
+        'capacidad': salon.capacidad,
+        'tipo': salon.tipo,
     } for salon in salones]
 
     # Crear un DataFrame a partir de la lista de diccionarios
@@ -156,3 +183,83 @@ def guardar_salones(salones: list[Salon], archivo_csv):
 
     # Escribir el DataFrame en el archivo CSV (esto sobreescribe el archivo existente)
     df.to_csv(archivo_csv, index=False)
+
+def cargar_franjas(archivo_csv) -> list[Franja]:
+    """
+    Lee un archivo CSV con las franjas de la semana y devuelve una lista de objetos Franja.
+
+    Se asume que el CSV tiene las columnas: 'dia' y 'hora' (hora de inicio "HH:MM")
+    Los dias se ordenan por su primera aparicion en el archivo.
+    Si el archivo no existe se usa un solo dia con las horas por defecto.
+    """
+    if not os.path.exists(archivo_csv):
+        return crear_franjas([DIA_POR_DEFECTO], HORAS_POR_DEFECTO)
+    df = pd.read_csv(archivo_csv, dtype=str)
+    franjas = []
+    for row in df.to_dict('records'):
+        franja = Franja(
+            dia=row['dia'].strip(),
+            hora=row['hora'].strip()
+        )
+        franjas.append(franja)
+    return franjas
+
+def guardar_franjas(franjas: list[Franja], archivo_csv):
+    """
+    Guarda un archivo CSV de franjas
+    
+    Se asume que el CSV tiene las columnas: 
+    'dia', 'hora'
+    """
+    # Convertir la lista de objetos a una lista de diccionarios
+    data = [{
+        'dia': franja.dia,
+        'hora': franja.hora,
+    } for franja in franjas]
+
+    # Crear un DataFrame a partir de la lista de diccionarios
+    df = pd.DataFrame(data, columns=['dia', 'hora'])
+
+    # Escribir el DataFrame en el archivo CSV (esto sobreescribe el archivo existente)
+    df.to_csv(archivo_csv, index=False)
+
+def asignaciones_solucion(horario: dict) -> list[dict]:
+    """
+    Asignaciones de un horario con solo los identificadores (el contenido de guardar_solucion)
+
+    Codigo y sesion del curso, id del salon, dia y hora de la franja y registro del docente,
+    los identificadores leidos por pandas como tipos de numpy se convierten a tipos de Python
+    """
+    def identificador(valor):
+        return valor.item() if hasattr(valor, 'item') else valor
+
+    return [{
+        'curso': identificador(curso.codigo),
+        'sesion': curso.sesion,
+        'salon': identificador(salon.id),
+        'dia': franja.dia,
+        'hora': franja.hora,
+        'docente': identificador(docente.registro) if docente is not None else None,
+    } for curso, (salon, franja, docente) in horario.items()]
+
+def guardar_solucion(horario: dict, archivo_json):
+    """
+    Guarda un horario (resultado del algoritmo) en un archivo JSON
+
+    Solo se guardan los identificadores: codigo y sesion del curso, id del salon,
+    dia y hora de la franja y registro del docente, asi la solucion se puede cargar con datos editados
+    """
+    with open(archivo_json, 'w', encoding='utf-8') as archivo:
+        json.dump({'asignaciones': asignaciones_solucion(horario)}, archivo, ensure_ascii=False, indent=2,
+                  default=str)
+
+def cargar_solucion(archivo_json) -> list[dict]:
+    """
+    Lee un horario guardado con guardar_solucion y devuelve sus asignaciones
+
+    Cada asignacion es un diccionario con las llaves: 
+    'curso', 'sesion', 'salon', 'dia', 'hora', 'docente'
+    (las soluciones guardadas antes de las franjas semanales no traen 'sesion' ni 'dia')
+    """
+    with open(archivo_json, encoding='utf-8') as archivo:
+        return json.load(archivo)['asignaciones']
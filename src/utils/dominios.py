@@ -0,0 +1,50 @@
+import random
+
+# Dominio factible de un curso: las asignaciones (salon, franja, docente) que pueden ser validas
+# Los salones no dependen de la franja ni del docente, por eso el dominio se guarda como dos listas
+# y una muestra uniforme de cada una es una muestra uniforme de las asignaciones factibles
+class DominioCurso:
+    __slots__ = ("salones", "franjas_docentes", "conjunto_salones", "conjunto_franjas_docentes", "factible")
+
+    def __init__(self, salones, franjas_docentes, factible=True):
+        # salones que admiten al curso (capacidad y tipo)
+        self.salones = list(salones)
+        # pares (franja, docente) en los que un docente permitido esta disponible, (franja, None) si no tiene docentes
+        self.franjas_docentes = list(franjas_docentes)
+        self.conjunto_salones = set(self.salones)
+        self.conjunto_franjas_docentes = set(self.franjas_docentes)
+        # False si no habia asignaciones factibles y el dominio es el espacio completo
+        self.factible = factible
+
+    def muestra(self, rng=random) -> tuple:
+        franja, docente = rng.choice(self.franjas_docentes)
+        return (rng.choice(self.salones), franja, docente)
+
+    def admite(self, salon, franja, docente) -> bool:
+        return salon in self.conjunto_salones and (franja, docente) in self.conjunto_franjas_docentes
+
+    # Cantidad de asignaciones factibles
+    def tamano(self) -> int:
+        return len(self.salones) * len(self.franjas_docentes)
+
+# Calcula el dominio de cada curso una sola vez por instancia
+# Si un curso no tiene salones o pares (franja, docente) factibles se usa el espacio completo de ese componente,
+# asi la instancia se puede resolver y los conflictos lo reportan; esos cursos se devuelven en sin_solucion
+def calcular_dominios(cursos, salones, franjas, docentes_por_curso) -> tuple[dict, list]:
+    dominios = {}
+    sin_solucion = []
+    for curso in cursos:
+        salones_curso = [salon for salon in salones if salon.admite(curso)]
+        docentes = docentes_por_curso.get(curso.codigo, [])
+        if docentes:
+            todos_los_pares = [(franja, docente) for franja in franjas for docente in docentes]
+            pares = [(franja, docente) for franja, docente in todos_los_pares if docente.esta_disponible(franja.hora)]
+        else:
+            todos_los_pares = pares = [(franja, None) for franja in franjas]
+
+        factible = True
+        if not salones_curso or not pares:
+            sin_solucion.append(curso)
+            factible = False
+        dominios[curso] = DominioCurso(salones_curso or salones, pares or todos_los_pares, factible)
+    return dominios, sin_solucion
@@ -0,0 +1,315 @@
+import itertools
+import multiprocessing
+import os
+import pickle
+import queue
+import random
+import sqlite3
+import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.connection import wait
+
+from utils.algoritmo import AmbienteAlgoritmo
+from utils.almacen import AlmacenEjecuciones
+from utils.pdf_handler import crear_horarios_pdf
+from utils.solvers import crear_solver
+
+# Ejecuciones de la interfaz sobre una instancia ya preparada
+# preparar_data (dominios, huellas, evaluador) se hace una vez y la misma instancia se usa en cada ejecucion
+# hasta que cambian los datos. Para comparar configuraciones varias se ejecutan a la vez en procesos separados,
+# cada proceso recibe la instancia serializada al iniciar y ejecuta sobre ella todas las que le tocan
+
+# Resultado de una ejecucion con los datos que muestra la interfaz (horario, series y reportes)
+def resultado_ejecucion(ambiente: AmbienteAlgoritmo, ejecucion_id: int | None = None) -> dict:
+    return {
+        "horario": ambiente.resultado,
+        "conflictos": ambiente.conflictos_por_generacion,
+        "continuidades": ambiente.continuidad_por_generacion,
+        "penalizaciones": ambiente.penalizacion_por_generacion,
+        "diversidades": ambiente.diversidad_por_generacion,
+        "tasas_mutacion": ambiente.tasa_mutacion_por_generacion,
+        "conflictos_mejor_individuo": ambiente.conflictos_mejor_individuo,
+        "conflictos_por_tipo": ambiente.conflictos_por_tipo,
+        "iteraciones": ambiente.iteraciones_optimas,
+        "evaluaciones": ambiente.evaluaciones,
+        "duplicados": ambiente.duplicados_por_generacion,
+        "estadisticas_operadores": ambiente.estadisticas_operadores,
+        "motivo_terminacion": ambiente.motivo_terminacion,
+        "reinicios": ambiente.reinicios,
+        "tiempo": ambiente.tiempo_ejecucion,
+        "continuidad": ambiente.porcentaje_continuidad,
+        "memoria": ambiente.memoria_consumida,
+        "memoria_pico": ambiente.memoria_pico,
+        "memoria_pico_muestreado": ambiente.memoria_pico_muestreado,
+        "memoria_pico_asignada": ambiente.memoria_pico_asignada,
+        "memoria_por_generacion": ambiente.memoria_por_generacion,
+        "asignaciones_principales": ambiente.asignaciones_principales,
+        "reporte_horarios_pdf": ambiente.reporte_horarios_pdf,
+        "reprogramacion": ambiente.solucion_previa is not None,
+        "cursos_modificados": ambiente.cursos_modificados,
+        "ejecucion_id": ejecucion_id,
+        "semilla": ambiente.semilla,
+        # sin los individuos, solo los valores de cada objetivo
+        "frente_pareto": [{clave: valor for clave, valor in solucion.items() if clave != "individuo"}
+                          for solucion in ambiente.frente_pareto],
+    }
+
+# Ejecuta un motor sobre una instancia preparada, sin solucion previa se descarta la reprogramacion
+# que haya dejado la ejecucion anterior
+def ejecutar_en_ambiente(ambiente: AmbienteAlgoritmo, motor: str, generaciones: int, parametros: dict,
+                         solucion_previa=None, peso_desviacion=0, guardar_historial=False) -> dict:
+    solver = crear_solver(motor, ambiente)
+    if solucion_previa is not None:
+        ambiente.preparar_reprogramacion(solucion_previa, peso_desviacion)
+    else:
+        ambiente.descartar_reprogramacion()
+    solver.resolver(generaciones, parametros)
+
+    ejecucion_id = None
+    if guardar_historial:
+        # conexion propia del hilo o proceso que ejecuta
+        try:
+            with AlmacenEjecuciones() as almacen:
+                ejecucion_id = almacen.guardar_ejecucion(
+                    ambiente, motor, {**parametros, "semilla": ambiente.semilla, "generaciones": generaciones})
+        except sqlite3.Error as e:
+            ambiente.log(f"No se pudo guardar la ejecucion en el historial: {e}")
+    return resultado_ejecucion(ambiente, ejecucion_id)
+
+# Instancia, cola de progreso y evento de cancelacion de cada proceso del grupo, se asignan al iniciar el proceso
+ambiente_proceso: AmbienteAlgoritmo | None = None
+cola_proceso = None
+
+def iniciar_proceso(instancia: bytes, cola, cancelacion):
+    global ambiente_proceso, cola_proceso
+    ambiente_proceso = pickle.loads(instancia)
+    ambiente_proceso.callback_log = lambda mensaje: None
+    ambiente_proceso.cancelacion = cancelacion
+    cola_proceso = cola
+
+# Se ejecuta en un proceso del grupo, las metricas de cada generacion llegan por la cola como (id, "progreso", metricas)
+# El horario vuelve con copias de los cursos, salones y docentes (ver AmbienteAlgoritmo.internar_individuo)
+def ejecutar_configuracion(id_ejecucion: int, motor: str, generaciones: int, parametros: dict, solucion_previa,
+                           peso_desviacion, guardar_historial: bool, generar_pdf: bool, directorio: str) -> dict:
+    ambiente = ambiente_proceso
+    ambiente.callback_generacion = lambda metricas: cola_proceso.put((id_ejecucion, "progreso", metricas))
+    ambiente.generar_pdf = generar_pdf
+    ambiente.directorio_reportes = directorio
+    return ejecutar_en_ambiente(ambiente, motor, generaciones, parametros, solucion_previa, peso_desviacion,
+                                guardar_historial)
+
+# Procesos que ejecutan configuraciones sobre la misma instancia, como maximo 'max_procesos' a la vez
+# y el resto espera en la cola del ejecutor. Al cambiar la instancia o la cantidad de procesos se crea
+# un ejecutor nuevo, las ejecuciones enviadas al anterior terminan con los datos con que se enviaron
+# Todos los ejecutores comparten un evento de cancelacion que los procesos revisan al final de cada generacion
+class GrupoEjecuciones:
+    def __init__(self, max_procesos: int = 2, directorio_base: str = os.path.join("reports", "ejecuciones")):
+        self.max_procesos = max(1, max_procesos)
+        self.directorio_base = directorio_base
+        # spawn: el proceso hijo no hereda los hilos de la interfaz
+        self.contexto = multiprocessing.get_context("spawn")
+        self.cola = self.contexto.Queue()
+        self.cancelacion = self.contexto.Event()
+        self.ejecutor: ProcessPoolExecutor | None = None
+        self.instancia: bytes | None = None
+        self.anteriores: list[ProcessPoolExecutor] = []
+        self.contador = itertools.count(1)
+
+    # instancia es el AmbienteAlgoritmo preparado y serializado con pickle
+    def enviar(self, instancia: bytes, motor: str, generaciones: int, parametros: dict, solucion_previa=None,
+               peso_desviacion=0, guardar_historial=False, generar_pdf=True,
+               max_procesos: int | None = None) -> tuple[int, Future]:
+        if max_procesos is not None:
+            max_procesos = max(1, max_procesos)
+        if self.ejecutor is None or instancia is not self.instancia or max_procesos not in (None, self.max_procesos):
+            self.reemplazar_ejecutor(instancia, max_procesos or self.max_procesos)
+        id_ejecucion = next(self.contador)
+        # el reporte PDF siempre se llama igual, cada ejecucion lo escribe en su carpeta
+        directorio = os.path.abspath(os.path.join(self.directorio_base, f"{id_ejecucion:04d}"))
+        futuro = self.ejecutor.submit(ejecutar_configuracion, id_ejecucion, motor, generaciones, dict(parametros),
+                                      solucion_previa, peso_desviacion, guardar_historial, generar_pdf, directorio)
+        return id_ejecucion, futuro
+
+    def reemplazar_ejecutor(self, instancia: bytes, max_procesos: int):
+        if self.ejecutor is not None:
+            self.ejecutor.shutdown(wait=False)
+            self.anteriores.append(self.ejecutor)
+        self.instancia = instancia
+        self.max_procesos = max_procesos
+        self.ejecutor = ProcessPoolExecutor(max_procesos, mp_context=self.contexto,
+                                            initializer=iniciar_proceso, initargs=(instancia, self.cola, self.cancelacion))
+
+    # Metricas recibidas desde la ultima llamada, (id, metricas) en orden de llegada
+    def progreso(self) -> list[tuple[int, dict]]:
+        mensajes = []
+        while True:
+            try:
+                id_ejecucion, _, metricas = self.cola.get_nowait()
+            except queue.Empty:
+                return mensajes
+            mensajes.append((id_ejecucion, metricas))
+
+    # Las ejecuciones en curso terminan al final de su generacion con motivo "cancelada" y las que estan en cola
+    # se descartan, los procesos salen solos. Los ejecutores siguientes usan un evento nuevo
+    def detener(self):
+        self.cancelacion.set()
+        for ejecutor in self.anteriores + [self.ejecutor]:
+            if ejecutor is not None:
+                ejecutor.shutdown(wait=False, cancel_futures=True)
+        self.cancelacion = self.contexto.Event()
+        self.anteriores = []
+        self.ejecutor = None
+        self.instancia = None
+
+# Proceso de una semilla del portafolio, todo lo que reporta va por su propia conexion como (tipo, datos)
+# Cada ejecucion tiene su conexion para que terminar un proceso no deje a medias los mensajes de los demas
+def ejecutar_semilla(instancia: bytes, conexion, motor: str, generaciones: int, parametros: dict, solucion_previa,
+                     peso_desviacion):
+    try:
+        ambiente = pickle.loads(instancia)
+        ambiente.callback_log = lambda mensaje: None
+        ambiente.callback_generacion = lambda metricas: conexion.send(("progreso", metricas))
+        ambiente.generar_pdf = False
+        conexion.send(("resultado", ejecutar_en_ambiente(ambiente, motor, generaciones, parametros, solucion_previa,
+                                                         peso_desviacion)))
+    except Exception:
+        conexion.send(("error", traceback.format_exc()))
+    finally:
+        conexion.close()
+
+# Portafolio: la misma configuracion con 'ejecuciones' semillas distintas, cada una en su proceso
+# y como maximo 'max_procesos' a la vez. Pasado el calentamiento (fraccion de las generaciones) una ejecucion
+# cuya mejor penalizacion supera en mas de 'margen' (relativo) a la mejor que tenia otra en la misma generacion
+# se termina y su lugar lo ocupa la siguiente semilla. Si una cumple los criterios de convergencia se terminan
+# las demas. Gana la de menos conflictos y mayor continuidad, con su semilla se repite con el parametro 'semilla'
+class Portafolio:
+    def __init__(self, ambiente: AmbienteAlgoritmo, motor: str, generaciones: int, parametros: dict,
+                 ejecuciones: int = 4, max_procesos: int | None = None, semillas=None,
+                 calentamiento: float = 0.2, margen: float = 0.5, solucion_previa=None, peso_desviacion=0):
+        self.ambiente = ambiente
+        self.motor = motor
+        self.generaciones = generaciones
+        self.parametros = dict(parametros)
+        self.solucion_previa = solucion_previa
+        self.peso_desviacion = peso_desviacion
+        self.semillas = list(semillas) if semillas is not None else [random.getrandbits(32) for _ in range(ejecuciones)]
+        self.max_procesos = max(1, max_procesos or min(len(self.semillas), os.cpu_count() or 1))
+        self.generacion_minima = max(1, int(calentamiento * generaciones))
+        self.margen = margen
+        # por ejecucion (indice de su semilla): mejor penalizacion hasta cada generacion, estado y resultado
+        self.mejores: list[list[float]] = [[] for _ in self.semillas]
+        self.estados = ["en_cola"] * len(self.semillas)
+        self.resultados: dict[int, dict] = {}
+        self.procesos = {}
+        # (indice, metricas) de cada generacion de cada ejecucion
+        self.callback_progreso = None
+        self.callback_log = ambiente.log
+
+    def ejecutar(self) -> dict:
+        # la instancia preparada se serializa una vez para todas las semillas
+        instancia = pickle.dumps(self.ambiente)
+        contexto = multiprocessing.get_context("spawn")
+        pendientes = deque(range(len(self.semillas)))
+        conexiones = {}
+        try:
+            while pendientes or conexiones:
+                while pendientes and len(conexiones) < self.max_procesos:
+                    indice = pendientes.popleft()
+                    lectura, escritura = contexto.Pipe(duplex=False)
+                    proceso = contexto.Process(target=ejecutar_semilla, daemon=True, args=(
+                        instancia, escritura, self.motor, self.generaciones,
+                        {**self.parametros, "semilla": self.semillas[indice]}, self.solucion_previa,
+                        self.peso_desviacion))
+                    proceso.start()
+                    escritura.close()
+                    self.procesos[indice] = proceso
+                    self.estados[indice] = "ejecutando"
+                    conexiones[lectura] = indice
+
+                for lectura in wait(list(conexiones)):
+                    indice = conexiones[lectura]
+                    try:
+                        tipo, datos = lectura.recv()
+                    except EOFError:
+                        tipo, datos = "error", f"El proceso termino con codigo {self.procesos[indice].exitcode}"
+                    if tipo == "progreso":
+                        self.registrar_progreso(indice, datos)
+                        if not self.rezagada(indice):
+                            continue
+                        self.log(f"Semilla {self.semillas[indice]}: penalizacion {self.mejores[indice][-1]:.2f} "
+                                 f"en la generacion {len(self.mejores[indice]) - 1}, se descarta.")
+                        self.terminar(indice, "descartada")
+                    elif tipo == "resultado":
+                        self.resultados[indice] = datos
+                        self.estados[indice] = "completada"
+                        if datos["motivo_terminacion"] == "convergencia":
+                            self.log(f"Semilla {self.semillas[indice]}: cumplio los criterios, se terminan las demas.")
+                            for otro in list(pendientes) + [otro for otro in conexiones.values() if otro != indice]:
+                                self.terminar(otro, "descartada")
+                            pendientes.clear()
+                    else:
+                        self.estados[indice] = "error"
+                        self.log(f"Semilla {self.semillas[indice]}: {datos}")
+                    for conexion, otro in list(conexiones.items()):
+                        if self.estados[otro] != "ejecutando":
+                            conexion.close()
+                            del conexiones[conexion]
+        finally:
+            for indice in range(len(self.semillas)):
+                if self.estados[indice] == "ejecutando":
+                    self.terminar(indice, "descartada")
+        return self.resultado()
+
+    def registrar_progreso(self, indice: int, metricas: dict):
+        mejores = self.mejores[indice]
+        mejores.append(min(metricas["penalizacion"], mejores[-1]) if mejores else metricas["penalizacion"])
+        if self.callback_progreso is not None:
+            self.callback_progreso(indice, metricas)
+
+    # Se compara con las otras ejecuciones en la misma generacion, asi el peso de continuidad
+    # (que cambia con la generacion) es el mismo y una semilla que empezo despues no queda en desventaja
+    def rezagada(self, indice: int) -> bool:
+        generacion = len(self.mejores[indice]) - 1
+        if generacion < self.generacion_minima:
+            return False
+        rivales = [mejores[generacion] for otro, mejores in enumerate(self.mejores)
+                   if otro != indice and len(mejores) > generacion]
+        if not rivales:
+            return False
+        lider = min(rivales)
+        return self.mejores[indice][generacion] > lider + self.margen * max(abs(lider), 1)
+
+    def terminar(self, indice: int, estado: str):
+        proceso = self.procesos.get(indice)
+        if proceso is not None and proceso.is_alive():
+            proceso.terminate()
+            proceso.join()
+        self.estados[indice] = estado
+
+    # Resultado de la mejor ejecucion con el horario sobre los objetos de la instancia original,
+    # mas el resumen de cada semilla en "portafolio"
+    def resultado(self) -> dict:
+        resumen = [{
+            "semilla": semilla,
+            "estado": self.estados[indice],
+            "generaciones": len(self.mejores[indice]),
+            "penalizacion": self.mejores[indice][-1] if self.mejores[indice] else None,
+            "conflictos": self.resultados[indice]["conflictos_mejor_individuo"] if indice in self.resultados else None,
+            "continuidad": self.resultados[indice]["continuidad"] if indice in self.resultados else None,
+        } for indice, semilla in enumerate(self.semillas)]
+        if not self.resultados:
+            raise RuntimeError("Ninguna ejecucion del portafolio termino")
+        mejor = min(self.resultados, key=lambda indice: (self.resultados[indice]["conflictos_mejor_individuo"],
+                                                          -self.resultados[indice]["continuidad"]))
+        resultado = dict(self.resultados[mejor])
+        resultado["horario"] = self.ambiente.internar_individuo(resultado["horario"])
+        if self.ambiente.generar_pdf:
+            resultado["reporte_horarios_pdf"] = os.path.abspath(crear_horarios_pdf(
+                resultado["horario"], self.ambiente.directorio_reportes, self.ambiente.franjas))
+        resultado["portafolio"] = resumen
+        return resultado
+
+    def log(self, mensaje: str):
+        if self.callback_log is not None:
+            self.callback_log(mensaje)
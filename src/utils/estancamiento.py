@@ -0,0 +1,52 @@
+from collections import deque
+
+# Detecta cuando la busqueda deja de progresar
+# Criterios (cada uno se desactiva con su valor por defecto):
+#   sin_mejora: la mejor penalizacion no mejora en 'generaciones_sin_mejora' generaciones
+#   mejora_lenta: la mejora promedio por generacion en la ultima 'ventana_mejora' es menor a 'epsilon_mejora'
+#   colapso_diversidad: la diversidad cayo bajo el umbral (lo que provoca reinsercion)
+#                       y aun asi no hubo mejora en 'generaciones_tras_colapso' generaciones
+class DetectorEstancamiento:
+    def __init__(self, generaciones_sin_mejora: int = 0, epsilon_mejora: float = 0, ventana_mejora: int = 50,
+                 detectar_colapso_diversidad: bool = False, generaciones_tras_colapso: int = 20):
+        self.generaciones_sin_mejora = generaciones_sin_mejora
+        self.epsilon_mejora = epsilon_mejora
+        self.ventana_mejora = max(1, ventana_mejora)
+        self.detectar_colapso_diversidad = detectar_colapso_diversidad
+        self.generaciones_tras_colapso = generaciones_tras_colapso
+        self.reiniciar(0)
+
+    def activo(self) -> bool:
+        return self.generaciones_sin_mejora > 0 or self.epsilon_mejora > 0 or self.detectar_colapso_diversidad
+
+    # Se llama al inicio y despues de cada reinicio de la poblacion
+    def reiniciar(self, generacion: int):
+        self.mejor = float("inf")
+        self.generacion_mejora = generacion
+        self.historial = deque(maxlen=self.ventana_mejora + 1)
+        self.generacion_colapso = None
+
+    # Devuelve el motivo del estancamiento o None si la busqueda sigue progresando
+    def evaluar(self, generacion: int, penalizacion: float, diversidad: float, umbral_diversidad: float) -> str | None:
+        if penalizacion < self.mejor - 1e-9:
+            self.mejor = penalizacion
+            self.generacion_mejora = generacion
+            self.generacion_colapso = None
+        self.historial.append(self.mejor)
+
+        if self.generaciones_sin_mejora > 0 and generacion - self.generacion_mejora >= self.generaciones_sin_mejora:
+            return "sin_mejora"
+
+        if self.epsilon_mejora > 0 and len(self.historial) == self.historial.maxlen:
+            tasa_mejora = (self.historial[0] - self.historial[-1]) / self.ventana_mejora
+            if tasa_mejora < self.epsilon_mejora:
+                return "mejora_lenta"
+
+        if self.detectar_colapso_diversidad:
+            if diversidad < umbral_diversidad and self.generacion_colapso is None:
+                self.generacion_colapso = generacion
+            if (self.generacion_colapso is not None and
+                    generacion - self.generacion_colapso >= self.generaciones_tras_colapso):
+                return "colapso_diversidad"
+
+        return None
@@ -0,0 +1,167 @@
+import numpy as np
+
+# Numba es opcional (requirements-opcional.txt): si esta instalado los nucleos se compilan, si no se pueden
+# ejecutar como Python normal (con los mismos resultados, para las pruebas) pero AmbienteAlgoritmo usa su funcion
+# de costo original, que es mas rapida que los nucleos sin compilar
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+NUMBA_DISPONIBLE = njit is not None
+
+def compilar(funcion):
+    if njit is None:
+        return funcion
+    return njit(cache=True, nogil=True)(funcion)
+
+# Columnas de la matriz de genes que reciben los nucleos: (curso, salon, franja, docente)
+# con los indices de la instancia, el docente es -1 si el curso no tiene
+CURSO, SALON, FRANJA, DOCENTE = 0, 1, 2, 3
+
+# Choques de un individuo con las mismas reglas que AmbienteAlgoritmo.choques
+# Cada contador guarda cuantas asignaciones hay en cada recurso y franja, k asignaciones en la misma clave
+# suman 0 + 1 + ... + (k - 1) = k(k-1)/2 pares. Los contadores se limpian al terminar para el siguiente individuo
+@compilar
+def choques_genes(genes, grupo, codigo, multiples, dia, disponible, franjas, dias,
+                  cuenta_salon, cuenta_docente, cuenta_grupo, cuenta_sesion):
+    penalizacion = 0
+    conflictos = 0
+    for j in range(genes.shape[0]):
+        curso = genes[j, CURSO]
+        franja = genes[j, FRANJA]
+        docente = genes[j, DOCENTE]
+        clave = genes[j, SALON] * franjas + franja
+        pares = cuenta_salon[clave]
+        cuenta_salon[clave] += 1
+        penalizacion += 5 * pares
+        conflictos += pares
+        if docente >= 0:
+            if not disponible[docente, franja]:
+                penalizacion += 5
+                conflictos += 1
+            clave = docente * franjas + franja
+            pares = cuenta_docente[clave]
+            cuenta_docente[clave] += 1
+            penalizacion += pares
+            conflictos += pares
+        clave = grupo[curso] * franjas + franja
+        penalizacion += cuenta_grupo[clave]
+        cuenta_grupo[clave] += 1
+        if multiples[curso]:
+            clave = codigo[curso] * dias + dia[franja]
+            penalizacion += cuenta_sesion[clave]
+            cuenta_sesion[clave] += 1
+
+    for j in range(genes.shape[0]):
+        curso = genes[j, CURSO]
+        franja = genes[j, FRANJA]
+        cuenta_salon[genes[j, SALON] * franjas + franja] = 0
+        if genes[j, DOCENTE] >= 0:
+            cuenta_docente[genes[j, DOCENTE] * franjas + franja] = 0
+        cuenta_grupo[grupo[curso] * franjas + franja] = 0
+        if multiples[curso]:
+            cuenta_sesion[codigo[curso] * dias + dia[franja]] = 0
+    return penalizacion, conflictos
+
+# Continuidad de un individuo con las mismas reglas que AmbienteAlgoritmo.calcular_continuidad
+# Los periodos de cada (grupo, dia) se ordenan juntos en una sola clave y los grupos se suman
+# en el orden en que aparecen por primera vez, el mismo orden de suma que el diccionario de la version en Python
+@compilar
+def continuidad_genes(genes, grupo, dia, periodo, dias, periodos, orden, cantidad, consecutivos):
+    cursos = genes.shape[0]
+    claves = np.empty(cursos, dtype=np.int64)
+    grupos = 0
+    for j in range(cursos):
+        franja = genes[j, FRANJA]
+        grupo_dia = grupo[genes[j, CURSO]] * dias + dia[franja]
+        if cantidad[grupo_dia] == 0:
+            orden[grupos] = grupo_dia
+            grupos += 1
+        cantidad[grupo_dia] += 1
+        claves[j] = grupo_dia * periodos + periodo[franja]
+
+    claves.sort()
+    for j in range(1, cursos):
+        if claves[j] // periodos == claves[j - 1] // periodos and claves[j] - claves[j - 1] == 1:
+            consecutivos[claves[j] // periodos] += 1
+
+    suma_continuidad = 0.0
+    grupos_validos = 0
+    for i in range(grupos):
+        grupo_dia = orden[i]
+        if cantidad[grupo_dia] >= 2:
+            suma_continuidad += (consecutivos[grupo_dia] / (cantidad[grupo_dia] - 1)) * 100
+            grupos_validos += 1
+        cantidad[grupo_dia] = 0
+        consecutivos[grupo_dia] = 0
+    if grupos_validos > 0:
+        return suma_continuidad / grupos_validos
+    return 100.0
+
+# Evalua todos los individuos de la matriz (individuos, cursos, 4)
+# Devuelve la penalizacion por choques, los conflictos y el porcentaje de continuidad de cada uno
+@compilar
+def evaluar_genes(matriz, grupo, codigo, multiples, dia, periodo, disponible, franjas, dias, periodos,
+                  cuenta_salon, cuenta_docente, cuenta_grupo, cuenta_sesion, orden, cantidad, consecutivos):
+    individuos = matriz.shape[0]
+    penalizaciones = np.zeros(individuos, dtype=np.int64)
+    conflictos = np.zeros(individuos, dtype=np.int64)
+    continuidades = np.zeros(individuos, dtype=np.float64)
+    for k in range(individuos):
+        penalizacion, conflicto = choques_genes(
+            matriz[k], grupo, codigo, multiples, dia, disponible, franjas, dias,
+            cuenta_salon, cuenta_docente, cuenta_grupo, cuenta_sesion)
+        penalizaciones[k] = penalizacion
+        conflictos[k] = conflicto
+        continuidades[k] = continuidad_genes(matriz[k], grupo, dia, periodo, dias, periodos, orden, cantidad, consecutivos)
+    return penalizaciones, conflictos, continuidades
+
+# Evaluacion de individuos con los nucleos sobre su representacion entera
+# Los cursos, salones, franjas y docentes deben tener su indice de la instancia (ver AmbienteAlgoritmo.internar_modelos)
+# Los contadores se reservan una sola vez y los nucleos los dejan en cero despues de cada individuo
+class EvaluadorAcelerado:
+    def __init__(self, cursos, salones, franjas, docentes):
+        grupos = {}
+        codigos = {}
+        self.grupo = np.array([grupos.setdefault((curso.carrera, curso.semestre), len(grupos)) for curso in cursos],
+                              dtype=np.int64)
+        self.codigo = np.array([codigos.setdefault(curso.codigo, len(codigos)) for curso in cursos], dtype=np.int64)
+        self.multiples = np.array([curso.sesiones > 1 for curso in cursos], dtype=np.bool_)
+        self.dia = np.array([franja.dia_indice for franja in franjas], dtype=np.int64)
+        self.periodo = np.array([franja.periodo for franja in franjas], dtype=np.int64)
+        self.disponible = np.array([[docente.esta_disponible(franja.hora) for franja in franjas] for docente in docentes],
+                                   dtype=np.bool_).reshape(len(docentes), len(franjas))
+        self.franjas = len(franjas)
+        self.dias = int(self.dia.max(initial=0)) + 1
+        self.periodos = int(self.periodo.max(initial=0)) + 1
+
+        self.cuenta_salon = np.zeros(max(1, len(salones) * self.franjas), dtype=np.int64)
+        self.cuenta_docente = np.zeros(max(1, len(docentes) * self.franjas), dtype=np.int64)
+        self.cuenta_grupo = np.zeros(max(1, len(grupos) * self.franjas), dtype=np.int64)
+        self.cuenta_sesion = np.zeros(max(1, len(codigos) * self.dias), dtype=np.int64)
+        self.orden = np.zeros(max(1, len(grupos) * self.dias), dtype=np.int64)
+        self.cantidad = np.zeros(max(1, len(grupos) * self.dias), dtype=np.int64)
+        self.consecutivos = np.zeros(max(1, len(grupos) * self.dias), dtype=np.int64)
+
+    # Matriz (individuos, cursos, 4), los genes quedan en el orden de cada diccionario
+    def codificar(self, poblacion) -> np.ndarray:
+        valores = []
+        for individuo in poblacion:
+            for curso, (salon, franja, docente) in individuo.items():
+                valores += (curso.indice, salon.indice, franja.indice, -1 if docente is None else docente.indice)
+        cursos = len(poblacion[0]) if poblacion else 0
+        return np.array(valores, dtype=np.int64).reshape(len(poblacion), cursos, 4)
+
+    # (penalizacion por choques, conflictos, continuidad) de cada individuo, como valores de Python
+    def evaluar(self, poblacion) -> list[tuple[int, int, float]]:
+        if not poblacion:
+            return []
+        return self.evaluar_matriz(self.codificar(poblacion))
+
+    def evaluar_matriz(self, matriz: np.ndarray) -> list[tuple[int, int, float]]:
+        penalizaciones, conflictos, continuidades = evaluar_genes(
+            matriz, self.grupo, self.codigo, self.multiples, self.dia, self.periodo, self.disponible,
+            self.franjas, self.dias, self.periodos, self.cuenta_salon, self.cuenta_docente, self.cuenta_grupo,
+            self.cuenta_sesion, self.orden, self.cantidad, self.consecutivos)
+        return list(zip(penalizaciones.tolist(), conflictos.tolist(), continuidades.tolist()))
@@ -0,0 +1,137 @@
+import csv
+import json
+import unicodedata
+from datetime import date, datetime, timedelta
+
+# Exportadores del horario final (Individuo) para otros sistemas
+# Escriben asignacion por asignacion, el documento completo nunca se arma en memoria
+
+DURACION_PERIODO = timedelta(minutes=50)
+
+COLUMNAS = [
+    "curso_codigo", "curso_nombre", "carrera", "semestre", "seccion", "sesion",
+    "salon_id", "salon_nombre", "dia", "hora_inicio", "hora_fin", "docente_registro", "docente_nombre",
+]
+
+# Dias que se reconocen por nombre para ubicar las franjas en el calendario (lunes = 0)
+DIAS_SEMANA = {
+    "lunes": 0, "martes": 1, "miercoles": 2, "jueves": 3, "viernes": 4, "sabado": 5, "domingo": 6,
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3, "friday": 4, "saturday": 5, "sunday": 6,
+}
+
+def hora_fin(hora: str) -> str:
+    return (datetime.strptime(hora, "%H:%M") + DURACION_PERIODO).strftime("%H:%M")
+
+# Una fila por asignacion, ordenadas por franja (dia y hora) y salon
+def filas_horario(horario: dict):
+    asignaciones = sorted(horario.items(),
+                          key=lambda item: (item[1][1].indice, str(item[1][0].id), str(item[0].codigo), item[0].sesion))
+    for curso, (salon, franja, docente) in asignaciones:
+        yield {
+            "curso_codigo": curso.codigo,
+            "curso_nombre": curso.nombre,
+            "carrera": curso.carrera,
+            "semestre": curso.semestre,
+            "seccion": curso.seccion,
+            "sesion": curso.sesion,
+            "salon_id": salon.id,
+            "salon_nombre": salon.nombre,
+            "dia": franja.dia,
+            "hora_inicio": franja.hora,
+            "hora_fin": hora_fin(franja.hora),
+            "docente_registro": docente.registro if docente is not None else None,
+            "docente_nombre": docente.nombre if docente is not None else None,
+        }
+
+def exportar_csv(horario: dict, archivo: str):
+    with open(archivo, "w", newline="", encoding="utf-8") as salida:
+        escritor = csv.DictWriter(salida, fieldnames=COLUMNAS)
+        escritor.writeheader()
+        for fila in filas_horario(horario):
+            escritor.writerow(fila)
+
+# Un arreglo JSON con un objeto por asignacion
+def exportar_json(horario: dict, archivo: str):
+    with open(archivo, "w", encoding="utf-8") as salida:
+        salida.write("[")
+        for i, fila in enumerate(filas_horario(horario)):
+            salida.write(",\n  " if i else "\n  ")
+            # los valores leidos por pandas pueden ser tipos de numpy
+            json.dump(fila, salida, ensure_ascii=False,
+                      default=lambda valor: valor.item() if hasattr(valor, "item") else str(valor))
+        salida.write("\n]\n")
+
+def escapar_ical(texto) -> str:
+    return (str(texto).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n"))
+
+# Las lineas de iCalendar no deben pasar de 75 octetos, las siguientes empiezan con un espacio
+def linea_ical(texto: str) -> str:
+    codificado = texto.encode("utf-8")
+    if len(codificado) <= 75:
+        return texto + "\r\n"
+    partes = []
+    limite = 75
+    while codificado:
+        corte = min(limite, len(codificado))
+        # no se corta a la mitad de un caracter UTF-8
+        while corte < len(codificado) and (codificado[corte] & 0xC0) == 0x80:
+            corte -= 1
+        partes.append(codificado[:corte].decode("utf-8"))
+        codificado = codificado[corte:]
+        limite = 74
+    return "\r\n ".join(partes) + "\r\n"
+
+# Fecha de cada dia de la semana a partir de 'fecha': los dias con nombre conocido (Lunes, Martes, ...)
+# caen en su siguiente ocurrencia, los demas se cuentan por su posicion en la semana
+def fechas_dias(horario: dict, fecha: date) -> dict:
+    fechas = {}
+    for _, franja, _ in horario.values():
+        if franja.dia in fechas:
+            continue
+        nombre = unicodedata.normalize("NFKD", str(franja.dia)).encode("ascii", "ignore").decode().strip().lower()
+        if nombre in DIAS_SEMANA:
+            fechas[franja.dia] = fecha + timedelta(days=(DIAS_SEMANA[nombre] - fecha.weekday()) % 7)
+        else:
+            fechas[franja.dia] = fecha + timedelta(days=max(franja.dia_indice, 0))
+    return fechas
+
+# Un evento por sesion en la semana que empieza en la fecha indicada (hoy por defecto)
+# repeticion es una regla RRULE opcional, por ejemplo "FREQ=WEEKLY" para repetir la semana
+def exportar_ical(horario: dict, archivo: str, fecha: date | None = None, repeticion: str | None = None):
+    fecha = fecha or date.today()
+    fechas = fechas_dias(horario, fecha)
+    marca = datetime.now().strftime("%Y%m%dT%H%M%S")
+    with open(archivo, "w", newline="", encoding="utf-8") as salida:
+        salida.write(linea_ical("BEGIN:VCALENDAR"))
+        salida.write(linea_ical("VERSION:2.0"))
+        salida.write(linea_ical("PRODID:-//Proyecto1IA1//Horarios//ES"))
+        for fila in filas_horario(horario):
+            inicio = datetime.combine(fechas[fila["dia"]], datetime.strptime(fila["hora_inicio"], "%H:%M").time())
+            descripcion = f"{fila['carrera']} - Semestre {fila['semestre']} - Seccion {fila['seccion']}"
+            if fila["docente_nombre"] is not None:
+                descripcion += f" - Docente: {fila['docente_nombre']}"
+            salida.write(linea_ical("BEGIN:VEVENT"))
+            salida.write(linea_ical(f"UID:{escapar_ical(fila['curso_codigo'])}-{fila['sesion']}-{inicio:%Y%m%dT%H%M}@horarios"))
+            salida.write(linea_ical(f"DTSTAMP:{marca}"))
+            salida.write(linea_ical(f"DTSTART:{inicio:%Y%m%dT%H%M%S}"))
+            salida.write(linea_ical(f"DTEND:{inicio + DURACION_PERIODO:%Y%m%dT%H%M%S}"))
+            if repeticion:
+                salida.write(linea_ical(f"RRULE:{repeticion}"))
+            salida.write(linea_ical(f"SUMMARY:{escapar_ical(fila['curso_nombre'])} ({escapar_ical(fila['curso_codigo'])})"))
+            salida.write(linea_ical(f"LOCATION:{escapar_ical(fila['salon_nombre'])}"))
+            salida.write(linea_ical(f"DESCRIPTION:{escapar_ical(descripcion)}"))
+            salida.write(linea_ical("END:VEVENT"))
+        salida.write(linea_ical("END:VCALENDAR"))
+
+FORMATOS_EXPORTACION = {
+    "csv": (exportar_csv, "CSV Files (*.csv)"),
+    "json": (exportar_json, "JSON Files (*.json)"),
+    "ical": (exportar_ical, "iCalendar Files (*.ics)"),
+}
+
+EXTENSIONES = {"csv": ".csv", "json": ".json", "ical": ".ics"}
+
+def exportar(horario: dict, formato: str, archivo: str):
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Formato de exportacion desconocido: {formato}")
+    FORMATOS_EXPORTACION[formato][0](horario, archivo)
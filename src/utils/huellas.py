@@ -0,0 +1,32 @@
+import random
+
+# Huellas de Zobrist de los individuos
+# Cada valor posible de cada componente de un gen (salon, franja y docente de un curso) recibe un numero
+# aleatorio de 64 bits y la huella de un individuo es el XOR de los numeros de sus genes
+# Cambiar un gen actualiza la huella en O(1) (ver cambiar) y dos individuos iguales tienen la misma huella,
+# con 64 bits la probabilidad de que dos individuos distintos coincidan es despreciable
+class TablaHuellas:
+    def __init__(self, cursos, salones, franjas, docentes, semilla=0):
+        # generador propio: construir la tabla no altera la secuencia aleatoria del algoritmo
+        generador = random.Random(semilla)
+        self.por_salon = [[generador.getrandbits(64) for _ in salones] for _ in cursos]
+        self.por_franja = [[generador.getrandbits(64) for _ in franjas] for _ in cursos]
+        # la posicion 0 corresponde a los cursos sin docente
+        self.por_docente = [[generador.getrandbits(64) for _ in range(len(docentes) + 1)] for _ in cursos]
+
+    # Numero del gen (salon, franja, docente) del curso
+    def gen(self, curso, asignacion) -> int:
+        salon, franja, docente = asignacion
+        i = curso.indice
+        return (self.por_salon[i][salon.indice] ^ self.por_franja[i][franja.indice]
+                ^ self.por_docente[i][docente.indice + 1 if docente is not None else 0])
+
+    def huella(self, individuo) -> int:
+        resultado = 0
+        for curso, asignacion in individuo.items():
+            resultado ^= self.gen(curso, asignacion)
+        return resultado
+
+    # Huella despues de reemplazar el gen anterior del curso por el nuevo
+    def cambiar(self, huella: int, curso, anterior, nuevo) -> int:
+        return huella ^ self.gen(curso, anterior) ^ self.gen(curso, nuevo)
@@ -0,0 +1,122 @@
+import os
+import sys
+import tracemalloc
+
+import psutil
+
+# resource no existe en Windows, ahi el pico lo da psutil (peak_wset)
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MB = 1024 * 1024
+# Carpeta src, los sitios de asignacion se limitan a los archivos del proyecto
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tamaño en bytes de una poblacion, los objetos compartidos (cursos, salones, docentes, horas)
+# se cuentan una sola vez
+def tamano_poblacion(poblacion) -> int:
+    vistos = set()
+    total = 0
+    pendientes = list(poblacion)
+    while pendientes:
+        objeto = pendientes.pop()
+        if id(objeto) in vistos:
+            continue
+        vistos.add(id(objeto))
+        total += sys.getsizeof(objeto)
+        if isinstance(objeto, dict):
+            pendientes.extend(objeto.keys())
+            pendientes.extend(objeto.values())
+        elif isinstance(objeto, (list, tuple)):
+            pendientes.extend(objeto)
+    return total
+
+# Pico de RSS del proceso desde que inicio en MB, None si el sistema no lo reporta
+# ru_maxrss esta en KiB en Linux y en bytes en macOS
+def pico_rss_proceso(proceso: psutil.Process) -> float | None:
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico / MB if sys.platform == "darwin" else pico / 1024
+    pico = getattr(proceso.memory_info(), "peak_wset", None)
+    return pico / MB if pico is not None else None
+
+# Registra el consumo de memoria durante una ejecucion del algoritmo
+# RSS del proceso (psutil) y memoria asignada por Python atribuida por linea (tracemalloc)
+# El pico de RSS es el del sistema si el proceso lo alcanzo durante la ejecucion, si no (el proceso ya
+# habia usado mas memoria antes) es el mayor de los valores medidos en cada generacion y pico_rss_muestreado es True
+# Si tracemalloc ya estaba activo (otra ejecucion u otro perfilador) no se reinicia su pico,
+# el pico asignado es entonces el mayor incremento medido en cada generacion respecto al inicio
+class MonitorMemoria:
+    def __init__(self, top_asignaciones: int = 10, solo_proyecto: bool = True):
+        self.top_asignaciones = top_asignaciones
+        self.solo_proyecto = solo_proyecto
+        self.proceso = psutil.Process(os.getpid())
+        self.por_generacion: list[dict] = []
+        self.pico_rss: float = 0
+        self.pico_rss_muestreado: bool = True
+        self.pico_proceso_inicial: float | None = None
+        self.pico_asignado: float = 0
+        self.asignado_inicial: int = 0
+        self.asignaciones_principales: list[str] = []
+        self.inicio_tracemalloc = False
+
+    def iniciar(self):
+        self.por_generacion = []
+        self.pico_rss = self.proceso.memory_info().rss / MB
+        self.pico_rss_muestreado = True
+        self.pico_proceso_inicial = pico_rss_proceso(self.proceso)
+        self.pico_asignado = 0
+        self.asignaciones_principales = []
+        # si alguien mas ya inicio tracemalloc no se detiene al final ni se reinicia su pico
+        self.inicio_tracemalloc = not tracemalloc.is_tracing()
+        if self.inicio_tracemalloc:
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+        self.asignado_inicial = tracemalloc.get_traced_memory()[0]
+
+    def registrar_generacion(self, generacion: int, poblacion) -> dict:
+        rss = self.proceso.memory_info().rss / MB
+        asignado, pico = tracemalloc.get_traced_memory()
+        if not self.inicio_tracemalloc:
+            asignado = max(0, asignado - self.asignado_inicial)
+            pico = asignado
+        registro = {
+            "generacion": generacion,
+            "rss": rss,
+            "asignado": asignado / MB,
+            "pico_asignado": pico / MB,
+            "poblacion": tamano_poblacion(poblacion) / MB,
+        }
+        self.pico_rss = max(self.pico_rss, rss)
+        self.pico_asignado = max(self.pico_asignado, pico / MB)
+        self.por_generacion.append(registro)
+        return registro
+
+    # Toma la instantanea de los sitios con mas memoria asignada y detiene el rastreo
+    def detener(self):
+        if tracemalloc.is_tracing():
+            filtros = [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ]
+            if self.solo_proyecto:
+                # la interfaz (matplotlib, Qt) tambien asigna memoria mientras corre el algoritmo
+                filtros.append(tracemalloc.Filter(True, os.path.join(RAIZ_PROYECTO, "*")))
+            instantanea = tracemalloc.take_snapshot().filter_traces(filtros)
+            estadisticas = instantanea.statistics("lineno")[:self.top_asignaciones]
+            self.asignaciones_principales = [
+                f"{stat.traceback[0].filename}:{stat.traceback[0].lineno} "
+                f"{stat.size / 1024:.1f} KiB en {stat.count} bloques"
+                for stat in estadisticas
+            ]
+            if self.inicio_tracemalloc:
+                tracemalloc.stop()
+        self.pico_rss = max(self.pico_rss, self.proceso.memory_info().rss / MB)
+        pico_proceso = pico_rss_proceso(self.proceso)
+        if pico_proceso is not None and self.pico_proceso_inicial is not None \
+                and pico_proceso > self.pico_proceso_inicial:
+            # el sistema actualiza ru_maxrss con retraso, puede quedar un poco debajo de la ultima medicion
+            self.pico_rss = max(self.pico_rss, pico_proceso)
+            self.pico_rss_muestreado = False
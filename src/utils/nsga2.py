@@ -0,0 +1,72 @@
+# Herramientas del modo multiobjetivo (NSGA-II)
+# Los objetivos de cada individuo son una tupla de valores a minimizar, por ejemplo (conflictos, 100 - continuidad)
+
+# a domina a b si no es peor en ningun objetivo y es mejor en al menos uno
+def domina(a: tuple, b: tuple) -> bool:
+    mejor_en_alguno = False
+    for valor_a, valor_b in zip(a, b):
+        if valor_a > valor_b:
+            return False
+        if valor_a < valor_b:
+            mejor_en_alguno = True
+    return mejor_en_alguno
+
+# Ordenamiento rapido no dominado (Deb et al.)
+# Devuelve los frentes como listas de indices, el primero es el frente de Pareto
+# Cada par se compara una sola vez: O(M N^2) comparaciones
+def ordenamiento_no_dominado(objetivos: list[tuple]) -> list[list[int]]:
+    n = len(objetivos)
+    dominados_por = [[] for _ in range(n)]
+    contador_dominancia = [0] * n
+    for i in range(n):
+        for j in range(i + 1, n):
+            if domina(objetivos[i], objetivos[j]):
+                dominados_por[i].append(j)
+                contador_dominancia[j] += 1
+            elif domina(objetivos[j], objetivos[i]):
+                dominados_por[j].append(i)
+                contador_dominancia[i] += 1
+
+    frentes = [[i for i in range(n) if contador_dominancia[i] == 0]]
+    while frentes[-1]:
+        siguiente = []
+        for i in frentes[-1]:
+            for j in dominados_por[i]:
+                contador_dominancia[j] -= 1
+                if contador_dominancia[j] == 0:
+                    siguiente.append(j)
+        frentes.append(siguiente)
+    frentes.pop()
+    return frentes
+
+# Distancia de aglomeracion de los individuos de un frente, los extremos de cada objetivo reciben infinito
+def distancia_aglomeracion(objetivos: list[tuple], frente: list[int]) -> dict[int, float]:
+    distancias = {i: 0.0 for i in frente}
+    if len(frente) <= 2:
+        return {i: float("inf") for i in frente}
+    for m in range(len(objetivos[frente[0]])):
+        ordenados = sorted(frente, key=lambda i: objetivos[i][m])
+        minimo, maximo = objetivos[ordenados[0]][m], objetivos[ordenados[-1]][m]
+        distancias[ordenados[0]] = distancias[ordenados[-1]] = float("inf")
+        if maximo == minimo:
+            continue
+        for k in range(1, len(ordenados) - 1):
+            distancias[ordenados[k]] += (objetivos[ordenados[k + 1]][m] - objetivos[ordenados[k - 1]][m]) / (maximo - minimo)
+    return distancias
+
+# Seleccion ambiental: se llenan 'tamano' lugares frente por frente
+# el ultimo frente que no cabe completo se corta por mayor distancia de aglomeracion
+# Devuelve los indices conservados y para cada uno la clave (rango, -distancia), menor es mejor
+def reducir_poblacion(objetivos: list[tuple], tamano: int) -> tuple[list[int], dict[int, tuple[int, float]]]:
+    conservados = []
+    claves = {}
+    for rango, frente in enumerate(ordenamiento_no_dominado(objetivos)):
+        if len(conservados) >= tamano:
+            break
+        distancias = distancia_aglomeracion(objetivos, frente)
+        if len(conservados) + len(frente) > tamano:
+            frente = sorted(frente, key=lambda i: -distancias[i])[:tamano - len(conservados)]
+        for i in frente:
+            conservados.append(i)
+            claves[i] = (rango, -distancias[i])
+    return conservados, claves
@@ -0,0 +1,92 @@
+import math
+import random
+
+# Operadores de variacion entre los que se reparte el trabajo
+OPERADORES_CRUZA = ("punto_medio", "uniforme")
+OPERADORES_MUTACION = ("aleatoria", "reparadora", "dirigida")
+
+# Como se elige el operador de cada hijo
+# "generacion" es el calendario fijo de cruza_adaptativa y mutacion_adaptativa (o la mutacion dirigida),
+# los otros se adaptan al credito que cada operador gana en la instancia actual
+SELECCION_OPERADORES = {
+    "generacion": "Segun la Generacion",
+    "probabilidad": "Emparejamiento de Probabilidad",
+    "bandido": "Bandido Multibrazo (UCB)",
+}
+
+# Credito de un grupo de operadores (las cruzas o las mutaciones)
+# Cada hijo evaluado registra si mejoro al mejor de sus padres y cuantas evaluaciones costo, la recompensa
+# es exito / evaluaciones (la mutacion reparadora gasta varias por hijo). Al final de cada generacion
+# la calidad de cada operador se mueve hacia su recompensa promedio (promedio exponencial con 'adaptacion'),
+# asi un operador que deja de funcionar a mitad de la ejecucion pierde su parte en pocas generaciones
+#   probabilidad: cada operador se elige con probabilidad proporcional a su calidad, nunca menos de prob_minima
+#   bandido: UCB1, el de mayor calidad + exploracion * sqrt(2 ln(usos totales) / usos del operador)
+class SelectorOperadores:
+    def __init__(self, operadores, metodo: str = "probabilidad", prob_minima: float = 0.05,
+                 adaptacion: float = 0.3, exploracion: float = 0.3, rng=random):
+        self.operadores = list(operadores)
+        self.rng = rng
+        self.metodo = metodo
+        self.prob_minima = min(prob_minima, 1 / len(self.operadores))
+        self.adaptacion = adaptacion
+        self.exploracion = exploracion
+        self.calidad = {operador: 1.0 for operador in self.operadores}
+        self.probabilidades = [1 / len(self.operadores)] * len(self.operadores)
+        self.usos = dict.fromkeys(self.operadores, 0)
+        self.evaluados = dict.fromkeys(self.operadores, 0)
+        self.exitos = dict.fromkeys(self.operadores, 0)
+        self.evaluaciones = dict.fromkeys(self.operadores, 0)
+        # recompensas de la generacion en curso: operador -> [suma, cantidad]
+        self.pendientes = {}
+
+    def elegir(self) -> str:
+        if self.metodo == "bandido":
+            operador = self.elegir_ucb()
+        else:
+            operador = self.rng.choices(self.operadores, self.probabilidades)[0]
+        self.usar(operador)
+        return operador
+
+    def elegir_ucb(self) -> str:
+        sin_usar = [operador for operador in self.operadores if self.usos[operador] == 0]
+        if sin_usar:
+            return self.rng.choice(sin_usar)
+        total = math.log(sum(self.usos.values()))
+        return max(self.operadores, key=lambda operador: self.calidad[operador]
+                   + self.exploracion * math.sqrt(2 * total / self.usos[operador]))
+
+    # Cuenta un hijo producido con el operador (tambien cuando lo eligio el calendario fijo)
+    def usar(self, operador: str, cantidad: int = 1):
+        self.usos[operador] += cantidad
+
+    def registrar(self, operador: str, exito: bool, evaluaciones: int = 1):
+        self.evaluados[operador] += 1
+        self.exitos[operador] += int(exito)
+        self.evaluaciones[operador] += evaluaciones
+        pendiente = self.pendientes.setdefault(operador, [0.0, 0])
+        pendiente[0] += int(exito) / max(1, evaluaciones)
+        pendiente[1] += 1
+
+    # Se llama una vez por generacion, los operadores sin hijos evaluados conservan su calidad
+    def actualizar(self):
+        for operador, (suma, cantidad) in self.pendientes.items():
+            self.calidad[operador] += self.adaptacion * (suma / cantidad - self.calidad[operador])
+        self.pendientes = {}
+        total = sum(self.calidad.values())
+        libre = 1 - self.prob_minima * len(self.operadores)
+        self.probabilidades = [self.prob_minima + libre * (self.calidad[operador] / total if total > 0
+                                                           else 1 / len(self.operadores))
+                               for operador in self.operadores]
+
+    # Resumen por operador para el reporte de la ejecucion
+    def estadisticas(self) -> dict[str, dict]:
+        usos_totales = sum(self.usos.values())
+        return {operador: {
+            "usos": self.usos[operador],
+            "participacion": self.usos[operador] / usos_totales if usos_totales else 0,
+            "evaluados": self.evaluados[operador],
+            "exitos": self.exitos[operador],
+            "tasa_exito": self.exitos[operador] / self.evaluados[operador] if self.evaluados[operador] else 0,
+            "evaluaciones": self.evaluaciones[operador],
+            "calidad": self.calidad[operador],
+        } for operador in self.operadores}
@@ -27,19 +27,25 @@ def break_text(text, max_chars=10):
         lines.append(current_line)
     return "<br/>".join(lines)
 
-def crear_horarios_pdf(cursos):
+def crear_horarios_pdf(cursos, output_dir="reports", franjas=None):
     """
-    Genera un reporte en PDF del horario, donde las columnas representan los salones
-    y las filas representan los horarios. El parámetro 'individuo' es un diccionario:
-      dict[Curso, tuple[Salon, str, Docente|None]]
+    Genera un reporte en PDF del horario, una tabla por dia donde las columnas representan
+    los salones y las filas representan los periodos. El parámetro 'individuo' es un diccionario:
+      dict[Curso, tuple[Salon, Franja, Docente|None]]
+    franjas es la lista de franjas de la instancia, si no se indica se usan las del horario.
+    El archivo se escribe en output_dir (por defecto la carpeta reports).
     Retorna el path del archivo PDF generado.
     """
-    horarios = ["13:40", "14:30", "15:20", "16:10", "17:00", "17:50", "18:40", "19:30", "20:20"]
+    if franjas is None:
+        franjas = sorted({asignacion[1] for asignacion in cursos.values()}, key=lambda f: f.indice)
 
     salones_set = set()
-    for asignacion in cursos.values():
-        salon = asignacion[0]
-        salones_set.add(salon)
+    # cursos de cada (franja, salon), se agrupan una sola vez en lugar de recorrer el horario por celda
+    por_celda = {}
+    for curso, asignacion in cursos.items():
+        salon_asignado, franja_asignada, _ = asignacion
+        salones_set.add(salon_asignado)
+        por_celda.setdefault((franja_asignada, salon_asignado), []).append((curso, asignacion[2]))
     salones_list = sorted(list(salones_set), key=lambda x: x.id if hasattr(x, "id") else x.nombre)
 
     # Estilos para la tabla
@@ -47,33 +53,32 @@ def crear_horarios_pdf(cursos):
     cell_style = styles['Normal']
     cell_style.fontSize = 6
 
-    data = []
-    header = [Paragraph("", cell_style)]
-    for salon in salones_list:
-        header.append(Paragraph(salon.nombre, cell_style))
-    data.append(header)
-
-
-    for hora in horarios:
-        hora_inicial = datetime.strptime(hora, "%H:%M")
+    # Una tabla por dia en el orden de la semana
+    tablas = {}
+    for franja in franjas:
+        if franja.dia not in tablas:
+            header = [Paragraph("", cell_style)]
+            for salon in salones_list:
+                header.append(Paragraph(salon.nombre, cell_style))
+            tablas[franja.dia] = [header]
+        data = tablas[franja.dia]
+        hora_inicial = datetime.strptime(franja.hora, "%H:%M")
         hora_final = (hora_inicial + timedelta(minutes=50)).strftime('%H:%M')
         hora_inicial = hora_inicial.strftime('%H:%M')
         row = [Paragraph(f"{hora_inicial} - {hora_final}", cell_style)]
         for salon in salones_list:
             cell_texts = []
-            for curso, asignacion in cursos.items():
-                salon_asignado, hora_asignada, docente = asignacion
-                if hora_asignada == hora and salon_asignado == salon:
-                    cell_texts.append(f"{curso.nombre}")
+            for curso, docente in por_celda.get((franja, salon), []):
+                cell_texts.append(f"{curso.nombre}")
+                if docente is not None:
                     cell_texts.append(f"{docente.nombre}")
-                    cell_texts.append(f"(S:{curso.semestre})")
-                    cell_texts.append(f"(C:{curso.carrera})")
+                cell_texts.append(f"(S:{curso.semestre})")
+                cell_texts.append(f"(C:{curso.carrera})")
             contenido = "\n".join(cell_texts) if cell_texts else ""
             paragraph = Paragraph(contenido, cell_style)
             row.append(paragraph)
         data.append(row)
 
-    output_dir = "reports"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     pdf_path = os.path.join(output_dir, "reporte_horarios.pdf")
@@ -86,10 +91,8 @@ def crear_horarios_pdf(cursos):
     elements.append(Spacer(1, 6))
 
     col_width = 60
-    num_cols = len(data[0])
+    num_cols = len(salones_list) + 1
     colWidths = [col_width] * num_cols
-
-    table = Table(data, colWidths=colWidths)
     table_style = TableStyle([
         ('BACKGROUND', (0,0), (-1,0), colors.grey),
         ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
@@ -98,8 +101,15 @@ def crear_horarios_pdf(cursos):
         ('BOTTOMPADDING', (0,0), (-1,0), 12),
         ('GRID', (0,0), (-1,-1), 1, colors.black)
     ])
-    table.setStyle(table_style)
-    elements.append(table)
+
+    for dia, data in tablas.items():
+        # con un solo dia se mantiene el reporte de una sola tabla sin encabezado de dia
+        if len(tablas) > 1:
+            elements.append(Paragraph(str(dia), styles['Heading2']))
+        table = Table(data, colWidths=colWidths)
+        table.setStyle(table_style)
+        elements.append(table)
+        elements.append(Spacer(1, 12))
 
     doc.build(elements)
     return pdf_path
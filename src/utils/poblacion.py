@@ -0,0 +1,88 @@
+import heapq
+import itertools
+
+# Poblacion del estado estacionario con reemplazo del peor en O(log n)
+# Cada entrada tiene el mismo formato que evaluar_poblacion: (costo, conflictos, individuo, continuidad)
+# Las entradas ocupan posiciones fijas: un reemplazo escribe la entrada nueva en la posicion de la quitada, asi la
+# matriz codificada de la variacion por lotes solo cambia en esa fila (ver AmbienteAlgoritmo.reemplazar_fila)
+# El peor sale de un heap de (-costo, -orden, posicion); las claves de las entradas reemplazadas se quedan en el heap
+# y se descartan al llegar a la cima (borrado perezoso), el heap se reconstruye cuando dobla a la poblacion
+# El mejor se actualiza al reemplazar: un hijo solo entra si mejora al miembro que sustituye
+# Los costos se calcularon con peso_continuidad, al cambiar el peso se ajustan con reponderar
+class PoblacionOrdenada:
+    def __init__(self, entradas=None, peso_continuidad: float = 0):
+        self.entradas: list[tuple] = list(entradas or [])
+        self.peso_continuidad = peso_continuidad
+        # orden de insercion de cada entrada, entre costos iguales sale primero la mas reciente
+        self.contador = itertools.count()
+        self.ordenes: list[int] = []
+        self.heap: list[tuple[float, int, int]] = []
+        self.posicion_mejor = 0
+        self.reconstruir()
+
+    def reconstruir(self):
+        self.ordenes = [next(self.contador) for _ in self.entradas]
+        self.construir_heap()
+        self.posicion_mejor = min(range(len(self.entradas)), key=lambda posicion: self.entradas[posicion][0], default=0)
+
+    def construir_heap(self):
+        self.heap = [(-entrada[0], -orden, posicion)
+                     for posicion, (entrada, orden) in enumerate(zip(self.entradas, self.ordenes))]
+        heapq.heapify(self.heap)
+
+    # El costo suma peso * (100 - continuidad) / 100 (ver AmbienteAlgoritmo.combinar_costo), al cambiar el peso
+    # se ajusta cada costo sin reevaluar, asi los hijos se comparan en la misma escala que los miembros
+    # Las entradas conservan su posicion
+    def reponderar(self, peso_continuidad: float):
+        if peso_continuidad == self.peso_continuidad:
+            return
+        diferencia = peso_continuidad - self.peso_continuidad
+        for posicion, (costo, conflictos, individuo, continuidad) in enumerate(self.entradas):
+            self.entradas[posicion] = (costo + diferencia * (100 - continuidad) / 100, conflictos, individuo, continuidad)
+        self.peso_continuidad = peso_continuidad
+        self.reconstruir()
+
+    # Posicion del miembro de mayor costo
+    def posicion_peor(self) -> int:
+        while -self.heap[0][1] != self.ordenes[self.heap[0][2]]:
+            heapq.heappop(self.heap)
+        return self.heap[0][2]
+
+    # Torneo inverso: la posicion de mayor costo entre 'tamano' miembros al azar, nunca la del mejor
+    def posicion_torneo(self, tamano: int, rng) -> int:
+        if len(self.entradas) < 2:
+            return self.posicion_peor()
+        candidatos = [posicion + (posicion >= self.posicion_mejor)
+                      for posicion in rng.sample(range(len(self.entradas) - 1), min(tamano, len(self.entradas) - 1))]
+        return max(candidatos, key=lambda posicion: self.entradas[posicion][0])
+
+    # Escribe la entrada en la posicion y devuelve la que estaba
+    def reemplazar(self, posicion: int, entrada: tuple) -> tuple:
+        quitada = self.entradas[posicion]
+        self.entradas[posicion] = entrada
+        self.ordenes[posicion] = next(self.contador)
+        heapq.heappush(self.heap, (-entrada[0], -self.ordenes[posicion], posicion))
+        if posicion == self.posicion_mejor or entrada[0] < self.entradas[self.posicion_mejor][0]:
+            self.posicion_mejor = posicion
+        if len(self.heap) > 2 * len(self.entradas):
+            self.construir_heap()
+        return quitada
+
+    def mejor(self) -> tuple:
+        return self.entradas[self.posicion_mejor]
+
+    def peor(self) -> tuple:
+        return self.entradas[self.posicion_peor()]
+
+    # Entradas de mejor a peor, una vez por generacion
+    def ordenadas(self) -> list[tuple]:
+        return sorted(self.entradas, key=lambda entrada: entrada[0])
+
+    def individuos(self) -> list:
+        return [entrada[2] for entrada in self.entradas]
+
+    def __len__(self) -> int:
+        return len(self.entradas)
+
+    def __getitem__(self, posicion):
+        return self.entradas[posicion]
@@ -0,0 +1,61 @@
+import bisect
+import itertools
+import math
+import random
+
+# Operadores de seleccion que trabajan sobre los costos ya calculados por evaluar_poblacion
+# Reciben la lista de costos (menor es mejor) y devuelven los indices de los padres elegidos,
+# todos los de una generacion en una sola llamada. Ninguno vuelve a llamar a funcion_costo
+# rng es el generador de la ejecucion (AmbienteAlgoritmo.rng), por defecto el modulo random
+
+# Torneo: cada padre es el de menor costo entre 'tamano' candidatos al azar
+def seleccion_torneo(costos: list[float], cantidad: int, tamano: int = 3, rng=random) -> list[int]:
+    n = len(costos)
+    tamano = max(1, min(tamano, n))
+    indices = range(n)
+    return [min(rng.sample(indices, tamano), key=costos.__getitem__) for _ in range(cantidad)]
+
+# Seleccion por rango lineal: la probabilidad depende solo de la posicion, no de la magnitud del costo
+# presion (entre 1 y 2) es cuantas veces mas probable es elegir al mejor que al promedio
+# Cada eleccion es O(1): se invierte la distribucion acumulada F(x) = presion*x - (presion-1)*x^2
+def seleccion_rango(costos: list[float], cantidad: int, presion: float = 1.5, rng=random) -> list[int]:
+    n = len(costos)
+    orden = sorted(range(n), key=costos.__getitem__)
+    presion = min(max(presion, 1.0), 2.0)
+    if presion == 1.0:
+        return [orden[rng.randrange(n)] for _ in range(cantidad)]
+    a = presion - 1
+    seleccionados = []
+    for _ in range(cantidad):
+        u = rng.random()
+        x = (presion - math.sqrt(presion * presion - 4 * a * u)) / (2 * a)
+        seleccionados.append(orden[min(int(x * n), n - 1)])
+    return seleccionados
+
+# Muestreo universal estocastico: una sola ruleta con 'cantidad' punteros equidistantes
+# Usa la misma aptitud que se muestra en la bitacora, 1 / (1 + penalizacion)
+def seleccion_universal(costos: list[float], cantidad: int, rng=random) -> list[int]:
+    acumulada = list(itertools.accumulate(1 / (1 + max(costo, 0)) for costo in costos))
+    paso = acumulada[-1] / cantidad
+    inicio = rng.random() * paso
+    ultimo = len(costos) - 1
+    seleccionados = [min(bisect.bisect_right(acumulada, inicio + i * paso), ultimo) for i in range(cantidad)]
+    # los punteros salen en orden, se mezclan para que las parejas no sean siempre vecinos
+    rng.shuffle(seleccionados)
+    return seleccionados
+
+METODOS_SELECCION = {
+    "torneo": "Torneo",
+    "rango": "Rango Lineal",
+    "universal": "Muestreo Universal Estocastico",
+}
+
+def seleccionar_padres(metodo: str, costos: list[float], cantidad: int,
+                       tamano_torneo: int = 3, presion: float = 1.5, rng=random) -> list[int]:
+    if metodo == "torneo":
+        return seleccion_torneo(costos, cantidad, tamano_torneo, rng)
+    if metodo == "rango":
+        return seleccion_rango(costos, cantidad, presion, rng)
+    if metodo == "universal":
+        return seleccion_universal(costos, cantidad, rng)
+    raise ValueError(f"Metodo de seleccion desconocido: {metodo}")
@@ -0,0 +1,454 @@
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+import traceback
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from models import Curso, Docente, DocenteCurso, Franja, Salon
+from utils.data_handler import (asignaciones_solucion, cargar_cursos, cargar_docentes, cargar_franjas,
+                                cargar_relaciones, cargar_salones)
+from utils.solvers import PARAMETROS_POR_DEFECTO, SOLVERS, crear_solver
+
+# Servicio local para ejecutar el algoritmo sin la interfaz
+# Los trabajos (datos + parametros) se encolan y se ejecutan en procesos separados,
+# como maximo 'max_procesos' a la vez. El progreso de cada generacion llega por una cola compartida
+# Los trabajos terminados se conservan hasta que se eliminan, pasan 'ttl_terminados' segundos desde su fin
+# o hay mas de 'max_terminados' (se descartan los mas antiguos), junto con su carpeta de resultados
+
+EN_COLA, EJECUTANDO, COMPLETADO, CANCELADO, ERROR = "en_cola", "ejecutando", "completado", "cancelado", "error"
+TERMINADOS = (COMPLETADO, CANCELADO, ERROR)
+# Segundos minimos entre dos envios de la mejor solucion parcial de un trabajo
+INTERVALO_MEJOR_PARCIAL = 1.0
+
+# Construye los modelos de un trabajo
+# datos es {"directorio": carpeta con los CSV} o las listas de registros con las mismas columnas que los CSV
+def cargar_datos(datos: dict) -> dict:
+    if "directorio" in datos:
+        directorio = datos["directorio"]
+        return {
+            "cursos": cargar_cursos(os.path.join(directorio, "cursos.csv")),
+            "salones": cargar_salones(os.path.join(directorio, "salones.csv")),
+            "docentes": cargar_docentes(os.path.join(directorio, "docentes.csv")),
+            "relaciones": cargar_relaciones(os.path.join(directorio, "relaciones_docente_curso.csv")),
+            "franjas": cargar_franjas(os.path.join(directorio, "franjas.csv")),
+        }
+    return {
+        "cursos": [Curso(r["nombre"], r["codigo"], r["carrera"], r["semestre"], r["seccion"], r["tipo"],
+                         r.get("sesiones", 1), r.get("inscritos"), r.get("tipo_salon"))
+                   for r in datos["cursos"]],
+        "salones": [Salon(id=r["id"], nombre=r["nombre"], capacidad=r.get("capacidad"), tipo=r.get("tipo"))
+                    for r in datos["salones"]],
+        "docentes": [Docente(r["nombre"], r["registro"], r["hora_entrada"], r["hora_salida"])
+                     for r in datos["docentes"]],
+        "relaciones": [DocenteCurso(registro_docente=r["registro"], codigo_curso=r["codigo"])
+                       for r in datos["relaciones"]],
+        # sin franjas se usa un solo dia con las horas por defecto
+        "franjas": [Franja(r["dia"], r["hora"]) for r in datos["franjas"]] if datos.get("franjas") else None,
+    }
+
+# Se ejecuta en el proceso hijo, todo lo que se reporta pasa por la cola como (id, tipo, datos)
+def ejecutar_trabajo(id_trabajo: str, datos: dict, motor: str, generaciones: int, parametros: dict,
+                     solucion_previa, directorio: str, cola):
+    try:
+        solver = crear_solver(motor)
+        ambiente = solver.cargar_instancia(**cargar_datos(datos))
+        ambiente.directorio_reportes = directorio
+        ambiente.callback_log = lambda mensaje: None
+        enviada = {"generacion": None, "momento": 0}
+
+        # ademas del progreso se envia la mejor solucion hasta ahora cuando cambia, a lo mas una vez por intervalo
+        def reportar_generacion(metricas):
+            cola.put((id_trabajo, "progreso", metricas))
+            if time.time() - enviada["momento"] < INTERVALO_MEJOR_PARCIAL:
+                return
+            mejor = ambiente.mejor_hasta_ahora()
+            if mejor is None or mejor["generacion"] == enviada["generacion"]:
+                return
+            enviada.update(generacion=mejor["generacion"], momento=time.time())
+            horario = mejor.pop("horario")
+            cola.put((id_trabajo, "mejor", {**mejor, "asignaciones": asignaciones_solucion(horario)}))
+
+        ambiente.callback_generacion = reportar_generacion
+        if solucion_previa is not None:
+            ambiente.preparar_reprogramacion(solucion_previa, parametros.pop("peso_desviacion", 0))
+        solver.resolver(generaciones, parametros)
+
+        cola.put((id_trabajo, "resultado", {
+            "conflictos": ambiente.conflictos_mejor_individuo,
+            "continuidad": ambiente.porcentaje_continuidad,
+            "iteraciones": ambiente.iteraciones_optimas,
+            "evaluaciones": ambiente.evaluaciones,
+            "motivo_terminacion": ambiente.motivo_terminacion,
+            "tiempo": ambiente.tiempo_ejecucion,
+            "memoria_pico": ambiente.memoria_pico,
+            "cursos_modificados": ambiente.cursos_modificados,
+            "semilla": ambiente.semilla,
+            "frente_pareto": [{clave: valor for clave, valor in solucion.items() if clave != "individuo"}
+                              for solucion in ambiente.frente_pareto],
+            "asignaciones": asignaciones_solucion(ambiente.resultado),
+            "reporte_horarios_pdf": ambiente.reporte_horarios_pdf,
+        }))
+    except Exception:
+        cola.put((id_trabajo, "error", traceback.format_exc()))
+
+class Trabajo:
+    def __init__(self, id_trabajo: str, motor: str, generaciones: int, parametros: dict, datos: dict,
+                 solucion_previa, directorio: str):
+        self.id = id_trabajo
+        self.motor = motor
+        self.generaciones = generaciones
+        self.parametros = parametros
+        self.datos = datos
+        self.solucion_previa = solucion_previa
+        self.directorio = directorio
+        self.estado = EN_COLA
+        self.progreso: list[dict] = []
+        self.resultado: dict | None = None
+        # mejor solucion enviada mientras el trabajo se ejecuta (ver ejecutar_trabajo)
+        self.mejor_parcial: dict | None = None
+        self.error: str | None = None
+        self.proceso = None
+        self.creado = time.time()
+        self.inicio: float | None = None
+        self.fin: float | None = None
+
+    def resumen(self, con_resultado: bool = False) -> dict:
+        resumen = {
+            "id": self.id,
+            "estado": self.estado,
+            "motor": self.motor,
+            "generaciones": self.generaciones,
+            "generaciones_completadas": len(self.progreso),
+            "ultima_generacion": self.progreso[-1] if self.progreso else None,
+            "creado": self.creado,
+            "inicio": self.inicio,
+            "fin": self.fin,
+        }
+        if self.error is not None:
+            resumen["error"] = self.error
+        if con_resultado and self.resultado is not None:
+            resumen["resultado"] = {clave: valor for clave, valor in self.resultado.items() if clave != "asignaciones"}
+        return resumen
+
+# Cola de trabajos con un limite de procesos en ejecucion
+class GestorTrabajos:
+    def __init__(self, max_procesos: int = 2, max_cola: int = 100, directorio_base: str = "trabajos",
+                 max_terminados: int = 100, ttl_terminados: float | None = 24 * 3600):
+        self.max_procesos = max(1, max_procesos)
+        self.max_cola = max_cola
+        self.directorio_base = directorio_base
+        self.max_terminados = max(0, max_terminados)
+        self.ttl_terminados = ttl_terminados
+        # spawn: el proceso hijo no hereda los hilos del servidor
+        self.contexto = multiprocessing.get_context("spawn")
+        self.cola_mensajes = self.contexto.Queue()
+        self.trabajos: dict[str, Trabajo] = {}
+        self.pendientes: deque[str] = deque()
+        self.en_ejecucion: set[str] = set()
+        self.condicion = threading.Condition()
+        self.contador = itertools.count(1)
+        self.activo = True
+        self.hilos = [
+            threading.Thread(target=self.despachar, daemon=True),
+            threading.Thread(target=self.recibir_mensajes, daemon=True),
+        ]
+        for hilo in self.hilos:
+            hilo.start()
+
+    def enviar(self, solicitud: dict) -> Trabajo:
+        motor = solicitud.get("motor", "genetico")
+        if motor not in SOLVERS:
+            raise ValueError(f"Motor de optimizacion desconocido: {motor}")
+        if "datos" not in solicitud:
+            raise ValueError("La solicitud no incluye datos")
+        generaciones = int(solicitud.get("generaciones", 100))
+        parametros = {**PARAMETROS_POR_DEFECTO, **solicitud.get("parametros", {})}
+
+        with self.condicion:
+            if len(self.pendientes) >= self.max_cola:
+                raise OverflowError("La cola de trabajos esta llena")
+            id_trabajo = f"{next(self.contador):05d}"
+            directorio = os.path.abspath(os.path.join(self.directorio_base, id_trabajo))
+            trabajo = Trabajo(id_trabajo, motor, generaciones, parametros, solicitud["datos"],
+                              solicitud.get("solucion_previa"), directorio)
+            self.trabajos[id_trabajo] = trabajo
+            self.pendientes.append(id_trabajo)
+            self.condicion.notify_all()
+        return trabajo
+
+    def obtener(self, id_trabajo: str) -> Trabajo | None:
+        return self.trabajos.get(id_trabajo)
+
+    def cancelar(self, id_trabajo: str) -> bool:
+        with self.condicion:
+            trabajo = self.trabajos.get(id_trabajo)
+            if trabajo is None or trabajo.estado in TERMINADOS:
+                return False
+            if trabajo.estado == EN_COLA:
+                self.pendientes.remove(id_trabajo)
+            elif trabajo.proceso is not None:
+                trabajo.proceso.terminate()
+            self.terminar(trabajo, CANCELADO)
+            return True
+
+    # Elimina un trabajo terminado y su carpeta, los que siguen en cola o ejecutandose se cancelan antes
+    def eliminar(self, id_trabajo: str) -> bool:
+        with self.condicion:
+            trabajo = self.trabajos.get(id_trabajo)
+            if trabajo is None or trabajo.estado not in TERMINADOS:
+                return False
+            self.descartar(trabajo)
+            return True
+
+    # Se llama con la condicion tomada
+    def descartar(self, trabajo: Trabajo):
+        del self.trabajos[trabajo.id]
+        shutil.rmtree(trabajo.directorio, ignore_errors=True)
+
+    # Retencion de los trabajos terminados: los vencidos por ttl_terminados y los que excedan max_terminados
+    # (primero los que terminaron antes). Se llama con la condicion tomada
+    def depurar_terminados(self):
+        terminados = sorted((trabajo for trabajo in self.trabajos.values() if trabajo.estado in TERMINADOS),
+                            key=lambda trabajo: trabajo.fin)
+        vencidos = len(terminados) - self.max_terminados
+        if self.ttl_terminados is not None:
+            limite = time.time() - self.ttl_terminados
+            vencidos = max(vencidos, sum(1 for trabajo in terminados if trabajo.fin < limite))
+        for trabajo in terminados[:max(0, vencidos)]:
+            self.descartar(trabajo)
+
+    # Se llama con la condicion tomada
+    def terminar(self, trabajo: Trabajo, estado: str):
+        trabajo.estado = estado
+        trabajo.fin = time.time()
+        trabajo.datos = None
+        self.en_ejecucion.discard(trabajo.id)
+        self.depurar_terminados()
+        self.condicion.notify_all()
+
+    # Inicia los trabajos en cola mientras haya lugar
+    def despachar(self):
+        while True:
+            with self.condicion:
+                while self.activo and (not self.pendientes or len(self.en_ejecucion) >= self.max_procesos):
+                    self.condicion.wait(timeout=1)
+                    self.revisar_procesos()
+                    if self.ttl_terminados is not None:
+                        self.depurar_terminados()
+                if not self.activo:
+                    return
+                trabajo = self.trabajos[self.pendientes.popleft()]
+                os.makedirs(trabajo.directorio, exist_ok=True)
+                trabajo.proceso = self.contexto.Process(
+                    target=ejecutar_trabajo,
+                    args=(trabajo.id, trabajo.datos, trabajo.motor, trabajo.generaciones, dict(trabajo.parametros),
+                          trabajo.solucion_previa, trabajo.directorio, self.cola_mensajes),
+                    daemon=True)
+                trabajo.proceso.start()
+                trabajo.estado = EJECUTANDO
+                trabajo.inicio = time.time()
+                self.en_ejecucion.add(trabajo.id)
+
+    # Un proceso que termina sin reportar (por ejemplo por falta de memoria) se marca como error
+    # Se llama con la condicion tomada
+    def revisar_procesos(self):
+        for id_trabajo in list(self.en_ejecucion):
+            trabajo = self.trabajos[id_trabajo]
+            if trabajo.proceso is not None and not trabajo.proceso.is_alive() and trabajo.proceso.exitcode != 0:
+                trabajo.error = f"El proceso termino con codigo {trabajo.proceso.exitcode}"
+                self.terminar(trabajo, ERROR)
+
+    def recibir_mensajes(self):
+        while self.activo:
+            try:
+                id_trabajo, tipo, contenido = self.cola_mensajes.get(timeout=1)
+            except queue.Empty:
+                continue
+            with self.condicion:
+                trabajo = self.trabajos.get(id_trabajo)
+                if trabajo is None or trabajo.estado != EJECUTANDO:
+                    continue
+                if tipo == "progreso":
+                    trabajo.progreso.append(contenido)
+                elif tipo == "mejor":
+                    trabajo.mejor_parcial = contenido
+                elif tipo == "resultado":
+                    trabajo.resultado = contenido
+                    self.terminar(trabajo, COMPLETADO)
+                else:
+                    trabajo.error = contenido
+                    self.terminar(trabajo, ERROR)
+                self.condicion.notify_all()
+
+    # Espera a que el trabajo cambie (nuevas generaciones o fin), para transmitir el progreso
+    def esperar_cambios(self, trabajo: Trabajo, generaciones_vistas: int, timeout: float = 15) -> None:
+        with self.condicion:
+            self.condicion.wait_for(
+                lambda: len(trabajo.progreso) > generaciones_vistas or trabajo.estado in TERMINADOS or not self.activo,
+                timeout=timeout)
+
+    def detener(self):
+        with self.condicion:
+            self.activo = False
+            for id_trabajo in list(self.en_ejecucion):
+                trabajo = self.trabajos[id_trabajo]
+                if trabajo.proceso is not None:
+                    trabajo.proceso.terminate()
+                self.terminar(trabajo, CANCELADO)
+            self.condicion.notify_all()
+
+# Rutas:
+#   POST   /trabajos                  encola un trabajo {"datos", "motor", "generaciones", "parametros", "solucion_previa"}
+#   GET    /trabajos                  estado de todos los trabajos
+#   GET    /trabajos/<id>             estado y resultado de un trabajo
+#   GET    /trabajos/<id>/progreso    metricas por generacion (?desde=N), con ?seguir=1 se transmiten
+#                                     como lineas JSON hasta que el trabajo termina
+#   GET    /trabajos/<id>/solucion    asignaciones del horario (mismo formato que guardar_solucion), mientras
+#                                     se ejecuta la mejor solucion hasta ahora con "parcial": true
+#   GET    /trabajos/<id>/pdf         reporte PDF del horario
+#   DELETE /trabajos/<id>             cancela el trabajo, si ya termino lo elimina junto con sus resultados
+class ManejadorServicio(BaseHTTPRequestHandler):
+    gestor: GestorTrabajos = None
+
+    def log_message(self, format, *args):
+        logging.getLogger(__name__).info("%s - %s", self.address_string(), format % args)
+
+    def responder_json(self, estado: int, contenido):
+        cuerpo = json.dumps(contenido, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def ruta(self) -> tuple[list[str], dict]:
+        url = urlparse(self.path)
+        return [parte for parte in url.path.split("/") if parte], parse_qs(url.query)
+
+    def trabajo_de_ruta(self, partes) -> Trabajo | None:
+        trabajo = self.gestor.obtener(partes[1]) if len(partes) >= 2 else None
+        if trabajo is None:
+            self.responder_json(404, {"error": "Trabajo no encontrado"})
+        return trabajo
+
+    def do_POST(self):
+        partes, _ = self.ruta()
+        if partes != ["trabajos"]:
+            self.responder_json(404, {"error": "Ruta no encontrada"})
+            return
+        try:
+            longitud = int(self.headers.get("Content-Length", 0))
+            solicitud = json.loads(self.rfile.read(longitud) or b"{}")
+            trabajo = self.gestor.enviar(solicitud)
+        except OverflowError as e:
+            self.responder_json(503, {"error": str(e)})
+            return
+        except (ValueError, TypeError) as e:
+            self.responder_json(400, {"error": str(e)})
+            return
+        self.responder_json(202, trabajo.resumen())
+
+    def do_DELETE(self):
+        partes, _ = self.ruta()
+        if len(partes) != 2 or partes[0] != "trabajos":
+            self.responder_json(404, {"error": "Ruta no encontrada"})
+            return
+        trabajo = self.trabajo_de_ruta(partes)
+        if trabajo is None:
+            return
+        if self.gestor.cancelar(trabajo.id):
+            self.responder_json(200, trabajo.resumen())
+        elif self.gestor.eliminar(trabajo.id):
+            self.responder_json(200, {**trabajo.resumen(), "eliminado": True})
+        else:
+            self.responder_json(404, {"error": "Trabajo no encontrado"})
+
+    def do_GET(self):
+        partes, consulta = self.ruta()
+        if not partes or partes[0] != "trabajos":
+            self.responder_json(404, {"error": "Ruta no encontrada"})
+            return
+        if len(partes) == 1:
+            self.responder_json(200, [trabajo.resumen() for trabajo in list(self.gestor.trabajos.values())])
+            return
+        trabajo = self.trabajo_de_ruta(partes)
+        if trabajo is None:
+            return
+
+        recurso = partes[2] if len(partes) > 2 else None
+        if recurso is None:
+            self.responder_json(200, trabajo.resumen(con_resultado=True))
+        elif recurso == "progreso":
+            desde = consulta.get("desde", ["0"])[0]
+            if not desde.isdigit():
+                self.responder_json(400, {"error": f"desde debe ser un entero no negativo: {desde}"})
+            elif consulta.get("seguir", ["0"])[0] == "1":
+                self.transmitir_progreso(trabajo, int(desde))
+            else:
+                self.responder_json(200, trabajo.progreso[int(desde):])
+        elif recurso == "solucion" and trabajo.resultado is None and trabajo.mejor_parcial is not None \
+                and trabajo.estado == EJECUTANDO:
+            self.responder_json(200, {**trabajo.mejor_parcial, "parcial": True})
+        elif recurso in ("solucion", "pdf"):
+            if trabajo.resultado is None:
+                self.responder_json(409, {"error": f"El trabajo no tiene resultado ({trabajo.estado})"})
+            elif recurso == "solucion":
+                self.responder_json(200, {"asignaciones": trabajo.resultado["asignaciones"]})
+            else:
+                self.enviar_pdf(trabajo.resultado["reporte_horarios_pdf"])
+        else:
+            self.responder_json(404, {"error": "Ruta no encontrada"})
+
+    # Lineas JSON (una por generacion) hasta que el trabajo termina, la ultima es el estado final
+    def transmitir_progreso(self, trabajo: Trabajo, desde: int):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        enviadas = desde
+        try:
+            while True:
+                nuevas = trabajo.progreso[enviadas:]
+                for metricas in nuevas:
+                    self.wfile.write(json.dumps(metricas).encode("utf-8") + b"\n")
+                enviadas += len(nuevas)
+                self.wfile.flush()
+                if trabajo.estado in TERMINADOS:
+                    self.wfile.write(json.dumps(trabajo.resumen(), default=str).encode("utf-8") + b"\n")
+                    return
+                self.gestor.esperar_cambios(trabajo, enviadas)
+        except (BrokenPipeError, ConnectionResetError):
+            # el cliente cerro la conexion, el trabajo sigue
+            return
+
+    def enviar_pdf(self, ruta: str):
+        try:
+            with open(ruta, "rb") as archivo:
+                contenido = archivo.read()
+        except OSError:
+            self.responder_json(404, {"error": "No se encontro el reporte PDF"})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Disposition", "attachment; filename=reporte_horarios.pdf")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+def crear_servidor(host: str = "127.0.0.1", puerto: int = 8765, max_procesos: int = 2, max_cola: int = 100,
+                   directorio_base: str = "trabajos", max_terminados: int = 100,
+                   ttl_terminados: float | None = 24 * 3600) -> ThreadingHTTPServer:
+    gestor = GestorTrabajos(max_procesos, max_cola, directorio_base, max_terminados, ttl_terminados)
+    manejador = type("Manejador", (ManejadorServicio,), {"gestor": gestor})
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    servidor.gestor = gestor
+    return servidor
@@ -0,0 +1,264 @@
+import inspect
+import math
+import time
+from abc import ABC, abstractmethod
+
+from utils.algoritmo import AmbienteAlgoritmo, Individuo
+from utils.costo_incremental import CostoIncremental
+from utils.estancamiento import DetectorEstancamiento
+from utils.memoria import MonitorMemoria
+
+# Interfaz comun de los motores de optimizacion
+# Todos trabajan sobre un AmbienteAlgoritmo (instancia y funcion de costo) y dejan el resultado
+# en los mismos campos (resultado, conflictos_por_generacion, tiempo_ejecucion, ...)
+class Solver(ABC):
+    nombre = ""
+
+    def __init__(self, ambiente: AmbienteAlgoritmo | None = None):
+        self.ambiente = ambiente if ambiente is not None else AmbienteAlgoritmo()
+
+    def cargar_instancia(self, cursos=None, salones=None, docentes=None, relaciones=None, franjas=None) -> AmbienteAlgoritmo:
+        self.ambiente.preparar_data(cursos, salones, docentes, relaciones, franjas)
+        return self.ambiente
+
+    # generaciones es el presupuesto, parametros contiene los argumentos por nombre de AmbienteAlgoritmo.ejecutar
+    # cada motor usa los que le corresponden
+    @abstractmethod
+    def resolver(self, generaciones: int, parametros: dict) -> AmbienteAlgoritmo:
+        ...
+
+class SolverGenetico(Solver):
+    nombre = "Algoritmo Genético"
+
+    def resolver(self, generaciones: int, parametros: dict) -> AmbienteAlgoritmo:
+        # se ignoran los parametros que solo usan otros motores
+        aceptados = inspect.signature(self.ambiente.ejecutar).parameters
+        self.ambiente.ejecutar(generaciones=generaciones,
+                               **{clave: valor for clave, valor in parametros.items() if clave in aceptados})
+        return self.ambiente
+
+# NSGA-II: optimiza conflictos, continuidad (y opcionalmente carga docente) como objetivos separados
+# ademas del resultado principal deja el frente de Pareto en ambiente.frente_pareto
+class SolverMultiobjetivo(Solver):
+    nombre = "NSGA-II (Multiobjetivo)"
+
+    def resolver(self, generaciones: int, parametros: dict) -> AmbienteAlgoritmo:
+        aceptados = inspect.signature(self.ambiente.ejecutar_multiobjetivo).parameters
+        self.ambiente.ejecutar_multiobjetivo(generaciones=generaciones,
+                                             **{clave: valor for clave, valor in parametros.items() if clave in aceptados})
+        return self.ambiente
+
+# Recocido simulado sobre una sola solucion
+# Cada "generacion" son movimientos_por_generacion movimientos, asi las metricas y criterios de parada
+# se comparan directamente con el algoritmo genetico
+class SolverRecocido(Solver):
+    nombre = "Recocido Simulado"
+    aceptacion = "recocido"
+
+    # Movimiento vecino: se reasigna el salon o la franja y el docente de un curso
+    # o se intercambian las franjas (con su docente) de dos cursos. Devuelve los genes originales para deshacerlo
+    # El intercambio solo se hace si los dos genes nuevos estan en el dominio de su curso, si no se mueve un gen
+    def vecino(self, individuo: Individuo) -> list:
+        cursos = self.ambiente.cursos_mutables()
+        if not cursos:
+            return []
+        rng = self.ambiente.rng
+        if len(cursos) > 1 and rng.random() < 0.2:
+            curso_1, curso_2 = rng.sample(cursos, 2)
+            salon_1, franja_1, docente_1 = individuo[curso_1]
+            salon_2, franja_2, docente_2 = individuo[curso_2]
+            dominios = self.ambiente.dominios
+            if dominios[curso_1].admite(salon_1, franja_2, docente_2) and dominios[curso_2].admite(salon_2, franja_1, docente_1):
+                originales = [(curso_1, individuo[curso_1]), (curso_2, individuo[curso_2])]
+                individuo[curso_1] = (salon_1, franja_2, docente_2)
+                individuo[curso_2] = (salon_2, franja_1, docente_1)
+                return originales
+
+        curso = rng.choice(cursos)
+        salon, franja, docente = individuo[curso]
+        nuevo_salon, nueva_franja, nuevo_docente = self.ambiente.gen_aleatorio(curso)
+        originales = [(curso, individuo[curso])]
+        # la franja y el docente se cambian juntos para que el gen quede dentro del dominio del curso
+        if rng.random() < 0.5:
+            individuo[curso] = (nuevo_salon, franja, docente)
+        else:
+            individuo[curso] = (salon, nueva_franja, nuevo_docente)
+        return originales
+
+    @staticmethod
+    def deshacer(individuo: Individuo, originales: list):
+        for curso, gen in reversed(originales):
+            individuo[curso] = gen
+
+    # Temperatura con la que un empeoramiento promedio se acepta con probabilidad 1/2
+    def estimar_temperatura(self, individuo: Individuo, costo: float, muestras: int = 30) -> float:
+        estado = CostoIncremental(self.ambiente, individuo)
+        empeoramientos = []
+        for _ in range(muestras):
+            originales = self.vecino(individuo)
+            estado.aplicar(individuo, originales)
+            nuevo_costo, _, _ = estado.costo()
+            estado.revertir(individuo, originales)
+            self.deshacer(individuo, originales)
+            if nuevo_costo > costo:
+                empeoramientos.append(nuevo_costo - costo)
+        if not empeoramientos:
+            return 1.0
+        return (sum(empeoramientos) / len(empeoramientos)) / math.log(2)
+
+    def resolver(self, generaciones: int, parametros: dict) -> AmbienteAlgoritmo:
+        ambiente = self.ambiente
+        start_time = time.time()
+        monitor_memoria = MonitorMemoria() if parametros.get("rastrear_memoria") else None
+        if monitor_memoria is not None:
+            monitor_memoria.iniciar()
+
+        ambiente.penalizacion_continuidad = parametros.get("penalizacion_continuidad", 10)
+        ambiente.generacion_actual = 0
+        ambiente.total_generaciones = generaciones
+        ambiente.reiniciar_metricas()
+        ambiente.sembrar(parametros.get("semilla"))
+        ambiente.iniciar_presupuesto(parametros.get("tiempo_limite", 0), parametros.get("max_evaluaciones", 0))
+        presupuesto = ambiente.fraccion_presupuesto is not None
+
+        movimientos = parametros.get("movimientos_por_generacion") or max(1, len(ambiente.cursos))
+        aceptacion = parametros.get("aceptacion", self.aceptacion)
+        longitud_historial = parametros.get("longitud_historial", 50)
+        detector = DetectorEstancamiento(parametros.get("generaciones_sin_mejora", 0),
+                                         parametros.get("epsilon_mejora", 0),
+                                         parametros.get("ventana_mejora", 50))
+
+        actual = dict(ambiente.solucion_base) if ambiente.solucion_base is not None else ambiente.crear_individuo()
+        costo, _, _ = ambiente.funcion_costo(actual)
+        mejor = dict(actual)
+        temperatura, enfriamiento = 0, 1
+        if aceptacion == "recocido":
+            temperatura = parametros.get("temperatura_inicial") or self.estimar_temperatura(actual, costo)
+            temperatura_inicial = temperatura
+            temperatura_final = min(parametros.get("temperatura_final", 0.01), temperatura)
+            # enfriamiento geometrico para llegar a temperatura_final al terminar las generaciones
+            # con tiempo o evaluaciones como presupuesto la temperatura sigue ambiente.avance()
+            if not presupuesto:
+                enfriamiento = (temperatura_final / temperatura) ** (1 / max(1, generaciones * movimientos))
+        historial = [costo] * max(1, longitud_historial)
+        paso = 0
+
+        conflictos = 0
+        convergencia = generaciones
+        for generacion in ambiente.rango_generaciones(generaciones):
+            ambiente.generacion_actual = generacion
+            ambiente.medir_presupuesto()
+            if aceptacion == "recocido" and presupuesto:
+                temperatura = temperatura_inicial * (temperatura_final / temperatura_inicial) ** ambiente.avance()
+            # el peso de continuidad depende de la generacion, se reevaluan la solucion actual y la mejor
+            # cada movimiento se evalua por diferencias sobre el estado de la solucion actual
+            costo, _, _ = ambiente.funcion_costo(actual)
+            mejor_costo, conflictos, continuidad = ambiente.funcion_costo(mejor)
+            estado = CostoIncremental(ambiente, actual)
+
+            aceptados = 0
+            for _ in range(movimientos):
+                originales = self.vecino(actual)
+                estado.aplicar(actual, originales)
+                nuevo_costo, nuevos_conflictos, nueva_continuidad = estado.costo()
+
+                if aceptacion == "tardia":
+                    # aceptacion tardia: se compara contra el costo de hace longitud_historial pasos
+                    posicion = paso % len(historial)
+                    acepta = nuevo_costo <= costo or nuevo_costo <= historial[posicion]
+                else:
+                    delta = nuevo_costo - costo
+                    acepta = delta <= 0 or ambiente.rng.random() < math.exp(-delta / max(temperatura, 1e-12))
+
+                if acepta:
+                    costo = nuevo_costo
+                    aceptados += 1
+                    if nuevo_costo < mejor_costo:
+                        # la nueva mejor se confirma con la evaluacion completa
+                        costo, nuevos_conflictos, nueva_continuidad = ambiente.funcion_costo(actual)
+                        if costo < mejor_costo:
+                            mejor = dict(actual)
+                            mejor_costo, conflictos, continuidad = costo, nuevos_conflictos, nueva_continuidad
+                else:
+                    estado.revertir(actual, originales)
+                    self.deshacer(actual, originales)
+
+                if aceptacion == "tardia":
+                    historial[paso % len(historial)] = costo
+                temperatura *= enfriamiento
+                paso += 1
+
+            memoria = None
+            if monitor_memoria is not None:
+                memoria = monitor_memoria.registrar_generacion(generacion, [actual, mejor])
+            # una sola solucion: no hay diversidad, en lugar de la tasa de mutacion se registra la de aceptacion
+            ambiente.registrar_metricas(generacion, mejor_costo, conflictos, continuidad, 0, aceptados / movimientos,
+                                        memoria, mejor)
+            ambiente.log(f"Iteracion {generacion}: Penalizacion: {mejor_costo:.5f} Conflictos: {conflictos} "
+                         f"Continuidad: {continuidad:.5f} Temperatura: {temperatura:.5f} "
+                         f"Aceptacion: {aceptados / movimientos:.3f} Evaluaciones: {ambiente.evaluaciones}")
+
+            if ambiente.cumple_criterios(conflictos, continuidad, mejor_costo,
+                                         parametros.get("conflicto_esperado", 0), parametros.get("evaluar_conflicto", False),
+                                         parametros.get("continuidad_esperada", 0), parametros.get("evaluar_continuidad", False),
+                                         parametros.get("penalizacion_esperada", 0), parametros.get("evaluar_penalizacion", False)):
+                convergencia = generacion
+                ambiente.motivo_terminacion = "convergencia"
+                break
+
+            agotado = ambiente.presupuesto_agotado()
+            if agotado is not None:
+                convergencia = generacion
+                ambiente.motivo_terminacion = agotado
+                break
+
+            if detector.activo():
+                motivo = detector.evaluar(generacion, ambiente.penalizacion_comparable(mejor_costo, continuidad), 0, 0)
+                if motivo is not None:
+                    convergencia = generacion
+                    ambiente.motivo_terminacion = motivo
+                    break
+
+        ambiente.finalizar_ejecucion(mejor, conflictos, convergencia, start_time, monitor_memoria)
+        return ambiente
+
+# Aceptacion tardia (late acceptance hill climbing), no necesita calibrar temperatura
+class SolverAceptacionTardia(SolverRecocido):
+    nombre = "Aceptación Tardía"
+    aceptacion = "tardia"
+
+# Parametros de AmbienteAlgoritmo.ejecutar, los mismos valores iniciales que la interfaz
+PARAMETROS_POR_DEFECTO = {
+    "poblacion_inicial": 10,
+    "tasa_mutacion": 0.3,
+    "penalizacion_continuidad": 10,
+    "conflicto_esperado": 0,
+    "evaluar_conflicto": False,
+    "continuidad_esperada": 0,
+    "evaluar_continuidad": False,
+    "penalizacion_esperada": 0,
+    "evaluar_penalizacion": True,
+    "umbral_diversidad": 0.1,
+    "intervalo_reinsercion": 5,
+    "porcentaje_reinsercion": 0.3,
+    "modo_mutacion": "adaptativa",
+    "control_duplicados": "compartir",
+    "seleccion_operadores": "generacion",
+    # None sortea una semilla nueva, la usada queda en ambiente.semilla
+    "semilla": None,
+    # presupuesto en segundos y en evaluaciones de la funcion de costo, 0 = solo limitan las generaciones
+    "tiempo_limite": 0,
+    "max_evaluaciones": 0,
+}
+
+SOLVERS: dict[str, type[Solver]] = {
+    "genetico": SolverGenetico,
+    "recocido": SolverRecocido,
+    "tardia": SolverAceptacionTardia,
+    "multiobjetivo": SolverMultiobjetivo,
+}
+
+def crear_solver(nombre: str, ambiente: AmbienteAlgoritmo | None = None) -> Solver:
+    if nombre not in SOLVERS:
+        raise ValueError(f"Motor de optimizacion desconocido: {nombre}")
+    return SOLVERS[nombre](ambiente)
@@ -0,0 +1,381 @@
+import random
+
+import numpy as np
+
+# Columnas de la matriz de cromosomas, cada gen (curso) es (salon, franja, docente)
+SALON, FRANJA, DOCENTE = 0, 1, 2
+
+# Mascara de las claves que aparecen mas de una vez en su fila
+def repetidos(claves: np.ndarray) -> np.ndarray:
+    filas = np.arange(claves.shape[0], dtype=np.int64)[:, None]
+    minimo = claves.min(initial=0)
+    combinadas = filas * (int(claves.max(initial=0)) - int(minimo) + 1) + (claves - minimo)
+    _, inversa, cuentas = np.unique(combinadas.ravel(), return_inverse=True, return_counts=True)
+    return (cuentas[inversa] > 1).reshape(claves.shape)
+
+# Representacion entera de los individuos para generar una generacion completa de hijos a la vez
+# Una poblacion es una matriz (individuos, cursos, 3): indice del salon, indice de la franja
+# y posicion del docente dentro de docentes_por_curso del curso (-1 si el curso no tiene docentes)
+class CodificacionGenetica:
+    # libres: cursos que puede cambiar la mutacion (reprogramacion), None para todos
+    # dominios: DominioCurso de cada curso (ver utils.dominios), los genes aleatorios se muestrean de ellos
+    def __init__(self, cursos, salones, franjas, docentes_por_curso, libres=None, dominios=None, generador=random):
+        self.cursos = list(cursos)
+        self.salones = list(salones)
+        self.franjas = list(franjas)
+        self.docentes = [list(docentes_por_curso.get(curso.codigo, [])) for curso in self.cursos]
+        self.indice_salon = {salon: indice for indice, salon in enumerate(self.salones)}
+        self.indice_franja = {franja: indice for indice, franja in enumerate(self.franjas)}
+        self.indice_docente = [{docente: indice for indice, docente in enumerate(docentes)}
+                               for docentes in self.docentes]
+        # cantidad de docentes permitidos por curso, limita el rango de la mutacion del docente
+        self.cantidad_docentes = np.array([len(docentes) for docentes in self.docentes], dtype=np.int32)
+        self.mascara_libres = None
+        if libres is not None:
+            self.mascara_libres = np.array([curso in libres for curso in self.cursos], dtype=bool)
+        self.salones_factibles = None
+        self.previa = None
+        self.peso_desviacion = 0
+        if dominios is not None:
+            self.preparar_dominios(dominios)
+        self.preparar_conflictos()
+        # indices de la instancia de cada curso, salon, franja y docente permitido, ver genes_instancia
+        self.curso_instancia = np.array([curso.indice for curso in self.cursos], dtype=np.int64)
+        self.salon_instancia = np.array([salon.indice for salon in self.salones], dtype=np.int64)
+        self.franja_instancia = np.array([franja.indice for franja in self.franjas], dtype=np.int64)
+        self.docente_instancia = np.full(self.docente_comun.shape, -1, dtype=np.int64)
+        for i, docentes in enumerate(self.docentes):
+            self.docente_instancia[i, :len(docentes)] = [docente.indice for docente in docentes]
+        # objetos de cada indice para decodificar, la columna 0 de los docentes es None (indice -1)
+        self.objetos_salon = np.empty(len(self.salones), dtype=object)
+        self.objetos_salon[:] = self.salones
+        self.objetos_franja = np.empty(len(self.franjas), dtype=object)
+        self.objetos_franja[:] = self.franjas
+        self.objetos_docente = np.full((len(self.cursos), self.docente_comun.shape[1] + 1), None, dtype=object)
+        for i, docentes in enumerate(self.docentes):
+            for j, docente in enumerate(docentes):
+                self.objetos_docente[i, j + 1] = docente
+        # el generador de numpy se siembra desde el de la ejecucion para que la semilla la reproduzca
+        self.rng = np.random.default_rng(generador.getrandbits(64))
+
+    # Los dominios se guardan como matrices con relleno: fila por curso con los indices factibles
+    # y la cantidad de validos de cada fila, asi se muestrean todos los cursos a la vez
+    def preparar_dominios(self, dominios):
+        salones = [[self.indice_salon[salon] for salon in dominios[curso].salones] for curso in self.cursos]
+        pares = [[(self.indice_franja[franja], -1 if docente is None else self.indice_docente[i][docente])
+                  for franja, docente in dominios[curso].franjas_docentes]
+                 for i, curso in enumerate(self.cursos)]
+        self.cantidad_salones = np.array([len(fila) for fila in salones], dtype=np.int32)
+        self.cantidad_pares = np.array([len(fila) for fila in pares], dtype=np.int32)
+        self.salones_factibles = np.zeros((len(self.cursos), max(self.cantidad_salones, default=1)), dtype=np.int32)
+        self.pares_factibles = np.zeros((len(self.cursos), max(self.cantidad_pares, default=1), 2), dtype=np.int32)
+        for i, (fila_salones, fila_pares) in enumerate(zip(salones, pares)):
+            self.salones_factibles[i, :len(fila_salones)] = fila_salones
+            self.pares_factibles[i, :len(fila_pares)] = fila_pares
+
+    # Datos para detectar conflictos sobre la matriz: indice comun de cada docente, su disponibilidad
+    # en cada franja, grupo (carrera y semestre) de cada curso y dia de cada franja
+    def preparar_conflictos(self):
+        docentes_unicos = {}
+        for docentes in self.docentes:
+            for docente in docentes:
+                docentes_unicos.setdefault(docente, len(docentes_unicos))
+        self.docente_comun = np.zeros((len(self.cursos), max(self.cantidad_docentes, default=0) or 1), dtype=np.int64)
+        for i, docentes in enumerate(self.docentes):
+            self.docente_comun[i, :len(docentes)] = [docentes_unicos[docente] for docente in docentes]
+        self.disponible = np.array([[docente.esta_disponible(franja.hora) for franja in self.franjas]
+                                    for docente in docentes_unicos], dtype=bool).reshape(len(docentes_unicos), len(self.franjas))
+        grupos = {}
+        codigos = {}
+        self.grupo = np.array([grupos.setdefault((curso.carrera, curso.semestre), len(grupos)) for curso in self.cursos],
+                              dtype=np.int64)
+        self.codigo = np.array([codigos.setdefault(curso.codigo, len(codigos)) for curso in self.cursos], dtype=np.int64)
+        self.sesiones_multiples = np.array([curso.sesiones > 1 for curso in self.cursos], dtype=bool)
+        self.dia_franja = np.array([franja.dia_indice for franja in self.franjas], dtype=np.int64)
+        self.dias = int(self.dia_franja.max(initial=0)) + 1
+        self.periodo_franja = np.array([max(franja.periodo, 0) for franja in self.franjas], dtype=np.int64)
+
+    # Mascaras (individuos, cursos) de los genes en conflicto (salon, docente o disponibilidad) y de los que
+    # solo suman penalizacion (grupo o sesiones el mismo dia), con las reglas de AmbienteAlgoritmo.cursos_en_conflicto
+    def genes_en_conflicto(self, matriz: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        cursos = np.arange(len(self.cursos))
+        franjas = len(self.franjas)
+        franja = matriz[..., FRANJA].astype(np.int64)
+        # los genes sin docente o de cursos con una sola sesion reciben claves negativas unicas y nunca se repiten
+        unica = -1 - cursos
+
+        duros = repetidos(matriz[..., SALON].astype(np.int64) * franjas + franja)
+        con_docente = matriz[..., DOCENTE] >= 0
+        docente = self.docente_comun[cursos, np.maximum(matriz[..., DOCENTE], 0)]
+        duros |= repetidos(np.where(con_docente, docente * franjas + franja, unica))
+        if self.disponible.size:
+            duros |= con_docente & ~self.disponible[docente, franja]
+
+        blandos = repetidos(self.grupo * franjas + franja)
+        dias = int(self.dia_franja.max(initial=0)) + 1
+        blandos |= repetidos(np.where(self.sesiones_multiples, self.codigo * dias + self.dia_franja[franja], unica))
+        return duros, blandos
+
+    # Matriz (individuos, cursos, 4) con los indices de la instancia, la que evaluan los nucleos de utils.evaluacion
+    def genes_instancia(self, matriz: np.ndarray) -> np.ndarray:
+        genes = np.empty(matriz.shape[:2] + (4,), dtype=np.int64)
+        genes[..., 0] = self.curso_instancia
+        genes[..., 1] = self.salon_instancia[matriz[..., SALON]]
+        genes[..., 2] = self.franja_instancia[matriz[..., FRANJA]]
+        docente = matriz[..., DOCENTE]
+        genes[..., 3] = np.where(docente >= 0,
+                                 self.docente_instancia[np.arange(len(self.cursos)), np.maximum(docente, 0)], -1)
+        return genes
+
+    def codificar(self, poblacion) -> np.ndarray:
+        # se arma una lista plana y se convierte una sola vez, asignar elemento por elemento en numpy es lento
+        indice_salon, indice_franja = self.indice_salon, self.indice_franja
+        valores = []
+        for individuo in poblacion:
+            for curso, indice_docente in zip(self.cursos, self.indice_docente):
+                salon, franja, docente = individuo[curso]
+                valores.append(indice_salon[salon])
+                valores.append(indice_franja[franja])
+                valores.append(-1 if docente is None else indice_docente.get(docente, -1))
+        return np.array(valores, dtype=np.int32).reshape(len(poblacion), len(self.cursos), 3)
+
+    # Los indices se traducen por columna con arreglos de objetos y los genes se arman con zip, sin recorrer
+    # cada gen en Python
+    def decodificar(self, matriz: np.ndarray) -> list[dict]:
+        if not len(matriz):
+            return []
+        salones = self.objetos_salon[matriz[..., SALON]].tolist()
+        franjas = self.objetos_franja[matriz[..., FRANJA]].tolist()
+        docentes = self.objetos_docente[np.arange(len(self.cursos)), matriz[..., DOCENTE] + 1].tolist()
+        return [dict(zip(self.cursos, zip(*fila))) for fila in zip(salones, franjas, docentes)]
+
+    # Genes aleatorios validos para una matriz de forma (individuos, cursos)
+    def genes_aleatorios(self, individuos: int) -> np.ndarray:
+        forma = (individuos, len(self.cursos))
+        genes = np.empty(forma + (3,), dtype=np.int32)
+        if self.salones_factibles is not None:
+            # posicion uniforme dentro del dominio de cada curso
+            cursos = np.arange(len(self.cursos))
+            salon = np.floor(self.rng.random(forma) * self.cantidad_salones).astype(np.intp)
+            par = np.floor(self.rng.random(forma) * self.cantidad_pares).astype(np.intp)
+            genes[..., SALON] = self.salones_factibles[cursos, salon]
+            genes[..., FRANJA:] = self.pares_factibles[cursos, par]
+            return genes
+        genes[..., SALON] = self.rng.integers(0, len(self.salones), forma)
+        genes[..., FRANJA] = self.rng.integers(0, len(self.franjas), forma)
+        # posicion uniforme dentro de los docentes permitidos de cada curso, -1 si no tiene
+        docente = np.floor(self.rng.random(forma) * self.cantidad_docentes).astype(np.int32)
+        genes[..., DOCENTE] = np.where(self.cantidad_docentes > 0, docente, -1)
+        return genes
+
+    # Cruza de todos los pares a la vez con mascaras por gen
+    # prob_uniforme es la probabilidad de que un hijo use cruza uniforme en lugar de la de punto medio
+    # usa_uniforme indica la cruza de cada hijo si ya se eligio (seleccion adaptativa de operadores)
+    def cruzar(self, padres_1: np.ndarray, padres_2: np.ndarray, prob_uniforme: float,
+               usa_uniforme: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        hijos, cursos = padres_1.shape[:2]
+        punto_medio = np.arange(cursos) < cursos // 2
+        uniforme = self.rng.random((hijos, cursos)) < 0.5
+        if usa_uniforme is None:
+            usa_uniforme = self.rng.random(hijos) < prob_uniforme
+        del_padre_1 = np.where(usa_uniforme[:, None], uniforme, punto_medio)
+        return np.where(del_padre_1[..., None], padres_1, padres_2), usa_uniforme
+
+    # Cada gen se reemplaza por uno aleatorio con probabilidad tasa_mutacion
+    # Con prob_exploracion la mutacion es dirigida: solo los genes en conflicto (o con penalizacion si el hijo
+    # no tiene conflictos) usan tasa_mutacion, el resto cambia con prob_exploracion
+    # dirigidos limita la mutacion dirigida a algunos hijos, None la aplica a todos
+    # reparados son los hijos con mutacion reparadora: sus genes sorteados con tasa_mutacion se reparan (ver reparar,
+    # peso_continuidad es el peso de continuidad actual de la ejecucion)
+    # tasa_aleatoria es la tasa de los hijos con mutacion aleatoria, None usa tasa_mutacion
+    def mutar(self, hijos: np.ndarray, tasa_mutacion: float, prob_exploracion: float | None = None,
+              dirigidos: np.ndarray | None = None, reparados: np.ndarray | None = None,
+              tasa_aleatoria: float | None = None, peso_continuidad: float = 0) -> np.ndarray:
+        if tasa_aleatoria is None:
+            tasa_aleatoria = tasa_mutacion
+        probabilidad = tasa_aleatoria
+        if prob_exploracion is not None and (dirigidos is None or dirigidos.any()):
+            duros, blandos = self.genes_en_conflicto(hijos)
+            objetivo = np.where(duros.any(axis=1, keepdims=True), duros, blandos)
+            # un hijo sin ningun gen objetivo recibe la mutacion normal
+            objetivo |= ~objetivo.any(axis=1, keepdims=True)
+            probabilidad = np.where(objetivo, tasa_mutacion, prob_exploracion)
+            if dirigidos is not None:
+                probabilidad = np.where(dirigidos[:, None], probabilidad, tasa_aleatoria)
+        if reparados is not None:
+            probabilidad = np.where(reparados[:, None], tasa_mutacion, probabilidad)
+        mascara = self.rng.random(hijos.shape[:2]) < probabilidad
+        if self.mascara_libres is not None:
+            mascara &= self.mascara_libres
+        reparar = None
+        if reparados is not None:
+            reparar = mascara & reparados[:, None]
+            mascara &= ~reparados[:, None]
+        if mascara.any():
+            hijos[mascara] = self.genes_aleatorios(hijos.shape[0])[mascara]
+        if reparar is not None and reparar.any():
+            self.reparar(hijos, reparar, peso_continuidad)
+        return hijos
+
+    # Mutacion reparadora de AmbienteAlgoritmo.mutacion_reparadora sobre la matriz: cada gen marcado prueba
+    # alternativas genes aleatorios y se queda con el de menor costo, o con el actual si ninguno lo mejora.
+    # En lugar de evaluar el horario completo por alternativa se lleva por hijo la ocupacion de salones, docentes,
+    # grupos, sesiones por dia y periodos de cada grupo y dia, con ella se obtienen los choques del gen contra el
+    # resto del hijo y la continuidad que tendria el hijo con cada alternativa (ver costo_opciones).
+    # Se recorren los cursos en orden, reparando el curso en todos los hijos a la vez, y la ocupacion se actualiza
+    # despues de cada curso, asi cada gen ve las reparaciones anteriores del mismo hijo como en la version por hijo
+    def reparar(self, hijos: np.ndarray, mascara: np.ndarray, peso_continuidad: float = 0,
+                alternativas: int = 3) -> np.ndarray:
+        tablas = self.tablas_ocupacion(hijos)
+        candidatos = self.genes_aleatorios(alternativas * hijos.shape[0]).reshape((alternativas,) + hijos.shape)
+        for curso in np.flatnonzero(mascara.any(axis=0)):
+            filas = np.flatnonzero(mascara[:, curso])
+            actuales = hijos[filas, curso]
+            # el gen actual sale de la ocupacion para comparar todas las opciones contra el resto del hijo
+            self.ocupar(tablas, filas, curso, actuales, -1)
+            opciones = np.concatenate([actuales[None], candidatos[:, filas, curso]])
+            costos = self.costo_opciones(tablas, filas, curso, opciones, peso_continuidad)
+            # argmin se queda con la primera opcion de menor costo, el gen actual gana los empates
+            elegidas = opciones[costos.argmin(axis=0), np.arange(len(filas))]
+            hijos[filas, curso] = elegidas
+            self.ocupar(tablas, filas, curso, elegidas, 1)
+        return hijos
+
+    # Solucion previa de una reprogramacion, reparar suma peso_desviacion a cada gen que se aleje de ella
+    # como combinar_costo (los cursos que no estaban en la previa siempre cuentan como cambio)
+    def fijar_previa(self, previa, peso_desviacion: float):
+        self.peso_desviacion = peso_desviacion
+        self.previa = np.full((len(self.cursos), 3), -2, dtype=np.int32)
+        for i, (curso, indice_docente) in enumerate(zip(self.cursos, self.indice_docente)):
+            if curso in previa:
+                salon, franja, docente = previa[curso]
+                self.previa[i] = (self.indice_salon[salon], self.indice_franja[franja],
+                                  -1 if docente is None else indice_docente.get(docente, -1))
+
+    # Claves de la ocupacion para los genes (..., 3) del curso: salon y franja, docente comun y franja
+    # (-1 sin docente), grupo y franja, curso y dia, grupo y dia, y periodo
+    def claves_ocupacion(self, curso: int, genes: np.ndarray) -> tuple[np.ndarray, ...]:
+        franjas = len(self.franjas)
+        franja = genes[..., FRANJA].astype(np.int64)
+        docente = self.docente_comun[curso, np.maximum(genes[..., DOCENTE], 0)]
+        dia = self.dia_franja[franja]
+        return (genes[..., SALON].astype(np.int64) * franjas + franja,
+                np.where(genes[..., DOCENTE] >= 0, docente * franjas + franja, -1),
+                self.grupo[curso] * franjas + franja,
+                self.codigo[curso] * self.dias + dia,
+                self.grupo[curso] * self.dias + dia,
+                self.periodo_franja[franja])
+
+    # Conteos por hijo: (hijos, claves) de salon, docente, grupo y sesiones por dia (solo cursos con varias
+    # sesiones), (hijos, grupo y dia, periodo) de los periodos, y (hijos, grupo y dia) de la cantidad de cursos y de
+    # los pares consecutivos de cada grupo y dia, con los que se calcula la continuidad (ver continuidad_opciones)
+    def tablas_ocupacion(self, hijos: np.ndarray) -> list[np.ndarray]:
+        cantidad = hijos.shape[0]
+        franjas = len(self.franjas)
+        grupos = int(self.grupo.max(initial=0)) + 1
+        periodos = int(self.periodo_franja.max(initial=0)) + 1
+        tamanos = [len(self.salones) * franjas, (self.disponible.shape[0] or 1) * franjas, grupos * franjas,
+                   (int(self.codigo.max(initial=0)) + 1) * self.dias, grupos * self.dias * periodos]
+        claves = [np.stack(columna, axis=1) for columna in
+                  zip(*(self.claves_ocupacion(curso, hijos[:, curso]) for curso in range(len(self.cursos))))]
+        claves[3] = np.where(self.sesiones_multiples, claves[3], -1)
+        claves[4] = claves[4] * periodos + claves.pop()
+        tablas = []
+        for clave, tamano in zip(claves, tamanos):
+            validas = clave >= 0
+            filas = np.broadcast_to(np.arange(cantidad)[:, None], clave.shape)[validas]
+            tablas.append(np.bincount(filas * tamano + clave[validas], minlength=cantidad * tamano).reshape(cantidad, -1))
+        tablas[4] = tablas[4].reshape(cantidad, grupos * self.dias, periodos)
+        ocupados = tablas[4] > 0
+        tablas.append(tablas[4].sum(axis=2))
+        tablas.append((ocupados[..., 1:] & ocupados[..., :-1]).sum(axis=2))
+        return tablas
+
+    # Suma (signo 1) o quita (signo -1) los genes del curso en las filas de las tablas, las filas no se repiten
+    # Un periodo que se ocupa (o se libera) suma (o resta) un par consecutivo por cada vecino ocupado
+    def ocupar(self, tablas: list[np.ndarray], filas: np.ndarray, curso: int, genes: np.ndarray, signo: int):
+        salon, docente, grupo, sesion, grupo_dia, periodo = self.claves_ocupacion(curso, genes)
+        tablas[0][filas, salon] += signo
+        con_docente = docente >= 0
+        tablas[1][filas[con_docente], docente[con_docente]] += signo
+        tablas[2][filas, grupo] += signo
+        if self.sesiones_multiples[curso]:
+            tablas[3][filas, sesion] += signo
+        periodos = tablas[4]
+        libre = periodos[filas, grupo_dia, periodo] == (1 if signo < 0 else 0)
+        vecinos = self.vecinos_ocupados(periodos, filas, grupo_dia, periodo)
+        periodos[filas, grupo_dia, periodo] += signo
+        tablas[5][filas, grupo_dia] += signo
+        tablas[6][filas, grupo_dia] += signo * np.where(libre, vecinos, 0)
+
+    # Cantidad de periodos vecinos (anterior y siguiente del mismo dia) ocupados en el grupo y dia de cada fila
+    @staticmethod
+    def vecinos_ocupados(periodos: np.ndarray, filas: np.ndarray, grupo_dia: np.ndarray,
+                         periodo: np.ndarray) -> np.ndarray:
+        ultimo = periodos.shape[2] - 1
+        anterior = (periodo > 0) & (periodos[filas, grupo_dia, np.maximum(periodo - 1, 0)] > 0)
+        siguiente = (periodo < ultimo) & (periodos[filas, grupo_dia, np.minimum(periodo + 1, ultimo)] > 0)
+        return anterior.astype(np.int64) + siguiente
+
+    # Costo (opciones, filas) de cada opcion del curso en su hijo, con los terminos de funcion_costo: los choques
+    # contra el resto del hijo con los pesos de AmbienteAlgoritmo.choques (salon 5, docente 1, docente no disponible
+    # 5, grupo 1 y sesiones el mismo dia 1), la falta de continuidad del hijo completo y la desviacion de la previa
+    def costo_opciones(self, tablas: list[np.ndarray], filas: np.ndarray, curso: int, opciones: np.ndarray,
+                       peso_continuidad: float) -> np.ndarray:
+        salon, docente, grupo, sesion, grupo_dia, periodo = self.claves_ocupacion(curso, opciones)
+        costo = 5 * tablas[0][filas, salon] + tablas[2][filas, grupo]
+        con_docente = docente >= 0
+        if con_docente.any():
+            comun = self.docente_comun[curso, np.maximum(opciones[..., DOCENTE], 0)]
+            costo += np.where(con_docente, tablas[1][filas, np.maximum(docente, 0)]
+                              + 5 * ~self.disponible[comun, opciones[..., FRANJA]], 0)
+        if self.sesiones_multiples[curso]:
+            costo += tablas[3][filas, sesion]
+        continuidad = self.continuidad_opciones(tablas, filas, grupo_dia, periodo)
+        costo = costo + peso_continuidad * (100 - continuidad) / 100
+        if self.previa is not None:
+            costo += self.peso_desviacion * (opciones != self.previa[curso]).any(axis=-1)
+        return costo
+
+    # Continuidad de calcular_continuidad que tendria cada hijo con una opcion agregada en (grupo_dia, periodo):
+    # el promedio de consecutivos / (cursos - 1) de los grupos y dias con al menos dos cursos, la opcion solo cambia
+    # su grupo y dia, y si ocupa un periodo libre suma un par consecutivo por cada vecino ocupado
+    def continuidad_opciones(self, tablas: list[np.ndarray], filas: np.ndarray, grupo_dia: np.ndarray,
+                             periodo: np.ndarray) -> np.ndarray:
+        tamano, consecutivos = tablas[5][filas], tablas[6][filas]
+        validos = tamano >= 2
+        porcentaje = np.where(validos, 100 * consecutivos / np.maximum(tamano - 1, 1), 0)
+        suma = porcentaje.sum(axis=1)
+        cantidad = validos.sum(axis=1)
+
+        fila = np.arange(len(filas))
+        libre = tablas[4][filas, grupo_dia, periodo] == 0
+        nuevos = np.where(libre, self.vecinos_ocupados(tablas[4], filas, grupo_dia, periodo), 0)
+        tamano_nuevo = tamano[fila, grupo_dia] + 1
+        valido_nuevo = tamano_nuevo >= 2
+        porcentaje_nuevo = np.where(valido_nuevo, 100 * (consecutivos[fila, grupo_dia] + nuevos)
+                                    / np.maximum(tamano_nuevo - 1, 1), 0)
+        suma = suma - porcentaje[fila, grupo_dia] + porcentaje_nuevo
+        cantidad = cantidad - validos[fila, grupo_dia] + valido_nuevo
+        return np.where(cantidad > 0, suma / np.maximum(cantidad, 1), 100)
+
+    # Genera una generacion de hijos: matriz son los padres codificados, indices las parejas seleccionadas
+    def variacion(self, matriz: np.ndarray, indices, tasa_mutacion: float, prob_uniforme: float,
+                  prob_exploracion: float | None = None) -> np.ndarray:
+        return self.variacion_con_operadores(matriz, indices, tasa_mutacion, prob_uniforme, prob_exploracion)[0]
+
+    # Igual que variacion, pero tambien devuelve que hijos usaron cruza uniforme y cuales mutacion dirigida
+    # uniforme y dirigidos fijan esos operadores por hijo en lugar de sortearlos, reparados, tasa_aleatoria
+    # y peso_continuidad se pasan a mutar
+    def variacion_con_operadores(self, matriz: np.ndarray, indices, tasa_mutacion: float, prob_uniforme: float,
+                                 prob_exploracion: float | None = None, uniforme: np.ndarray | None = None,
+                                 dirigidos: np.ndarray | None = None, reparados: np.ndarray | None = None,
+                                 tasa_aleatoria: float | None = None,
+                                 peso_continuidad: float = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        indices = np.asarray(indices, dtype=np.intp).reshape(-1, 2)
+        hijos, uniforme = self.cruzar(matriz[indices[:, 0]], matriz[indices[:, 1]], prob_uniforme, uniforme)
+        if dirigidos is None:
+            dirigidos = np.full(len(hijos), prob_exploracion is not None)
+        return (self.mutar(hijos, tasa_mutacion, prob_exploracion, dirigidos, reparados, tasa_aleatoria,
+                           peso_continuidad),
+                uniforme, dirigidos)
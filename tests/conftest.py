@@ -0,0 +1,183 @@
+import json
+import random
+import time
+from pathlib import Path
+
+import pytest
+
+from models import Curso, Docente, DocenteCurso, Salon
+from models.franja import HORAS_POR_DEFECTO, crear_franjas
+from utils.algoritmo import AmbienteAlgoritmo
+from utils.data_handler import cargar_cursos, cargar_docentes, cargar_relaciones, cargar_salones
+
+RAIZ = Path(__file__).resolve().parent.parent
+DATOS = RAIZ / "data_usada"
+REFERENCIAS = Path(__file__).resolve().parent / "referencias"
+DIAS = ["Lunes", "Martes", "Miercoles", "Jueves", "Viernes"]
+
+def pytest_addoption(parser):
+    parser.addoption("--actualizar-referencias", action="store_true",
+                     help="guarda los resultados y tiempos actuales como nuevas referencias")
+    parser.addoption("--tolerancia-rendimiento", type=float, default=2.0,
+                     help="cuantas veces mas lento que la referencia puede ser un benchmark")
+
+# Valores de referencia guardados en tests/referencias/<nombre>.json
+# Con --actualizar-referencias los valores actuales reemplazan a los guardados
+class Referencias:
+    def __init__(self, archivo: Path, actualizar: bool):
+        self.archivo = archivo
+        self.actualizar = actualizar
+        self.valores = json.loads(archivo.read_text(encoding="utf-8")) if archivo.exists() else {}
+        self.modificado = False
+
+    def esperado(self, clave: str):
+        if self.actualizar:
+            return None
+        if clave not in self.valores:
+            pytest.skip(f"No hay referencia para {clave}, ejecute pytest --actualizar-referencias")
+        return self.valores[clave]
+
+    def guardar(self, clave: str, valor):
+        self.valores[clave] = valor
+        self.modificado = True
+
+    # Compara un resultado con su referencia (o la actualiza), las listas anidadas se comparan aplanadas
+    def verificar(self, clave: str, valor):
+        esperado = self.esperado(clave)
+        if self.actualizar:
+            self.guardar(clave, valor)
+            return
+        assert aplanar(valor) == pytest.approx(aplanar(esperado)), clave
+
+    def escribir(self):
+        if self.modificado:
+            self.archivo.parent.mkdir(parents=True, exist_ok=True)
+            self.archivo.write_text(json.dumps(self.valores, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
+                                    encoding="utf-8")
+
+def aplanar(valor) -> list:
+    if isinstance(valor, (list, tuple)):
+        return [elemento for parte in valor for elemento in aplanar(parte)]
+    return [valor]
+
+def crear_referencias(request, nombre: str):
+    referencias = Referencias(REFERENCIAS / f"{nombre}.json", request.config.getoption("--actualizar-referencias"))
+    yield referencias
+    referencias.escribir()
+
+@pytest.fixture(scope="session")
+def referencias_resultados(request):
+    yield from crear_referencias(request, "resultados")
+
+@pytest.fixture(scope="session")
+def referencias_rendimiento(request):
+    yield from crear_referencias(request, "rendimiento")
+
+# Ambiente listo para evaluar: generacion 3 de 10 con peso de continuidad 10
+def preparar_ambiente(cursos, salones, docentes, relaciones, franjas=None, usar_aceleracion=False) -> AmbienteAlgoritmo:
+    ambiente = AmbienteAlgoritmo()
+    ambiente.callback_log = lambda mensaje: None
+    ambiente.usar_aceleracion = usar_aceleracion
+    ambiente.generar_pdf = False
+    ambiente.preparar_data(cursos, salones, docentes, relaciones, franjas)
+    ambiente.total_generaciones = 10
+    ambiente.generacion_actual = 3
+    ambiente.penalizacion_continuidad = 10
+    return ambiente
+
+@pytest.fixture
+def crear_ambiente():
+    return preparar_ambiente
+
+# Instancia de data_usada, con semana=True en una semana de cinco dias y un tercio de los cursos con dos sesiones
+@pytest.fixture
+def ambiente_usada():
+    def crear(semana: bool = False, usar_aceleracion: bool = False) -> AmbienteAlgoritmo:
+        cursos = cargar_cursos(DATOS / "cursos.csv")
+        franjas = None
+        if semana:
+            franjas = crear_franjas(DIAS, HORAS_POR_DEFECTO)
+            for curso in cursos[::3]:
+                curso.sesiones = 2
+        return preparar_ambiente(cursos, cargar_salones(DATOS / "salones.csv"), cargar_docentes(DATOS / "docentes.csv"),
+                                 cargar_relaciones(DATOS / "relaciones_docente_curso.csv"), franjas, usar_aceleracion)
+    return crear
+
+# Instancia generada con una semilla: grupos de cursos por carrera y semestre, salones con capacidad y tipo,
+# docentes con horarios parciales y cursos con varias sesiones
+@pytest.fixture
+def ambiente_sintetico():
+    def crear(cursos: int = 60, salones: int = 8, docentes: int = 15, dias: int = 5, semilla: int = 0,
+              usar_aceleracion: bool = False) -> AmbienteAlgoritmo:
+        generador = random.Random(semilla)
+        lista_salones = [Salon(f"Salon {i}", f"S{i:02d}", generador.choice([30, 60, 90]),
+                               "Laboratorio" if i % 4 == 0 else "Aula") for i in range(salones)]
+        lista_docentes = []
+        for i in range(docentes):
+            entrada = generador.choice(["13:00", "13:40", "15:20", "17:00"])
+            salida = generador.choice(["19:30", "20:20", "22:00"])
+            lista_docentes.append(Docente(f"Docente {i}", f"D{i:03d}", entrada, salida))
+        lista_cursos = []
+        relaciones = []
+        for i in range(cursos):
+            laboratorio = generador.random() < 0.1
+            lista_cursos.append(Curso(f"Curso {i}", f"C{i:03d}", f"Carrera {i % 3}", 1 + (i // 3) % 6, "A",
+                                      "Obligatorio", generador.choice([1, 1, 2, 3]), generador.choice([20, 40, 80]),
+                                      "Laboratorio" if laboratorio else None))
+            for docente in generador.sample(lista_docentes, generador.choice([0, 1, 2, 3])):
+                relaciones.append(DocenteCurso(docente.registro, f"C{i:03d}"))
+        franjas = crear_franjas(DIAS[:dias], HORAS_POR_DEFECTO)
+        return preparar_ambiente(lista_cursos, lista_salones, lista_docentes, relaciones, franjas, usar_aceleracion)
+    return crear
+
+# Trabajo fijo de Python puro, los tiempos de los benchmarks se guardan relativos a el
+# para que las referencias sirvan en maquinas de distinta velocidad
+def tiempo_calibracion() -> float:
+    def trabajo():
+        conteo = {}
+        for i in range(200_000):
+            clave = (i % 97, i % 13)
+            conteo[clave] = conteo.get(clave, 0) + 1
+        return sorted(conteo.values())
+    return medir(trabajo, repeticiones=10)
+
+# Menor tiempo de varias repeticiones, el menos afectado por otros procesos
+def medir(funcion, repeticiones: int = 5) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+@pytest.fixture(scope="session")
+def calibracion() -> float:
+    return tiempo_calibracion()
+
+# Compara el tiempo de un benchmark (relativo a la calibracion) con su referencia
+@pytest.fixture
+def comparar_rendimiento(request, referencias_rendimiento, calibracion):
+    tolerancia = request.config.getoption("--tolerancia-rendimiento")
+
+    def comparar(clave: str, funcion, repeticiones: int = 10):
+        relativo = medir(funcion, repeticiones) / calibracion
+        esperado = referencias_rendimiento.esperado(clave)
+        if referencias_rendimiento.actualizar:
+            referencias_rendimiento.guardar(clave, round(relativo, 4))
+            return
+        assert relativo <= esperado * tolerancia, (
+            f"{clave}: {relativo:.3f} veces la calibracion, la referencia es {esperado:.3f} "
+            f"(tolerancia {tolerancia}x)")
+    return comparar
+
+# Compara dos variantes medidas en la misma sesion, sin referencias guardadas: una optimizacion no puede ser
+# mas lenta que el codigo que reemplaza, aunque las referencias se hayan guardado con ese tiempo
+@pytest.fixture
+def comparar_con_original(request):
+    tolerancia = request.config.getoption("--tolerancia-rendimiento")
+
+    def comparar(nombre: str, funcion, original, repeticiones: int = 3):
+        tiempo, tiempo_original = medir(funcion, repeticiones), medir(original, repeticiones)
+        assert tiempo <= tiempo_original * tolerancia, (
+            f"{nombre}: {tiempo / tiempo_original:.2f} veces el tiempo del original (tolerancia {tolerancia}x)")
+    return comparar
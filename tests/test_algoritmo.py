@@ -0,0 +1,207 @@
+import random
+
+import pytest
+
+from models import Curso, Docente, DocenteCurso, Salon
+from models.franja import crear_franjas
+from utils.poblacion import PoblacionOrdenada
+from utils.solvers import PARAMETROS_POR_DEFECTO, Solver, SolverGenetico, SolverRecocido
+
+# Instancia pequena: dos salones, un docente de 13:00 a 14:30 y los periodos 13:40, 14:30 y 15:20 de lunes y martes
+# Los cursos C1 y C2 son del mismo grupo, C3 de otro y C4 tiene dos sesiones
+@pytest.fixture
+def ambiente_pequeno(crear_ambiente):
+    cursos = [Curso("Curso 1", "C1", "Sistemas", 1, "A", "Obligatorio"),
+              Curso("Curso 2", "C2", "Sistemas", 1, "A", "Obligatorio"),
+              Curso("Curso 3", "C3", "Civil", 2, "A", "Obligatorio"),
+              Curso("Curso 4", "C4", "Civil", 4, "A", "Obligatorio", sesiones=2)]
+    salones = [Salon("Salon 1", "S1"), Salon("Salon 2", "S2")]
+    docentes = [Docente("Docente 1", "D1", "13:00", "14:30")]
+    relaciones = [DocenteCurso("D1", "C1"), DocenteCurso("D1", "C3")]
+    franjas = crear_franjas(["Lunes", "Martes"], ["13:40", "14:30", "15:20"])
+    return crear_ambiente(cursos, salones, docentes, relaciones, franjas)
+
+# Individuo con los genes (salon, dia, periodo, con docente) de cada curso de la instancia pequena
+def individuo(ambiente, genes) -> dict:
+    resultado = {}
+    for curso, (salon, dia, periodo, con_docente) in zip(ambiente.cursos, genes):
+        franja = ambiente.franjas[dia * 3 + periodo]
+        resultado[curso] = (ambiente.salones[salon], franja, ambiente.docentes[0] if con_docente else None)
+    return resultado
+
+def test_tres_cursos_en_el_mismo_salon_y_franja(ambiente_pequeno):
+    # C1, C3 y la segunda sesion de C4 en el salon 1 el lunes a las 15:20: tres pares
+    horario = individuo(ambiente_pequeno, [(0, 0, 2, False), (1, 0, 0, False), (0, 0, 2, False),
+                                           (1, 1, 0, False), (0, 0, 2, False)])
+    assert ambiente_pequeno.choques(horario) == (15, 3)
+    assert {curso.codigo for curso in ambiente_pequeno.cursos_en_conflicto(horario)["salon"]} == {"C1", "C3", "C4"}
+
+def test_disponibilidad_y_choque_de_docente(ambiente_pequeno):
+    # el docente sale a las 14:30, no cubre el periodo de las 14:30 a las 15:20
+    horario = individuo(ambiente_pequeno, [(0, 0, 1, True), (1, 0, 0, False), (1, 1, 1, False),
+                                           (0, 1, 0, False), (1, 0, 2, False)])
+    assert ambiente_pequeno.choques(horario) == (5, 1)
+
+    # el mismo docente en dos salones a la vez
+    horario = individuo(ambiente_pequeno, [(0, 0, 0, True), (0, 1, 0, False), (1, 0, 0, True),
+                                           (0, 1, 1, False), (0, 0, 2, False)])
+    assert ambiente_pequeno.choques(horario) == (1, 1)
+
+def test_penalizaciones_de_grupo_y_sesiones(ambiente_pequeno):
+    # C1 y C2 (mismo grupo) en la misma franja y salones distintos: penalizacion sin conflicto
+    horario = individuo(ambiente_pequeno, [(0, 0, 0, False), (1, 0, 0, False), (0, 1, 1, False),
+                                           (0, 1, 0, False), (1, 0, 2, False)])
+    assert ambiente_pequeno.choques(horario) == (1, 0)
+
+    # las dos sesiones de C4 el mismo dia
+    horario = individuo(ambiente_pequeno, [(0, 0, 0, False), (1, 0, 1, False), (0, 1, 1, False),
+                                           (0, 0, 1, False), (0, 0, 2, False)])
+    assert ambiente_pequeno.choques(horario) == (1, 0)
+
+    horario = individuo(ambiente_pequeno, [(0, 0, 0, False), (1, 0, 1, False), (0, 1, 1, False),
+                                           (0, 0, 1, False), (0, 1, 2, False)])
+    assert ambiente_pequeno.choques(horario) == (0, 0)
+
+@pytest.mark.parametrize("periodos, esperada", [
+    # periodos de C1 y C2 el lunes (C3 y C4 quedan solos en su grupo y dia)
+    ((0, 1), 100), ((0, 2), 0), ((1, 0), 100),
+])
+def test_continuidad(ambiente_pequeno, periodos, esperada):
+    horario = individuo(ambiente_pequeno, [(0, 0, periodos[0], False), (1, 0, periodos[1], False),
+                                           (0, 1, 1, False), (0, 0, 1, False), (0, 1, 2, False)])
+    assert ambiente_pequeno.calcular_continuidad(horario) == esperada
+
+def test_continuidad_promedia_grupos_y_separa_dias(ambiente_pequeno):
+    # C1 y C2 consecutivos (100) y las dos sesiones de C4 separadas el lunes (0)
+    horario = individuo(ambiente_pequeno, [(0, 0, 0, False), (1, 0, 1, False), (0, 1, 1, False),
+                                           (1, 0, 0, False), (1, 0, 2, False)])
+    assert ambiente_pequeno.calcular_continuidad(horario) == 50
+    # periodos seguidos en dias distintos no son consecutivos, sin grupos de dos cursos la continuidad es 100
+    horario = individuo(ambiente_pequeno, [(0, 0, 2, False), (1, 1, 0, False), (0, 1, 1, False),
+                                           (1, 0, 0, False), (1, 1, 2, False)])
+    assert ambiente_pequeno.calcular_continuidad(horario) == 100
+
+def test_funcion_costo_combina_choques_y_continuidad(ambiente_pequeno):
+    horario = individuo(ambiente_pequeno, [(0, 0, 0, False), (1, 0, 0, False), (0, 1, 1, False),
+                                           (1, 0, 1, False), (1, 0, 2, False)])
+    # generacion 3 de 10 con peso inicial 10: peso 10 + (50 - 10) * 0.3 = 22
+    # choques: C1 y C2 en la misma franja y las dos sesiones de C4 el lunes
+    # continuidad: C1 y C2 en el mismo periodo (0) y las sesiones de C4 consecutivas (100)
+    assert ambiente_pequeno.choques(horario) == (2, 0)
+    assert ambiente_pequeno.funcion_costo(horario) == pytest.approx((2 + 22 * 0.5, 0, 50))
+    assert ambiente_pequeno.evaluaciones == 1
+
+def test_diversidad(ambiente_pequeno):
+    base = individuo(ambiente_pequeno, [(0, 0, 0, False), (1, 0, 0, False), (0, 1, 1, False),
+                                        (1, 0, 1, False), (1, 0, 2, False)])
+    otro = dict(base)
+    otro[ambiente_pequeno.cursos[0]] = (ambiente_pequeno.salones[1],) + base[ambiente_pequeno.cursos[0]][1:]
+    distinto = individuo(ambiente_pequeno, [(1, 1, 2, True), (0, 1, 2, False), (1, 0, 0, True),
+                                            (0, 1, 0, False), (0, 1, 1, False)])
+    assert ambiente_pequeno.calcular_diversidad([base, dict(base)]) == 0
+    assert ambiente_pequeno.distancia(base, otro) == pytest.approx(1 / 5)
+    # pares: base-otro 1/5, base-distinto 1, otro-distinto 1
+    assert ambiente_pequeno.calcular_diversidad([base, otro, distinto]) == pytest.approx((1 / 5 + 2) / 3)
+    assert ambiente_pequeno.calcular_diversidad([base]) == 0
+
+# Los miembros del estado estacionario se comparan con el peso de continuidad actual, no con el de su insercion
+def test_poblacion_ordenada_se_repondera_al_cambiar_el_peso(ambiente_pequeno):
+    ambiente_pequeno.sembrar(3)
+    poblacion = [ambiente_pequeno.crear_individuo() for _ in range(8)]
+    ordenada = PoblacionOrdenada(ambiente_pequeno.evaluar_poblacion(poblacion),
+                                 ambiente_pequeno.peso_continuidad_actual())
+    ambiente_pequeno.generacion_actual = 9
+    ordenada.reponderar(ambiente_pequeno.peso_continuidad_actual())
+    esperados = sorted(ambiente_pequeno.funcion_costo(individuo)[0] for individuo in poblacion)
+    assert [entrada[0] for entrada in ordenada.ordenadas()] == pytest.approx(esperados)
+    for costo, _, individuo, _ in ordenada.entradas:
+        assert costo == pytest.approx(ambiente_pequeno.funcion_costo(individuo)[0])
+    assert ordenada.mejor()[0] == pytest.approx(esperados[0]) and ordenada.peor()[0] == pytest.approx(esperados[-1])
+
+# Reemplazos al azar: el peor y el mejor siguen a los de la lista y el torneo inverso nunca elige al mejor
+def test_poblacion_ordenada_reemplazos():
+    rng = random.Random(4)
+    ordenada = PoblacionOrdenada([(rng.randint(0, 20), 0, None, 0) for _ in range(12)])
+    for _ in range(300):
+        costos = [entrada[0] for entrada in ordenada.entradas]
+        assert ordenada.peor()[0] == max(costos) and ordenada.mejor()[0] == min(costos)
+        if rng.random() < 0.5:
+            posicion = ordenada.posicion_torneo(3, rng)
+            assert posicion != ordenada.posicion_mejor
+        else:
+            posicion = ordenada.posicion_peor()
+        ordenada.reemplazar(posicion, (costos[posicion] - rng.randint(1, 5), 0, None, 0))
+    assert len(ordenada.heap) <= 2 * len(ordenada)
+
+# Resultados fijos con semilla, cambian si cambia la funcion de costo o la forma de recorrer el espacio de busqueda
+# (se regeneran con pytest --actualizar-referencias)
+def costos_aleatorios(ambiente, semilla: int) -> list:
+    ambiente.sembrar(semilla)
+    poblacion = [ambiente.crear_individuo() for _ in range(20)]
+    return [list(ambiente.funcion_costo(individuo)) + [ambiente.calcular_diversidad(poblacion[:i + 2])]
+            for i, individuo in enumerate(poblacion)]
+
+@pytest.mark.parametrize("semana", [False, True])
+def test_costos_fijos_data_usada(ambiente_usada, referencias_resultados, semana):
+    referencias_resultados.verificar(f"costos data_usada semana={semana}", costos_aleatorios(ambiente_usada(semana), 5))
+
+def test_costos_fijos_sintetico(ambiente_sintetico, referencias_resultados):
+    referencias_resultados.verificar("costos sintetico", costos_aleatorios(ambiente_sintetico(), 5))
+
+# Con penalizacion_esperada -1 nunca se cumple el criterio de convergencia y se ejecutan todas las generaciones,
+# las ejecuciones fijas lo comprueban antes de comparar con la referencia
+def resumen(ambiente) -> list:
+    return [ambiente.penalizacion_por_generacion, ambiente.conflictos_por_generacion,
+            ambiente.continuidad_por_generacion, ambiente.evaluaciones]
+
+@pytest.mark.parametrize("variacion_por_lotes", [False, True])
+def test_ejecucion_fija_genetico(ambiente_usada, referencias_resultados, variacion_por_lotes):
+    ambiente = ambiente_usada(True)
+    SolverGenetico(ambiente).resolver(10, {**PARAMETROS_POR_DEFECTO, "variacion_por_lotes": variacion_por_lotes,
+                                           "penalizacion_esperada": -1, "semilla": 21})
+    assert len(ambiente.conflictos_por_generacion) == 10 and ambiente.motivo_terminacion == "generaciones"
+    referencias_resultados.verificar(f"genetico data_usada lotes={variacion_por_lotes}", resumen(ambiente))
+
+# La variacion por lotes llega a soluciones de la misma calidad que la variacion por hijo con la misma semilla
+def test_variacion_por_lotes_calidad_comparable(ambiente_usada):
+    finales = {}
+    for variacion_por_lotes in (False, True):
+        ambiente = ambiente_usada()
+        SolverGenetico(ambiente).resolver(40, {**PARAMETROS_POR_DEFECTO, "variacion_por_lotes": variacion_por_lotes,
+                                               "penalizacion_esperada": -1, "semilla": 3})
+        finales[variacion_por_lotes] = ambiente.penalizacion_por_generacion[-1], ambiente.conflictos_por_generacion[-1]
+    (penalizacion, conflictos), (penalizacion_lotes, conflictos_lotes) = finales[False], finales[True]
+    assert conflictos_lotes <= conflictos
+    assert penalizacion_lotes <= 1.5 * penalizacion
+
+# En el estado estacionario por lotes la matriz se actualiza por filas y sigue igual a codificar la poblacion
+def test_estacionario_por_lotes_actualiza_filas(ambiente_usada):
+    ambiente = ambiente_usada()
+    SolverGenetico(ambiente).resolver(5, {**PARAMETROS_POR_DEFECTO, "variacion_por_lotes": True,
+                                          "modo_evolucion": "estacionario", "penalizacion_esperada": -1, "semilla": 8})
+    individuos = [entrada[2] for entrada in ambiente.entradas_codificadas]
+    assert (ambiente.matriz_codificada == ambiente.codificacion.codificar(individuos)).all()
+
+# Los movimientos del recocido nunca sacan un gen del dominio de su curso
+def test_vecino_recocido_respeta_dominios(ambiente_usada):
+    ambiente = ambiente_usada(True)
+    ambiente.sembrar(6)
+    solver = SolverRecocido(ambiente)
+    horario = ambiente.crear_individuo()
+    for _ in range(2000):
+        for curso, _ in solver.vecino(horario):
+            assert ambiente.dominios[curso].admite(*horario[curso])
+
+def test_ejecucion_fija_recocido(ambiente_sintetico, referencias_resultados):
+    ambiente = ambiente_sintetico()
+    SolverRecocido(ambiente).resolver(10, {**PARAMETROS_POR_DEFECTO, "penalizacion_esperada": -1, "semilla": 21})
+    assert len(ambiente.conflictos_por_generacion) == 10 and ambiente.motivo_terminacion == "generaciones"
+    referencias_resultados.verificar("recocido sintetico", resumen(ambiente))
+
+# Un motor sin resolver falla al crearlo, no a mitad de una ejecucion
+def test_solver_sin_resolver():
+    class SinResolver(Solver):
+        nombre = "Sin resolver"
+
+    with pytest.raises(TypeError):
+        SinResolver()
@@ -0,0 +1,68 @@
+import sqlite3
+
+from utils.almacen import ESQUEMA, VERSION_ESQUEMA, AlmacenEjecuciones
+from utils.solvers import PARAMETROS_POR_DEFECTO, SolverGenetico
+
+# Historial anterior a las franjas semanales: asignaciones sin sesion ni dia y user_version 0
+ASIGNACIONES_ANTERIOR = """
+CREATE TABLE asignaciones (
+    ejecucion_id INTEGER NOT NULL REFERENCES ejecuciones(id) ON DELETE CASCADE,
+    curso TEXT NOT NULL,
+    salon TEXT NOT NULL,
+    hora TEXT NOT NULL,
+    docente TEXT,
+    PRIMARY KEY (ejecucion_id, curso)
+) WITHOUT ROWID;
+"""
+
+def test_migrar_historial_anterior_y_reconstruir(ambiente_usada, tmp_path):
+    ambiente = ambiente_usada()
+    ambiente.sembrar(1)
+    horario = ambiente.crear_individuo()
+    ruta = tmp_path / "ejecuciones.db"
+    conexion = sqlite3.connect(ruta)
+    conexion.executescript(ASIGNACIONES_ANTERIOR + ESQUEMA)
+    conexion.execute("INSERT INTO ejecuciones (id, fecha, motor, huella_dataset, cantidad_cursos, parametros, "
+                     "conflictos, continuidad) VALUES (1, 0, 'genetico', 'x', ?, '{}', 0, 0)", (len(horario),))
+    conexion.executemany("INSERT INTO asignaciones VALUES (1, ?, ?, ?, ?)",
+                         [(curso.codigo, str(salon.id), franja.hora,
+                           str(docente.registro) if docente is not None else None)
+                          for curso, (salon, franja, docente) in horario.items()])
+    conexion.commit()
+    conexion.close()
+
+    with AlmacenEjecuciones(str(ruta)) as almacen:
+        assert almacen.conexion.execute("PRAGMA user_version").fetchone()[0] == VERSION_ESQUEMA
+        columnas = [fila[1] for fila in almacen.conexion.execute("PRAGMA table_info(asignaciones)")]
+        assert {"sesion", "dia"} <= set(columnas)
+        asignaciones = almacen.asignaciones(1)
+    assert len(asignaciones) == len(horario)
+    assert all(asignacion["sesion"] == 0 and "dia" not in asignacion for asignacion in asignaciones)
+    # las asignaciones migradas quedan en el primer dia, el de la instancia de un solo dia
+    solucion, afectados = ambiente.reconstruir_solucion(asignaciones)
+    assert solucion == horario and not afectados
+
+    # una base ya migrada se abre sin volver a migrar
+    with AlmacenEjecuciones(str(ruta)) as almacen:
+        assert almacen.asignaciones(1) == asignaciones
+
+def test_guardar_ejecucion_y_reconstruir(ambiente_usada, tmp_path):
+    ambiente = ambiente_usada(True)
+    parametros = {**PARAMETROS_POR_DEFECTO, "penalizacion_esperada": -1, "semilla": 4}
+    SolverGenetico(ambiente).resolver(5, parametros)
+
+    with AlmacenEjecuciones(str(tmp_path / "historial" / "ejecuciones.db")) as almacen:
+        ejecucion_id = almacen.guardar_ejecucion(ambiente, "genetico", parametros)
+        ejecucion = almacen.ejecucion(ejecucion_id)
+        metricas = almacen.metricas(ejecucion_id)
+        asignaciones = almacen.asignaciones(ejecucion_id)
+        assert almacen.mejores_ejecuciones(ejecucion["huella_dataset"])[0]["id"] == ejecucion_id
+
+    assert ejecucion["parametros"]["semilla"] == 4
+    assert ejecucion["conflictos"] == ambiente.conflictos_mejor_individuo
+    assert [fila["generacion"] for fila in metricas] == list(range(len(ambiente.penalizacion_por_generacion)))
+    assert [fila["conflictos"] for fila in metricas] == ambiente.conflictos_por_generacion
+    # las sesiones semanales se guardan con su dia y el horario se reconstruye igual
+    assert len(asignaciones) == len(ambiente.cursos)
+    solucion, afectados = ambiente.reconstruir_solucion(asignaciones)
+    assert solucion == ambiente.resultado and not afectados
@@ -0,0 +1,168 @@
+import pickle
+import random
+import threading
+import time
+
+import pytest
+
+from utils.ejecuciones import GrupoEjecuciones, Portafolio, ejecutar_en_ambiente
+from utils.solvers import PARAMETROS_POR_DEFECTO
+
+PARAMETROS = {**PARAMETROS_POR_DEFECTO, "penalizacion_esperada": -1}
+
+def ejecutar_con_semilla(ambiente, motor: str = "genetico", **opciones) -> dict:
+    return ejecutar_en_ambiente(ambiente, motor, 8, {**PARAMETROS, "semilla": 21}, **opciones)
+
+# La instancia preparada se reutiliza: una reprogramacion anterior no cambia la siguiente ejecucion
+def test_instancia_reutilizada_igual_a_una_nueva(ambiente_usada):
+    ambiente = ambiente_usada(True)
+    previa = [{"curso": curso.codigo, "sesion": curso.sesion, "salon": salon.id, "dia": franja.dia,
+               "hora": franja.hora, "docente": docente.registro if docente is not None else None}
+              for curso, (salon, franja, docente) in ambiente.crear_individuo().items()]
+    ejecutar_con_semilla(ambiente, "recocido", solucion_previa=previa, peso_desviacion=5)
+    assert ambiente.solucion_previa is not None
+
+    reutilizada = ejecutar_con_semilla(ambiente)
+    nueva = ejecutar_con_semilla(ambiente_usada(True))
+    assert not reutilizada["reprogramacion"]
+    for clave in ("penalizaciones", "conflictos", "continuidades", "evaluaciones"):
+        assert reutilizada[clave] == nueva[clave]
+
+def test_instancia_serializada_sin_callbacks(ambiente_usada):
+    ambiente = ambiente_usada()
+    ambiente.callback_generacion = lambda metricas: None
+    copia = pickle.loads(pickle.dumps(ambiente))
+    assert copia.callback_generacion is None and copia.callback_log is None
+    assert [curso.indice for curso in copia.cursos] == [curso.indice for curso in ambiente.cursos]
+    assert set(copia.dominios) == set(copia.cursos)
+
+# Varias configuraciones a la vez sobre la misma instancia, cada una reporta su progreso
+def test_grupo_ejecuta_configuraciones_en_paralelo(ambiente_usada, tmp_path):
+    ambiente = ambiente_usada()
+    instancia = pickle.dumps(ambiente)
+    grupo = GrupoEjecuciones(2, str(tmp_path))
+    try:
+        enviadas = [grupo.enviar(instancia, motor, 5, PARAMETROS, generar_pdf=False)
+                    for motor in ("genetico", "recocido", "genetico")]
+        resultados = {id_ejecucion: futuro.result(timeout=120) for id_ejecucion, futuro in enviadas}
+        # las metricas llegan por otra cola, pueden llegar despues del resultado
+        progreso = {}
+        limite = time.time() + 10
+        while sum(map(len, progreso.values())) < 15 and time.time() < limite:
+            for id_ejecucion, metricas in grupo.progreso():
+                progreso.setdefault(id_ejecucion, []).append(metricas["generacion"])
+            time.sleep(0.05)
+    finally:
+        grupo.detener()
+
+    for id_ejecucion, resultado in resultados.items():
+        assert len(resultado["conflictos"]) == 5
+        assert progreso[id_ejecucion] == list(range(5))
+        horario = ambiente.internar_individuo(resultado["horario"])
+        assert set(horario) == set(ambiente.cursos)
+
+# Detener interrumpe la ejecucion en curso al final de su generacion y descarta las que estan en cola
+def test_grupo_detener_cancela_ejecuciones(ambiente_usada, tmp_path):
+    grupo = GrupoEjecuciones(1, str(tmp_path))
+    instancia = pickle.dumps(ambiente_usada())
+    enviadas = [grupo.enviar(instancia, "genetico", 100000, PARAMETROS, generar_pdf=False) for _ in range(3)]
+    limite = time.time() + 60
+    while not grupo.progreso() and time.time() < limite:
+        time.sleep(0.05)
+    grupo.detener()
+
+    _, primera = enviadas[0]
+    resultado = primera.result(timeout=60)
+    assert resultado["motivo_terminacion"] == "cancelada" and len(resultado["conflictos"]) < 100000
+    # el ejecutor puede haber pasado una ejecucion mas a sus procesos, esa tambien termina cancelada
+    for _, futuro in enviadas[1:]:
+        assert futuro.cancelled() or futuro.result(timeout=60)["motivo_terminacion"] == "cancelada"
+    assert not grupo.cancelacion.is_set()
+
+# Cada ejecucion sortea de su propio generador, el estado del modulo random no la cambia
+def test_misma_semilla_misma_ejecucion(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    primera = ejecutar_con_semilla(ambiente)
+    random.seed(99)
+    ejecutar_en_ambiente(ambiente, "recocido", 3, PARAMETROS)
+    segunda = ejecutar_con_semilla(ambiente)
+    assert primera["semilla"] == segunda["semilla"] == 21
+    assert primera["penalizaciones"] == segunda["penalizaciones"]
+    assert primera["horario"] == segunda["horario"]
+
+def test_portafolio_descarta_rezagadas_en_la_misma_generacion(ambiente_usada):
+    portafolio = Portafolio(ambiente_usada(), "genetico", 10, PARAMETROS, semillas=[1, 2, 3], margen=0.5)
+    portafolio.mejores = [[30, 20, 10], [30, 25, 16], [40, 30]]
+    assert not portafolio.rezagada(0)
+    assert portafolio.rezagada(1)
+    # sin calentamiento cumplido no se descarta aunque vaya peor
+    portafolio.mejores[2] = [60]
+    assert not portafolio.rezagada(2)
+
+def test_portafolio_devuelve_la_mejor_semilla(ambiente_usada):
+    ambiente = ambiente_usada()
+    portafolio = Portafolio(ambiente, "genetico", 6, PARAMETROS, semillas=[3, 5, 8], max_procesos=3)
+    resultado = portafolio.ejecutar()
+    assert resultado["semilla"] in (3, 5, 8)
+    assert set(resultado["horario"]) == set(ambiente.cursos)
+    completadas = [ejecucion for ejecucion in resultado["portafolio"] if ejecucion["estado"] == "completada"]
+    assert min((ejecucion["conflictos"], -ejecucion["continuidad"]) for ejecucion in completadas) == (
+        resultado["conflictos_mejor_individuo"], -resultado["continuidad"])
+
+    repetida = ejecutar_en_ambiente(ambiente, "genetico", 6, {**PARAMETROS, "semilla": resultado["semilla"]})
+    assert repetida["penalizaciones"] == resultado["penalizaciones"]
+    assert repetida["horario"] == resultado["horario"]
+
+@pytest.mark.parametrize("motor", ["genetico", "recocido", "multiobjetivo"])
+def test_presupuesto_de_evaluaciones_sin_limite_de_generaciones(ambiente_usada, motor):
+    ambiente = ambiente_usada()
+    # el multiobjetivo no usa la penalizacion como criterio, un conflicto esperado imposible lo mantiene activo
+    parametros = {**PARAMETROS, "evaluar_conflicto": True, "conflicto_esperado": -1}
+    resultado = ejecutar_en_ambiente(ambiente, motor, 0, {**parametros, "max_evaluaciones": 300, "semilla": 4})
+    assert resultado["motivo_terminacion"] == "evaluaciones"
+    # se revisa al final de cada generacion, la anterior aun no llegaba al limite
+    assert resultado["evaluaciones"] >= 300 > ambiente.evaluaciones_por_generacion[-2]
+    assert 0 < ambiente.avance() <= 1
+
+def test_tiempo_limite(ambiente_usada):
+    resultado = ejecutar_en_ambiente(ambiente_usada(), "genetico", 0, {**PARAMETROS, "tiempo_limite": 0.5})
+    assert resultado["motivo_terminacion"] == "tiempo"
+    assert 0.5 <= resultado["tiempo"] < 5
+
+# Con presupuesto los calendarios siguen la fraccion consumida y no generacion / total_generaciones
+def test_calendarios_siguen_el_presupuesto(ambiente_usada):
+    ambiente = ambiente_usada()
+    ambiente.generacion_actual, ambiente.total_generaciones = 10, 1000
+    assert ambiente.avance() == 0.01
+    ambiente.iniciar_presupuesto(max_evaluaciones=200)
+    ambiente.evaluaciones = 100
+    ambiente.medir_presupuesto()
+    assert ambiente.avance() == 0.5
+    assert ambiente.penalizacion_continuidad_dinamica(ambiente.avance(), 10) == 30
+    assert ambiente.tasa_mutacion_adaptativa(0.3, ambiente.avance(), 1, 0.1) == pytest.approx(0.2)
+    # la fraccion queda fija hasta la siguiente generacion
+    ambiente.evaluaciones = 150
+    assert ambiente.avance() == 0.5
+    ambiente.medir_presupuesto()
+    assert ambiente.avance() == 0.75
+
+def test_mejor_hasta_ahora_desde_otro_hilo(ambiente_usada):
+    ambiente = ambiente_usada()
+    assert ambiente.mejor_hasta_ahora() is None
+    hilo = threading.Thread(target=ejecutar_en_ambiente,
+                            args=(ambiente, "genetico", 0, {**PARAMETROS, "tiempo_limite": 1.5}))
+    hilo.start()
+    parcial = None
+    while parcial is None and hilo.is_alive():
+        parcial = ambiente.mejor_hasta_ahora()
+        time.sleep(0.01)
+    hilo.join()
+
+    assert parcial is not None and parcial["tiempo"] < 1.5
+    final = ambiente.mejor_hasta_ahora()
+    assert final["evaluaciones"] >= parcial["evaluaciones"]
+    # el horario devuelto es una copia, cambiarlo no afecta a la ejecucion
+    parcial["horario"].clear()
+    assert set(ambiente.mejor_hasta_ahora()["horario"]) == set(ambiente.cursos)
+    _, conflictos, continuidad = ambiente.funcion_costo(final["horario"])
+    assert (conflictos, continuidad) == (final["conflictos"], final["continuidad"])
@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from utils import algoritmo
+from utils.costo_incremental import CostoIncremental
+from utils.evaluacion import EvaluadorAcelerado
+from utils.solvers import PARAMETROS_POR_DEFECTO, SolverGenetico, SolverRecocido
+from utils.variacion import CodificacionGenetica
+
+# Individuos aleatorios y otros con muchos choques: todos los cursos en pocos salones y franjas
+def poblacion_prueba(ambiente) -> list[dict]:
+    ambiente.sembrar(7)
+    rng = ambiente.rng
+    poblacion = [ambiente.crear_individuo() for _ in range(100)]
+    for _ in range(20):
+        salones = rng.sample(ambiente.salones, 2)
+        franjas = rng.sample(ambiente.franjas, 3)
+        poblacion.append({curso: (rng.choice(salones), rng.choice(franjas), docente)
+                          for curso, (_, _, docente) in ambiente.crear_individuo().items()})
+    return poblacion
+
+def crear_evaluador(ambiente) -> EvaluadorAcelerado:
+    return EvaluadorAcelerado(ambiente.cursos, ambiente.salones, ambiente.franjas, ambiente.docentes)
+
+# Sin numba AmbienteAlgoritmo usa su funcion de costo original, las comparaciones con el evaluador fuerzan los
+# nucleos (sin compilar si falta numba) para que siempre se compare la evaluacion sobre arreglos con la de Python
+@pytest.fixture
+def con_nucleos(monkeypatch):
+    monkeypatch.setattr(algoritmo, "NUMBA_DISPONIBLE", True)
+
+# Cuenta las matrices que evalua el evaluador, para comprobar que la evaluacion paso por los nucleos
+def contar_matrices(evaluador: EvaluadorAcelerado, monkeypatch) -> list:
+    matrices = []
+    evaluar_matriz = evaluador.evaluar_matriz
+
+    def contar(matriz):
+        matrices.append(len(matriz))
+        return evaluar_matriz(matriz)
+    monkeypatch.setattr(evaluador, "evaluar_matriz", contar)
+    return matrices
+
+@pytest.mark.parametrize("semana", [False, True])
+def test_nucleos_igual_que_python(ambiente_usada, semana):
+    ambiente = ambiente_usada(semana)
+    poblacion = poblacion_prueba(ambiente)
+
+    for individuo, (penalizacion, conflictos, continuidad) in zip(poblacion, crear_evaluador(ambiente).evaluar(poblacion)):
+        assert (penalizacion, conflictos) == ambiente.choques(individuo)
+        assert continuidad == ambiente.calcular_continuidad(individuo)
+
+def test_nucleos_igual_que_python_sintetico(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    poblacion = poblacion_prueba(ambiente)
+
+    for individuo, (penalizacion, conflictos, continuidad) in zip(poblacion, crear_evaluador(ambiente).evaluar(poblacion)):
+        assert (penalizacion, conflictos) == ambiente.choques(individuo)
+        assert continuidad == ambiente.calcular_continuidad(individuo)
+
+@pytest.mark.parametrize("semana", [False, True])
+def test_funcion_costo_igual_con_evaluador(ambiente_usada, semana, monkeypatch):
+    ambiente = ambiente_usada(semana)
+    poblacion = poblacion_prueba(ambiente)
+    assert ambiente.evaluador is None
+    esperados = [ambiente.funcion_costo(individuo) for individuo in poblacion]
+
+    ambiente.evaluador = crear_evaluador(ambiente)
+    matrices = contar_matrices(ambiente.evaluador, monkeypatch)
+    assert [ambiente.funcion_costo(individuo) for individuo in poblacion] == esperados
+    assert len(matrices) == len(poblacion)
+    assert ambiente.evaluar_lote(poblacion) == esperados
+    assert sum(matrices) == 2 * len(poblacion)
+
+def test_matriz_por_lotes_igual_que_python(ambiente_usada):
+    ambiente = ambiente_usada(True)
+    random.seed(3)
+    codificacion = CodificacionGenetica(ambiente.cursos, ambiente.salones, ambiente.franjas, ambiente.docentes_por_curso,
+                                        dominios=ambiente.dominios)
+    matriz = codificacion.genes_aleatorios(100)
+
+    partes = crear_evaluador(ambiente).evaluar_matriz(codificacion.genes_instancia(matriz))
+    for individuo, (penalizacion, conflictos, continuidad) in zip(codificacion.decodificar(matriz), partes):
+        assert (penalizacion, conflictos) == ambiente.choques(individuo)
+        assert continuidad == ambiente.calcular_continuidad(individuo)
+
+# El costo por diferencias de los motores de trayectoria sigue a funcion_costo movimiento a movimiento,
+# tambien en una reprogramacion con penalizacion por desviacion
+@pytest.mark.parametrize("reprogramacion", [False, True])
+def test_costo_incremental_igual_que_funcion_costo(ambiente_usada, reprogramacion):
+    ambiente = ambiente_usada(True)
+    ambiente.sembrar(5)
+    horario = ambiente.crear_individuo()
+    if reprogramacion:
+        ambiente.solucion_previa, ambiente.solucion_base = dict(horario), dict(horario)
+        ambiente.lista_genes_libres = ambiente.cursos[::2]
+        ambiente.genes_libres = set(ambiente.lista_genes_libres)
+        ambiente.peso_desviacion = 3
+    solver = SolverRecocido(ambiente)
+    estado = CostoIncremental(ambiente, horario)
+    for _ in range(1000):
+        originales = solver.vecino(horario)
+        estado.aplicar(horario, originales)
+        assert estado.costo() == pytest.approx(ambiente.funcion_costo(horario))
+        if ambiente.rng.random() < 0.5:
+            estado.revertir(horario, originales)
+            solver.deshacer(horario, originales)
+
+# Sin numba la aceleracion pedida usa la funcion de costo original, no los nucleos sin compilar
+def test_sin_numba_se_usa_la_funcion_de_costo(ambiente_usada, monkeypatch):
+    monkeypatch.setattr(algoritmo, "NUMBA_DISPONIBLE", False)
+    ambiente = ambiente_usada(usar_aceleracion=True)
+    ambiente.preparar_evaluador()
+    assert ambiente.evaluador is None
+
+# La misma semilla da la misma ejecucion con cualquiera de los dos evaluadores
+@pytest.mark.parametrize("variacion_por_lotes", [False, True])
+def test_ejecucion_igual_con_evaluador(ambiente_usada, variacion_por_lotes, con_nucleos, monkeypatch):
+    ejecuciones = []
+    for usar_aceleracion in (False, True):
+        ambiente = ambiente_usada(True, usar_aceleracion)
+        assert (ambiente.evaluador is not None) == usar_aceleracion
+        if usar_aceleracion:
+            matrices = contar_matrices(ambiente.evaluador, monkeypatch)
+        SolverGenetico(ambiente).resolver(15, {**PARAMETROS_POR_DEFECTO, "variacion_por_lotes": variacion_por_lotes,
+                                               "modo_mutacion": "dirigida", "penalizacion_esperada": -1,
+                                               "semilla": 11})
+        ejecuciones.append((ambiente.resultado, ambiente.penalizacion_por_generacion, ambiente.conflictos_por_generacion,
+                            ambiente.continuidad_por_generacion))
+    assert sum(matrices) == ambiente.evaluaciones
+    assert ejecuciones[0] == ejecuciones[1]
@@ -0,0 +1,67 @@
+import csv
+import json
+from datetime import date
+
+import pytest
+
+from models import Curso
+from models.franja import Franja
+from utils.exportador import escapar_ical, exportar, fechas_dias, linea_ical
+
+def desplegar(lineas: str) -> str:
+    return lineas.replace("\r\n ", "")
+
+@pytest.mark.parametrize("texto", ["SUMMARY:" + "Programación de señales ñandú " * 6, "DESCRIPTION:" + "á" * 100,
+                                   "LOCATION:" + "€" * 40 + "x"])
+def test_linea_ical_se_dobla_sin_cortar_caracteres(texto):
+    resultado = linea_ical(texto)
+    assert resultado.endswith("\r\n")
+    lineas = resultado[:-2].split("\r\n")
+    assert len(lineas) > 1
+    assert all(len(linea.encode("utf-8")) <= 75 for linea in lineas)
+    assert all(linea.startswith(" ") for linea in lineas[1:])
+    assert desplegar(resultado[:-2]) == texto
+
+def test_linea_ical_corta_no_se_dobla():
+    texto = "S" * 75
+    assert linea_ical(texto) == texto + "\r\n"
+
+def test_escapar_ical():
+    assert escapar_ical("Lab; redes, \\piso 2\nala") == "Lab\\; redes\\, \\\\piso 2\\nala"
+    assert escapar_ical(12) == "12"
+
+def test_fechas_dias():
+    horario = {i: (None, franja, None) for i, franja in enumerate([
+        Franja("Lunes", "13:40", 0), Franja("Miércoles", "13:40", 2), Franja("Domingo", "13:40", 6),
+        Franja("Dia 2", "13:40", 1), Franja("Diario", "14:30", -1)])}
+    # 2026-10-21 es miercoles: cada dia con nombre cae en su siguiente ocurrencia, los demas por su posicion
+    assert fechas_dias(horario, date(2026, 10, 21)) == {
+        "Lunes": date(2026, 10, 26), "Miércoles": date(2026, 10, 21), "Domingo": date(2026, 10, 25),
+        "Dia 2": date(2026, 10, 22), "Diario": date(2026, 10, 21)}
+
+def test_exportar_formatos(ambiente_usada, tmp_path):
+    ambiente = ambiente_usada(True)
+    ambiente.sembrar(2)
+    horario = ambiente.crear_individuo()
+    curso = next(iter(horario))
+    # un nombre largo con caracteres de varios octetos y separadores que se escapan
+    horario[Curso("Introducción a la programación; teoría, práctica y laboratorio de computación", "999",
+                  curso.carrera, curso.semestre, curso.seccion, curso.tipo)] = horario[curso]
+
+    exportar(horario, "csv", tmp_path / "horario.csv")
+    with open(tmp_path / "horario.csv", encoding="utf-8", newline="") as archivo:
+        filas = list(csv.DictReader(archivo))
+    exportar(horario, "json", tmp_path / "horario.json")
+    registros = json.loads((tmp_path / "horario.json").read_text(encoding="utf-8"))
+    assert len(filas) == len(registros) == len(horario)
+    assert [fila["curso_codigo"] for fila in filas] == [str(registro["curso_codigo"]) for registro in registros]
+
+    exportar(horario, "ical", tmp_path / "horario.ics")
+    contenido = (tmp_path / "horario.ics").read_bytes()
+    assert all(len(linea) <= 75 for linea in contenido.split(b"\r\n"))
+    texto = desplegar(contenido.decode("utf-8"))
+    assert texto.count("BEGIN:VEVENT") == len(horario)
+    assert "SUMMARY:Introducción a la programación\\; teoría\\, práctica y laboratorio de computación (999)" in texto
+
+    with pytest.raises(ValueError):
+        exportar(horario, "xml", tmp_path / "horario.xml")
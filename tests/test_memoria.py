@@ -0,0 +1,34 @@
+import tracemalloc
+
+from utils.memoria import MonitorMemoria
+
+# Con tracemalloc ya activo (otro perfilador) el monitor no reinicia su pico ni lo detiene
+def test_no_reinicia_el_pico_de_otro_rastreo():
+    tracemalloc.start()
+    try:
+        bloque = bytearray(4 * 1024 * 1024)
+        del bloque
+        _, pico_exterior = tracemalloc.get_traced_memory()
+
+        monitor = MonitorMemoria()
+        monitor.iniciar()
+        datos = [list(range(1000)) for _ in range(20)]
+        registro = monitor.registrar_generacion(0, datos)
+        monitor.detener()
+
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= pico_exterior
+        # el pico reportado es el incremento de esta ejecucion, no el del rastreo exterior
+        assert 0 < registro["pico_asignado"] < pico_exterior / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def test_pico_rss_no_es_menor_que_lo_medido():
+    monitor = MonitorMemoria()
+    monitor.iniciar()
+    datos = [bytearray(1024 * 1024) for _ in range(64)]
+    registro = monitor.registrar_generacion(0, datos)
+    monitor.detener()
+    assert not tracemalloc.is_tracing()
+    assert monitor.pico_rss >= registro["rss"]
+    assert monitor.pico_asignado >= 64
@@ -0,0 +1,158 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils.operadores import SelectorOperadores
+from utils.seleccion import seleccionar_padres
+from utils.solvers import PARAMETROS_POR_DEFECTO, SolverGenetico
+from utils.variacion import CodificacionGenetica
+
+def dentro_del_dominio(ambiente, individuo) -> bool:
+    return all(ambiente.dominios[curso].admite(*gen) for curso, gen in individuo.items())
+
+def codificacion(ambiente) -> CodificacionGenetica:
+    return CodificacionGenetica(ambiente.cursos, ambiente.salones, ambiente.franjas, ambiente.docentes_por_curso,
+                                dominios=ambiente.dominios)
+
+def test_dominios_respetan_capacidad_tipo_y_disponibilidad(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    for curso, dominio in ambiente.dominios.items():
+        if not dominio.factible:
+            continue
+        assert all(salon.admite(curso) for salon in dominio.salones)
+        for franja, docente in dominio.franjas_docentes:
+            if docente is None:
+                assert not ambiente.docentes_por_curso[curso.codigo]
+            else:
+                assert docente in ambiente.docentes_por_curso[curso.codigo]
+                assert docente.esta_disponible(franja.hora)
+
+    ambiente.sembrar(1)
+    assert all(dentro_del_dominio(ambiente, ambiente.crear_individuo()) for _ in range(20))
+
+def test_cruzas_toman_los_genes_de_los_padres(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    ambiente.sembrar(2)
+    padre1, padre2 = ambiente.crear_individuo(), ambiente.crear_individuo()
+
+    hijo = ambiente.cruza(padre1, padre2)
+    mitad = len(ambiente.cursos) // 2
+    assert all(hijo[curso] is padre1[curso] for curso in ambiente.cursos[:mitad])
+    assert all(hijo[curso] is padre2[curso] for curso in ambiente.cursos[mitad:])
+
+    hijo = ambiente.cruza_uniforme(padre1, padre2)
+    assert list(hijo) == ambiente.cursos
+    assert all(hijo[curso] is padre1[curso] or hijo[curso] is padre2[curso] for curso in ambiente.cursos)
+
+def test_mutaciones_quedan_en_el_dominio(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    ambiente.sembrar(3)
+    for _ in range(10):
+        assert dentro_del_dominio(ambiente, ambiente.mutacion(ambiente.crear_individuo(), 0.5))
+        assert dentro_del_dominio(ambiente, ambiente.mutacion_dirigida(ambiente.crear_individuo(), 0.5))
+
+    individuo = ambiente.crear_individuo()
+    assert ambiente.mutacion(dict(individuo), 0) == individuo
+
+def test_mutacion_dirigida_solo_cambia_cursos_objetivo(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    ambiente.sembrar(4)
+    for _ in range(10):
+        individuo = ambiente.crear_individuo()
+        objetivo = ambiente.cursos_objetivo(individuo)
+        assert objetivo
+        mutado = ambiente.mutacion_dirigida(dict(individuo), 1, prob_exploracion=0)
+        assert {curso for curso in ambiente.cursos if mutado[curso] is not individuo[curso]} <= objetivo
+
+def test_codificacion_ida_y_vuelta(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    ambiente.sembrar(5)
+    poblacion = [ambiente.crear_individuo() for _ in range(10)]
+    genes = codificacion(ambiente)
+    assert genes.decodificar(genes.codificar(poblacion)) == poblacion
+
+def test_variacion_por_lotes_queda_en_el_dominio(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    random.seed(6)
+    genes = codificacion(ambiente)
+    matriz = genes.genes_aleatorios(20)
+    parejas = np.arange(40) % 20
+    for prob_exploracion in (None, 0.02):
+        hijos = genes.variacion(matriz, parejas, 0.3, 0.5, prob_exploracion)
+        assert hijos.shape == (20, len(ambiente.cursos), 3)
+        assert all(dentro_del_dominio(ambiente, hijo) for hijo in genes.decodificar(hijos))
+
+# Cada gen reparado cambia el costo de su hijo en la diferencia exacta de costo_opciones, la reparacion nunca empeora
+def test_reparacion_por_lotes_nunca_empeora(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    ambiente.sembrar(8)
+    genes = CodificacionGenetica(ambiente.cursos, ambiente.salones, ambiente.franjas, ambiente.docentes_por_curso,
+                                 dominios=ambiente.dominios, generador=ambiente.rng)
+    matriz = genes.codificar([ambiente.crear_individuo() for _ in range(10)])
+    antes = [ambiente.funcion_costo(individuo)[0] for individuo in genes.decodificar(matriz)]
+    reparados = genes.reparar(matriz.copy(), np.ones(matriz.shape[:2], dtype=bool), ambiente.peso_continuidad_actual())
+    despues = [ambiente.funcion_costo(individuo)[0] for individuo in genes.decodificar(reparados)]
+    assert all(costo <= anterior + 1e-9 for costo, anterior in zip(despues, antes))
+    assert sum(despues) < sum(antes)
+    assert all(dentro_del_dominio(ambiente, hijo) for hijo in genes.decodificar(reparados))
+
+def test_huella_incremental_igual_que_recalculada(ambiente_sintetico):
+    ambiente = ambiente_sintetico()
+    ambiente.sembrar(7)
+    individuo = ambiente.crear_individuo()
+    huella = ambiente.huella(individuo)
+    assert ambiente.huella(dict(reversed(list(individuo.items())))) == huella
+    for _ in range(50):
+        curso = ambiente.rng.choice(ambiente.cursos)
+        anterior = individuo[curso]
+        individuo[curso] = ambiente.gen_aleatorio(curso)
+        huella = ambiente.tabla_huellas.cambiar(huella, curso, anterior, individuo[curso])
+        assert huella == ambiente.huella(individuo)
+
+@pytest.mark.parametrize("metodo", ["torneo", "rango", "universal"])
+def test_seleccion_devuelve_indices_validos(metodo):
+    random.seed(8)
+    costos = [random.uniform(0, 100) for _ in range(30)]
+    indices = seleccionar_padres(metodo, costos, 60)
+    assert len(indices) == 60
+    assert all(0 <= i < 30 for i in indices)
+    # con presion de seleccion el promedio de los padres es mejor que el de la poblacion
+    assert sum(costos[i] for i in indices) / 60 < sum(costos) / 30
+
+@pytest.mark.parametrize("metodo", ["probabilidad", "bandido"])
+def test_selector_favorece_al_operador_con_credito(metodo):
+    random.seed(10)
+    selector = SelectorOperadores(["bueno", "malo"], metodo)
+    for _ in range(20):
+        for _ in range(10):
+            operador = selector.elegir()
+            selector.registrar(operador, operador == "bueno")
+        selector.actualizar()
+    estadisticas = selector.estadisticas()
+    assert estadisticas["bueno"]["usos"] > 3 * estadisticas["malo"]["usos"]
+    assert estadisticas["bueno"]["tasa_exito"] == 1
+    assert estadisticas["malo"]["exitos"] == 0
+    if metodo == "probabilidad":
+        assert selector.prob_minima <= min(selector.probabilidades) < 2 * selector.prob_minima
+
+def test_selector_cobra_las_evaluaciones_extra():
+    selector = SelectorOperadores(["barato", "caro"])
+    selector.registrar("barato", True)
+    selector.registrar("caro", True, evaluaciones=10)
+    selector.actualizar()
+    assert selector.calidad["barato"] > selector.calidad["caro"]
+    assert selector.probabilidades[0] > selector.probabilidades[1]
+
+@pytest.mark.parametrize("seleccion_operadores", ["generacion", "probabilidad", "bandido"])
+@pytest.mark.parametrize("variacion_por_lotes", [False, True])
+def test_estadisticas_de_operadores(ambiente_sintetico, seleccion_operadores, variacion_por_lotes):
+    ambiente = ambiente_sintetico()
+    SolverGenetico(ambiente).resolver(8, {**PARAMETROS_POR_DEFECTO, "seleccion_operadores": seleccion_operadores,
+                                          "variacion_por_lotes": variacion_por_lotes, "penalizacion_esperada": -1,
+                                          "semilla": 11})
+    cruzas, mutaciones = ambiente.estadisticas_operadores["cruza"], ambiente.estadisticas_operadores["mutacion"]
+    assert sum(datos["usos"] for datos in cruzas.values()) == sum(datos["usos"] for datos in mutaciones.values()) > 0
+    assert "reparadora" in mutaciones
+    for datos in list(cruzas.values()) + list(mutaciones.values()):
+        assert datos["exitos"] <= datos["evaluados"] <= datos["usos"]
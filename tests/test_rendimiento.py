@@ -0,0 +1,98 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils.evaluacion import NUMBA_DISPONIBLE
+from utils.solvers import PARAMETROS_POR_DEFECTO, SolverGenetico, SolverRecocido
+from utils.variacion import CodificacionGenetica
+
+# Benchmarks comparados con tests/referencias/rendimiento.json, se omiten con pytest -m "not rendimiento"
+# Los que usan los nucleos de utils.evaluacion guardan una referencia por backend (compilado o Python)
+pytestmark = pytest.mark.rendimiento
+
+BACKEND = "numba" if NUMBA_DISPONIBLE else "python"
+
+@pytest.fixture
+def poblacion_usada(ambiente_usada):
+    ambiente = ambiente_usada(True)
+    ambiente.sembrar(9)
+    return ambiente, [ambiente.crear_individuo() for _ in range(50)]
+
+def test_funcion_costo(poblacion_usada, comparar_rendimiento):
+    ambiente, poblacion = poblacion_usada
+    comparar_rendimiento("funcion_costo", lambda: [ambiente.funcion_costo(individuo) for individuo in poblacion])
+
+def test_calcular_continuidad(poblacion_usada, comparar_rendimiento):
+    ambiente, poblacion = poblacion_usada
+    comparar_rendimiento("calcular_continuidad",
+                         lambda: [ambiente.calcular_continuidad(individuo) for individuo in poblacion])
+
+def test_calcular_diversidad(poblacion_usada, comparar_rendimiento):
+    ambiente, poblacion = poblacion_usada
+    comparar_rendimiento("calcular_diversidad", lambda: ambiente.calcular_diversidad(poblacion[:30]))
+
+def test_huellas(poblacion_usada, comparar_rendimiento):
+    ambiente, poblacion = poblacion_usada
+    comparar_rendimiento("huella", lambda: [ambiente.huella(individuo) for individuo in poblacion])
+
+def test_evaluar_lote_acelerado(ambiente_usada, comparar_rendimiento):
+    ambiente = ambiente_usada(True, usar_aceleracion=True)
+    ambiente.sembrar(9)
+    poblacion = [ambiente.crear_individuo() for _ in range(50)]
+    # sin numba no hay evaluador y se mide la funcion de costo original
+    if ambiente.evaluador is not None:
+        ambiente.evaluador.evaluar(poblacion[:1])
+
+    # sin el cache de partes, cada repeticion evalua toda la poblacion
+    def evaluar():
+        ambiente.partes_por_id.clear()
+        ambiente.evaluar_lote(poblacion)
+    comparar_rendimiento(f"evaluar_lote[{BACKEND}]", evaluar)
+
+def test_variacion_por_lotes(ambiente_usada, comparar_rendimiento):
+    ambiente = ambiente_usada(True)
+    random.seed(9)
+    genes = CodificacionGenetica(ambiente.cursos, ambiente.salones, ambiente.franjas, ambiente.docentes_por_curso,
+                                 dominios=ambiente.dominios)
+    matriz = genes.genes_aleatorios(50)
+    parejas = np.arange(100) % 50
+    comparar_rendimiento("variacion_por_lotes", lambda: genes.variacion(matriz, parejas, 0.3, 0.5, 0.02))
+
+# Ejecuciones cortas de todas las generaciones (sin convergencia), con la misma semilla en cada repeticion
+def ejecucion(solver, generaciones: int, **parametros):
+    def ejecutar():
+        solver.resolver(generaciones, {**PARAMETROS_POR_DEFECTO, "penalizacion_esperada": -1, "semilla": 13,
+                                       **parametros})
+    return ejecutar
+
+@pytest.mark.parametrize("usar_aceleracion", [False, True])
+def test_genetico_generacional(ambiente_sintetico, comparar_rendimiento, usar_aceleracion):
+    solver = SolverGenetico(ambiente_sintetico(usar_aceleracion=usar_aceleracion))
+    clave = f"genetico_generacional_acelerado[{BACKEND}]" if usar_aceleracion else "genetico_generacional"
+    comparar_rendimiento(clave,
+                         ejecucion(solver, 5, modo_evolucion="generacional"), repeticiones=3)
+
+# Con o sin numba, pedir la evaluacion acelerada nunca vuelve mas lenta la ejecucion
+def test_aceleracion_no_es_mas_lenta(ambiente_sintetico, comparar_con_original):
+    ejecuciones = [ejecucion(SolverGenetico(ambiente_sintetico(usar_aceleracion=usar_aceleracion)), 5,
+                             modo_evolucion="generacional") for usar_aceleracion in (True, False)]
+    # la primera ejecucion compila los nucleos
+    ejecuciones[0]()
+    comparar_con_original("genetico_generacional_acelerado", *ejecuciones)
+
+@pytest.mark.parametrize("usar_aceleracion", [False, True])
+def test_genetico_por_lotes(ambiente_usada, comparar_rendimiento, usar_aceleracion):
+    solver = SolverGenetico(ambiente_usada(True, usar_aceleracion))
+    clave = f"genetico_por_lotes_acelerado[{BACKEND}]" if usar_aceleracion else "genetico_por_lotes"
+    comparar_rendimiento(clave,
+                         ejecucion(solver, 10, modo_evolucion="generacional", variacion_por_lotes=True,
+                                   poblacion_inicial=30), repeticiones=3)
+
+def test_genetico_estacionario(ambiente_sintetico, comparar_rendimiento):
+    solver = SolverGenetico(ambiente_sintetico())
+    comparar_rendimiento("genetico_estacionario", ejecucion(solver, 5, modo_evolucion="estacionario"), repeticiones=3)
+
+def test_recocido(ambiente_sintetico, comparar_rendimiento):
+    solver = SolverRecocido(ambiente_sintetico())
+    comparar_rendimiento("recocido", ejecucion(solver, 5), repeticiones=3)
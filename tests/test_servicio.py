@@ -0,0 +1,132 @@
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from utils.servicio import CANCELADO, COMPLETADO, EJECUTANDO, EN_COLA, GestorTrabajos, Trabajo, crear_servidor
+
+# Instancia minima: cuatro cursos de un solo dia con las horas por defecto
+DATOS = {
+    "cursos": [{"nombre": f"Curso {i}", "codigo": f"C{i}", "carrera": "Sistemas", "semestre": 1 + i % 2,
+                "seccion": "A", "tipo": "Obligatorio"} for i in range(1, 5)],
+    "salones": [{"id": 1, "nombre": "Salon 1"}, {"id": 2, "nombre": "Salon 2"}],
+    "docentes": [{"nombre": "Docente 1", "registro": "D1", "hora_entrada": "13:00", "hora_salida": "21:00"}],
+    "relaciones": [{"registro": "D1", "codigo": "C1"}, {"registro": "D1", "codigo": "C2"}],
+}
+
+def solicitud(generaciones: int) -> dict:
+    return {"datos": DATOS, "generaciones": generaciones,
+            "parametros": {"poblacion_inicial": 10, "penalizacion_esperada": -1, "semilla": 5}}
+
+# Servidor en un puerto libre, sus trabajos se guardan en tmp_path
+@pytest.fixture
+def servicio(tmp_path):
+    servidores = []
+
+    def crear(**opciones) -> tuple[str, GestorTrabajos]:
+        servidor = crear_servidor(puerto=0, directorio_base=str(tmp_path / "trabajos"), **opciones)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        servidores.append(servidor)
+        return f"http://127.0.0.1:{servidor.server_address[1]}", servidor.gestor
+    yield crear
+    for servidor in servidores:
+        servidor.gestor.detener()
+        servidor.shutdown()
+        servidor.server_close()
+
+def pedir(metodo: str, url: str, cuerpo: dict | None = None) -> tuple[int, object]:
+    datos = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=datos, method=metodo), timeout=60) as respuesta:
+            return respuesta.status, json.loads(respuesta.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+def esperar(url: str, condicion, limite: float = 60) -> dict:
+    fin = time.time() + limite
+    while time.time() < fin:
+        _, estado = pedir("GET", url)
+        if condicion(estado):
+            return estado
+        time.sleep(0.1)
+    pytest.fail(f"El trabajo no llego al estado esperado: {estado}")
+
+def test_trabajo_completo_con_progreso_transmitido(servicio):
+    base, _ = servicio()
+    estado, trabajo = pedir("POST", f"{base}/trabajos", solicitud(5))
+    assert estado == 202 and trabajo["estado"] == EN_COLA
+    url = f"{base}/trabajos/{trabajo['id']}"
+
+    with urllib.request.urlopen(f"{url}/progreso?seguir=1", timeout=60) as respuesta:
+        lineas = [json.loads(linea) for linea in respuesta]
+    assert lineas[-1]["estado"] == COMPLETADO
+    assert len(lineas[:-1]) == 5
+
+    _, final = pedir("GET", url)
+    assert final["resultado"]["semilla"] == 5
+    estado, solucion = pedir("GET", f"{url}/solucion")
+    assert estado == 200
+    assert sorted(asignacion["curso"] for asignacion in solucion["asignaciones"]) == ["C1", "C2", "C3", "C4"]
+    assert pedir("GET", f"{url}/progreso?desde=3")[1] == lineas[3:-1]
+    for desde in ("x", "-1"):
+        assert pedir("GET", f"{url}/progreso?desde={desde}")[0] == 400
+
+def test_cancelar_y_eliminar(servicio, tmp_path):
+    base, _ = servicio()
+    _, trabajo = pedir("POST", f"{base}/trabajos", solicitud(100000))
+    url = f"{base}/trabajos/{trabajo['id']}"
+    esperar(url, lambda estado: estado["generaciones_completadas"] > 0)
+
+    estado, cancelado = pedir("DELETE", url)
+    assert estado == 200 and cancelado["estado"] == CANCELADO
+    assert (tmp_path / "trabajos" / trabajo["id"]).exists()
+    # un trabajo terminado se elimina junto con su carpeta
+    estado, eliminado = pedir("DELETE", url)
+    assert estado == 200 and eliminado["eliminado"]
+    assert not (tmp_path / "trabajos" / trabajo["id"]).exists()
+    assert pedir("GET", url)[0] == 404
+
+def test_limite_de_procesos(servicio):
+    base, _ = servicio(max_procesos=1)
+    ids = [pedir("POST", f"{base}/trabajos", solicitud(100000))[1]["id"] for _ in range(2)]
+    esperar(f"{base}/trabajos/{ids[0]}", lambda estado: estado["generaciones_completadas"] > 0)
+    time.sleep(1.5)
+    estados = [trabajo["estado"] for trabajo in pedir("GET", f"{base}/trabajos")[1]]
+    assert estados == [EJECUTANDO, EN_COLA]
+
+    # al cancelar el primero se inicia el segundo
+    pedir("DELETE", f"{base}/trabajos/{ids[0]}")
+    esperar(f"{base}/trabajos/{ids[1]}", lambda estado: estado["estado"] == EJECUTANDO)
+    pedir("DELETE", f"{base}/trabajos/{ids[1]}")
+
+# La retencion descarta los trabajos terminados mas antiguos y los vencidos, los activos se conservan
+def test_retencion_de_terminados(tmp_path):
+    gestor = GestorTrabajos(directorio_base=str(tmp_path), max_terminados=2, ttl_terminados=60)
+    try:
+        with gestor.condicion:
+            for numero in range(5):
+                trabajo = Trabajo(f"{numero:05d}", "genetico", 1, {}, {}, None, str(tmp_path / f"{numero:05d}"))
+                gestor.trabajos[trabajo.id] = trabajo
+            gestor.trabajos["00004"].estado = EJECUTANDO
+            for numero in range(4):
+                gestor.terminar(gestor.trabajos[f"{numero:05d}"], COMPLETADO)
+            assert sorted(gestor.trabajos) == ["00002", "00003", "00004"]
+
+            gestor.trabajos["00002"].fin -= 120
+            gestor.depurar_terminados()
+            assert sorted(gestor.trabajos) == ["00003", "00004"]
+    finally:
+        gestor.detener()
+
+# El servicio y los procesos de ejecuciones no cargan Qt
+def test_sin_qt():
+    codigo = "import sys, utils.servicio, utils.ejecuciones, utils.solvers; print('PyQt5' in sys.modules)"
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+                            env={**os.environ, "PYTHONPATH": os.path.join(os.path.dirname(__file__), "..", "src")})
+    assert salida.stdout.split()[-1] == "False"